@@ -0,0 +1,283 @@
+# bot/alpha_bus.py – bounded, thread-safe alpha event bus
+"""
+Replaces the bare ``deque`` + 5 s polling between sniffer and brain.
+
+  • bounded – ``maxsize`` events, with a configurable overflow policy:
+        drop_oldest  → evict the oldest queued event to make room
+        block        → producer waits for room (threads block, loop producers
+                       ``await put_async``); a ``put`` on a thread running an
+                       event loop cannot wait and is rejected instead of
+                       deadlocking it – also before the first ``get_batch``
+        coalesce     → an event for a mint already queued is merged into it
+                       in place (keyed on ``key`` – the address, the symbol
+                       when there is none: symbols collide across mints); a
+                       full queue then falls back to drop_oldest
+  • the consumer awaits ``get_batch()`` and wakes the moment an event lands –
+    also when ``put`` is called from a non-loop thread (Telegram, file watcher)
+  • depth / high-water / drop / coalesce / wait-time counters via ``stats()``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Deque, Dict, List, Tuple
+
+from loguru import logger
+
+Event = Dict[str, Any]
+
+
+class OverflowPolicy(str, Enum):
+    DROP_OLDEST = "drop_oldest"
+    BLOCK = "block"
+    COALESCE = "coalesce"
+
+
+class AlphaBus:
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        policy: OverflowPolicy | str = OverflowPolicy.DROP_OLDEST,
+        block_timeout: float | None = None,
+        key: str = "address",
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = maxsize
+        self.policy = OverflowPolicy(policy)
+        self.block_timeout = block_timeout
+        self.key = key
+
+        self._items: Deque[Tuple[int, Event]] = deque()      # (enqueue perf_counter_ns, event)
+        self._index: Dict[Any, Event] = {}                   # coalesce key → queued event
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+
+        # consumer side – bound on the first get_batch()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: int | None = None
+        self._ready: asyncio.Event | None = None
+        self._space: asyncio.Event | None = None
+        self._space_loop: asyncio.AbstractEventLoop | None = None    # the put_async producer's loop
+        self._waiting = False
+
+        self.pushed = self.consumed = self.dropped = self.coalesced = self.rejected = 0
+        self.high_water = 0
+        self._wait_ns_total = 0
+        self._wait_ns_max = 0
+
+    # ─────────────── producer side ───────────────
+    def put(self, evt: Event) -> bool:
+        """Enqueue from any thread. Returns False if the event was rejected."""
+        with self._lock:
+            if not self._admit(evt):
+                return False
+            wake = self._waiting
+            self._waiting = False
+        if wake:
+            self._wake()
+        return True
+
+    async def put_async(self, evt: Event) -> bool:
+        """Loop-side producer: under the *block* policy, await room instead of rejecting.
+        Room is checked and taken under one lock – a producer that lost the slot waits again."""
+        while True:
+            with self._lock:
+                full = self.policy is OverflowPolicy.BLOCK and len(self._items) >= self.maxsize
+                if not full:
+                    admitted = self._admit(evt)
+                    wake = self._waiting
+                    self._waiting = False
+                    break
+                if self._space is None:
+                    self._space = asyncio.Event()
+                    self._space_loop = asyncio.get_running_loop()
+                self._space.clear()
+                space = self._space
+            await space.wait()
+        if wake:
+            self._wake()
+        return admitted
+
+    def _admit(self, evt: Event) -> bool:
+        """Apply the overflow policy and append. Caller holds the lock."""
+        if self.policy is OverflowPolicy.COALESCE:
+            queued = self._index.get(self._key(evt))
+            if queued is not None:
+                queued.update(evt)
+                self.coalesced += 1
+                return True
+
+        if len(self._items) >= self.maxsize:
+            if self.policy is OverflowPolicy.BLOCK:
+                if self._on_loop() or not self._not_full.wait_for(
+                    lambda: len(self._items) < self.maxsize, timeout=self.block_timeout
+                ):
+                    self.rejected += 1
+                    logger.warning(f"⛔ Alpha bus full – rejected {self._key(evt)}")
+                    return False
+            else:
+                _, oldest = self._items.popleft()
+                self._unindex(oldest)
+                self.dropped += 1
+
+        self._items.append((time.perf_counter_ns(), evt))
+        if self.policy is OverflowPolicy.COALESCE:
+            self._index[self._key(evt)] = evt
+        self.pushed += 1
+        self.high_water = max(self.high_water, len(self._items))
+        return True
+
+    def _on_loop(self) -> bool:
+        """True on the consumer's loop thread – or any thread running a loop, also before the first get_batch()."""
+        if threading.get_ident() == self._loop_thread:
+            return True
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return True
+
+    def _key(self, evt: Event) -> Any:
+        return evt.get(self.key) or evt.get("symbol")
+
+    def _signal_space(self) -> None:
+        """Wake ``put_async`` producers – asyncio.Event is not thread-safe, so off its loop go through it."""
+        space, loop = self._space, self._space_loop
+        if space is None or loop is None:
+            return
+        try:
+            on_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            space.set()
+        elif not loop.is_closed():
+            loop.call_soon_threadsafe(space.set)
+
+    def _unindex(self, evt: Event) -> None:
+        k = self._key(evt)
+        if self._index.get(k) is evt:
+            del self._index[k]
+
+    def _wake(self) -> None:
+        loop, ready = self._loop, self._ready
+        if loop is None or ready is None:
+            return
+        if threading.get_ident() == self._loop_thread:
+            ready.set()
+        else:
+            loop.call_soon_threadsafe(ready.set)
+
+    # ─────────────── consumer side ───────────────
+    def drain(self, max_items: int | None = None) -> List[Event]:
+        """Pop up to ``max_items`` queued events without waiting."""
+        now = time.perf_counter_ns()
+        out: List[Event] = []
+        with self._lock:
+            while self._items and (max_items is None or len(out) < max_items):
+                t_enq, evt = self._items.popleft()
+                self._unindex(evt)
+                waited = now - t_enq
+                self._wait_ns_total += waited
+                self._wait_ns_max = max(self._wait_ns_max, waited)
+                out.append(evt)
+            self.consumed += len(out)
+            if out:
+                self._not_full.notify_all()
+                self._signal_space()
+        return out
+
+    async def get_batch(self, max_items: int | None = None) -> List[Event]:
+        """Wait until at least one event is queued, then drain."""
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+            self._loop_thread = threading.get_ident()
+            self._ready = asyncio.Event()
+        while True:
+            batch = self.drain(max_items)
+            if batch:
+                return batch
+            with self._lock:
+                if self._items:
+                    continue
+                self._ready.clear()
+                self._waiting = True
+            await self._ready.wait()
+
+    # ─────────────── introspection ───────────────
+    def snapshot(self) -> List[Event]:
+        """Copies of the queued events, oldest first (the queue is left untouched)."""
+        with self._lock:
+            return [dict(evt) for _, evt in self._items]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "depth": len(self._items),
+                "maxsize": self.maxsize,
+                "policy": self.policy.value,
+                "high_water": self.high_water,
+                "pushed": self.pushed,
+                "consumed": self.consumed,
+                "dropped": self.dropped,
+                "coalesced": self.coalesced,
+                "rejected": self.rejected,
+                "avg_wait_us": self._wait_ns_total / self.consumed / 1000 if self.consumed else 0.0,
+                "max_wait_us": self._wait_ns_max / 1000,
+            }
+
+
+class InFlight:
+    """
+    Events taken off ``bus`` whose verdict is still pending, keyed by mint.
+
+    The checkpointer tracks it like a bus (``pushed`` / ``consumed`` /
+    ``coalesced`` + ``snapshot``), so an event drained but not yet screened
+    survives a restart; what it restores is ``put`` back on ``bus`` and
+    screened again.
+    """
+
+    def __init__(self, bus: AlphaBus) -> None:
+        self.bus = bus
+        self._events: Dict[str, Event] = {}
+        self._lock = threading.Lock()                        # the checkpointer snapshots from a thread
+        self.pushed = self.consumed = self.coalesced = 0
+
+    def add(self, key: str, evt: Event) -> bool:
+        """Track ``evt``; False when an event for ``key`` is already being screened."""
+        with self._lock:
+            if key in self._events:
+                return False
+            self._events[key] = evt
+            self.pushed += 1
+            return True
+
+    def settle(self, key: str) -> None:
+        with self._lock:
+            if self._events.pop(key, None) is not None:
+                self.consumed += 1
+
+    def put(self, evt: Event) -> bool:
+        """Restored events go back on the bus."""
+        return self.bus.put(evt)
+
+    def snapshot(self) -> List[Event]:
+        with self._lock:
+            return [dict(evt) for evt in self._events.values()]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._events
+
+    def __len__(self) -> int:
+        return len(self._events)
@@ -0,0 +1,176 @@
+# bot/amm.py – constant-product (x·y = k) fill simulation from snapshot liquidity / price
+"""
+Paper fills that pay for the pool they hit.
+
+A snapshot row's ``liquidity`` (USD, both sides) and ``price`` (USD per
+token) are read as a constant-product pool holding y = liquidity / 2 of
+quote and x = y / price tokens.  Buying with ``q`` of quote:
+
+  • the fee stays in the pool: only q' = q · (1 − fee) is swapped
+  • tokens out = x · q' / (y + q'); the pool ends at (x − out, y + q)
+  • ``max_slippage`` makes the order a limit at mid · (1 + max_slippage):
+    the curve is swept only until its marginal price reaches the limit,
+    i.e. q' ≤ y · (√(1 + max_slippage) − 1); the remainder is left
+    unfilled (``PARTIAL``)
+  • no liquidity, no price or nothing to spend → ``REJECTED``
+
+``simulate_buys`` is the batch API: columns in, columns out – NumPy when it
+is installed, one tight loop otherwise (same numbers) – for backtests and
+stress runs.  ``Pool`` keeps one pool's reserves moving across successive
+paper buys.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+try:  # optional – the pure-Python path is used when NumPy is missing
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on environment
+    np = None
+
+AMM_FEE_BPS = float(os.getenv("AMM_FEE_BPS", "25"))                 # Raydium AMM v4: 0.25 %
+AMM_MAX_SLIPPAGE = float(os.getenv("AMM_MAX_SLIPPAGE", "0.05"))
+
+FILLED, PARTIAL, REJECTED = 0, 1, 2
+STATUS = ("filled", "partial", "rejected")
+
+
+@dataclass
+class Fills:
+    """Column-wise results of ``simulate_buys``; index ``i`` is order ``i``."""
+
+    tokens: Sequence[float]           # tokens received
+    spent: Sequence[float]            # quote spent, fee included (≤ the amount asked)
+    fee: Sequence[float]
+    price: Sequence[float]            # average fill price (spent / tokens), 0 when rejected
+    slippage: Sequence[float]         # average price vs the mid before the trade (fee included)
+    impact: Sequence[float]           # mid after vs mid before
+    status: Sequence[int]
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    def row(self, i: int) -> Dict[str, object]:
+        return {
+            "amount": float(self.tokens[i]),
+            "price": float(self.price[i]),
+            "spent": float(self.spent[i]),
+            "fee": float(self.fee[i]),
+            "slippage": float(self.slippage[i]),
+            "impact": float(self.impact[i]),
+            "status": STATUS[int(self.status[i])],
+        }
+
+
+def simulate_buys(
+    liquidity: Sequence[float],
+    price: Sequence[float],
+    amount: Sequence[float],
+    *,
+    fee_bps: float = AMM_FEE_BPS,
+    max_slippage: float = AMM_MAX_SLIPPAGE,
+) -> Fills:
+    """Every order against its own pool (``liquidity[i]``, ``price[i]``), independently."""
+    fee = fee_bps / 10_000
+    headroom = math.sqrt(1.0 + max_slippage) - 1.0
+    if np is not None:
+        return _simulate_numpy(liquidity, price, amount, fee, headroom)
+    return _simulate_python(liquidity, price, amount, fee, headroom)
+
+
+def _simulate_python(liquidity, price, amount, fee: float, headroom: float) -> Fills:
+    keep = 1.0 - fee
+    n = len(amount)
+    tokens, spent, fees, avg, slip, impact = ([0.0] * n for _ in range(6))
+    status = [REJECTED] * n
+    for i, (liq, mid, q) in enumerate(zip(liquidity, price, amount)):
+        if not (liq > 0 and mid > 0 and q > 0):
+            continue
+        y = liq * 0.5
+        x = y / mid
+        cap = y * headroom / keep
+        s = q if q <= cap else cap
+        swapped = s * keep
+        out = x * swapped / (y + swapped)
+        p = s / out
+        tokens[i], spent[i], fees[i], avg[i] = out, s, s - swapped, p
+        slip[i] = p / mid - 1.0
+        impact[i] = (y + s) / (x - out) / mid - 1.0
+        status[i] = FILLED if s == q else PARTIAL
+    return Fills(tokens, spent, fees, avg, slip, impact, status)
+
+
+def _simulate_numpy(liquidity, price, amount, fee: float, headroom: float) -> Fills:
+    liq = np.asarray(liquidity, dtype=float)
+    mid = np.asarray(price, dtype=float)
+    q = np.asarray(amount, dtype=float)
+    ok = (liq > 0) & (mid > 0) & (q > 0)
+    keep = 1.0 - fee
+    y = np.where(ok, liq * 0.5, 1.0)
+    safe_mid = np.where(ok, mid, 1.0)
+    x = y / safe_mid
+    s = np.where(ok, np.minimum(q, y * headroom / keep), 0.0)
+    swapped = s * keep
+    out = x * swapped / (y + swapped)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = np.where(ok, s / out, 0.0)
+    slip = np.where(ok, p / safe_mid - 1.0, 0.0)
+    impact = np.where(ok, (y + s) / (x - out) / safe_mid - 1.0, 0.0)
+    status = np.where(ok, np.where(s == q, FILLED, PARTIAL), REJECTED)
+    return Fills(out, s, s - swapped, p, slip, impact, status)
+
+
+@dataclass
+class Pool:
+    """One pool's reserves; paper buys move them, fresh snapshot data replaces them."""
+
+    base: float                       # tokens
+    quote: float                      # USD
+    fee_bps: float = AMM_FEE_BPS
+
+    @classmethod
+    def from_snapshot(cls, liquidity: float, price: float, fee_bps: float = AMM_FEE_BPS) -> "Pool":
+        quote = liquidity * 0.5
+        return cls(quote / price, quote, fee_bps)
+
+    @property
+    def liquidity(self) -> float:
+        return self.quote * 2.0
+
+    @property
+    def price(self) -> float:
+        return self.quote / self.base
+
+    def apply(self, fills: Fills, i: int) -> None:
+        """Move the reserves by order ``i`` of ``fills`` (simulated against this pool)."""
+        if fills.status[i] != REJECTED:
+            self.base -= float(fills.tokens[i])
+            self.quote += float(fills.spent[i])
+
+    def buy(self, amount: float, max_slippage: float = AMM_MAX_SLIPPAGE) -> Dict[str, object]:
+        fills = simulate_buys([self.liquidity], [self.price], [amount], fee_bps=self.fee_bps, max_slippage=max_slippage)
+        self.apply(fills, 0)
+        return fills.row(0)
+
+
+def fill_price(row: dict, amount: float, **kw) -> float:
+    """Average price paid buying ``amount`` of quote into a snapshot row's pool – 0 when it cannot fill."""
+    fills = simulate_buys([_f(row.get("liquidity"))], [_f(row.get("price"))], [amount], **kw)
+    return float(fills.price[0])
+
+
+def _f(value: object) -> float:
+    try:
+        return float(value or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def columns(rows: Sequence[dict], amount: float | Sequence[float]) -> tuple[List[float], List[float], List[float]]:
+    """(liquidity, price, amount) columns for ``simulate_buys`` from snapshot rows."""
+    amounts = [amount] * len(rows) if isinstance(amount, (int, float)) else list(amount)
+    return [_f(r.get("liquidity")) for r in rows], [_f(r.get("price")) for r in rows], amounts
@@ -3,121 +3,392 @@
 AshBorn “Brain” – central command router + alpha-event promoter
 ────────────────────────────────────────────────
 Phase-0  = simulation only
-  • BUY / SELL → fake buyer_engine
-  • STATUS / REBALANCE → log only
-  • Alpha events come from sniffer → auto-promoted to BUY
+  • BUY → paper AMM fills (buyer_engine), receipts booked in the position book
+  • SELL → closes (part of) a position at its last refreshed price
+  • STATUS → executor, positions / P&L and latency report
+  • REBALANCE → log only
+  • Alpha events come from sniffer → risk checks (bot.risk) → BUY
 """
 
 from __future__ import annotations
 
 import asyncio
-from collections import deque
+import os
+import sys
+from concurrent.futures import Future
 from datetime import datetime, timezone
-from typing import Deque, Dict, Tuple
+from typing import Dict, List
 
 from loguru import logger
-from bot.buyer_engine import simulate_buy_token
-from sniffers.bird_eye import fetch_latest_tokens
+from bot.alpha_bus import AlphaBus, InFlight
+from bot.buyer_engine import paper_buyer, simulate_buy_token
+from bot.checkpoint import checkpointer
+from bot.executor import Order, OrderExecutor
+from bot.notifier import notify
+from bot.positions import PositionBook, PriceRefresher
+from bot.risk import STANDARD_CHECKS, RiskPipeline, Verdict, replay_rules, standard_checks
+from bot.trade_store import TradeStore, open_trade_store
+from utils.dedupe import make_dedupe
+from utils.logger import hot
+from utils.tracing import tracer
+from sniffers.token_table import RuleSet
 
 # ─────────────────── Alpha queue ───────────────────
-ALPHA_QUEUE: Deque[Dict[str, str]] = deque()
+ALPHA_QUEUE = AlphaBus(
+    maxsize=int(os.getenv("ALPHA_QUEUE_MAXSIZE", "1024")),
+    policy=os.getenv("ALPHA_QUEUE_POLICY", "drop_oldest"),
+)
+checkpointer.track_bus("alpha_queue", ALPHA_QUEUE)       # queued events survive a restart
 
-def push_alpha_event(symbol: str, name: str) -> None:
-    ALPHA_QUEUE.append({
+# what the running brain has already screened (keyed on mint address + change kind, sliding window)
+ALPHA_SEEN = make_dedupe()
+checkpointer.track_dedupe("brain.seen", ALPHA_SEEN)
+
+# drained, verdict still pending – tracked after the queue, so a move between the two is never missed
+ALPHA_INFLIGHT = InFlight(ALPHA_QUEUE)
+checkpointer.track_bus("alpha_inflight", ALPHA_INFLIGHT)
+
+# kinds (see sniffers.snapshot_diff.DeltaKind) that are promoted to a BUY
+BUY_KINDS = {"new_listing", "liquidity_change", "volume_spike"}
+
+def _alpha_event(
+    symbol: str, name: str, address: str | None, kind: str, payload: dict | None, discovered_ns: int = 0
+) -> Dict:
+    evt = {
         "symbol": symbol.upper(),
         "name": name,
+        "address": address or "",
+        "kind": kind,
+        "payload": payload or {},
         "ts": datetime.now(timezone.utc).isoformat(),
-    })
-    logger.debug(f"➕ Alpha event queued → {symbol}/{name}")
+    }
+    if tracer.enabled:
+        queued = tracer.now()
+        tracer.record("sniffer", discovered_ns, queued)
+        evt["trace"] = {"discovered": discovered_ns or queued, "queued": queued}
+    return evt
+
+def push_alpha_event(
+    symbol: str, name: str, address: str | None = None, kind: str = "new_listing", payload: dict | None = None,
+    discovered_ns: int = 0,
+) -> bool:
+    queued = ALPHA_QUEUE.put(_alpha_event(symbol, name, address, kind, payload, discovered_ns))
+    if queued:
+        hot("alpha.queued").debug("➕ Alpha event queued → {}/{} ({})", symbol, name, kind)
+    return queued
+
+async def push_alpha_event_async(
+    symbol: str, name: str, address: str | None = None, kind: str = "new_listing", payload: dict | None = None,
+    discovered_ns: int = 0,
+) -> bool:
+    """Loop-side push: under the *block* policy waits for room instead of rejecting."""
+    queued = await ALPHA_QUEUE.put_async(_alpha_event(symbol, name, address, kind, payload, discovered_ns))
+    if queued:
+        hot("alpha.queued").debug("➕ Alpha event queued → {}/{} ({})", symbol, name, kind)
+    return queued
 
 # ─────────────────── Memory storage ────────────────
 TRADED_FILE = "data/traded_tokens.txt"
-traded_tokens: set[str] = set()
-
-def load_traded_tokens() -> None:
-    try:
-        with open(TRADED_FILE, "r", encoding="utf-8") as f:
-            for line in f:
-                token = line.strip().upper()
-                if token:
-                    traded_tokens.add(token)
-        logger.debug(f"📁 Loaded {len(traded_tokens)} traded tokens from memory.")
-    except FileNotFoundError:
-        logger.info("📁 No traded token memory yet – starting fresh.")
-
-def remember_trade(token: str) -> None:
-    token = token.upper()
-    if token not in traded_tokens:
-        traded_tokens.add(token)
-        with open(TRADED_FILE, "a", encoding="utf-8") as f:
-            f.write(token + "\n")
-        logger.debug(f"🧠 Remembered traded token: {token}")
+TRADED_DB = "data/traded_tokens.db"
+TRADE_STORE_BACKEND = os.getenv("TRADE_STORE", "sqlite")        # sqlite | log
+TRADE_STORE_BLOOM = int(os.getenv("TRADE_STORE_BLOOM", "0"))    # expected tokens, 0 = off
+trade_store: TradeStore | None = None
+
+def load_traded_tokens() -> TradeStore:
+    global trade_store
+    if trade_store is None:
+        if TRADE_STORE_BACKEND == "log":
+            trade_store = open_trade_store("log", TRADED_FILE)
+        else:
+            trade_store = open_trade_store(
+                TRADE_STORE_BACKEND, TRADED_DB, legacy_file=TRADED_FILE, bloom_capacity=TRADE_STORE_BLOOM
+            )
+        logger.debug(f"📁 Trade memory ready ({TRADE_STORE_BACKEND}) – {len(trade_store)} traded tokens.")
+    return trade_store
+
+def remember_trade(token: str) -> bool:
+    """``token`` is the mint address – the symbol only for orders without one."""
+    if load_traded_tokens().add(token):
+        logger.debug(f"🧠 Remembered traded token: {token.upper()}")
+        return True
+    return False
 
 def was_already_traded(token: str) -> bool:
-    return token.upper() in traded_tokens
+    return load_traded_tokens().contains(token)
+
+# ─────────────── BirdEye shortlist rules ───────────────
+MIN_LIQUIDITY = 10_000
+MIN_V24H_USD = 50_000
+NAME_BLACKLIST = ("test", "fake", "scam")
+
+def shortlist_rules(min_liquidity: float = MIN_LIQUIDITY, min_v24h_usd: float = MIN_V24H_USD) -> RuleSet:
+    """The configured ``RISK_CHECKS`` minus their I/O – what a backtest replays of the live screening."""
+    return replay_rules(
+        RISK_CHECKS.split(","), min_liquidity=min_liquidity, min_v24h_usd=min_v24h_usd, blacklist=NAME_BLACKLIST
+    )
+
+# ─────────────── risk checks ───────────────
+# every candidate (alpha event or BirdEye shortlist row) passes these before a BUY
+RISK_CHECKS = os.getenv("RISK_CHECKS", ",".join(STANDARD_CHECKS))
+RISK_CONCURRENCY = int(os.getenv("RISK_CONCURRENCY", "8"))
+risk_pipeline: RiskPipeline | None = None
+
+def get_risk_pipeline() -> RiskPipeline:
+    global risk_pipeline
+    if risk_pipeline is None:
+        checks = standard_checks(
+            RISK_CHECKS.split(","), min_liquidity=MIN_LIQUIDITY, min_v24h_usd=MIN_V24H_USD, blacklist=NAME_BLACKLIST
+        )
+        risk_pipeline = RiskPipeline(checks, concurrency=RISK_CONCURRENCY)
+    return risk_pipeline
 
 # ─────────────── brain “manager” class ───────────────
 class CommandBrain:
-    def __init__(self) -> None:
-        self.seen: set[Tuple[str, str]] = set()
+    def __init__(self, seen=None, inflight: InFlight | None = None) -> None:
+        # keyed on ``seen_key`` (mint, + kind for changes) inside a sliding window; a key
+        # is added once its verdict is in – until then it is in ``inflight``
+        self.seen = seen if seen is not None else make_dedupe()
+        self.inflight = inflight if inflight is not None else InFlight(ALPHA_QUEUE)
+        self.screening: set[asyncio.Task] = set()             # batches still in their I/O checks
 
-    async def alpha_watcher_loop(self, poll: int = 5) -> None:
+    async def alpha_watcher_loop(self) -> None:
+        """
+        Wake on every push – no polling interval between sniffer and brain.
+        Each batch is screened in its own task, so a slow price quote never
+        holds back the next ``get_batch``; at most ``RISK_CONCURRENCY``
+        batches are in flight (their quotes share the pipeline's semaphore),
+        beyond that events wait on the bus and its drop policy applies.
+        """
         logger.info("🧠 Alpha-watcher loop spun-up …")
-        while True:
-            self.analyze_alpha()
-            await asyncio.sleep(poll)
+        limit = max(1, get_risk_pipeline().concurrency)
+        try:
+            while True:
+                while len(self.screening) >= limit:
+                    await asyncio.wait(self.screening, return_when=asyncio.FIRST_COMPLETED)
+                events = await ALPHA_QUEUE.get_batch()
+                dequeued = tracer.now()
+                candidates = self.admit(events, dequeued)           # in flight before the next await
+                if not candidates:
+                    continue
+                task = asyncio.create_task(self.screen(candidates, dequeued))
+                self.screening.add(task)
+                task.add_done_callback(self._screened)
+        finally:
+            for task in self.screening:
+                task.cancel()
 
-    def analyze_alpha(self) -> None:
-        processed = 0
-        while ALPHA_QUEUE:
-            evt = ALPHA_QUEUE.popleft()
-            key = (evt["symbol"], evt["ts"])
-            if key in self.seen:
+    def _screened(self, task: asyncio.Task) -> None:
+        self.screening.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.opt(exception=task.exception()).error("❌ Alpha screening failed")
+
+    async def idle(self) -> None:
+        """Wait until every batch handed to a screening task has its verdicts."""
+        while self.screening:
+            await asyncio.wait(self.screening)
+
+    async def analyze_alpha(self) -> None:
+        """Drain whatever is queued right now (no waiting)."""
+        await self.process_alpha(ALPHA_QUEUE.drain())
+
+    async def process_alpha(self, events: List[Dict]) -> None:
+        dequeued = tracer.now()
+        await self.screen(self.admit(events, dequeued), dequeued)
+
+    def admit(self, events: List[Dict], dequeued: int) -> List[Dict]:
+        """The BUY candidates among ``events``, each recorded in flight until its verdict."""
+        candidates = []
+        for evt in events:
+            trace = evt.get("trace")
+            if trace:
+                tracer.record("queue", trace["queued"], dequeued)
+            kind = evt.get("kind", "new_listing")
+            if kind not in BUY_KINDS:
+                hot("alpha.drop").warning("📉 {} → {} {}", kind, evt["symbol"], evt.get("payload", {}))
                 continue
-            self.seen.add(key)
+            payload = evt.get("payload") or {}
+            if kind == "liquidity_change" and payload.get("liquidity", 0) < payload.get("prev_liquidity", 0):
+                hot("alpha.drop").warning("📉 Liquidity pulled → {} {}", evt["symbol"], payload)
+                continue
+            key = self.seen_key(evt)
+            if key in self.seen or not self.inflight.add(key, evt):
+                continue
+            candidates.append(evt)
+        return candidates
+
+    async def screen(self, candidates: List[Dict], dequeued: int) -> None:
+        """Risk-check admitted candidates; each is marked seen as its verdict lands, passes become BUYs."""
+        if not candidates:
+            return
+        processed = 0
+        checked = [self.candidate(evt) for evt in candidates]
+
+        def promote(i: int, verdict: Verdict) -> None:
+            nonlocal processed
+            evt = candidates[i]
+            key = self.seen_key(evt)
+            self.seen.check_and_add(key)
+            self.inflight.settle(key)
+            if not verdict.ok:
+                hot("alpha.reject").info("🛡️ {} rejected by {} – {}", evt["symbol"], verdict.check, verdict.reason)
+                return
             processed += 1
+            kind = evt.get("kind", "new_listing")
+            trace = evt.get("trace")
 
             cmd = {
                 "action": "BUY",
                 "token": evt["symbol"],
                 "amount": 0.20,
+                "source": "alpha",
+                "address": evt.get("address", ""),
+                "liquidity": checked[i].get("liquidity"),
+                "price": checked[i].get("price") or verdict.facts.get("price"),   # snapshot, else the quote
             }
-            logger.info(f"🧠 Promoting alpha ⇒ BUY → {cmd}")
+            if trace:
+                cmd["trace"] = trace
+                tracer.record("analyze", dequeued)
+            hot("alpha.promote").info("🧠 Promoting alpha ({}) ⇒ BUY → {}", kind, cmd)
+            notify("alert", f"{kind} {evt['symbol']} ({evt.get('name', '')})")
             handle_command(cmd)
 
+        try:
+            await get_risk_pipeline().screen(checked, on_verdict=promote)
+        except asyncio.CancelledError:
+            for evt in candidates:                        # shutdown / restart: back on the bus, screened later
+                if self.seen_key(evt) in self.inflight:
+                    self.inflight.put(evt)
+            raise
+        finally:
+            for evt in candidates:                        # failed: a later announcement may retry
+                self.inflight.settle(self.seen_key(evt))
         if processed:
             logger.debug(f"🧠 AlphaBrain processed {processed} event(s).")
 
-    def simulate_birdeye_trades(self) -> None:
-        logger.info("📱 Checking BirdEye for fresh tokens …")
-        tokens = fetch_latest_tokens(limit=10)
-        shortlisted = []
+    @staticmethod
+    def seen_key(evt: Dict) -> str:
+        """
+        Dedupe key: the mint (symbol if unknown) for a listing, mint + kind for
+        a change – a token announced as new must still get its later
+        liquidity / volume moves screened.
+        """
+        mint = evt.get("address") or evt["symbol"]
+        kind = evt.get("kind", "new_listing")
+        return mint if kind == "new_listing" else f"{mint}:{kind}"
 
-        for t in tokens:
-            try:
-                if t["liquidity"] < 10_000:
-                    continue
-                if t.get("v24hUSD", 0) < 50_000:
-                    continue
-                if not t["name"] or not t["symbol"]:
-                    continue
-                if any(s in t["name"].lower() for s in ["test", "fake", "scam"]):
-                    continue
-                shortlisted.append(t)
-            except Exception as e:
-                logger.warning(f"⚠️ Token parse error: {e}")
+    @staticmethod
+    def candidate(evt: Dict) -> Dict:
+        """What the risk checks see for an alpha event: its payload plus the token's identity."""
+        return {**(evt.get("payload") or {}), "symbol": evt["symbol"], "name": evt.get("name", ""),
+                "address": evt.get("address", "")}
 
-        for token in shortlisted:
+    async def simulate_birdeye_trades(self) -> None:
+        from sniffers.bird_eye import fetch_latest_tokens    # HTTP stack only when BirdEye is used
+
+        logger.info("📱 Checking BirdEye for fresh tokens …")
+        tokens = await fetch_latest_tokens(limit=10)
+        verdicts = await get_risk_pipeline().screen(tokens)
+
+        for token, verdict in zip(tokens, verdicts):
+            if not verdict.ok:
+                logger.debug(f"🛡️ [BirdEye] {token.get('symbol')} rejected by {verdict.check} – {verdict.reason}")
+                continue
             cmd = {
                 "action": "BUY",
                 "token": token["symbol"],
                 "amount": 0.20,
+                "source": "alpha",
+                "address": token.get("address", ""),
+                "liquidity": token.get("liquidity"),
+                "price": token.get("price") or verdict.facts.get("price"),
             }
             logger.info(f"🧠 [BirdEye] Promoting filtered ⇒ BUY → {cmd}")
             handle_command(cmd)
 
+# ─────────────── positions ───────────────
+position_book = PositionBook()
+price_refresher: PriceRefresher | None = None
+
+def book_fill(order: Order, receipt: dict) -> None:
+    position_book.open_from_receipt(receipt, address=order.meta.get("address", ""))
+    notify("fill", f"BUY {order.token} {receipt.get('amount')} @ {receipt.get('price')} ({order.source})")
+
+def note_skip(order: Order) -> None:
+    notify("skip", f"{order.token} – already traded")
+
+def note_failure(order: Order, error: Exception) -> None:
+    notify("error", f"BUY {order.token} failed ({order.source}): {error}")
+
+async def run_price_refresher() -> None:
+    """Supervisor entry point: keep the open positions marked to BirdEye prices."""
+    global price_refresher
+    from sniffers.bird_eye import fetch_prices            # HTTP stack only when prices are refreshed
+
+    price_refresher = PriceRefresher(position_book, fetch_prices)
+    await price_refresher.run()
+
+# ─────────────── order execution ───────────────
+EXECUTOR_WORKERS = int(os.getenv("EXECUTOR_WORKERS", "2"))
+EXECUTOR_BATCH_SIZE = int(os.getenv("EXECUTOR_BATCH_SIZE", "1"))
+EXECUTOR_BATCH_WINDOW = float(os.getenv("EXECUTOR_BATCH_WINDOW", "0"))
+executor: OrderExecutor | None = None
+
+def buy_orders(orders) -> list:
+    """Paper-fill an executor batch – pools are looked up by each order's mint address."""
+    return paper_buyer.buy_batch(orders)
+
+def get_executor() -> OrderExecutor:
+    """The shared order executor, started on first use."""
+    global executor
+    if executor is None:
+        executor = OrderExecutor(
+            buy=simulate_buy_token,
+            already_traded=was_already_traded,
+            remember=remember_trade,
+            on_fill=book_fill,
+            on_skip=note_skip,
+            on_fail=note_failure,
+            buy_batch=buy_orders,
+            workers=EXECUTOR_WORKERS,
+            batch_size=EXECUTOR_BATCH_SIZE,
+            batch_window=EXECUTOR_BATCH_WINDOW,
+        ).start()
+    return executor
+
 # ─────────────── command router ───────────────
-def handle_command(cmd: dict | str) -> None:
+STATUS_TOP = 10                                    # positions listed by STATUS (largest |P&L| first)
+
+def status_snapshot() -> Dict[str, object]:
+    """Executor, position book, refresher and BirdEye budget counters (what STATUS logs)."""
+    snap: Dict[str, object] = {
+        "executor": executor.stats() if executor is not None else None,
+        "positions": position_book.summary(),
+    }
+    if price_refresher is not None:
+        snap["prices"] = price_refresher.stats()
+    if paper_buyer.filled or paper_buyer.rejected:
+        snap["paper"] = paper_buyer.stats()
+    if risk_pipeline is not None:
+        snap["risk"] = risk_pipeline.stats()
+    if checkpointer.active:
+        snap["checkpoint"] = checkpointer.stats()
+    snap["dedupe"] = {"brain": ALPHA_SEEN.stats()}
+    alpha_sniffer = sys.modules.get("sniffers.alpha_sniffer")
+    if alpha_sniffer is not None:
+        snap["dedupe"]["sniffer"] = alpha_sniffer.seen_symbols.stats()
+    bird_eye = sys.modules.get("sniffers.bird_eye")              # only once BirdEye is in use
+    if bird_eye is not None:
+        snap["birdeye"] = bird_eye.budget_stats()
+    if tracer.enabled:
+        snap["latency"] = tracer.report()
+    return snap
+
+def handle_command(cmd: dict | str) -> Future | dict | None:
+    """
+    Route one parsed command. BUYs are queued; their receipt arrives on the
+    returned future. SELL returns the fill, STATUS the ``status_snapshot()``.
+    """
+    entered = tracer.now()
     if isinstance(cmd, str):
         cmd = {"action": cmd.upper()}
 
@@ -129,23 +400,82 @@ def handle_command(cmd: dict | str) -> None:
         if not token:
             logger.warning("⚠️ BUY command missing token name.")
             return
-        if was_already_traded(token):
-            logger.info(f"🔁 Skipping {token} – already traded.")
+        address = cmd.get("address") or paper_buyer.address_of(token)   # manual BUYs: the last mint seen
+        if was_already_traded(address or token):                        # keyed like the executor
+            hot("buy.skip").info("🔁 Skipping {} – already traded.", token)
             return
-        logger.info(f"🚀 BUY signal → token={token} amount={amount}")
-        receipt = simulate_buy_token(token, amount or 0.0)
-        remember_trade(token)
-        logger.success(f"📟 Fake-buy receipt → {receipt}")
-        return
+        if cmd.get("liquidity") or cmd.get("price"):
+            paper_buyer.observe(token, cmd.get("liquidity"), cmd.get("price"), address=address)
+        source = cmd.get("source", "manual")
+        hot("buy.signal").info("🚀 BUY signal → token={} amount={} ({})", token, amount, source)
+        origin = (cmd.get("trace") or {}).get("discovered") or entered
+        future = get_executor().submit(
+            token, amount or 0.0, source=source, origin_ns=origin, address=address
+        )
+        tracer.record("handle", entered)
+        return future
 
     if action == "SELL":
-        logger.info(f"💸 SELL signal → token={token} amount={amount}")
-        logger.warning("⚠️ SELL simulation not implemented yet")
-        return
+        if not token:
+            logger.warning("⚠️ SELL command missing token name.")
+            return
+        logger.info(f"💸 SELL signal → token={token} amount={amount or 'all'}")
+        closed = position_book.close(token, amount, address=cmd.get("address", ""))
+        if closed is None:
+            logger.warning(f"⚠️ No open position in {token.upper()}")
+            return
+        pos, pnl = closed
+        price = pos.last_price or pos.entry_price
+        left = f"{pos.amount} left" if pos.amount > 0 else "position closed"
+        logger.success(f"📟 Simulated SELL {token.upper()} @ ${price:.6g} → P&L {pnl:+.4f} ({left})")
+        notify("sell", f"SELL {pos.token} @ {price:.6g} → P&L {pnl:+.4f} ({left})")
+        return {"token": pos.token, "price": price, "pnl": pnl, "left": pos.amount}
 
     if action == "STATUS":
         logger.info("📊 STATUS check requested")
-        return
+        snap = status_snapshot()
+        if snap["executor"] is not None:
+            logger.info(f"📊 Executor → {snap['executor']}")
+        book = snap["positions"]
+        logger.info(
+            f"📊 Positions → {book['open']} open, cost {book['cost']:.4f}, value {book['value']:.4f}, "
+            f"unrealized {book['unrealized']:+.4f}, realized {book['realized']:+.4f}"
+        )
+        for pos in sorted(position_book.positions(), key=lambda p: abs(p.unrealized), reverse=True)[:STATUS_TOP]:
+            logger.info(
+                f"   {pos.token:<10} {pos.amount:g} @ {pos.entry_price:.6g} → {pos.last_price:.6g} "
+                f"({pos.unrealized:+.4f}, refresh {pos.interval:g}s)"
+            )
+        if "prices" in snap:
+            logger.info(f"💹 Price refresher → {snap['prices']}")
+        if "paper" in snap:
+            logger.info(f"💰 Paper fills → {snap['paper']}")
+        if "risk" in snap:
+            risk = snap["risk"]
+            logger.info(f"🛡️ Risk checks → {risk['passed']}/{risk['evaluated']} passed")
+            for name, s in risk["checks"].items():
+                logger.info(
+                    f"   {name:<10} calls={s['calls']} rejected={s['rejected']} errors={s['errors']} "
+                    f"cached={s['cache_hits']} avg={s['avg_ms']:.3f}ms"
+                )
+        if "birdeye" in snap:
+            logger.info(f"🪙 BirdEye budget → {snap['birdeye']}")
+        if "checkpoint" in snap:
+            logger.info(f"💾 Checkpoint → {snap['checkpoint']}")
+        for owner, s in snap["dedupe"].items():
+            logger.info(
+                f"🧹 Seen ({owner}, {s['kind']}) → {s['size']} keys, occupancy {s['occupancy']:.1%}, "
+                f"est. FP {s['estimated_fp_rate']:.2e}, early rotations {s.get('early_rotations', 0)}"
+            )
+        if tracer.enabled:
+            for stage, s in snap["latency"].items():
+                logger.info(
+                    f"⏱️ {stage:<10} n={s['count']:<6} p50={s['p50_ms']:.2f}ms "
+                    f"p95={s['p95_ms']:.2f}ms p99={s['p99_ms']:.2f}ms max={s['max_ms']:.2f}ms"
+                )
+        else:
+            logger.info("⏱️ Latency tracing is off (set TRACE_LATENCY=1)")
+        return snap
 
     if action == "REBALANCE":
         logger.info("⚖️ Portfolio rebalance requested")
@@ -153,18 +483,28 @@ def handle_command(cmd: dict | str) -> None:
 
     logger.warning(f"🧗‍♂️ Unknown command: {cmd}")
 
-# ───────── helper to launch watcher ─────────
-def launch_background_tasks(loop: asyncio.AbstractEventLoop | None = None) -> None:
-    if loop is None:
-        loop = asyncio.get_event_loop()
-    load_traded_tokens()  # ← add this line
-    brain = CommandBrain()
-    loop.create_task(brain.alpha_watcher_loop())
+async def run_alpha_watcher() -> None:
+    """Supervisor entry point: trade memory + one brain consuming the alpha bus."""
+    load_traded_tokens()
+    await CommandBrain(ALPHA_SEEN, ALPHA_INFLIGHT).alpha_watcher_loop()     # checkpointed, kept across restarts
+
+# ───────── graceful shutdown ─────────
+def shutdown() -> None:
+    """Drain queued orders, then flush and close the trade memory."""
+    global executor, trade_store
+    if executor is not None:
+        logger.info(f"⏳ Draining {executor.pending()} queued order(s) …")
+        executor.stop(drain=True)
+        executor = None
+    if trade_store is not None:
+        trade_store.close()
+        trade_store = None
 
 # ───────── quick self-test ─────────
 if __name__ == "__main__":
     load_traded_tokens()
     push_alpha_event("TEST", "DemoToken")
     brain = CommandBrain()
-    brain.analyze_alpha()
-    brain.simulate_birdeye_trades()
+    asyncio.run(brain.analyze_alpha())
+    asyncio.run(brain.simulate_birdeye_trades())
+    get_executor().stop(drain=True)
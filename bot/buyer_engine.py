@@ -1,30 +1,176 @@
-# bot/buyer_engine.py – Simulated token buying engine (placeholder for real trades)
+# bot/buyer_engine.py – paper buying engine: AMM fills against the pools the sniffer saw
+"""
+The one simulated buyer (``bot.buyer.simulate_buy`` is kept as a shim).
+
+  • ``observe(token, liquidity, price, address)`` records a token's pool from
+    snapshot / stream / price-check data; the brain calls it with whatever a
+    BUY candidate carried.  Pools are keyed by mint address (the symbol when
+    there is none – symbols collide across mints) and kept in a bounded TTL
+    cache: ``PAPER_POOL_CACHE`` pools, each dropped ``PAPER_POOL_TTL`` s after
+    its last observation.  The last mint observed under each symbol is kept
+    too (``address_of``), so a BUY without an address – Telegram,
+    command.txt, "buy X 0.2" on the socket – fills against that mint's pool
+  • ``buy(token, amount)`` fills ``amount`` SOL (× ``PAPER_QUOTE_USD``) into
+    that pool through ``bot.amm`` – fee, slippage, price impact, partial fill
+    past ``AMM_MAX_SLIPPAGE`` – and moves the pool, so buying the same thin
+    pool again costs more until fresh data arrives
+  • ``buy_batch(orders)`` prices a whole executor batch in one
+    ``simulate_buys`` call
+  • a token without pool data is not filled – no more invented prices; the
+    receipt comes back with ``status: "rejected"`` and its ``reason`` ("no
+    pool data" / "nothing to spend") so callers can tell it from a skip.
+    A manual BUY of a token nothing has observed therefore does not fill
+    unless the command carries ``liquidity`` and ``price`` (control socket
+    JSON); a price quote alone cannot size a pool
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Sequence
 
 from loguru import logger
-from datetime import datetime
-import random
+
+from cachetools import TTLCache
+
+from bot.amm import AMM_FEE_BPS, AMM_MAX_SLIPPAGE, REJECTED, Pool, simulate_buys
+from utils.logger import hot
+
+PAPER_QUOTE_USD = float(os.getenv("PAPER_QUOTE_USD", "150"))       # USD per SOL – order amounts are SOL
+PAPER_POOL_CACHE = int(os.getenv("PAPER_POOL_CACHE", "4096"))
+PAPER_POOL_TTL = float(os.getenv("PAPER_POOL_TTL", "3600"))         # stale pool data is not bought against
+
+
+class PaperBuyer:
+    def __init__(
+        self,
+        fee_bps: float = AMM_FEE_BPS,
+        max_slippage: float = AMM_MAX_SLIPPAGE,
+        quote_usd: float = PAPER_QUOTE_USD,
+        max_pools: int = PAPER_POOL_CACHE,
+        ttl: float = PAPER_POOL_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.fee_bps = fee_bps
+        self.max_slippage = max_slippage
+        self.quote_usd = quote_usd
+        self.pools: TTLCache = TTLCache(maxsize=max_pools, ttl=ttl, timer=clock)
+        self._marks: TTLCache = TTLCache(maxsize=max_pools, ttl=ttl, timer=clock)   # key → [liquidity, price]
+        self._addresses: TTLCache = TTLCache(maxsize=max_pools, ttl=ttl, timer=clock)   # symbol → last mint
+        self._lock = threading.Lock()                 # executor workers are threads
+        self.filled = self.partial = self.rejected = 0
+        self.spent = self.fees = 0.0
+
+    def key(self, token: str, address: str = "") -> str:
+        with self._lock:
+            return self._key(token, address)
+
+    def _key(self, token: str, address: str = "") -> str:
+        """The address, else the last mint seen under the symbol, else the symbol. Caller holds the lock."""
+        return address or self._addresses.get(token.upper()) or token.upper()
+
+    def address_of(self, token: str) -> str:
+        """The last mint observed under symbol ``token`` ("" when none is known)."""
+        with self._lock:
+            return self._addresses.get(token.upper(), "")
+
+    def observe(
+        self, token: str, liquidity: float | None = None, price: float | None = None, address: str = ""
+    ) -> None:
+        """Fresh market data for ``token``'s pool (either half may be missing)."""
+        with self._lock:
+            if address:
+                self._addresses[token.upper()] = address
+            key = self._key(token, address)
+            mark = self._marks.get(key) or [0.0, 0.0]
+            if liquidity:
+                mark[0] = float(liquidity)
+            if price:
+                mark[1] = float(price)
+            self._marks[key] = mark                   # re-set: every observation restarts the TTL
+            if mark[0] > 0 and mark[1] > 0:
+                self.pools[key] = Pool.from_snapshot(mark[0], mark[1], self.fee_bps)
+
+    def buy(self, token: str, amount: float, address: str = "") -> dict:
+        return self._fill([(token, amount, self.key(token, address))])[0]
+
+    def buy_batch(self, orders: Sequence) -> List[dict]:
+        return self._fill([(o.token, o.amount, self.key(o.token, o.meta.get("address", ""))) for o in orders])
+
+    def _fill(self, orders: Sequence[tuple[str, float, str]]) -> List[dict]:
+        receipts: List[dict] = [{}] * len(orders)
+        pending = list(range(len(orders)))
+        with self._lock:
+            while pending:                            # one round per repeat of a token in the batch
+                seen, this_round, later = set(), [], []
+                for i in pending:
+                    key = orders[i][2]
+                    (later if key in seen else this_round).append(i)
+                    seen.add(key)
+                pools = [self.pools.get(orders[i][2]) for i in this_round]
+                fills = simulate_buys(
+                    [p.liquidity if p else 0.0 for p in pools],
+                    [p.price if p else 0.0 for p in pools],
+                    [float(orders[i][1] or 0.0) * self.quote_usd for i in this_round],
+                    fee_bps=self.fee_bps,
+                    max_slippage=self.max_slippage,
+                )
+                for j, (i, pool) in enumerate(zip(this_round, pools)):
+                    receipts[i] = self._receipt(orders[i], pool, fills, j)
+                pending = later
+        return receipts
+
+    def _receipt(self, order: tuple[str, float, str], pool: Pool | None, fills, j: int) -> dict:
+        token, amount = order[0].upper(), order[1]
+        receipt = {"token": token, "requested": amount, **fills.row(j),
+                   "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")}
+        if fills.status[j] == REJECTED:
+            self.rejected += 1
+            receipt["reason"] = "no pool data" if pool is None else "nothing to spend"
+            hot("buy.rejected").warning("🚫 Paper BUY {} {} not filled – {}", amount, token, receipt["reason"])
+            return receipt
+        pool.apply(fills, j)
+        receipt["total_cost"] = receipt["spent"]
+        self.filled += 1
+        self.partial += receipt["status"] == "partial"
+        self.spent += receipt["spent"]
+        self.fees += receipt["fee"]
+        hot("buy.simulated").info(
+            "💰 Paper BUY {} {} → {:.6g} @ ${:.6g} (slippage {:+.2%}, impact {:+.2%}, {})",
+            amount, token, receipt["amount"], receipt["price"], receipt["slippage"], receipt["impact"],
+            receipt["status"],
+        )
+        return receipt
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "filled": self.filled,
+            "partial": self.partial,
+            "rejected": self.rejected,
+            "spent": round(self.spent, 6),
+            "fees": round(self.fees, 6),
+            "pools": len(self.pools),
+        }
+
+
+paper_buyer = PaperBuyer()
+
 
 def simulate_buy_token(symbol: str, amount: float) -> dict:
     """
-    Simulates a token purchase and returns a fake receipt.
-
-    Arguments:
-    - symbol: Token symbol (e.g. SOL, PEPEKING)
-    - amount: Amount of token to 'buy'
+    Paper-buy ``amount`` of ``symbol`` against its last observed pool.
 
-    Returns:
-    - A dict receipt with fake transaction details
+    Returns the receipt – token, amount (tokens received), price (average),
+    spent, fee, slippage, impact, status.  When it cannot fill, ``status`` is
+    ``"rejected"`` and ``reason`` says why.
     """
-    price = round(random.uniform(0.01, 5.00), 4)   # Fake price per token
-    total_cost = round(amount * price, 4)
-
-    receipt = {
-        "token": symbol.upper(),
-        "amount": amount,
-        "price": price,
-        "total_cost": total_cost,
-        "timestamp": datetime.utcnow().isoformat() + "Z"
-    }
-
-    logger.info(f"💰 Simulated BUY: {amount} {symbol.upper()} @ ${price} each → total ${total_cost}")
-    return receipt
+    return paper_buyer.buy(symbol, amount)
+
+
+if __name__ == "__main__":
+    paper_buyer.observe("DEMO", liquidity=20_000, price=0.001)
+    for size in (10, 500, 5_000):
+        logger.info(simulate_buy_token("DEMO", size))
@@ -0,0 +1,308 @@
+# bot/checkpoint.py – incremental binary checkpoints of the brain / sniffer state for warm restarts
+"""
+A restart used to forget the alpha queue and both "seen" windows, so the bot
+re-announced every token and re-ran the risk checks against BirdEye for all
+of them.  Their owners now register them here and ``data/ashborn.ckpt``
+carries them across restarts:
+
+  file    = magic "ACKP", version | record*
+  record  = kind, name length, unix ts, body size, crc32 | name | zlib(body)
+  KEYS    keys first seen in dedupe ``name`` since its previous record
+          (NUL-joined utf-8) – appended every ``CHECKPOINT_INTERVAL``
+          seconds, only when there are any
+  EVENTS  the whole queue of alpha bus ``name`` (JSON) – appended only when
+          the bus moved; the last one wins
+
+  • ``restore()`` replays the file into whatever is registered and keeps the
+    rest until its owner registers (the sniffer is imported later, off-loop);
+    a key comes back with its original age, so it expires on schedule
+  • a torn tail (crash mid-append) fails its length / crc check and is
+    dropped, like ``sniffers.snapshot_archive``
+  • once the file passes ``CHECKPOINT_COMPACT_BYTES`` – or a restore found it
+    mostly dead – it is rewritten (temp + rename) without expired key
+    batches and superseded queue snapshots
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from loguru import logger
+
+MAGIC = b"ACKP"
+VERSION = 1
+_FILE = struct.Struct("<4sB")
+_RECORD = struct.Struct("<BBdII")                 # kind, name_len, ts, body_len, crc32
+
+KEYS, EVENTS = 1, 2
+
+CHECKPOINT_FILE = Path(os.getenv("CHECKPOINT_FILE", "data/ashborn.ckpt"))
+CHECKPOINT_INTERVAL = float(os.getenv("CHECKPOINT_INTERVAL", "5"))
+CHECKPOINT_COMPACT_BYTES = int(os.getenv("CHECKPOINT_COMPACT_BYTES", str(4 * 1024 * 1024)))
+CHECKPOINT_FSYNC = os.getenv("CHECKPOINT_FSYNC", "0").lower() in ("1", "true", "yes")
+
+
+@dataclass
+class Record:
+    kind: int
+    name: str
+    ts: float
+    body: bytes                                   # still compressed
+
+    def encode(self) -> bytes:
+        name = self.name.encode()
+        return _RECORD.pack(self.kind, len(name), self.ts, len(self.body), zlib.crc32(self.body)) + name + self.body
+
+    def keys(self) -> List[str]:
+        raw = zlib.decompress(self.body)
+        return raw.decode().split("\0") if raw else []
+
+    def events(self) -> List[dict]:
+        return json.loads(zlib.decompress(self.body))
+
+
+def keys_record(name: str, keys: List[str], ts: float) -> Record:
+    return Record(KEYS, name, ts, zlib.compress("\0".join(keys).encode(), 1))
+
+
+def events_record(name: str, events: List[dict], ts: float) -> Record:
+    events = [{k: v for k, v in evt.items() if k != "trace"} for evt in events]    # perf-counter stamps die with the process
+    return Record(EVENTS, name, ts, zlib.compress(json.dumps(events, default=str, separators=(",", ":")).encode(), 1))
+
+
+def read_records(data: bytes) -> Tuple[List[Record], int]:
+    """Every intact record of a checkpoint file, and the byte length they cover."""
+    if len(data) < _FILE.size:
+        return [], 0
+    magic, version = _FILE.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"not an AshBorn checkpoint (magic {magic!r}, version {version})")
+    out, pos = [], _FILE.size
+    while pos + _RECORD.size <= len(data):
+        kind, name_len, ts, body_len, crc = _RECORD.unpack_from(data, pos)
+        start = pos + _RECORD.size + name_len
+        end = start + body_len
+        if end > len(data) or zlib.crc32(data[start:end]) != crc:
+            break
+        out.append(Record(kind, data[pos + _RECORD.size:start].decode(), ts, data[start:end]))
+        pos = end
+    return out, pos
+
+
+class Checkpointer:
+    def __init__(
+        self,
+        path: Path | str = CHECKPOINT_FILE,
+        compact_bytes: int = CHECKPOINT_COMPACT_BYTES,
+        fsync: bool = CHECKPOINT_FSYNC,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.compact_bytes = compact_bytes
+        self.fsync = fsync
+        self.clock = clock
+        self._dedupes: Dict[str, object] = {}
+        self._buses: Dict[str, object] = {}
+        self._marks: Dict[str, tuple] = {}            # bus name → counters at its last EVENTS record
+        self._pending: Dict[str, List[Record]] | None = None    # restored, owner not registered yet
+        self._lock = threading.RLock()                # registration (sniffer imports off-loop) and file writes
+        self.checkpoints = self.records = self.bytes_written = self.compactions = 0
+        self.restored: Dict[str, int] = {}
+        self.restore_ms = 0.0
+
+    # ─────────────── registration ───────────────
+    def track_dedupe(self, name: str, dedupe) -> None:
+        """Checkpoint ``dedupe`` (``fresh`` / ``restore``) as ``name``."""
+        with self._lock:
+            self._dedupes[name] = dedupe
+            if self._pending is not None:             # checkpointing runs: start tracking new keys
+                dedupe.fresh()
+                self._apply(name)
+
+    def track_bus(self, name: str, bus) -> None:
+        """Checkpoint the queued events of alpha bus ``bus`` as ``name``."""
+        with self._lock:
+            self._buses[name] = bus
+            self._apply(name)
+            self._marks[name] = self._mark(bus)
+
+    @property
+    def active(self) -> bool:
+        """True once ``restore()`` has run, i.e. checkpointing is on."""
+        return self._pending is not None
+
+    @staticmethod
+    def _mark(bus) -> tuple:
+        return bus.pushed, bus.consumed, bus.coalesced
+
+    # ─────────────── restore ───────────────
+    def restore(self) -> Dict[str, int]:
+        """Read the file once: registered owners are restored now, later ones on registration."""
+        if self._pending is not None:                 # a supervisor restart must not re-queue the events
+            return dict(self.restored)
+        started = time.perf_counter()
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            data = b""
+        try:
+            records, good = read_records(data)
+        except ValueError as e:
+            logger.warning(f"💾 {self.path}: {e} – starting cold")
+            records, good = [], 0
+        if good and good < len(data):
+            logger.warning(f"💾 {self.path}: dropped a torn tail of {len(data) - good} bytes")
+        live = self._live(records)
+        with self._lock:
+            self._pending = {}
+            for rec in live:
+                self._pending.setdefault(rec.name, []).append(rec)
+            for dedupe in self._dedupes.values():
+                dedupe.fresh()                        # nothing is tracked until checkpointing runs
+            for name in list(self._dedupes) + list(self._buses):
+                self._apply(name)
+        if data and (good < len(data) or len(live) < len(records) // 2 or good > self.compact_bytes):
+            self._rewrite(live)
+        self.restore_ms = (time.perf_counter() - started) * 1000
+        if records:
+            logger.info(f"💾 Warm restart from {self.path} in {self.restore_ms:.1f} ms → {self.restored}")
+        return dict(self.restored)
+
+    def _apply(self, name: str) -> None:
+        """Hand ``name``'s restored records to its owner. Caller holds the lock."""
+        if self._pending is None or name not in self._pending:
+            return
+        records = self._pending.pop(name)
+        now = self.clock()
+        restored = 0
+        if name in self._dedupes:
+            dedupe = self._dedupes[name]
+            for rec in records:                        # oldest first: the TTL cache expects that order
+                if rec.kind == KEYS:
+                    restored += dedupe.restore(rec.keys(), now - rec.ts)
+        elif name in self._buses:
+            bus = self._buses[name]
+            for evt in records[-1].events():
+                restored += bool(bus.put(evt))
+        self.restored[name] = restored
+
+    def _live(self, records: List[Record]) -> List[Record]:
+        """Records still worth keeping: unexpired key batches and the last queue of each bus."""
+        now = self.clock()
+        last_events = {rec.name: i for i, rec in enumerate(records) if rec.kind == EVENTS}
+        out = []
+        for i, rec in enumerate(records):
+            if rec.kind == EVENTS:
+                if last_events[rec.name] == i:
+                    out.append(rec)
+            elif rec.kind == KEYS:
+                dedupe = self._dedupes.get(rec.name)
+                window = getattr(dedupe, "window", float(os.getenv("DEDUPE_WINDOW_S", "21600")))
+                if now - rec.ts < window:
+                    out.append(rec)
+        return out
+
+    # ─────────────── checkpointing ───────────────
+    def collect(self) -> List[Record]:
+        """What changed since the previous checkpoint, as records."""
+        now = self.clock()
+        out = []
+        with self._lock:
+            for name, dedupe in self._dedupes.items():
+                keys = dedupe.fresh()
+                if keys:
+                    out.append(keys_record(name, keys, now))
+            for name, bus in self._buses.items():
+                mark = self._mark(bus)
+                if mark != self._marks.get(name):
+                    self._marks[name] = mark
+                    out.append(events_record(name, bus.snapshot(), now))
+        return out
+
+    def checkpoint(self) -> int:
+        """Append what changed; compacts once the file has grown past ``compact_bytes``."""
+        records = self.collect()
+        if records:
+            self._append(records)
+        self.checkpoints += 1
+        if self.path.exists() and self.path.stat().st_size > self.compact_bytes:
+            self.compact()
+        return len(records)
+
+    def _append(self, records: List[Record]) -> None:
+        blob = b"".join(rec.encode() for rec in records)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("ab") as f:
+                if f.tell() == 0:
+                    f.write(_FILE.pack(MAGIC, VERSION))
+                f.write(blob)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            self.records += len(records)
+            self.bytes_written += len(blob)
+
+    def compact(self) -> None:
+        with self._lock:                              # no append may slip in between the read and the rename
+            try:
+                records, _ = read_records(self.path.read_bytes())
+            except (FileNotFoundError, ValueError):
+                return
+            self._rewrite(self._live(records))
+
+    def _rewrite(self, records: List[Record]) -> None:
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            with tmp.open("wb") as f:
+                f.write(_FILE.pack(MAGIC, VERSION))
+                f.write(b"".join(rec.encode() for rec in records))
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            self.compactions += 1
+
+    def stats(self) -> Dict[str, object]:
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        return {
+            "file_bytes": size,
+            "checkpoints": self.checkpoints,
+            "records": self.records,
+            "bytes_written": self.bytes_written,
+            "compactions": self.compactions,
+            "restored": dict(self.restored),
+            "restore_ms": round(self.restore_ms, 3),
+        }
+
+
+checkpointer = Checkpointer()
+
+
+def checkpoint_now() -> None:
+    """Final checkpoint on shutdown – whatever is still queued survives the restart."""
+    checkpointer.checkpoint()
+
+
+async def run_checkpointer(interval: float = CHECKPOINT_INTERVAL) -> None:
+    """Supervisor entry point: warm restart, then an incremental checkpoint every ``interval`` seconds."""
+    checkpointer.restore()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(checkpointer.checkpoint)
+        except OSError as e:
+            logger.warning(f"⚠️ Checkpoint write failed: {e}")
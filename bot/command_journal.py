@@ -0,0 +1,259 @@
+# bot/command_journal.py – append-only command journal with inotify wake-ups
+"""
+``command.txt`` is treated as an append-only journal: one command per line.
+
+  • a persisted byte offset marks how far the journal has been consumed, so
+    a restart resumes where the last run stopped.  With no offset stored yet
+    (first start) it is seeded at the end of the existing file: only lines
+    appended from then on run, not whatever the file already held
+  • the offset is committed after each line's handler has run (not fsynced):
+    delivery is at-least-once – a crash between the handler and the commit,
+    or before the OS writes the offset out, replays that line on restart
+    (a replayed BUY is skipped by the trade memory)
+  • a line is only considered complete once its trailing newline has been
+    written
+  • truncation or replacement of the file (new inode / shorter than the
+    offset) restarts consumption from byte 0, and so does a rewrite in place
+    (``echo CMD > command.txt``): the last bytes consumed are stored with the
+    offset, and if the file no longer holds them there it is read afresh
+  • Linux inotify wakes the watcher the moment the file is written; on other
+    platforms (or if inotify is unavailable) a cheap stat-based poll is used
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import time
+from pathlib import Path
+from typing import Callable, Iterator, Tuple
+
+from loguru import logger
+
+READ_CHUNK = 64 * 1024
+TAIL_BYTES = 64                                         # consumed bytes kept to recognise in-place rewrites
+
+
+class CommandJournal:
+    def __init__(self, path: Path | str, offset_path: Path | str) -> None:
+        self.path = Path(path)
+        self.offset_path = Path(offset_path)
+        self.inode, self.offset, self.tail = None, 0, b""
+        state = self._load_offset()
+        if state is None:
+            self._seed_at_end()
+        else:
+            self.inode, self.offset, self.tail = state
+
+    # ─────────────── offset persistence ───────────────
+    def _load_offset(self) -> Tuple[int | None, int, bytes] | None:
+        try:
+            state = json.loads(self.offset_path.read_text(encoding="utf-8"))
+            return state.get("inode"), int(state.get("offset", 0)), bytes.fromhex(state.get("tail", ""))
+        except FileNotFoundError:
+            return None
+        except (ValueError, AttributeError):
+            logger.warning(f"📜 {self.offset_path} is unreadable – treating {self.path} as new")
+            return None
+
+    def _seed_at_end(self) -> None:
+        """First start: skip the lines already in the file (up to its last newline)."""
+        try:
+            with self.path.open("rb") as f:
+                st = os.fstat(f.fileno())
+                f.seek(max(0, st.st_size - READ_CHUNK))
+                data = f.read()
+        except FileNotFoundError:
+            return                                      # created later: read it from the start
+        start = st.st_size - len(data)
+        end = start + data.rfind(b"\n") + 1
+        self.inode = st.st_ino
+        self.commit(end, data[:end - start][-TAIL_BYTES:])
+        if end:
+            logger.info(f"📜 {self.path} already holds {end} bytes – only new lines will run")
+
+    def commit(self, offset: int, tail: bytes = b"") -> None:
+        """Atomically persist the consumed offset and its ``tail`` bytes (write temp + rename)."""
+        self.offset, self.tail = offset, tail
+        self.offset_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.offset_path.with_suffix(self.offset_path.suffix + ".tmp")
+        state = {"inode": self.inode, "offset": offset, "tail": tail.hex()}
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp, self.offset_path)
+
+    def _rewritten(self, f) -> bool:
+        """Same inode, long enough – but do the bytes before the offset still match?"""
+        if not self.tail:
+            return False
+        f.seek(self.offset - len(self.tail))
+        return f.read(len(self.tail)) != self.tail
+
+    # ─────────────── reading ───────────────
+    def read_new(self) -> Iterator[Tuple[str, int, bytes]]:
+        """Yield ``(line, end_offset, tail)`` for every complete line past the offset."""
+        try:
+            f = self.path.open("rb")
+        except FileNotFoundError:
+            return
+        with f:
+            st = os.fstat(f.fileno())
+            if st.st_ino != self.inode or st.st_size < self.offset or self._rewritten(f):
+                if self.inode is not None:
+                    logger.info(f"📜 {self.path} was replaced, truncated or rewritten – reading from the start")
+                self.inode = st.st_ino
+                self.commit(0)
+            if st.st_size == self.offset:
+                return
+
+            f.seek(self.offset)
+            pos = self.offset
+            tail = self.tail
+            pending = b""
+            while True:
+                chunk = f.read(READ_CHUNK)
+                if not chunk:
+                    break
+                pending += chunk
+                *lines, pending = pending.split(b"\n")
+                for raw in lines:
+                    pos += len(raw) + 1
+                    tail = (tail + raw + b"\n")[-TAIL_BYTES:]
+                    yield raw.decode("utf-8", errors="replace").strip(), pos, tail
+
+    def process(self, handler: Callable[[str], None]) -> int:
+        """Dispatch every new non-empty line to ``handler``; returns lines handled."""
+        handled = 0
+        for line, end, tail in self.read_new():
+            if line:
+                try:
+                    handler(line)
+                except Exception as e:
+                    logger.error(f"❌ Command '{line}' failed: {e}")
+                handled += 1
+            self.commit(end, tail)
+        return handled
+
+
+# ─────────────── change notification ───────────────
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_EVENT_HDR = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Minimal ctypes binding: watch one directory, filter events by file name."""
+
+    def __init__(self, path: Path) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        directory = str(path.parent.resolve()).encode()
+        mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+        if libc.inotify_add_watch(self.fd, directory, mask) < 0:
+            err = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(err, "inotify_add_watch failed")
+        self.name = path.name.encode()
+
+    def wait(self, timeout: float | None) -> bool:
+        """Block until our file is touched (True) or the timeout passes (False)."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        return bool(ready) and self.drain()
+
+    def drain(self) -> bool:
+        hit = False
+        try:
+            while True:
+                buf = os.read(self.fd, READ_CHUNK)
+                i = 0
+                while i < len(buf):
+                    _, _, _, length = _EVENT_HDR.unpack_from(buf, i)
+                    name = buf[i + _EVENT_HDR.size:i + _EVENT_HDR.size + length].rstrip(b"\0")
+                    hit = hit or name == self.name
+                    i += _EVENT_HDR.size + length
+        except BlockingIOError:
+            pass
+        return hit
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class JournalWatcher:
+    def __init__(self, journal: CommandJournal, poll_interval: float = 0.25, use_inotify: bool = True) -> None:
+        self.journal = journal
+        self.poll_interval = poll_interval
+        self._inotify: _Inotify | None = None
+        self._last_stat: Tuple[int, int] | None = None
+        if use_inotify:
+            try:
+                self._inotify = _Inotify(journal.path)
+            except (OSError, AttributeError, TypeError) as e:
+                logger.info(f"📜 inotify unavailable ({e}) – polling {journal.path} every {poll_interval}s")
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self._inotify else "poll"
+
+    def fileno(self) -> int | None:
+        return self._inotify.fd if self._inotify else None
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Return once the journal may have new data (or after ``timeout``)."""
+        if self._inotify:
+            # the safety timeout covers events lost while the directory was swapped
+            self._inotify.wait(timeout if timeout is not None else 5.0)
+            return
+        deadline = time.monotonic() + (timeout if timeout is not None else float("inf"))
+        while time.monotonic() < deadline:
+            try:
+                st = self.journal.path.stat()
+                current = (st.st_size, st.st_mtime_ns)
+            except FileNotFoundError:
+                current = None
+            if current != self._last_stat:
+                self._last_stat = current
+                return
+            time.sleep(self.poll_interval)
+
+    def run(self, handler: Callable[[str], None]) -> None:
+        """Dispatch forever: drain the journal, then sleep until it changes."""
+        while True:
+            self.journal.process(handler)
+            self.wait()
+
+    async def run_async(self, handler: Callable[[str], None]) -> None:
+        """``run`` for an event loop: the inotify fd is watched with ``add_reader``."""
+        fd = self.fileno()
+        if fd is None:
+            while True:
+                self.journal.process(handler)
+                await asyncio.sleep(self.poll_interval)
+
+        loop = asyncio.get_running_loop()
+        ready = asyncio.Event()
+        loop.add_reader(fd, ready.set)
+        try:
+            while True:
+                self.journal.process(handler)
+                try:
+                    await asyncio.wait_for(ready.wait(), 5.0)
+                except asyncio.TimeoutError:
+                    pass
+                ready.clear()
+                self._inotify.drain()
+        finally:
+            loop.remove_reader(fd)
+
+    def close(self) -> None:
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
@@ -22,20 +22,17 @@ def parse_command(input_text: str) -> dict | None:
 
     command = parts[0]
 
-    if command == "buy":
-        logger.info("🧠 Detected command: BUY")
+    if command in ("buy", "sell"):
+        try:
+            amount = float(parts[2]) if len(parts) > 2 else None
+        except ValueError:
+            logger.warning(f"🧠 Invalid amount: {parts[2]}")
+            return None
+        logger.info(f"🧠 Detected command: {command.upper()}")
         return {
-            "action": "BUY",
+            "action": command.upper(),
             "token": parts[1].upper() if len(parts) > 1 else None,
-            "amount": float(parts[2]) if len(parts) > 2 else None
-        }
-
-    elif command == "sell":
-        logger.info("🧠 Detected command: SELL")
-        return {
-            "action": "SELL",
-            "token": parts[1].upper() if len(parts) > 1 else None,
-            "amount": float(parts[2]) if len(parts) > 2 else None
+            "amount": amount
         }
 
     elif command == "status":
@@ -0,0 +1,153 @@
+# bot/components.py – declarative, lazily imported runtime components
+"""
+Every long-running part of AshBorn is declared here as ``module:attr``
+strings; nothing is imported until the component is enabled and loaded.
+
+  • ``ENABLE_<NAME>=0`` switches a component off (tracing is opt-in via
+    ``TRACE_LATENCY=1``)
+  • a component whose required env vars are missing is skipped with a
+    warning instead of failing the boot – a local-only run (command file +
+    brain) needs neither a Telegram token nor a BirdEye key, and never
+    imports ``telegram`` or ``httpx``
+  • heavy, network-facing components (Telegram, sniffer) are *deferred*:
+    their modules are imported in a worker thread once the supervisor runs,
+    so the command file and the brain are listening before ``telegram`` /
+    ``httpx`` have even loaded
+  • shutdown hooks are declared the same way, registered once, and skipped
+    when their module was never imported (nothing to close)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import inspect
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Sequence, Tuple
+
+from loguru import logger
+
+
+def resolve(target: str):
+    module, _, attr = target.partition(":")
+    return getattr(importlib.import_module(module), attr)
+
+
+@dataclass(frozen=True)
+class Component:
+    name: str
+    target: str                                   # "module:coroutine_function"
+    env: str                                      # enable flag
+    default: bool = True
+    requires: Tuple[str, ...] = ()                # env vars that must be non-empty
+    shutdown: Tuple[str, ...] = ()                # "module:callable", sync or async
+    deferred: bool = False                        # import off-loop after start-up
+
+    def enabled(self) -> bool:
+        return os.getenv(self.env, "1" if self.default else "0").lower() in ("1", "true", "yes")
+
+    def missing(self) -> List[str]:
+        return [var for var in self.requires if not os.getenv(var)]
+
+    def load(self) -> Callable[[], Awaitable[None]]:
+        return resolve(self.target)
+
+    def deferred_factory(self) -> Callable[[], Awaitable[None]]:
+        async def run() -> None:
+            started = time.perf_counter()
+            factory = await asyncio.to_thread(self.load)
+            logger.debug(f"📦 {self.name} imported in {(time.perf_counter() - started) * 1000:.0f} ms (deferred)")
+            await factory()
+        run.__name__ = self.name
+        return run
+
+
+COMPONENTS: Tuple[Component, ...] = (
+    # first: its restore runs before the brain or the sniffer consume anything
+    Component("checkpoint", "bot.checkpoint:run_checkpointer", "ENABLE_CHECKPOINT",
+              shutdown=("bot.checkpoint:checkpoint_now",)),
+    Component("telegram", "bot.telegram_bot:run_telegram_bot", "ENABLE_TELEGRAM",
+              requires=("TELEGRAM_BOT_TOKEN",), shutdown=("bot.brain:shutdown",), deferred=True),
+    Component("sniffer", "sniffers.alpha_sniffer:start_sniffer_loop", "ENABLE_SNIFFER",
+              requires=("BIRDEYE_API_KEY",), shutdown=("bot.brain:shutdown", "sniffers.bird_eye:close_client"),
+              deferred=True),
+    Component("stream", "sniffers.birdeye_stream:start_stream_sniffer", "ENABLE_STREAM", default=False,
+              requires=("BIRDEYE_API_KEY",), shutdown=("bot.brain:shutdown",)),
+    Component("brain", "bot.brain:run_alpha_watcher", "ENABLE_BRAIN", shutdown=("bot.brain:shutdown",)),
+    Component("prices", "bot.brain:run_price_refresher", "ENABLE_PRICE_REFRESH",
+              requires=("BIRDEYE_API_KEY",), shutdown=("sniffers.bird_eye:close_client",)),
+    Component("commands", "bot.realtime:watch_command_file_async", "ENABLE_COMMAND_FILE",
+              shutdown=("bot.brain:shutdown",)),
+    Component("notifier", "bot.notifier:run_notifier", "ENABLE_NOTIFIER",
+              requires=("TELEGRAM_BOT_TOKEN", "TELEGRAM_CHAT_ID"), shutdown=("bot.notifier:flush",)),
+    Component("control", "bot.control:run_control_server", "ENABLE_CONTROL_SOCKET",
+              shutdown=("bot.brain:shutdown",)),
+    Component("status", "bot.status_region:run_status_region", "ENABLE_STATUS_REGION",
+              shutdown=("bot.status_region:close_region",)),
+    Component("tracing", "utils.tracing:export_loop", "TRACE_LATENCY", default=False,
+              shutdown=("utils.tracing:export_now",)),
+)
+
+# shutdown order: checkpoint what is still queued, drain orders / flush trade memory, final status,
+# last digest, close sockets, then the final metrics
+SHUTDOWN_ORDER = (
+    "bot.checkpoint:checkpoint_now", "bot.brain:shutdown", "bot.status_region:close_region", "bot.notifier:flush",
+    "sniffers.bird_eye:close_client", "utils.tracing:export_now",
+)
+
+
+@dataclass
+class Loaded:
+    component: Component
+    factory: Callable[[], Awaitable[None]]
+    import_ms: float | None                       # None → deferred
+
+
+def load_enabled(components: Sequence[Component] = COMPONENTS) -> List[Loaded]:
+    """Import the enabled, non-deferred components (and only those), timing each import."""
+    loaded = []
+    for comp in components:
+        if not comp.enabled():
+            logger.debug(f"⏸️ {comp.name} disabled ({comp.env}=0)")
+            continue
+        missing = comp.missing()
+        if missing:
+            logger.warning(f"⏸️ {comp.name} skipped – {', '.join(missing)} not set")
+            continue
+        if comp.deferred:
+            loaded.append(Loaded(comp, comp.deferred_factory(), None))
+            continue
+        started = time.perf_counter()
+        factory = comp.load()
+        loaded.append(Loaded(comp, factory, (time.perf_counter() - started) * 1000))
+    return loaded
+
+
+def shutdown_hooks(loaded: Sequence[Loaded]) -> List[Callable[[], Awaitable[None]]]:
+    """One hook per distinct target of the loaded components, in ``SHUTDOWN_ORDER``."""
+    targets = {t for item in loaded for t in item.component.shutdown}
+    ordered = [t for t in SHUTDOWN_ORDER if t in targets] + sorted(targets - set(SHUTDOWN_ORDER))
+    return [_hook(t) for t in ordered]
+
+
+def _hook(target: str) -> Callable[[], Awaitable[None]]:
+    async def hook() -> None:
+        if target.partition(":")[0] not in sys.modules:
+            return                                # never imported → nothing to drain or close
+        fn = resolve(target)
+        if inspect.iscoroutinefunction(fn):
+            await fn()
+        else:
+            await asyncio.to_thread(fn)           # blocking hooks (executor join, fsync) off the loop
+    hook.__name__ = target
+    return hook
+
+
+def describe(loaded: Sequence[Loaded]) -> Dict[str, object]:
+    return {
+        item.component.name: "deferred" if item.import_ms is None else round(item.import_ms, 1)
+        for item in loaded
+    }
@@ -0,0 +1,240 @@
+# bot/control.py – local Unix-socket control API (JSON lines, pipelined)
+"""
+Scripts and strategies drive the bot through ``data/ashborn.sock``:
+
+  request line (any of)                          response lines
+  ─────────────────────                          ──────────────
+  "buy SOL 0.2"  /  buy SOL 0.2 (bare text)       {"id": n, "ok": true, "ack": "queued"}   BUYs only
+  {"id": 7, "cmd": "sell SOL"}                    {"id": 7, "ok": true, "result": {...}}
+  {"id": 8, "action": "BUY", "token": "X", …}     {"id": 8, "ok": false, "error": "…"}
+  {"id": 9, "batch": [ …any of the above… ]}      one result per batch item, id "9.0", "9.1", …
+  [ …any of the above… ]
+
+  • pipelined: lines are dispatched as they arrive, nobody waits for the
+    previous receipt; results come back as they complete, tagged by ``id``
+    (the 1-based line number when the request has none)
+  • text goes through ``parse_command``, dicts with an ``action`` straight to
+    ``handle_command``; BUY results are the executor receipts
+  • at most ``max_inflight`` unfinished commands per connection – reading
+    stops until receipts drain, so a flood cannot queue unbounded work
+  • the socket is created mode 0600: only the bot's own user can connect
+  • a socket file left at the path is probed first: a stale one (nobody
+    accepts) is replaced, a live one – another instance – is left alone and
+    ``start()`` raises
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Iterable, List, Tuple
+
+from loguru import logger
+
+from bot.brain import handle_command
+from bot.commands import parse_command
+
+CONTROL_SOCKET = Path(os.getenv("CONTROL_SOCKET", "data/ashborn.sock"))
+CONTROL_MAX_INFLIGHT = int(os.getenv("CONTROL_MAX_INFLIGHT", "4096"))
+MAX_LINE = 16 * 1024 * 1024
+
+
+def _dumps(obj: Any) -> bytes:
+    return json.dumps(obj, default=str, separators=(",", ":")).encode() + b"\n"
+
+
+def expand(request: Any, default_id: Any) -> List[Tuple[Any, Any]]:
+    """Flatten one decoded request line into ``(id, command)`` pairs."""
+    if isinstance(request, dict) and "batch" in request:
+        rid, items = request.get("id", default_id), request["batch"] or []
+    elif isinstance(request, list):
+        rid, items = default_id, request
+    else:
+        return [(request.get("id", default_id) if isinstance(request, dict) else default_id, request)]
+    return [(item.get("id", f"{rid}.{i}") if isinstance(item, dict) else f"{rid}.{i}", item)
+            for i, item in enumerate(items)]
+
+
+def to_command(item: Any) -> dict | None:
+    if isinstance(item, str):
+        return parse_command(item)
+    if isinstance(item, dict):
+        if "cmd" in item:
+            return parse_command(str(item["cmd"]))
+        if item.get("action"):
+            return {k: v for k, v in item.items() if k != "id"}
+    return None
+
+
+class ControlServer:
+    def __init__(self, path: Path | str = CONTROL_SOCKET, max_inflight: int = CONTROL_MAX_INFLIGHT) -> None:
+        self.path = Path(path)
+        self.max_inflight = max_inflight
+        self.connections = self.commands = self.errors = 0
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> "ControlServer":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.is_socket():
+            if await self._alive():
+                raise RuntimeError(f"another instance is serving {self.path}")
+            self.path.unlink()                            # stale socket from a previous run
+        old_umask = os.umask(0o177)
+        try:
+            self._server = await asyncio.start_unix_server(self._client, path=str(self.path), limit=MAX_LINE)
+        finally:
+            os.umask(old_umask)
+        logger.info(f"🔌 Control socket listening on {self.path}")
+        return self
+
+    async def _alive(self) -> bool:
+        """Does something accept connections on ``path``?"""
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_unix_connection(str(self.path)), 1.0)
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        return True
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self.path.is_socket():
+            self.path.unlink()
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await asyncio.Event().wait()                  # until cancelled by the supervisor
+        finally:
+            await self.close()
+
+    # ─────────────── one connection ───────────────
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        slots = asyncio.Semaphore(self.max_inflight)
+        pending: set[asyncio.Task] = set()
+        line_no = 0
+        try:
+            while line := await reader.readline():
+                line_no += 1
+                text = line.strip()
+                if not text:
+                    continue
+                try:
+                    request = json.loads(text)
+                except ValueError:
+                    request = text.decode(errors="replace")          # bare "buy SOL 0.2"
+                for cid, item in expand(request, line_no):
+                    await slots.acquire()
+                    future = self._dispatch(cid, item, writer)
+                    if future is None:
+                        slots.release()
+                        continue
+                    task = asyncio.ensure_future(self._finish(cid, future, writer))
+                    task.add_done_callback(pending.discard)
+                    task.add_done_callback(lambda _: slots.release())
+                    pending.add(task)
+                if writer.transport.get_write_buffer_size() > 1 << 20:
+                    await writer.drain()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError) as e:
+            logger.warning(f"🔌 Control client dropped: {e}")
+        finally:
+            for task in pending:
+                task.cancel()
+            writer.close()
+
+    def _dispatch(self, cid: Any, item: Any, writer: asyncio.StreamWriter) -> Future | None:
+        """Run one command; reply now unless a receipt is still to come (then return its future)."""
+        self.commands += 1
+        try:
+            cmd = to_command(item)
+            if cmd is None:
+                self.errors += 1
+                writer.write(_dumps({"id": cid, "ok": False, "error": "unrecognised command"}))
+                return None
+            result = handle_command(cmd)
+        except Exception as e:
+            self.errors += 1
+            writer.write(_dumps({"id": cid, "ok": False, "error": str(e)}))
+            return None
+        if isinstance(result, Future):
+            writer.write(_dumps({"id": cid, "ok": True, "ack": "queued"}))
+            return result
+        if result is None and (cmd.get("action") or "").upper() in ("BUY", "SELL"):
+            writer.write(_dumps({"id": cid, "ok": False, "error": "not executed (see log)"}))
+        else:
+            writer.write(_dumps({"id": cid, "ok": True, "result": result}))
+        return None
+
+    async def _finish(self, cid: Any, future: Future, writer: asyncio.StreamWriter) -> None:
+        try:
+            receipt = await asyncio.wrap_future(future)
+            reply = {"id": cid, "ok": True, "result": receipt}
+            if receipt is None:
+                reply["skipped"] = "already traded"
+            elif receipt.get("status") == "rejected":
+                reply["skipped"] = receipt.get("reason") or "not filled"
+        except Exception as e:
+            self.errors += 1
+            reply = {"id": cid, "ok": False, "error": str(e)}
+        if writer.is_closing():
+            return
+        writer.write(_dumps(reply))
+        try:
+            await writer.drain()                          # a slow reader throttles its own receipts
+        except ConnectionError:
+            pass
+
+    def stats(self) -> dict:
+        return {"connections": self.connections, "commands": self.commands, "errors": self.errors}
+
+
+async def run_control_server() -> None:
+    """Supervisor entry point (no-op where Unix sockets are unavailable)."""
+    if not hasattr(asyncio, "start_unix_server"):
+        logger.warning("🔌 Control socket needs Unix-domain sockets – disabled on this platform")
+        return
+    await ControlServer().serve_forever()
+
+
+# ─────────────── client side ───────────────
+async def send_commands(
+    commands: Iterable[Any], path: Path | str = CONTROL_SOCKET, batch: int = 0
+) -> List[dict]:
+    """
+    Pipeline ``commands`` (text or dicts) to the control socket and collect
+    every response line; ``batch`` > 0 packs that many per request line.
+    """
+    items = list(commands)
+    reader, writer = await asyncio.open_unix_connection(str(path), limit=MAX_LINE)
+    if batch > 0:
+        lines = [_dumps(items[i:i + batch]) for i in range(0, len(items), batch)]
+    else:
+        lines = [_dumps(item) for item in items]
+    writer.write(b"".join(lines))
+    await writer.drain()
+    if writer.can_write_eof():
+        writer.write_eof()                                # half-close: server answers, then hangs up
+    replies = [json.loads(line) async for line in _lines(reader)]
+    writer.close()
+    return replies
+
+
+async def _lines(reader: asyncio.StreamReader):
+    while line := await reader.readline():
+        yield line
+
+
+if __name__ == "__main__":
+    for reply in asyncio.run(send_commands(sys.argv[1:] or ["status"])):
+        print(json.dumps(reply, default=str))
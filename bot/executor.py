@@ -0,0 +1,273 @@
+# bot/executor.py – prioritised, idempotent order execution off the caller's thread
+"""
+``handle_command`` used to run the buyer synchronously on whichever thread
+called it (sniffer loop, Telegram handler, file watcher).  Orders now go
+through an ``OrderExecutor``:
+
+  • priority queue – manual commands (Telegram / file / socket) jump ahead of
+    auto-promoted alpha; FIFO within one priority
+  • worker pool of ``workers`` threads
+  • idempotency key = mint address (``meta["address"]``, the symbol when there
+    is none – symbols collide across mints): while an order for a mint is
+    queued or running, another submit returns the same future instead of a
+    second buy; the "already traded?" check is repeated under that key right
+    before buying, so check-then-act can no longer race, and a fill is
+    remembered under it – another mint reusing the symbol is still bought
+  • every order's future is resolved: a failing hook (trade memory, skip /
+    fill callbacks) fails that order's future, never the worker thread
+  • optional batching: a worker takes up to ``batch_size`` orders that arrive
+    within ``batch_window`` seconds and hands them to ``buy_batch`` at once
+    (single orders go through ``buy_batch`` too when one is given)
+  • per-order queue-wait and execution-latency stats
+  • ``on_fill(order, receipt)`` hook for every successful receipt (position book),
+    ``on_skip(order)`` for every order dropped as already traded (its future
+    resolves to ``None``; a buyer receipt with ``status: "rejected"`` is an
+    order the buyer could not fill),
+    ``on_fail(order, error)`` for every order whose future failed
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Sequence
+
+from loguru import logger
+
+from utils.logger import hot
+from utils.tracing import tracer
+
+PRIORITY = {"manual": 0, "alpha": 10}
+
+
+@dataclass(order=True)
+class Order:
+    priority: int
+    seq: int
+    token: str = field(compare=False)
+    amount: float = field(compare=False)
+    source: str = field(compare=False)
+    key: str = field(compare=False, default="")
+    enqueued_ns: int = field(compare=False, default_factory=time.perf_counter_ns)
+    future: Future = field(compare=False, default_factory=Future)
+    meta: dict = field(compare=False, default_factory=dict)
+
+
+@dataclass
+class LatencyStats:
+    count: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+
+    def add(self, ns: int) -> None:
+        self.count += 1
+        self.total_ns += ns
+        self.max_ns = max(self.max_ns, ns)
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "avg_ms": self.total_ns / self.count / 1e6 if self.count else 0.0,
+            "max_ms": self.max_ns / 1e6,
+        }
+
+
+class OrderExecutor:
+    def __init__(
+        self,
+        buy: Callable[[str, float], dict],
+        already_traded: Callable[[str], bool],
+        remember: Callable[[str], object],
+        *,
+        buy_batch: Callable[[Sequence[Order]], List[dict]] | None = None,
+        on_fill: Callable[[Order, dict], object] | None = None,
+        on_skip: Callable[[Order], object] | None = None,
+        on_fail: Callable[[Order, Exception], object] | None = None,
+        workers: int = 2,
+        batch_size: int = 1,
+        batch_window: float = 0.0,
+    ) -> None:
+        self._buy = buy
+        self._buy_batch = buy_batch
+        self._on_fill = on_fill
+        self._on_skip = on_skip
+        self._on_fail = on_fail
+        self._already_traded = already_traded
+        self._remember = remember
+        self.workers = workers
+        self.batch_size = max(1, batch_size)
+        self.batch_window = batch_window
+
+        self._heap: List[Order] = []
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._inflight: Dict[str, Order] = {}
+        self._threads: List[threading.Thread] = []
+        self._stopping = False
+
+        self.queue_wait = LatencyStats()
+        self.execution = LatencyStats()
+        self.filled = self.skipped = self.failed = self.deduped = self.unfilled = 0
+
+    # ─────────────── lifecycle ───────────────
+    def start(self) -> "OrderExecutor":
+        with self._cond:
+            if self._threads:
+                return self
+            self._stopping = False
+            for i in range(self.workers):
+                t = threading.Thread(target=self._worker, name=f"OrderWorker-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+        return self
+
+    def stop(self, drain: bool = True, timeout: float | None = None) -> None:
+        """Stop the workers; with ``drain`` queued orders are executed first."""
+        with self._cond:
+            if not drain:
+                for order in self._heap:
+                    order.future.cancel()
+                    self._inflight.pop(order.key, None)
+                self._heap.clear()
+            self._stopping = True
+            self._cond.notify_all()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads.clear()
+
+    # ─────────────── submit ───────────────
+    def submit(self, token: str, amount: float, source: str = "manual", **meta) -> Future:
+        token = token.upper()
+        key = meta.get("address") or token
+        with self._cond:
+            if self._stopping:
+                raise RuntimeError("executor is stopped")
+            existing = self._inflight.get(key)
+            if existing is not None:
+                self.deduped += 1
+                if PRIORITY.get(source, 5) < existing.priority and existing in self._heap:
+                    existing.priority = PRIORITY.get(source, 5)          # manual upgrade of a queued alpha buy
+                    heapq.heapify(self._heap)
+                return existing.future
+            order = Order(PRIORITY.get(source, 5), next(self._seq), token, amount, source, key, meta=meta)
+            self._inflight[key] = order
+            heapq.heappush(self._heap, order)
+            self._cond.notify()
+        return order.future
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._heap)
+
+    # ─────────────── workers ───────────────
+    def _take_batch(self) -> List[Order]:
+        with self._cond:
+            self._cond.wait_for(lambda: self._heap or self._stopping)
+            if not self._heap:
+                return []
+            if self.batch_size > 1 and len(self._heap) < self.batch_size and self.batch_window:
+                self._cond.wait_for(lambda: len(self._heap) >= self.batch_size or self._stopping, self.batch_window)
+            return [heapq.heappop(self._heap) for _ in range(min(self.batch_size, len(self._heap)))]
+
+    def _worker(self) -> None:
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return
+            started = time.perf_counter_ns()
+            for order in batch:
+                self.queue_wait.add(started - order.enqueued_ns)
+                tracer.record("executor", order.enqueued_ns, started)
+            try:
+                self._execute(batch)
+            except Exception as e:                        # a bug here must not strand the futures
+                logger.exception(f"❌ Executor batch failed: {e}")
+                for order in batch:
+                    self._fail(order, e)
+            finally:
+                with self._cond:
+                    for order in batch:
+                        self._inflight.pop(order.key, None)
+
+    def _fail(self, order: Order, error: Exception) -> None:
+        if order.future.done():
+            return
+        self.failed += 1
+        order.future.set_exception(error)
+        if self._on_fail is not None:
+            try:
+                self._on_fail(order, error)
+            except Exception as e:
+                logger.error(f"❌ on_fail failed for {order.token}: {e}")
+
+    def _execute(self, batch: List[Order]) -> None:
+        live = []
+        for order in batch:
+            try:
+                if self._already_traded(order.key):
+                    self.skipped += 1
+                    hot("buy.skip").info("🔁 Skipping {} – already traded.", order.token)
+                    if self._on_skip is not None:
+                        self._on_skip(order)
+                    order.future.set_result(None)
+                else:
+                    live.append(order)
+            except Exception as e:                        # e.g. the trade store is already closed
+                logger.error(f"❌ Order for {order.token} failed before buying: {e}")
+                self._fail(order, e)
+        if not live:
+            return
+
+        started = time.perf_counter_ns()
+        try:
+            if self._buy_batch is not None:              # it sees each order's address, ``buy`` only the symbol
+                receipts = self._buy_batch(live)
+            else:
+                receipts = [self._buy(o.token, o.amount) for o in live]
+        except Exception as e:
+            logger.error(f"❌ Buy failed for {[o.token for o in live]}: {e}")
+            for o in live:
+                self._fail(o, e)
+            return
+        finished = time.perf_counter_ns()
+        elapsed = finished - started
+        tracer.record("buyer", started, finished)
+
+        for order, receipt in zip(live, receipts):
+            self.execution.add(elapsed // len(live))
+            tracer.record("end_to_end", order.meta.get("origin_ns", 0), finished)
+            if receipt and receipt.get("status") == "rejected":
+                self.unfilled += 1                        # the buyer could not fill it – its receipt says why
+            elif receipt:
+                try:
+                    self._remember(order.key)
+                except Exception as e:
+                    logger.error(f"❌ Bought {order.token} but could not remember it: {e}")
+                    self._fail(order, e)
+                    continue
+                self.filled += 1
+                hot("buy.receipt").success("📟 Fake-buy receipt → {}", receipt)
+                if self._on_fill is not None:
+                    try:
+                        self._on_fill(order, receipt)
+                    except Exception as e:
+                        logger.error(f"❌ on_fill failed for {order.token}: {e}")
+            order.future.set_result(receipt)
+
+    # ─────────────── introspection ───────────────
+    def stats(self) -> Dict[str, object]:
+        return {
+            "queued": self.pending(),
+            "workers": len(self._threads),
+            "filled": self.filled,
+            "skipped": self.skipped,
+            "unfilled": self.unfilled,
+            "failed": self.failed,
+            "deduped": self.deduped,
+            "queue_wait": self.queue_wait.as_dict(),
+            "execution": self.execution.as_dict(),
+        }
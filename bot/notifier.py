@@ -0,0 +1,262 @@
+# bot/notifier.py – outbound Telegram digests for the owner chat
+"""
+Fills, skips and alpha alerts pushed to ``TELEGRAM_CHAT_ID`` without ever
+slowing the trading path.
+
+  • ``notify(kind, text)`` is an O(1) append under a lock, callable from any
+    thread (executor workers, the loop); a no-op while no notifier runs
+  • events are coalesced into one digest per flush: fills are flushed
+    within ``fill_window`` seconds, everything else within ``window``
+  • digests list fills first, then errors, skips and alerts; each kind is
+    capped at ``max_lines`` lines ("… +N more") and the message at 4096 chars
+  • sends draw on a per-chat ``TokenBucket`` (``TELEGRAM_NOTIFY_RPM``); a 429
+    pauses the bucket for the server's ``retry_after`` and the digest is
+    kept – whatever arrives meanwhile is folded into it
+  • bounded: at ``maxsize`` queued events the oldest lowest-priority one is
+    dropped (fills last)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Tuple
+
+from loguru import logger
+
+from utils.rate_limit import TokenBucket
+
+TELEGRAM_API_URL = os.getenv("TELEGRAM_API_URL", "https://api.telegram.org")
+NOTIFY_WINDOW = float(os.getenv("TELEGRAM_NOTIFY_WINDOW", "5"))
+NOTIFY_FILL_WINDOW = float(os.getenv("TELEGRAM_NOTIFY_FILL_WINDOW", "1"))
+NOTIFY_RPM = float(os.getenv("TELEGRAM_NOTIFY_RPM", "20"))
+NOTIFY_MAXSIZE = int(os.getenv("TELEGRAM_NOTIFY_MAXSIZE", "10000"))
+MAX_MESSAGE = 4096
+
+# kind → (priority, digest heading); lower priority is sent first and dropped last
+KINDS: Dict[str, Tuple[int, str]] = {
+    "fill": (0, "✅ Fills"),
+    "sell": (0, "💸 Sells"),
+    "error": (1, "❌ Errors"),
+    "skip": (2, "🔁 Skipped"),
+    "alert": (3, "🔎 Alerts"),
+}
+
+
+class RetryAfter(Exception):
+    def __init__(self, seconds: float) -> None:
+        super().__init__(f"flood control, retry after {seconds:g}s")
+        self.seconds = seconds
+
+
+class Notifier:
+    def __init__(
+        self,
+        send: Callable[[str], Awaitable[None]],
+        *,
+        window: float = NOTIFY_WINDOW,
+        fill_window: float = NOTIFY_FILL_WINDOW,
+        per_minute: float = NOTIFY_RPM,
+        burst: float = 3,
+        maxsize: int = NOTIFY_MAXSIZE,
+        max_lines: int = 15,
+        retries: int = 3,
+    ) -> None:
+        self.send = send
+        self.window = window
+        self.fill_window = fill_window
+        self.bucket = TokenBucket(per_minute, burst=burst)
+        self.maxsize = maxsize
+        self.max_lines = max_lines
+        self.retries = retries
+
+        self._events: Dict[str, Deque[str]] = {kind: deque() for kind in KINDS}
+        self._size = 0
+        self._deadline: float | None = None               # monotonic flush time of what is queued
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
+
+        self.queued = self.dropped = self.sent = self.failed = self.throttled = 0
+
+    # ─────────────── producer side (any thread, never blocks) ───────────────
+    def notify(self, kind: str, text: str) -> None:
+        kind = kind if kind in KINDS else "alert"
+        window = self.fill_window if KINDS[kind][0] == 0 else self.window
+        with self._lock:
+            if self._size >= self.maxsize and not self._evict(KINDS[kind][0]):
+                self.dropped += 1
+                return
+            self._events[kind].append(text)
+            self._size += 1
+            self.queued += 1
+            deadline = time.monotonic() + window
+            hurry = self._deadline is None or deadline < self._deadline
+            if hurry:
+                self._deadline = deadline
+        if hurry:
+            self._poke()
+
+    def _evict(self, priority: int) -> bool:
+        """Drop the oldest event of the lowest priority at or below ``priority``. Caller holds the lock."""
+        for kind in sorted(KINDS, key=lambda k: -KINDS[k][0]):
+            if KINDS[kind][0] < priority:
+                break
+            if self._events[kind]:
+                self._events[kind].popleft()
+                self._size -= 1
+                self.dropped += 1
+                return True
+        return False
+
+    def _poke(self) -> None:
+        loop, wake = self._loop, self._wake
+        if loop is None or wake is None:
+            return
+        try:
+            loop.call_soon_threadsafe(wake.set)
+        except RuntimeError:                              # loop already closed
+            pass
+
+    # ─────────────── digest ───────────────
+    def pending(self) -> int:
+        return self._size
+
+    def digest(self) -> str:
+        """Drain everything queued into one message (empty string if nothing is)."""
+        with self._lock:
+            taken = {kind: list(q) for kind, q in self._events.items() if q}
+            for q in self._events.values():
+                q.clear()
+            self._size = 0
+            self._deadline = None
+        parts: List[str] = []
+        for kind in sorted(taken, key=lambda k: KINDS[k][0]):
+            lines = taken[kind]
+            shown = lines[: self.max_lines]
+            more = f"\n… +{len(lines) - len(shown)} more" if len(lines) > len(shown) else ""
+            parts.append(f"{KINDS[kind][1]} ({len(lines)})\n" + "\n".join(shown) + more)
+        text = "\n\n".join(parts)
+        return text if len(text) <= MAX_MESSAGE else text[: MAX_MESSAGE - 2] + " …"
+
+    async def flush(self, carry: str = "") -> str:
+        """Send one digest (``carry`` = a throttled one, merged in front). Returns what is still unsent."""
+        await self.bucket.acquire()
+        fresh = self.digest()
+        text = "\n\n".join(t for t in (carry, fresh) if t)[:MAX_MESSAGE]
+        if not text:
+            return ""
+        for attempt in range(self.retries + 1):
+            try:
+                await self.send(text)
+                self.sent += 1
+                return ""
+            except RetryAfter as e:
+                self.throttled += 1
+                self.bucket.pause(e.seconds)
+                logger.warning(f"📨 Telegram {e} – digest kept")
+                return text
+            except Exception as e:
+                if attempt == self.retries:
+                    self.failed += 1
+                    logger.error(f"❌ Telegram notification dropped: {e}")
+                    return ""
+                await asyncio.sleep(min(5.0, 0.5 * 2 ** attempt))
+        return ""
+
+    async def run(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        carry = ""
+        while True:
+            self._wake.clear()
+            deadline = self._deadline
+            if carry and deadline is None:
+                deadline = time.monotonic()
+            if deadline is None:
+                await self._wake.wait()
+                continue
+            wait = deadline - time.monotonic()
+            if wait > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), wait)     # an earlier deadline (a fill) wakes us
+                    continue
+                except asyncio.TimeoutError:
+                    pass
+            carry = await self.flush(carry)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "pending": self._size,
+            "queued": self.queued,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "throttled": self.throttled,
+        }
+
+
+class TelegramSender:
+    """``sendMessage`` to one chat over a pooled httpx client (imported lazily)."""
+
+    def __init__(self, token: str, chat_id: int | str, base_url: str = TELEGRAM_API_URL) -> None:
+        self.url = f"{base_url.rstrip('/')}/bot{token}/sendMessage"
+        self.chat_id = chat_id
+        self._http = None
+
+    async def __call__(self, text: str) -> None:
+        if self._http is None:
+            import httpx
+
+            self._http = httpx.AsyncClient(timeout=10.0)
+        resp = await self._http.post(self.url, json={"chat_id": self.chat_id, "text": text,
+                                                     "disable_web_page_preview": True})
+        if resp.status_code == 429:
+            retry = (resp.json().get("parameters") or {}).get("retry_after", 1)
+            raise RetryAfter(float(retry))
+        resp.raise_for_status()
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+
+# ─────────────── process-wide notifier ───────────────
+notifier: Notifier | None = None
+
+
+def notify(kind: str, text: str) -> None:
+    """Queue one owner notification; does nothing while the notifier component is off."""
+    if notifier is not None:
+        notifier.notify(kind, text)
+
+
+async def run_notifier() -> None:
+    """Supervisor entry point."""
+    global notifier
+    sender = TelegramSender(os.environ["TELEGRAM_BOT_TOKEN"], os.environ["TELEGRAM_CHAT_ID"])
+    notifier = notifier or Notifier(sender)
+    notifier.send = sender
+    logger.info("📨 Telegram notifier running …")
+    try:
+        await notifier.run()
+    finally:
+        await sender.aclose()
+
+
+async def flush() -> None:
+    """Shutdown hook: one last digest with whatever is still queued (best effort)."""
+    if notifier is None or not notifier.pending():
+        return
+    sender = TelegramSender(os.environ["TELEGRAM_BOT_TOKEN"], os.environ["TELEGRAM_CHAT_ID"])
+    notifier.send = sender
+    try:
+        await asyncio.wait_for(notifier.flush(), 5.0)
+    except Exception as e:
+        logger.warning(f"📨 Final Telegram digest not sent: {e}")
+    finally:
+        await sender.aclose()
@@ -0,0 +1,271 @@
+# bot/positions.py – in-memory position book and adaptive, batched price refresher
+"""
+Open positions, fed by buyer receipts, marked to market by one background task.
+
+  • ``PositionBook`` – mint address → ``Position`` dict (the symbol for a fill
+    without one – symbols collide across mints), plus a symbol index so
+    ``get`` / ``close`` by symbol stay O(1); guarded by a lock because fills
+    land on executor worker threads
+  • every position carries its own refresh deadline; a lazy-deletion heap
+    hands the refresher only the positions that are *due*
+  • adaptive interval: freshly bought or volatile positions (EWMA of absolute
+    log-returns over the threshold) refresh every ``min_interval``; a quiet
+    position backs off ×2 per refresh up to ``max_interval``
+  • ``PriceRefresher`` collects the due addresses and prices them through one
+    batched ``fetch`` call (``sniffers.bird_eye.fetch_prices`` – up to 100
+    addresses per request, batches in flight concurrently), so API calls
+    scale with due positions / batch size, not with open positions
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Sequence
+
+from loguru import logger
+
+PRICE_REFRESH_MIN = float(os.getenv("PRICE_REFRESH_MIN", "2"))          # s – fresh / volatile
+PRICE_REFRESH_MAX = float(os.getenv("PRICE_REFRESH_MAX", "60"))         # s – stale and quiet
+PRICE_FRESH_WINDOW = float(os.getenv("PRICE_FRESH_WINDOW", "300"))      # s after the buy
+PRICE_VOLATILE = float(os.getenv("PRICE_VOLATILE", "0.02"))             # EWMA |log-return| per refresh
+VOL_ALPHA = 0.3
+
+
+@dataclass
+class Position:
+    token: str
+    address: str
+    amount: float
+    entry_price: float
+    opened_at: float
+    last_price: float = 0.0
+    priced_at: float = 0.0
+    volatility: float = 0.0
+    interval: float = PRICE_REFRESH_MIN
+    next_refresh: float = 0.0
+    realized: float = 0.0
+
+    @property
+    def key(self) -> str:
+        return self.address or self.token
+
+    @property
+    def cost(self) -> float:
+        return self.amount * self.entry_price
+
+    @property
+    def value(self) -> float:
+        return self.amount * (self.last_price or self.entry_price)
+
+    @property
+    def unrealized(self) -> float:
+        return self.value - self.cost
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "token": self.token,
+            "address": self.address,
+            "amount": self.amount,
+            "entry_price": self.entry_price,
+            "last_price": self.last_price,
+            "unrealized": self.unrealized,
+            "volatility": self.volatility,
+            "interval": self.interval,
+        }
+
+
+@dataclass
+class PositionBook:
+    min_interval: float = PRICE_REFRESH_MIN
+    max_interval: float = PRICE_REFRESH_MAX
+    fresh_window: float = PRICE_FRESH_WINDOW
+    volatile: float = PRICE_VOLATILE
+    clock: Callable[[], float] = time.monotonic
+    realized: float = 0.0
+    _positions: Dict[str, Position] = field(default_factory=dict, init=False, repr=False)   # by Position.key
+    _symbols: Dict[str, set] = field(default_factory=dict, init=False, repr=False)        # symbol → keys
+    _due: List[tuple] = field(default_factory=list, init=False, repr=False)          # (deadline, seq, key)
+    _seq: itertools.count = field(default_factory=itertools.count, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    # ─────────────── fills ───────────────
+    def open(self, token: str, amount: float, price: float, address: str = "") -> Position:
+        """Add a fill; a second buy of the same mint averages into the position."""
+        token = token.upper()
+        now = self.clock()
+        with self._lock:
+            pos = self._positions.get(address or token)
+            if pos is None:
+                pos = Position(token, address, amount, price, now, last_price=price)
+                self._positions[pos.key] = pos
+                self._symbols.setdefault(token, set()).add(pos.key)
+            else:
+                total = pos.amount + amount
+                pos.entry_price = (pos.cost + amount * price) / total if total else price
+                pos.amount = total
+                pos.opened_at = now
+            if pos.address:                               # unpriceable without a mint address
+                self._schedule(pos, now, self.min_interval)
+            return pos
+
+    def open_from_receipt(self, receipt: dict, address: str = "") -> Position | None:
+        try:
+            return self.open(receipt["token"], float(receipt["amount"]), float(receipt["price"]),
+                             address or receipt.get("address", ""))
+        except (KeyError, TypeError, ValueError):
+            logger.warning(f"⚠️ Receipt without token/amount/price – not booked: {receipt}")
+            return None
+
+    def close(
+        self, token: str, amount: float | None = None, address: str = ""
+    ) -> tuple[Position, float] | None:
+        """Sell ``amount`` (all if None) at the last price; returns the position and realised P&L.
+        By symbol only when it names one position – two mints sharing it need ``address``."""
+        with self._lock:
+            pos = self._find(token, address)
+            if pos is None:
+                return None
+            sold = pos.amount if not amount or amount >= pos.amount else amount
+            pnl = sold * ((pos.last_price or pos.entry_price) - pos.entry_price)
+            pos.amount -= sold
+            pos.realized += pnl
+            self.realized += pnl
+            if pos.amount <= 0:
+                del self._positions[pos.key]              # its heap entries are dropped lazily
+                keys = self._symbols[pos.token]
+                keys.discard(pos.key)
+                if not keys:
+                    del self._symbols[pos.token]
+            return pos, pnl
+
+    # ─────────────── lookups ───────────────
+    def get(self, token: str, address: str = "") -> Position | None:
+        return self._find(token, address)
+
+    def _find(self, token: str, address: str = "") -> Position | None:
+        """By address; else by symbol when exactly one open position carries it."""
+        if address:
+            return self._positions.get(address)
+        keys = self._symbols.get(token.upper(), ())
+        if len(keys) > 1:
+            logger.warning(f"⚠️ {token.upper()} is held in {len(keys)} mints – give the address")
+            return None
+        return self._positions.get(next(iter(keys))) if keys else None
+
+    def __contains__(self, token: str) -> bool:
+        return token.upper() in self._symbols or token in self._positions
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def positions(self) -> List[Position]:
+        with self._lock:
+            return list(self._positions.values())
+
+    def summary(self) -> Dict[str, float]:
+        with self._lock:
+            cost = sum(p.cost for p in self._positions.values())
+            value = sum(p.value for p in self._positions.values())
+            return {"open": len(self._positions), "cost": cost, "value": value,
+                    "unrealized": value - cost, "realized": self.realized}
+
+    # ─────────────── refresh scheduling ───────────────
+    def due(self, now: float | None = None) -> List[Position]:
+        """Pop every position whose refresh deadline has passed (stale heap entries skipped)."""
+        now = self.clock() if now is None else now
+        out = []
+        with self._lock:
+            while self._due and self._due[0][0] <= now:
+                deadline, _, key = heapq.heappop(self._due)
+                pos = self._positions.get(key)
+                if pos is not None and pos.next_refresh == deadline:
+                    out.append(pos)
+        return out
+
+    def next_deadline(self) -> float | None:
+        with self._lock:
+            while self._due:
+                deadline, _, key = self._due[0]
+                pos = self._positions.get(key)
+                if pos is not None and pos.next_refresh == deadline:
+                    return deadline
+                heapq.heappop(self._due)
+            return None
+
+    def apply_prices(self, positions: Sequence[Position], prices: Dict[str, float]) -> int:
+        """Mark ``positions`` to ``prices`` (keyed by address) and reschedule each of them."""
+        now = self.clock()
+        updated = 0
+        with self._lock:
+            for pos in positions:
+                if self._positions.get(pos.key) is not pos:
+                    continue                              # sold while the request was in flight
+                price = prices.get(pos.address)
+                if price and price > 0:
+                    prev = pos.last_price or pos.entry_price
+                    if prev > 0:
+                        move = abs(math.log(price / prev))
+                        pos.volatility = VOL_ALPHA * move + (1 - VOL_ALPHA) * pos.volatility
+                    pos.last_price, pos.priced_at = price, now
+                    updated += 1
+                self._schedule(pos, now, self._interval(pos, now))
+        return updated
+
+    def _interval(self, pos: Position, now: float) -> float:
+        if now - pos.opened_at < self.fresh_window or pos.volatility >= self.volatile:
+            return self.min_interval
+        return min(self.max_interval, max(self.min_interval, pos.interval * 2))
+
+    def _schedule(self, pos: Position, now: float, interval: float) -> None:
+        pos.interval = interval
+        pos.next_refresh = now + interval
+        heapq.heappush(self._due, (pos.next_refresh, next(self._seq), pos.key))
+
+
+class PriceRefresher:
+    """Background task: price whatever is due in one batched call, sleep until the next deadline."""
+
+    def __init__(
+        self,
+        book: PositionBook,
+        fetch: Callable[[List[str]], Awaitable[Dict[str, float]]],
+        idle: float = 1.0,
+    ) -> None:
+        self.book = book
+        self.fetch = fetch
+        self.idle = idle                                  # ceiling on a sleep – new fills are due at once
+        self.rounds = self.requested = self.updated = 0
+
+    async def refresh_once(self) -> int:
+        due = self.book.due()
+        if not due:
+            return 0
+        addresses = sorted({p.address for p in due})
+        try:
+            prices = await self.fetch(addresses)
+        except Exception as e:                            # keep the old marks, retry on the next deadline
+            logger.error(f"❌ Price refresh failed for {len(addresses)} address(es): {e}")
+            prices = {}
+        updated = self.book.apply_prices(due, prices)
+        self.rounds += 1
+        self.requested += len(addresses)
+        self.updated += updated
+        return updated
+
+    async def run(self) -> None:
+        logger.info("💹 Price refresher running …")
+        while True:
+            await self.refresh_once()
+            deadline = self.book.next_deadline()
+            wait = self.idle if deadline is None else deadline - self.book.clock()
+            await asyncio.sleep(min(self.idle, max(0.0, wait)))
+
+    def stats(self) -> Dict[str, int]:
+        return {"rounds": self.rounds, "requested": self.requested, "updated": self.updated}
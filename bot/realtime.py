@@ -1,31 +1,34 @@
-import time
 from pathlib import Path
+from loguru import logger
 from .commands import parse_command
 from .brain import handle_command
+from .command_journal import CommandJournal, JournalWatcher
 
+# command.txt is append-only: `echo "BUY X 0.2" >> command.txt`
 COMMAND_FILE = Path("command.txt")
-LAST_COMMAND = ""
+OFFSET_FILE = Path("data/command.offset")
+
+def dispatch_command_line(command: str) -> None:
+    logger.info(f"📥 New Command Detected: {command}")
+    parsed = parse_command(command)
+    if parsed:
+        handle_command(parsed)
+    else:
+        logger.warning(f"⚠️ Invalid command format: {command!r}")
 
 def watch_command_file():
-    global LAST_COMMAND
-    print("🟢 AshBorn is listening for new commands in 'command.txt'...\n")
-    
-    while True:
-        if not COMMAND_FILE.exists():
-            time.sleep(1)
-            continue
-        
-        with COMMAND_FILE.open("r") as f:
-            command = f.read().strip()
-        
-        if command and command != LAST_COMMAND:
-            print(f"\n📥 New Command Detected: {command}")
-            parsed = parse_command(command)
-            if parsed:
-                handle_command(parsed)
-            else:
-                print("⚠️ Invalid command format.")
-            LAST_COMMAND = command
-        
-        time.sleep(2)
- 
+    watcher = JournalWatcher(CommandJournal(COMMAND_FILE, OFFSET_FILE))
+    logger.info(f"🟢 AshBorn is listening for new commands in '{COMMAND_FILE}' ({watcher.mode})")
+    try:
+        watcher.run(dispatch_command_line)
+    finally:
+        watcher.close()
+
+async def watch_command_file_async():
+    """Same as ``watch_command_file`` but on the caller's event loop (no thread, no sleep loop)."""
+    watcher = JournalWatcher(CommandJournal(COMMAND_FILE, OFFSET_FILE))
+    logger.info(f"🟢 AshBorn is listening for new commands in '{COMMAND_FILE}' ({watcher.mode})")
+    try:
+        await watcher.run_async(dispatch_command_line)
+    finally:
+        watcher.close()
@@ -0,0 +1,405 @@
+# bot/risk.py – cost-ordered, concurrent risk checks every BUY candidate passes
+"""
+A candidate is a token dict (a tokenlist row, or an alpha event's symbol /
+name / address plus its payload).  Each ``Check`` returns a short rejection
+reason, or passes with ``None`` – or with a dict of what it learned (the
+price check's quote), which the verdict carries as ``facts``.  Checks never
+write into the candidate: a cached outcome has to carry the same facts.
+
+  • checks declare a ``cost`` (seconds, a guess) – replaced by the measured
+    mean once a check has run ``MIN_SAMPLES`` times – and learn their
+    rejection rate as they go.  Every ``reorder_every`` candidates the
+    checks are re-sorted by cost / rejection rate: cheap checks that reject
+    a lot run first and short-circuit the rest
+  • sync checks (thresholds, blacklist) run inline, candidate by candidate;
+    only the survivors reach the I/O checks (price, security), which run
+    concurrently – all I/O checks of a candidate at once, up to
+    ``concurrency`` candidates at a time – and the first rejection cancels
+    the rest
+  • I/O checks cache their outcome per mint address for ``ttl`` seconds
+  • a check that raises rejects the candidate (fail closed) and is counted
+    under ``errors``
+  • ``stats()`` – per check calls, rejects, errors, cache hits, reject rate,
+    avg ms and rank, in the current order; STATUS shows it
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Sequence
+
+from cachetools import TTLCache
+
+from sniffers.token_table import Rule, RuleSet
+
+Reason = str | None
+Outcome = str | Dict[str, Any] | None                     # rejection reason | facts of a pass | plain pass
+
+MIN_SAMPLES = 8                                           # measured cost trusted after this many runs
+
+
+def candidate_key(candidate: dict) -> Hashable:
+    return candidate.get("address") or (candidate.get("symbol") or "").upper()
+
+
+def _reason(outcome: Outcome) -> Reason:
+    return outcome if isinstance(outcome, str) else None
+
+
+@dataclass(frozen=True)
+class Verdict:
+    ok: bool
+    check: str | None = None
+    reason: str = ""
+    facts: Dict[str, Any] = field(default_factory=dict, compare=False)     # what passing checks learned
+
+
+PASS = Verdict(True)
+
+
+@dataclass
+class Check:
+    name: str
+    fn: Callable[[dict], Outcome | Awaitable[Outcome]]
+    cost: float = 1e-6                                    # declared seconds per call
+    ttl: float = 0.0                                      # cache the outcome per candidate_key (I/O checks)
+    calls: int = 0
+    rejected: int = 0
+    errors: int = 0
+    cache_hits: int = 0
+    seconds: float = 0.0
+    io: bool = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.io = inspect.iscoroutinefunction(self.fn)
+
+    @property
+    def reject_rate(self) -> float:
+        return (self.rejected + 1) / (self.calls + 2)    # Laplace prior: unknown checks start at ½
+
+    @property
+    def observed_cost(self) -> float:
+        return self.seconds / self.calls if self.calls >= MIN_SAMPLES else self.cost
+
+    @property
+    def rank(self) -> float:
+        """Expected cost of running this check per candidate it removes – lower runs first."""
+        return self.observed_cost / self.reject_rate
+
+    def record(self, outcome: Outcome, seconds: float) -> None:
+        self.calls += 1
+        self.seconds += seconds
+        if _reason(outcome) is not None:
+            self.rejected += 1
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "reject_rate": round(self.rejected / self.calls, 3) if self.calls else 0.0,
+            "avg_ms": round(1000 * self.seconds / self.calls, 4) if self.calls else 0.0,
+            "rank": self.rank,
+        }
+
+
+class RiskPipeline:
+    def __init__(
+        self,
+        checks: Iterable[Check],
+        *,
+        concurrency: int = 8,
+        reorder_every: int = 64,
+        cache_size: int = 4096,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.checks: List[Check] = list(checks)
+        self.concurrency = concurrency
+        self.reorder_every = max(1, reorder_every)
+        self.evaluated = self.passed = 0
+        self._caches: Dict[str, TTLCache] = {
+            c.name: TTLCache(maxsize=cache_size, ttl=c.ttl, timer=clock) for c in self.checks if c.ttl > 0
+        }
+        self._semaphore: asyncio.Semaphore | None = None
+        self._semaphore_loop: asyncio.AbstractEventLoop | None = None
+        self._since_reorder = 0
+        self.reorder()
+
+    # ─────────────── ordering ───────────────
+    def reorder(self) -> None:
+        self.checks.sort(key=lambda c: c.rank)
+        self.sync_checks = [c for c in self.checks if not c.io]
+        self.io_checks = [c for c in self.checks if c.io]
+        self._since_reorder = 0
+
+    def order(self) -> List[str]:
+        return [c.name for c in self.checks]
+
+    # ─────────────── evaluation ───────────────
+    def precheck(self, candidate: dict) -> Verdict | None:
+        """Sync checks only: a rejection, or ``None`` when the candidate still needs its I/O checks."""
+        for check in self.sync_checks:
+            started = time.perf_counter()
+            try:
+                reason = _reason(check.fn(candidate))
+            except Exception as e:
+                check.errors += 1
+                reason = f"error: {e}"
+            check.record(reason, time.perf_counter() - started)
+            if reason is not None:
+                return Verdict(False, check.name, reason)
+        return None
+
+    async def evaluate(self, candidate: dict) -> Verdict:
+        return (await self.screen([candidate]))[0]
+
+    async def screen(
+        self, candidates: Sequence[dict], on_verdict: Callable[[int, Verdict], None] | None = None
+    ) -> List[Verdict]:
+        """
+        One verdict per candidate, in order.  ``on_verdict(index, verdict)``
+        fires as each one is decided – a candidate that clears its I/O checks
+        early is not held back by slower ones in the same batch.
+        """
+        verdicts: List[Verdict] = [PASS] * len(candidates)
+
+        def settle(i: int, verdict: Verdict) -> None:
+            verdicts[i] = verdict
+            self.evaluated += 1
+            self.passed += verdict.ok
+            if on_verdict is not None:
+                on_verdict(i, verdict)
+
+        survivors = []
+        for i, candidate in enumerate(candidates):
+            verdict = self.precheck(candidate)
+            self._since_reorder += 1
+            if self._since_reorder >= self.reorder_every:
+                self.reorder()
+            if verdict is None and self.io_checks:
+                survivors.append(i)
+            else:
+                settle(i, verdict or PASS)
+
+        if survivors:
+            loop = asyncio.get_running_loop()
+            if self._semaphore is None or self._semaphore_loop is not loop:
+                self._semaphore, self._semaphore_loop = asyncio.Semaphore(self.concurrency), loop
+
+            async def io_stage(i: int) -> None:
+                settle(i, await self._io_stage(candidates[i]))
+
+            await asyncio.gather(*(io_stage(i) for i in survivors))
+        return verdicts
+
+    async def _io_stage(self, candidate: dict) -> Verdict:
+        key = candidate_key(candidate)
+        to_run: List[Check] = []
+        facts: Dict[str, Any] = {}
+        for check in self.io_checks:                      # cached outcomes first – they are free
+            cache = self._caches.get(check.name)
+            if cache is not None and key in cache:
+                check.cache_hits += 1
+                outcome = cache[key]
+                if _reason(outcome) is not None:
+                    return Verdict(False, check.name, outcome)
+                facts.update(outcome or {})
+            else:
+                to_run.append(check)
+        if not to_run:
+            return Verdict(True, facts=facts) if facts else PASS
+
+        async with self._semaphore:
+            tasks = {asyncio.ensure_future(self._run_io(check, candidate, key)): check for check in to_run}
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    check, outcome = await next_done
+                    if _reason(outcome) is not None:
+                        return Verdict(False, check.name, outcome)
+                    facts.update(outcome or {})
+                return Verdict(True, facts=facts) if facts else PASS
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run_io(self, check: Check, candidate: dict, key: Hashable) -> tuple[Check, Outcome]:
+        started = time.perf_counter()
+        try:
+            outcome = await check.fn(candidate)
+        except asyncio.CancelledError:
+            raise                                         # short-circuited: no sample, nothing cached
+        except Exception as e:
+            check.errors += 1
+            check.record(f"error: {e}", time.perf_counter() - started)
+            return check, f"error: {e}"                    # errors are not cached – retry next time
+        check.record(outcome, time.perf_counter() - started)
+        cache = self._caches.get(check.name)
+        if cache is not None:
+            cache[key] = outcome
+        return check, outcome
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "evaluated": self.evaluated,
+            "passed": self.passed,
+            "checks": {c.name: c.stats() for c in self.checks},
+        }
+
+
+# ─────────────── standard checks ───────────────
+RISK_MAX_PRICE_DEVIATION = float(os.getenv("RISK_MAX_PRICE_DEVIATION", "0.5"))
+RISK_MAX_TOP10_HOLDERS = float(os.getenv("RISK_MAX_TOP10_HOLDERS", "0.5"))
+RISK_MAX_CREATOR_SHARE = float(os.getenv("RISK_MAX_CREATOR_SHARE", "0.2"))
+RISK_PRICE_TTL = float(os.getenv("RISK_PRICE_TTL", "30"))
+RISK_SECURITY_TTL = float(os.getenv("RISK_SECURITY_TTL", "600"))
+
+
+def _number(value: object) -> float | None:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def minimum(name: str, column: str, floor: float) -> Check:
+    """``column`` ≥ ``floor``; candidates that do not carry the column are left to the other checks."""
+
+    def check(candidate: dict) -> Reason:
+        value = _number(candidate.get(column))
+        if value is not None and value < floor:
+            return f"{column} {value:,.0f} < {floor:,.0f}"
+        return None
+
+    return Check(name, check, cost=1e-6)
+
+
+def name_blacklist(words: Sequence[str]) -> Check:
+    """The snapshot shortlist's blacklist (one precompiled regex) and its required name / symbol."""
+    rules = RuleSet(blacklist=words)
+
+    def check(candidate: dict) -> Reason:
+        if not candidate.get("symbol") or not candidate.get("name"):
+            return "missing name / symbol"
+        if rules.is_banned(str(candidate["name"])):
+            return "name blacklisted"
+        return None
+
+    return Check("blacklist", check, cost=2e-6)
+
+
+def price_sanity(fetch_price: Callable[[str], Awaitable[float]], max_deviation: float = RISK_MAX_PRICE_DEVIATION) -> Check:
+    """
+    BirdEye must quote a price, within ``max_deviation`` of the candidate's
+    own price when it has one.  ``fetch_price`` must raise on errors – a
+    timeout or 429 is then an uncached error, not a cached "no price".
+    Passes with ``{"price": quote}``: what prices a paper fill without one.
+    """
+
+    async def check(candidate: dict) -> Outcome:
+        address = candidate.get("address")
+        if not address:
+            return "no mint address"
+        price = await fetch_price(address)
+        if not price or price <= 0:
+            return "no price quote"
+        listed = _number(candidate.get("price"))
+        if listed and abs(price / listed - 1.0) > max_deviation:
+            return f"price {price:.6g} vs listed {listed:.6g}"
+        return {"price": price}
+
+    return Check("price", check, cost=0.05, ttl=RISK_PRICE_TTL)
+
+
+def token_security(
+    fetch_security: Callable[[str], Awaitable[dict]],
+    max_top10: float = RISK_MAX_TOP10_HOLDERS,
+    max_creator: float = RISK_MAX_CREATOR_SHARE,
+) -> Check:
+    """Holder concentration, creator share and freeze authority from BirdEye's token_security."""
+
+    async def check(candidate: dict) -> Reason:
+        address = candidate.get("address")
+        if not address:
+            return "no mint address"
+        info = await fetch_security(address)
+        if not info:
+            return "no security data"
+        if info.get("freezeable"):
+            return "freeze authority set"
+        top10 = _number(info.get("top10HolderPercent"))
+        if top10 is None:
+            return "no holder data"
+        if top10 > max_top10:
+            return f"top10 holders {top10:.0%}"
+        creator = _number(info.get("creatorPercentage")) or 0.0
+        if creator > max_creator:
+            return f"creator holds {creator:.0%}"
+        return None
+
+    return Check("security", check, cost=0.1, ttl=RISK_SECURITY_TTL)
+
+
+STANDARD_CHECKS = ("blacklist", "liquidity", "volume", "price", "security")
+
+
+def standard_checks(
+    names: Iterable[str] = STANDARD_CHECKS, *, min_liquidity: float, min_v24h_usd: float, blacklist: Sequence[str]
+) -> List[Check]:
+    """The named checks; price / security use the shared BirdEye client (imported on first call)."""
+
+    async def fetch_price(address: str) -> float:
+        from sniffers.bird_eye import quote_token_price
+        return await quote_token_price(address)
+
+    async def fetch_security(address: str) -> dict:
+        from sniffers.bird_eye import fetch_token_security
+        return await fetch_token_security(address)
+
+    factories: Dict[str, Callable[[], Check]] = {
+        "blacklist": lambda: name_blacklist(blacklist),
+        "liquidity": lambda: minimum("liquidity", "liquidity", min_liquidity),
+        "volume": lambda: minimum("volume", "v24hUSD", min_v24h_usd),
+        "price": lambda: price_sanity(fetch_price),
+        "security": lambda: token_security(fetch_security),
+    }
+    checks = []
+    for name in names:
+        name = name.strip()
+        if not name:
+            continue
+        if name not in factories:
+            raise ValueError(f"unknown risk check {name!r} (known: {', '.join(factories)})")
+        checks.append(factories[name]())
+    return checks
+
+
+def replay_rules(
+    names: Iterable[str] = STANDARD_CHECKS, *, min_liquidity: float, min_v24h_usd: float, blacklist: Sequence[str]
+) -> RuleSet:
+    """
+    The sync checks among ``names`` as one columnar ``RuleSet`` – what a
+    backtest replays over archived snapshots, so it filters like the live
+    pipeline configured with the same names.  The I/O checks (price,
+    security) need BirdEye at trade time and are left out; a snapshot row
+    always carries liquidity / volume, so "missing → not judged" never applies.
+    """
+    rules: List[Rule] = []
+    banned: Sequence[str] = ()
+    require: Sequence[str] = ()
+    for name in names:
+        name = name.strip()
+        if name == "blacklist":
+            banned, require = blacklist, ("name", "symbol")
+        elif name == "liquidity":
+            rules.append(Rule("liquidity", ">=", min_liquidity))
+        elif name == "volume":
+            rules.append(Rule("v24hUSD", ">=", min_v24h_usd))
+        elif name and name not in STANDARD_CHECKS:
+            raise ValueError(f"unknown risk check {name!r} (known: {', '.join(STANDARD_CHECKS)})")
+    return RuleSet(rules, blacklist=banned, require=require)
@@ -0,0 +1,285 @@
+# bot/status_region.py – memory-mapped status snapshot for dashboards and CLI tools
+"""
+The bot publishes its vital signs to a fixed-layout memory-mapped file every
+``STATUS_REGION_INTERVAL`` seconds (``/dev/shm/ashborn.status`` when
+``/dev/shm`` exists, else ``data/ashborn.status``).  A reader maps the file
+and copies the bytes – no socket round-trip, no lock shared with the bot and
+nothing running on the trading threads:
+
+  header     magic "ASTS", version, state (running / stopped), stage and
+             position counts, seq, updated / started (unix), pid
+  counters   alpha queue (depth, high-water, pushed, dropped …) and
+             executor (queued, filled, skipped, failed) as int64
+  values     position book totals and the BirdEye token-bucket budget as
+             float64
+  stages     up to 8 traced stages: name, count, p50 / p95 / p99 / max ms
+  positions  up to 16 open positions, largest |P&L| first
+
+  • seqlock: the writer makes ``seq`` odd, rewrites the region in one copy
+    and makes it even again; a reader retries while ``seq`` is odd or has
+    moved during its copy, so it never sees half an update
+  • little-endian and fixed offsets – any language can read it; the
+    ``struct`` formats below are the spec
+  • on shutdown the region is written once more with state "stopped"
+
+``python -m bot.status_region [--watch 1]`` prints it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Dict, List
+
+MAGIC = b"ASTS"
+VERSION = 1
+STOPPED, RUNNING = 0, 1
+MAX_STAGES = 8
+MAX_POSITIONS = 16
+
+_HEADER = struct.Struct("<4sBBBBQddII")         # magic, version, state, stages, positions, seq, updated, started, pid, pad
+_SEQ = struct.Struct("<Q")
+_SEQ_OFFSET = 8
+QUEUE_FIELDS = ("depth", "maxsize", "high_water", "pushed", "consumed", "dropped", "rejected")
+EXECUTOR_FIELDS = ("queued", "filled", "skipped", "failed")
+BOOK_FIELDS = ("open", "cost", "value", "unrealized", "realized")
+BUDGET_FIELDS = ("per_minute", "tokens", "granted", "delayed", "throttled", "wait_s", "paused_s")
+STAGE_FIELDS = ("count", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+POSITION_FIELDS = ("amount", "entry_price", "last_price", "unrealized")
+_COUNTERS = struct.Struct(f"<{len(QUEUE_FIELDS) + len(EXECUTOR_FIELDS)}q")
+_VALUES = struct.Struct(f"<{len(BOOK_FIELDS) + len(BUDGET_FIELDS)}d")
+_STAGE = struct.Struct("<12sq4d")
+_POSITION = struct.Struct("<16s4d")
+SIZE = _HEADER.size + _COUNTERS.size + _VALUES.size + MAX_STAGES * _STAGE.size + MAX_POSITIONS * _POSITION.size
+
+STATUS_REGION_FILE = Path(os.getenv(
+    "STATUS_REGION_FILE", "/dev/shm/ashborn.status" if os.path.isdir("/dev/shm") else "data/ashborn.status"
+))
+STATUS_REGION_INTERVAL = float(os.getenv("STATUS_REGION_INTERVAL", "1"))
+
+
+class StatusRegionError(ValueError):
+    """Not a status region, or one this reader cannot decode."""
+
+
+def _name(raw: bytes) -> str:
+    return raw.rstrip(b"\0").decode("utf-8", errors="ignore")
+
+
+def encode(snap: Dict, state: int, seq: int, started: float, now: float) -> bytes:
+    """The whole region for a ``bot.brain.status_snapshot()``-style dict (missing parts are zero)."""
+    queue = snap.get("queue") or {}
+    executor = snap.get("executor") or {}
+    book = snap.get("positions") or {}
+    budget = (snap.get("birdeye") or {}).get("limiter") or {}
+    stages = list((snap.get("latency") or {}).items())[:MAX_STAGES]
+    top = (snap.get("top") or [])[:MAX_POSITIONS]
+
+    out = bytearray(SIZE)
+    _HEADER.pack_into(out, 0, MAGIC, VERSION, state, len(stages), len(top), seq, now, started, os.getpid(), 0)
+    pos = _HEADER.size
+    _COUNTERS.pack_into(out, pos, *(int(queue.get(f, 0)) for f in QUEUE_FIELDS),
+                        *(int(executor.get(f, 0)) for f in EXECUTOR_FIELDS))
+    pos += _COUNTERS.size
+    _VALUES.pack_into(out, pos, *(float(book.get(f, 0.0)) for f in BOOK_FIELDS),
+                      *(float(budget.get(f, 0.0)) for f in BUDGET_FIELDS))
+    pos += _VALUES.size
+    for i, (stage, s) in enumerate(stages):
+        _STAGE.pack_into(out, pos + i * _STAGE.size, stage.encode()[:12], int(s["count"]),
+                         *(float(s[f]) for f in STAGE_FIELDS[1:]))
+    pos += MAX_STAGES * _STAGE.size
+    for i, p in enumerate(top):
+        _POSITION.pack_into(out, pos + i * _POSITION.size, p["token"].encode()[:16],
+                            *(float(p[f]) for f in POSITION_FIELDS))
+    return bytes(out)
+
+
+def decode(raw: bytes, now: float | None = None) -> Dict:
+    magic, version, state, n_stages, n_positions, seq, updated, started, pid, _ = _HEADER.unpack_from(raw)
+    if magic != MAGIC or version != VERSION:
+        raise StatusRegionError(f"not an AshBorn status region (magic {magic!r}, version {version})")
+    now = time.time() if now is None else now
+    pos = _HEADER.size
+    counters = _COUNTERS.unpack_from(raw, pos)
+    pos += _COUNTERS.size
+    values = _VALUES.unpack_from(raw, pos)
+    pos += _VALUES.size
+    latency = {}
+    for i in range(min(n_stages, MAX_STAGES)):
+        name, count, *ms = _STAGE.unpack_from(raw, pos + i * _STAGE.size)
+        latency[_name(name)] = {"count": count, **dict(zip(STAGE_FIELDS[1:], ms))}
+    pos += MAX_STAGES * _STAGE.size
+    top = []
+    for i in range(min(n_positions, MAX_POSITIONS)):
+        token, *rest = _POSITION.unpack_from(raw, pos + i * _POSITION.size)
+        top.append({"token": _name(token), **dict(zip(POSITION_FIELDS, rest))})
+    n_queue, n_book = len(QUEUE_FIELDS), len(BOOK_FIELDS)
+    return {
+        "state": "running" if state == RUNNING else "stopped",
+        "pid": pid,
+        "seq": seq,
+        "updated": updated,
+        "age_s": now - updated,
+        "uptime_s": updated - started,
+        "queue": dict(zip(QUEUE_FIELDS, counters[:n_queue])),
+        "executor": dict(zip(EXECUTOR_FIELDS, counters[n_queue:])),
+        "positions": dict(zip(BOOK_FIELDS, values[:n_book])),
+        "budget": dict(zip(BUDGET_FIELDS, values[n_book:])),
+        "latency": latency,
+        "top": top,
+    }
+
+
+# ─────────────── writer ───────────────
+class StatusRegion:
+    def __init__(self, path: Path | str = STATUS_REGION_FILE) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, SIZE)
+            self._mm = mmap.mmap(fd, SIZE)
+        finally:
+            os.close(fd)
+        self.started = time.time()
+        self.seq = _SEQ.unpack_from(self._mm, _SEQ_OFFSET)[0] & ~1     # readers of a previous run keep counting up
+        self.writes = 0
+
+    def publish(self, snap: Dict, state: int = RUNNING) -> None:
+        odd = self.seq + 1
+        _SEQ.pack_into(self._mm, _SEQ_OFFSET, odd)                   # readers: write in progress
+        self._mm[:SIZE] = encode(snap, state, odd, self.started, time.time())
+        self.seq = odd + 1
+        _SEQ.pack_into(self._mm, _SEQ_OFFSET, self.seq)
+        self.writes += 1
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+# ─────────────── reader ───────────────
+class StatusReader:
+    """Keeps the region mapped – one ``read()`` is a memory copy and a decode."""
+
+    def __init__(self, path: Path | str = STATUS_REGION_FILE, retries: int = 1000) -> None:
+        self.path = Path(path)
+        self.retries = retries
+        with self.path.open("rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < SIZE:
+            self._mm.close()
+            raise StatusRegionError(f"{self.path} is {len(self._mm)} bytes, expected {SIZE}")
+
+    def read(self) -> Dict:
+        for _ in range(self.retries):
+            seq = _SEQ.unpack_from(self._mm, _SEQ_OFFSET)[0]
+            if not seq & 1:
+                raw = self._mm[:SIZE]
+                if _SEQ.unpack_from(self._mm, _SEQ_OFFSET)[0] == seq:
+                    return decode(raw)
+            time.sleep(0)
+        raise StatusRegionError(f"{self.path} stayed mid-update for {self.retries} reads")
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+def read_status(path: Path | str = STATUS_REGION_FILE) -> Dict:
+    reader = StatusReader(path)
+    try:
+        return reader.read()
+    finally:
+        reader.close()
+
+
+# ─────────────── bot side ───────────────
+region: StatusRegion | None = None
+
+
+def collect() -> Dict:
+    """``status_snapshot()`` plus the alpha queue and the largest open positions."""
+    from bot.brain import ALPHA_QUEUE, position_book, status_snapshot    # here: the CLI reader never loads the bot
+
+    snap = status_snapshot()
+    snap["queue"] = ALPHA_QUEUE.stats()
+    largest = sorted(position_book.positions(), key=lambda p: abs(p.unrealized), reverse=True)[:MAX_POSITIONS]
+    snap["top"] = [
+        {"token": p.token, "amount": p.amount, "entry_price": p.entry_price,
+         "last_price": p.last_price, "unrealized": p.unrealized}
+        for p in largest
+    ]
+    return snap
+
+
+async def run_status_region(interval: float = STATUS_REGION_INTERVAL) -> None:
+    """Supervisor entry point: republish the region every ``interval`` seconds."""
+    global region
+    if region is None:
+        region = StatusRegion(STATUS_REGION_FILE)
+    while True:
+        region.publish(collect())
+        await asyncio.sleep(interval)
+
+
+def close_region() -> None:
+    """Last publish on shutdown (state "stopped", drained executor included), then unmap."""
+    global region
+    if region is not None:
+        region.publish(collect(), state=STOPPED)
+        region.close()
+        region = None
+
+
+# ─────────────── CLI ───────────────
+def render(status: Dict) -> str:
+    q, ex, book, budget = status["queue"], status["executor"], status["positions"], status["budget"]
+    lines = [
+        f"AshBorn pid {status['pid']} {status['state']} – updated {status['age_s']:.1f}s ago, "
+        f"up {status['uptime_s']:.0f}s",
+        f"queue     depth {q['depth']}/{q['maxsize']} (high {q['high_water']}), pushed {q['pushed']}, "
+        f"dropped {q['dropped']}, rejected {q['rejected']}",
+        f"executor  queued {ex['queued']}, filled {ex['filled']}, skipped {ex['skipped']}, failed {ex['failed']}",
+        f"positions {book['open']:.0f} open, cost {book['cost']:.4f}, value {book['value']:.4f}, "
+        f"unrealized {book['unrealized']:+.4f}, realized {book['realized']:+.4f}",
+        f"birdeye   {budget['tokens']:.1f}/{budget['per_minute']:.0f} tokens, granted {budget['granted']:.0f}, "
+        f"throttled {budget['throttled']:.0f}, paused {budget['paused_s']:.1f}s",
+    ]
+    for stage, s in status["latency"].items():
+        lines.append(f"⏱️ {stage:<10} n={s['count']:<6} p50={s['p50_ms']:.2f}ms p95={s['p95_ms']:.2f}ms "
+                     f"p99={s['p99_ms']:.2f}ms max={s['max_ms']:.2f}ms")
+    for p in status["top"]:
+        lines.append(f"   {p['token']:<16} {p['amount']:g} @ {p['entry_price']:.6g} → {p['last_price']:.6g} "
+                     f"({p['unrealized']:+.4f})")
+    return "\n".join(lines)
+
+
+def main(argv: List[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Print the bot's shared-memory status region")
+    ap.add_argument("--path", default=str(STATUS_REGION_FILE))
+    ap.add_argument("--watch", type=float, default=0.0, help="re-read every N seconds")
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args(argv)
+
+    reader = StatusReader(args.path)
+    try:
+        while True:
+            status = reader.read()
+            print(json.dumps(status) if args.json else render(status), flush=True)
+            if args.watch <= 0:
+                return
+            time.sleep(args.watch)
+            print()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# bot/stub_telegram.py – local fake Telegram Bot API for notifier tests
+"""
+Threaded HTTP server answering ``POST /bot<token>/sendMessage``:
+
+  → {"ok": true, "result": {"message_id": n, "chat": {"id": …}, "text": …}}
+
+Every accepted message is recorded in ``messages`` (with its arrival time).
+``flood_next(count, retry_after)`` answers the next requests like Telegram's
+flood control: 429 with ``parameters.retry_after``.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubTelegram:
+    def __init__(self, token: str = "test-token", host: str = "127.0.0.1", port: int = 0) -> None:
+        self.token = token
+        self.messages: list[dict] = []
+        self.rejected = 0
+        self._flood: list[float] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubTelegram":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="StubTelegram", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubTelegram":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def flood_next(self, count: int, retry_after: float = 1) -> None:
+        with self._lock:
+            self._flood.extend([retry_after] * count)
+
+    def route(self, path: str, body: dict) -> tuple[int, dict]:
+        if path != f"/bot{self.token}/sendMessage":
+            return 404, {"ok": False, "error_code": 404, "description": "Not Found"}
+        with self._lock:
+            if self._flood:
+                self.rejected += 1
+                retry = self._flood.pop(0)
+                return 429, {"ok": False, "error_code": 429, "description": "Too Many Requests",
+                             "parameters": {"retry_after": retry}}
+            self.messages.append({**body, "at": time.monotonic()})
+            message_id = len(self.messages)
+        return 200, {"ok": True, "result": {"message_id": message_id, "chat": {"id": body.get("chat_id")},
+                                            "text": body.get("text")}}
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:  # keep test output quiet
+                pass
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    body = {}
+                status, reply = stub.route(self.path, body)
+                payload = json.dumps(reply).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
@@ -0,0 +1,138 @@
+# bot/supervisor.py – one asyncio loop, structured tasks, restart-with-backoff
+"""
+Runs every long-lived AshBorn component as a supervised task on a single
+event loop (replacing the Telegram thread, the sniffer thread and the
+blocking file-watcher in the main thread).
+
+  • each component is an ``async`` factory; if it raises it is restarted
+    after an exponential, jittered backoff (reset once it stays up for
+    ``reset_after`` seconds); a clean return ends it for good
+  • SIGTERM / SIGINT trigger a graceful drain: components are cancelled,
+    given ``drain_timeout`` seconds to unwind, then shutdown hooks run in
+    registration order (stop the order executor, flush the trade store …)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import random
+import signal
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List
+
+from loguru import logger
+
+
+@dataclass
+class RestartPolicy:
+    initial: float = 1.0
+    maximum: float = 60.0
+    factor: float = 2.0
+    reset_after: float = 60.0
+
+    def delay(self, failures: int) -> float:
+        base = min(self.maximum, self.initial * self.factor ** max(0, failures - 1))
+        return random.uniform(base / 2, base)
+
+
+@dataclass
+class _Component:
+    name: str
+    factory: Callable[[], Awaitable[None]]
+    policy: RestartPolicy
+    restarts: int = 0
+    task: asyncio.Task | None = field(default=None, repr=False)
+
+
+class Supervisor:
+    def __init__(self, drain_timeout: float = 10.0) -> None:
+        self.drain_timeout = drain_timeout
+        self._components: Dict[str, _Component] = {}
+        self._hooks: List[Callable[[], object]] = []
+        self._stop: asyncio.Event | None = None
+
+    # ─────────────── registration ───────────────
+    def add(self, name: str, factory: Callable[[], Awaitable[None]], policy: RestartPolicy | None = None) -> None:
+        self._components[name] = _Component(name, factory, policy or RestartPolicy())
+
+    def on_shutdown(self, hook: Callable[[], object]) -> None:
+        """Run ``hook`` (sync or async) after all components have stopped."""
+        self._hooks.append(hook)
+
+    def request_stop(self) -> None:
+        if self._stop is not None:
+            self._stop.set()
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        return {
+            c.name: {"restarts": c.restarts, "running": bool(c.task and not c.task.done())}
+            for c in self._components.values()
+        }
+
+    # ─────────────── running ───────────────
+    async def _supervise(self, comp: _Component) -> None:
+        failures = 0
+        while True:
+            started = time.monotonic()
+            try:
+                await comp.factory()
+                logger.info(f"🏁 {comp.name} finished")
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                if time.monotonic() - started >= comp.policy.reset_after:
+                    failures = 0
+                failures += 1
+                comp.restarts += 1
+                delay = comp.policy.delay(failures)
+                logger.warning(f"🔁 {comp.name} crashed: {exc!r} – restarting in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def run(self, on_started: Callable[[], object] | None = None) -> None:
+        """Start every component and block until a stop is requested, then drain.
+
+        ``on_started`` runs once every component has reached its first await."""
+        loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        installed = []
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self.request_stop)
+                installed.append(sig)
+            except (NotImplementedError, RuntimeError, ValueError):   # non-main thread / Windows
+                pass
+
+        for comp in self._components.values():
+            comp.task = asyncio.create_task(self._supervise(comp), name=comp.name)
+        tasks = [c.task for c in self._components.values()]
+        stopper = asyncio.create_task(self._stop.wait())
+        try:
+            await asyncio.sleep(0)
+            if on_started is not None:
+                on_started()
+            while not self._stop.is_set() and any(not t.done() for t in tasks):
+                await asyncio.wait([stopper, *(t for t in tasks if not t.done())], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stopper.cancel()
+            await self._drain(tasks)
+            for sig in installed:
+                loop.remove_signal_handler(sig)
+
+    async def _drain(self, tasks: List[asyncio.Task]) -> None:
+        logger.info("🛑 Shutting down – draining components …")
+        for t in tasks:
+            t.cancel()
+        done, pending = await asyncio.wait(tasks, timeout=self.drain_timeout) if tasks else (set(), set())
+        for t in pending:
+            logger.warning(f"⏱️ {t.get_name()} did not stop within {self.drain_timeout}s")
+        for hook in self._hooks:
+            try:
+                result = hook()
+                if inspect.isawaitable(result):
+                    await asyncio.wait_for(result, self.drain_timeout)
+            except Exception as exc:
+                logger.error(f"❌ Shutdown hook {getattr(hook, '__name__', hook)} failed: {exc!r}")
+        logger.info("👋 AshBorn stopped cleanly")
@@ -1,7 +1,7 @@
 # bot/telegram_bot.py  – compatible with python-telegram-bot 20.x+
-# Adds:  • full-dict commands  • error-resistant auto-reconnect loop
+# Adds:  • full-dict commands  • runs as a supervised task on the main loop
 
-import os, asyncio, time, traceback
+import os, asyncio, traceback
 from loguru import logger
 from dotenv import load_dotenv
 
@@ -39,8 +39,8 @@ async def process_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
         logger.info(f"📩  Received Telegram message: {msg_text}")
 
-        cmd = parse_command(msg_text)                              # ← returns dict
-        if cmd["action"] == "UNKNOWN":
+        cmd = parse_command(msg_text)                              # ← dict, or None if unrecognised
+        if cmd is None:
             await update.message.reply_text(
                 "🤷‍♂️  Unknown command. Try e.g.:\n"
                 "`buy SOL 0.2`\n`sell DOGE 1.0`\n`status`\n`rebalance`",
@@ -66,30 +66,21 @@ async def process_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
 
 # ─────────────────────────── POLLER ────────────────────────────
-def _run_polling() -> None:
-    """Start a single polling session (may raise)."""
-    asyncio.set_event_loop(asyncio.new_event_loop())       # each thread needs its own loop
-    app = (
-        ApplicationBuilder()
-        .token(TOKEN)
-        .build()
-    )
-    app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, process_message))
-
-    logger.info("🤖  Telegram bot polling has started …")
-    app.run_polling()                                      # blocking until error / ^C
-
-
-def start_telegram_bot() -> None:
-    """Start Telegram polling in a background thread, with auto-reconnect."""
+async def run_telegram_bot() -> None:
+    """One polling session on the caller's loop; raises on failure so the supervisor restarts it."""
     if not TOKEN:
         logger.error("⚠️  TELEGRAM_BOT_TOKEN missing in .env")
         return
 
-    while True:                                            # auto-reconnect loop
+    app = ApplicationBuilder().token(TOKEN).build()
+    app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, process_message))
+
+    async with app:                                        # initialize() … shutdown()
+        await app.start()
+        await app.updater.start_polling()
+        logger.info("🤖  Telegram bot polling has started …")
         try:
-            _run_polling()                                 # returns only on fatal error / ^C
-        except Exception as exc:
-            logger.warning(f"🔁  Telegram bot disconnected: {exc!r}")
-            logger.info("♻️  Reconnecting in 5 s …")
-            time.sleep(5)
+            await asyncio.Event().wait()                   # until cancelled by the supervisor
+        finally:
+            await app.updater.stop()
+            await app.stop()
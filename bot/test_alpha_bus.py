@@ -0,0 +1,151 @@
+# bot/test_alpha_bus.py – overflow policies and wake-up behaviour of the alpha bus
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from bot.alpha_bus import AlphaBus
+
+
+def _evt(symbol: str, **extra) -> dict:
+    return {"symbol": symbol, "name": symbol.lower(), **extra}
+
+
+def test_drop_oldest_keeps_newest():
+    bus = AlphaBus(maxsize=3, policy="drop_oldest")
+    for s in "ABCDE":
+        assert bus.put(_evt(s))
+    assert [e["symbol"] for e in bus.drain()] == ["C", "D", "E"]
+    stats = bus.stats()
+    assert stats["dropped"] == 2 and stats["high_water"] == 3 and stats["depth"] == 0
+
+
+def test_coalesce_merges_in_place():
+    bus = AlphaBus(maxsize=10, policy="coalesce")
+    bus.put(_evt("A", liquidity=1))
+    bus.put(_evt("B"))
+    bus.put(_evt("A", liquidity=2))
+    events = bus.drain()
+    assert [e["symbol"] for e in events] == ["A", "B"]
+    assert events[0]["liquidity"] == 2
+    assert bus.stats()["coalesced"] == 1
+    # once drained, the same symbol queues again
+    bus.put(_evt("A"))
+    assert len(bus) == 1
+
+
+def test_coalesce_keeps_mints_sharing_a_symbol_apart():
+    bus = AlphaBus(maxsize=10, policy="coalesce")
+    bus.put(_evt("BONK", address="mintA", liquidity=1))
+    bus.put(_evt("BONK", address="mintB", liquidity=2))
+    bus.put(_evt("BONK", address="mintA", liquidity=3))
+    events = bus.drain()
+    assert [(e["address"], e["liquidity"]) for e in events] == [("mintA", 3), ("mintB", 2)]
+    assert bus.stats()["coalesced"] == 1
+
+
+def test_block_policy_waits_for_consumer():
+    bus = AlphaBus(maxsize=1, policy="block", block_timeout=2)
+    bus.put(_evt("A"))
+    done = threading.Event()
+
+    def producer():
+        bus.put(_evt("B"))
+        done.set()
+
+    t = threading.Thread(target=producer)
+    t.start()
+    assert not done.wait(0.05)
+    assert [e["symbol"] for e in bus.drain()] == ["A"]
+    assert done.wait(1)
+    t.join()
+    assert [e["symbol"] for e in bus.drain()] == ["B"]
+
+
+def test_block_policy_times_out():
+    bus = AlphaBus(maxsize=1, policy="block", block_timeout=0.01)
+    bus.put(_evt("A"))
+    assert bus.put(_evt("B")) is False
+    assert bus.stats()["rejected"] == 1
+
+
+def test_consumer_wakes_on_cross_thread_put():
+    bus = AlphaBus()
+
+    async def run():
+        loop_waiting = asyncio.ensure_future(bus.get_batch())
+        await asyncio.sleep(0.01)                       # consumer is parked now
+        sent = time.perf_counter()
+        threading.Thread(target=bus.put, args=(_evt("X"),)).start()
+        batch = await asyncio.wait_for(loop_waiting, 1)
+        return batch, time.perf_counter() - sent
+
+    batch, latency = asyncio.run(run())
+    assert [e["symbol"] for e in batch] == ["X"]
+    assert latency < 0.1
+
+
+def test_put_async_applies_backpressure():
+    bus = AlphaBus(maxsize=2, policy="block")
+
+    async def run():
+        received = []
+
+        async def consumer():
+            while len(received) < 5:
+                received.extend(await bus.get_batch())
+                await asyncio.sleep(0)
+
+        task = asyncio.ensure_future(consumer())
+        for s in "ABCDE":
+            assert await bus.put_async(_evt(s))
+        await asyncio.wait_for(task, 1)
+        return received
+
+    assert [e["symbol"] for e in asyncio.run(run())] == list("ABCDE")
+    assert bus.stats()["high_water"] <= 2
+
+
+def test_competing_async_producers_wait_for_a_drain_from_another_thread():
+    bus = AlphaBus(maxsize=1, policy="block")
+    received = []
+
+    def drainer():
+        deadline = time.monotonic() + 5
+        while len(received) < 20 and time.monotonic() < deadline:
+            received.extend(bus.drain())
+            time.sleep(0.001)
+
+    async def run():
+        thread = threading.Thread(target=drainer)
+        thread.start()
+
+        async def producer(prefix):
+            return [await bus.put_async(_evt(f"{prefix}{i}")) for i in range(10)]
+
+        results = await asyncio.wait_for(asyncio.gather(producer("A"), producer("B")), 5)
+        await asyncio.to_thread(thread.join)
+        return results
+
+    results = asyncio.run(run())
+    assert all(all(r) for r in results) and len(received) == 20
+    assert bus.stats()["rejected"] == 0
+
+
+def test_rejects_bad_config():
+    with pytest.raises(ValueError):
+        AlphaBus(maxsize=0)
+    with pytest.raises(ValueError):
+        AlphaBus(policy="nope")
+
+
+def test_block_put_from_a_loop_before_the_consumer_starts_is_rejected():
+    bus = AlphaBus(maxsize=1, policy="block")                # no timeout: waiting would hang the loop
+
+    async def producer():
+        return bus.put(_evt("A")), bus.put(_evt("B"))
+
+    assert asyncio.run(asyncio.wait_for(producer(), 2)) == (True, False)
+    assert bus.stats()["rejected"] == 1
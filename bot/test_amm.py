@@ -0,0 +1,131 @@
+# bot/test_amm.py – constant-product fills, partial fills, paper buyer pools and the batch API
+
+import math
+
+import pytest
+
+from bot import amm, brain
+from bot.amm import FILLED, PARTIAL, REJECTED, Pool, simulate_buys
+from bot.backtest import amm_fill, recorded_fill
+from bot.buyer_engine import PAPER_QUOTE_USD, PaperBuyer
+from bot.commands import parse_command
+from bot.positions import PositionBook
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_fill_pays_fee_and_slippage_on_the_curve():
+    fills = simulate_buys([20_000], [1.0], [100], fee_bps=25, max_slippage=0.5)
+    x = y = 10_000
+    swapped = 100 * (1 - 0.0025)
+    out = x * swapped / (y + swapped)
+    assert fills.status[0] == FILLED
+    assert fills.tokens[0] == pytest.approx(out) and fills.spent[0] == 100
+    assert fills.fee[0] == pytest.approx(0.25)
+    assert fills.price[0] == pytest.approx(100 / out)
+    assert fills.slippage[0] == pytest.approx(100 / out - 1)          # ≈ fee + curve, ~1.25 %
+    assert fills.impact[0] == pytest.approx((y + 100) / (x - out) - 1)
+
+
+def test_order_past_the_slippage_limit_is_partially_filled():
+    fills = simulate_buys([20_000, 20_000], [2.0, 2.0], [10_000, 10], fee_bps=0, max_slippage=0.05)
+    assert list(fills.status) == [PARTIAL, FILLED]
+    assert fills.spent[0] == pytest.approx(10_000 * (math.sqrt(1.05) - 1))   # swept up to the limit
+    assert fills.impact[0] == pytest.approx(0.05)
+
+
+def test_no_pool_or_nothing_to_spend_is_rejected():
+    fills = simulate_buys([0, 10_000, 10_000], [1.0, 0.0, 1.0], [5, 5, 0])
+    assert list(fills.status) == [REJECTED] * 3 and list(fills.tokens) == [0.0] * 3
+
+
+def test_numpy_and_python_paths_agree():
+    pytest.importorskip("numpy")
+    liquidity, price, amount = [5_000, 80_000, 0, 1e6], [0.01, 3.0, 1.0, 2e-6], [50, 50, 50, 1e5]
+    a = amm._simulate_python(liquidity, price, amount, 0.0025, math.sqrt(1.05) - 1)
+    b = amm._simulate_numpy(liquidity, price, amount, 0.0025, math.sqrt(1.05) - 1)
+    for name in ("tokens", "spent", "fee", "price", "slippage", "impact", "status"):
+        assert list(getattr(b, name)) == pytest.approx(list(getattr(a, name)))
+
+
+def test_pool_moves_with_each_paper_buy():
+    pool = Pool.from_snapshot(10_000, 0.5)
+    first, second = pool.buy(100), pool.buy(100)
+    assert second["price"] > first["price"] and pool.price > 0.5
+
+
+def test_paper_buyer_fills_batches_and_refuses_unknown_tokens():
+    buyer = PaperBuyer(fee_bps=30, max_slippage=0.1, quote_usd=2.0)
+    buyer.observe("moon", liquidity=10_000)
+    assert buyer.buy("MOON", 1)["reason"] == "no pool data"              # no price yet
+    buyer.observe("MOON", price=0.01)
+    orders = [type("O", (), {"token": t, "amount": 5, "meta": {}})() for t in ("MOON", "MOON", "NOPE")]
+    a, b, c = buyer.buy_batch(orders)
+    assert c["status"] == "rejected" and c["spent"] == 0 and buyer.rejected == 2
+    assert a["spent"] == 10 and a["requested"] == 5 and a["status"] == "filled"
+    assert b["price"] > a["price"]                                       # second buy hits the moved pool
+    assert buyer.stats()["filled"] == 2 and buyer.stats()["fees"] == pytest.approx(0.06)
+    buyer.observe("MOON", liquidity=10_000, price=0.01)                  # fresh data resets the pool
+    assert buyer.buy("MOON", 5)["price"] == pytest.approx(a["price"])
+
+
+def test_paper_pools_are_keyed_by_mint_and_expire():
+    clock = FakeClock()
+    buyer = PaperBuyer(quote_usd=1.0, max_pools=2, ttl=60, clock=clock)
+    buyer.observe("PEPE", liquidity=10_000, price=0.01, address="mintA")
+    buyer.observe("PEPE", liquidity=500, price=9.0, address="mintB")          # same symbol, other mint
+    assert buyer.buy("PEPE", 5, address="mintA")["price"] == pytest.approx(0.01, rel=0.01)
+    assert buyer.buy("PEPE", 5)["price"] > 9.0                           # no address: the last mint seen
+    assert buyer.address_of("pepe") == "mintB" and buyer.address_of("NOPE") == ""
+    buyer.observe("C", liquidity=10_000, price=1.0, address="mintC")
+    assert len(buyer.pools) == 2                                         # bounded: oldest evicted
+    clock.now += 61
+    assert buyer.buy("C", 5, address="mintC")["status"] == "rejected" and len(buyer.pools) == 0
+
+
+def test_brain_books_the_paper_fill(monkeypatch):
+    monkeypatch.setattr(brain, "paper_buyer", PaperBuyer())
+    monkeypatch.setattr(brain, "position_book", PositionBook())
+    monkeypatch.setattr(brain, "was_already_traded", lambda token: False)
+    monkeypatch.setattr(brain, "remember_trade", lambda token: True)
+    monkeypatch.setattr(brain, "executor", None)
+    try:
+        future = brain.handle_command({"action": "BUY", "token": "THIN", "amount": 500,
+                                       "liquidity": 4_000, "price": 0.002})
+        receipt = future.result(timeout=5)
+    finally:
+        brain.executor.stop(drain=True)
+        brain.executor = None
+    assert receipt["status"] == "partial" and receipt["spent"] < 500
+    pos = brain.position_book.get("THIN")
+    assert pos.amount == pytest.approx(receipt["amount"]) and pos.entry_price > 0.002
+
+
+def test_manual_buy_without_address_fills_against_the_observed_mint(monkeypatch):
+    remembered = []
+    monkeypatch.setattr(brain, "paper_buyer", PaperBuyer())
+    monkeypatch.setattr(brain, "position_book", PositionBook())
+    monkeypatch.setattr(brain, "was_already_traded", lambda key: key in remembered)
+    monkeypatch.setattr(brain, "remember_trade", lambda key: remembered.append(key) or True)
+    monkeypatch.setattr(brain, "executor", None)
+    brain.paper_buyer.observe("MOON", liquidity=50_000, price=0.01, address="MoonMint")   # seen on the alpha path
+    try:
+        receipt = brain.handle_command(parse_command("buy moon 0.2")).result(timeout=5)
+        assert brain.handle_command(parse_command("buy moon 0.2")) is None             # same mint: traded
+    finally:
+        brain.executor.stop(drain=True)
+        brain.executor = None
+    assert receipt["status"] == "filled" and remembered == ["MoonMint"]
+
+def test_backtest_amm_fill_costs_more_than_the_recorded_price():
+    row = {"liquidity": 12_000, "price": 0.3}
+    assert recorded_fill(row, 100) == 0.3
+    assert amm_fill(row, 100) > 0.3 and amm_fill({"liquidity": 0, "price": 0.3}, 100) == 0.0
+    assert amm_fill(row, 0.2) == pytest.approx(amm.fill_price(row, 0.2 * PAPER_QUOTE_USD))   # SOL, like the buyer
+    assert amm_fill(row, 0.2) > amm_fill(row, 0.2, quote_usd=1.0)
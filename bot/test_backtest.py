@@ -0,0 +1,39 @@
+# bot/test_backtest.py – one-pass parameter sweep over an archive
+
+from bot.backtest import StrategyParams, grid, sweep
+from sniffers.snapshot_archive import SnapshotArchive, SnapshotRecorder
+
+
+def _tok(address, price, liquidity=100_000, v24h=100_000, name=None):
+    return {"address": address, "symbol": address.upper(), "name": name or f"{address} coin",
+            "price": price, "mc": price * 1e6, "liquidity": liquidity, "v24hUSD": v24h}
+
+
+def _archive(tmp_path):
+    rec = SnapshotRecorder(tmp_path)
+    rec.append([_tok("a", 1.0), _tok("b", 1.0, liquidity=20_000), _tok("scam", 1.0, name="scam coin")], ts=0)
+    rec.append([_tok("a", 1.5), _tok("b", 0.5, liquidity=20_000), _tok("c", 2.0, v24h=60_000)], ts=60)
+    rec.append([_tok("a", 3.0), _tok("c", 4.0, v24h=60_000)], ts=120)          # b vanished
+    return SnapshotArchive(tmp_path)
+
+
+def test_sweep_matches_per_parameter_semantics(tmp_path):
+    params = grid(min_liquidity=(10_000, 50_000), min_v24h_usd=(50_000, 80_000), horizon_s=(60,))
+    with _archive(tmp_path) as archive:
+        results = {(r.params.min_liquidity, r.params.min_v24h_usd): r.as_dict() for r in sweep(archive, params)}
+
+    loose = results[(10_000, 50_000)]          # a, b at t=0 (scam blacklisted); c at t=60
+    assert loose["trades"] == 3 and loose["open"] == 0
+    # exits one snapshot later – a: 1 → 1.5 (+50 %), b: 1 → 0.5 (−50 %), c: 2 → 4 (+100 %)
+    assert abs(loose["pnl"] - 0.2 * (0.5 - 0.5 + 1.0)) < 1e-9
+    assert abs(loose["hit_rate"] - 2 / 3) < 1e-9
+
+    strict = results[(50_000, 80_000)]         # only a qualifies
+    assert strict["trades"] == 1 and abs(strict["roi"] - 0.5) < 1e-9
+
+
+def test_each_parameter_set_buys_a_token_once_and_top_limits_the_ranking(tmp_path):
+    with _archive(tmp_path) as archive:
+        one, wide = sweep(archive, [StrategyParams(top=1, horizon_s=1e9), StrategyParams(top=10, horizon_s=1e9)])
+    assert one.trades == 1                     # only the top-volume token (a, first by stable order)
+    assert wide.trades == 3 and wide.open == 3
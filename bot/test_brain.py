@@ -1,11 +1,16 @@
-from bot.brain import CommandBrain, push_alpha_event
+import asyncio
+
+from bot.brain import CommandBrain, get_executor, push_alpha_event
 
 # Simulate a manual alpha trigger
 push_alpha_event("TEST123", "Test Token")
 
 # Instantiate and process
 brain = CommandBrain()
-brain.analyze_alpha()
+asyncio.run(brain.analyze_alpha())
 
 # Simulate BirdEye fetch test
-brain.simulate_birdeye_trades()
+asyncio.run(brain.simulate_birdeye_trades())
+
+# Wait for the queued fake buys to finish
+get_executor().stop(drain=True)
@@ -0,0 +1,147 @@
+# bot/test_checkpoint.py – warm-restart checkpoints: incremental records, restore, torn tail, compaction
+
+from bot.alpha_bus import AlphaBus, InFlight
+from bot.checkpoint import EVENTS, KEYS, Checkpointer, read_records
+from utils.dedupe import TTLDedupe
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def running(path, clock, window=600):
+    """One 'process': a bus and a dedupe registered with a checkpointer that has restored."""
+    ckpt = Checkpointer(path, clock=clock)
+    bus, seen = AlphaBus(maxsize=16), TTLDedupe(window, 1000, clock=clock)
+    ckpt.track_bus("alpha_queue", bus)
+    ckpt.track_dedupe("brain.seen", seen)
+    ckpt.restore()
+    return ckpt, bus, seen
+
+
+def test_restart_restores_queue_and_seen_keys(tmp_path):
+    clock = FakeClock()
+    ckpt, bus, seen = running(tmp_path / "a.ckpt", clock)
+    seen.check_and_add("mintA")
+    bus.put({"symbol": "AAA", "address": "mintA", "trace": {"queued": 1}})
+    bus.put({"symbol": "BBB", "address": "mintB"})
+    assert ckpt.checkpoint() == 2
+    assert ckpt.checkpoint() == 0                                  # nothing moved → nothing appended
+    seen.check_and_add("mintB")
+    bus.drain(1)
+    assert ckpt.checkpoint() == 2
+
+    clock.now += 30
+    _, bus2, seen2 = running(tmp_path / "a.ckpt", clock)
+    assert [e["symbol"] for e in bus2.snapshot()] == ["BBB"]       # the last queue snapshot wins
+    assert "trace" not in bus2.drain()[0]
+    assert "mintA" in seen2 and "mintB" in seen2
+
+
+def test_drained_but_unscreened_events_survive_a_restart(tmp_path):
+    from bot.brain import CommandBrain
+
+    clock = FakeClock()
+    ckpt, bus, seen = running(tmp_path / "a.ckpt", clock)
+    inflight = InFlight(bus)
+    ckpt.track_bus("alpha_inflight", inflight)
+    alpha = CommandBrain(seen, inflight)
+    for sym in ("AAA", "BBB"):
+        bus.put({"symbol": sym, "name": sym, "address": f"mint{sym}", "kind": "new_listing"})
+    assert len(alpha.admit(bus.drain(), 0)) == 2
+    inflight.settle("mintAAA")                                    # AAA got its verdict …
+    seen.check_and_add("mintAAA")
+    ckpt.checkpoint()                                             # … BBB is still being screened: crash
+
+    warm = Checkpointer(tmp_path / "a.ckpt", clock=clock)
+    bus2, seen2 = AlphaBus(maxsize=16), TTLDedupe(600, 1000, clock=clock)
+    warm.track_bus("alpha_queue", bus2)
+    warm.track_bus("alpha_inflight", InFlight(bus2))
+    warm.track_dedupe("brain.seen", seen2)
+    warm.restore()
+    assert [e["symbol"] for e in bus2.snapshot()] == ["BBB"]      # back on the bus, screened again
+    assert "mintBBB" not in seen2 and "mintAAA" in seen2
+
+
+def test_keys_come_back_with_their_age_and_expire_on_schedule(tmp_path):
+    clock = FakeClock()
+    ckpt, _, seen = running(tmp_path / "a.ckpt", clock, window=60)
+    seen.check_and_add("mintA")
+    ckpt.checkpoint()
+    clock.now += 40
+    _, _, seen2 = running(tmp_path / "a.ckpt", clock, window=60)
+    assert "mintA" in seen2
+    clock.now += 25
+    assert "mintA" not in seen2
+
+
+def test_late_registration_gets_its_restored_keys(tmp_path):
+    clock = FakeClock()
+    ckpt = Checkpointer(tmp_path / "a.ckpt", clock=clock)
+    ckpt.restore()
+    sniffer_seen = TTLDedupe(600, 100, clock=clock)
+    ckpt.track_dedupe("sniffer.seen", sniffer_seen)
+    sniffer_seen.check_and_add("mintS")
+    ckpt.checkpoint()
+
+    warm = Checkpointer(tmp_path / "a.ckpt", clock=clock)
+    assert warm.restore() == {}                                    # nobody registered yet
+    late = TTLDedupe(600, 100, clock=clock)
+    warm.track_dedupe("sniffer.seen", late)                        # the sniffer imports off-loop, later
+    assert "mintS" in late and warm.stats()["restored"] == {"sniffer.seen": 1}
+
+
+def test_torn_tail_is_dropped(tmp_path):
+    clock = FakeClock()
+    path = tmp_path / "a.ckpt"
+    ckpt, _, seen = running(path, clock)
+    for key in ("m1", "m2"):
+        seen.check_and_add(key)
+        ckpt.checkpoint()
+    data = path.read_bytes()
+    path.write_bytes(data[:-3])                                    # crash mid-append
+    records, good = read_records(path.read_bytes())
+    assert [r.keys() for r in records] == [["m1"]] and good < len(data) - 3
+
+    _, _, seen2 = running(path, clock)
+    assert "m1" in seen2 and "m2" not in seen2
+    assert path.stat().st_size == good                             # rewritten without the tail
+
+
+def test_compaction_drops_expired_keys_and_old_queues(tmp_path):
+    clock = FakeClock()
+    path = tmp_path / "a.ckpt"
+    ckpt, bus, seen = running(path, clock, window=60)
+    for i in range(5):
+        seen.check_and_add(f"mint{i}")
+        bus.put({"symbol": f"T{i}"})
+        ckpt.checkpoint()
+        clock.now += 20
+    ckpt.compact()
+    records, _ = read_records(path.read_bytes())
+    assert [r.kind for r in records].count(EVENTS) == 1
+    assert [r.keys() for r in records if r.kind == KEYS] == [["mint3"], ["mint4"]]
+    assert ckpt.stats()["compactions"] == 1
+
+
+def test_not_a_checkpoint_starts_cold(tmp_path):
+    path = tmp_path / "a.ckpt"
+    path.write_bytes(b"garbage that is not a checkpoint")
+    ckpt, bus, _ = running(path, FakeClock())
+    assert len(bus) == 0 and ckpt.active
+    bus.put({"symbol": "NEW"})
+    ckpt.checkpoint()
+    assert [r.events()[0]["symbol"] for r in read_records(path.read_bytes())[0]] == ["NEW"]
+
+
+def test_brain_state_is_registered():
+    from bot import brain
+    from bot.checkpoint import checkpointer
+
+    assert checkpointer._buses["alpha_queue"] is brain.ALPHA_QUEUE
+    assert checkpointer._dedupes["brain.seen"] is brain.ALPHA_SEEN
+    assert checkpointer._buses["alpha_inflight"] is brain.ALPHA_INFLIGHT
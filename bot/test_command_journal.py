@@ -0,0 +1,139 @@
+# bot/test_command_journal.py – command journal offsets (no loss, no repeats without a crash) + watcher wake-ups
+
+import threading
+import time
+
+import pytest
+
+from bot.command_journal import CommandJournal, JournalWatcher
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return tmp_path / "command.txt", tmp_path / "command.offset"
+
+
+def _append(path, text: str) -> None:
+    with path.open("a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_repeated_commands_are_not_dropped(paths):
+    cmd, off = paths
+    journal = CommandJournal(cmd, off)
+    _append(cmd, "BUY X 0.2\nBUY X 0.2\n")
+    seen = []
+    assert journal.process(seen.append) == 2
+    assert seen == ["BUY X 0.2", "BUY X 0.2"]
+
+
+def test_partial_line_waits_for_newline(paths):
+    cmd, off = paths
+    journal = CommandJournal(cmd, off)
+    seen = []
+    _append(cmd, "BUY A 1\nSELL ")
+    journal.process(seen.append)
+    _append(cmd, "B 2\n")
+    journal.process(seen.append)
+    assert seen == ["BUY A 1", "SELL B 2"]
+
+
+def test_offset_survives_restart(paths):
+    cmd, off = paths
+    journal = CommandJournal(cmd, off)
+    _append(cmd, "BUY A 1\nBUY B 1\n")
+    journal.process(lambda _: None)
+    _append(cmd, "BUY C 1\n")
+    seen = []
+    CommandJournal(cmd, off).process(seen.append)
+    assert seen == ["BUY C 1"]
+
+
+def test_first_start_skips_what_the_file_already_holds(paths):
+    cmd, off = paths
+    _append(cmd, "BUY USDC 0.2\nSELL ")                    # a stale command and a line still being typed
+    journal = CommandJournal(cmd, off)
+    seen = []
+    assert journal.process(seen.append) == 0
+    _append(cmd, "SOL 1\nSTATUS\n")
+    CommandJournal(cmd, off).process(seen.append)           # the seeded offset is persisted
+    assert seen == ["SELL SOL 1", "STATUS"]
+
+
+def test_truncation_restarts_from_zero(paths):
+    cmd, off = paths
+    journal = CommandJournal(cmd, off)
+    _append(cmd, "BUY A 1\nBUY B 1\n")
+    journal.process(lambda _: None)
+    cmd.write_text("STATUS\n", encoding="utf-8")
+    seen = []
+    journal.process(seen.append)
+    assert seen == ["STATUS"]
+
+
+def test_rewrite_in_place_is_read_from_the_start(paths):
+    cmd, off = paths
+    journal = CommandJournal(cmd, off)
+    _append(cmd, "BUY A 1\n")
+    journal.process(lambda _: None)
+    seen = []
+    for text in ("SELL SOL 1.5\n", "BUY USDC 0.2\n"):            # `echo CMD > command.txt`, same inode
+        with cmd.open("r+", encoding="utf-8") as f:
+            f.truncate()
+            f.write(text)
+        CommandJournal(cmd, off).process(seen.append)
+    assert seen == ["SELL SOL 1.5", "BUY USDC 0.2"]
+
+
+def test_handler_errors_do_not_stall_the_journal(paths):
+    cmd, off = paths
+    journal = CommandJournal(cmd, off)
+    _append(cmd, "BAD\nGOOD\n")
+    seen = []
+
+    def handler(line):
+        if line == "BAD":
+            raise ValueError("boom")
+        seen.append(line)
+
+    journal.process(handler)
+    assert seen == ["GOOD"]
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_watcher_delivers_burst_exactly_once(paths, use_inotify):
+    cmd, off = paths
+    cmd.touch()
+    watcher = JournalWatcher(CommandJournal(cmd, off), poll_interval=0.01, use_inotify=use_inotify)
+    seen = []
+    stop = threading.Event()
+
+    def consume():
+        while not stop.is_set():
+            watcher.journal.process(seen.append)
+            watcher.wait(0.05)
+
+    t = threading.Thread(target=consume)
+    t.start()
+    for i in range(500):
+        _append(cmd, f"BUY T{i} 0.1\n")
+    deadline = time.monotonic() + 5
+    while len(seen) < 500 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stop.set()
+    t.join()
+    watcher.close()
+    assert seen == [f"BUY T{i} 0.1" for i in range(500)]
+
+
+def test_inotify_wakes_promptly(paths):
+    cmd, off = paths
+    cmd.touch()
+    watcher = JournalWatcher(CommandJournal(cmd, off))
+    if watcher.mode != "inotify":
+        pytest.skip("inotify not available")
+    threading.Timer(0.05, _append, args=(cmd, "STATUS\n")).start()
+    started = time.monotonic()
+    watcher.wait(2)
+    watcher.close()
+    assert time.monotonic() - started < 1
@@ -0,0 +1,72 @@
+# bot/test_components.py – lazy component registry and import-time parsing
+
+import asyncio
+import sys
+
+from bot import components
+from bot.components import Component, load_enabled, shutdown_hooks
+from utils.importprof import parse_importtime, summarize
+
+
+def test_disabled_or_unconfigured_components_are_never_imported(monkeypatch):
+    monkeypatch.setenv("ENABLE_NOPE", "0")
+    monkeypatch.delenv("ASHBORN_TEST_TOKEN", raising=False)
+    comps = (
+        Component("nope", "ashborn_missing_module:run", "ENABLE_NOPE"),
+        Component("needs_key", "ashborn_missing_module:run", "ENABLE_NEEDS_KEY", requires=("ASHBORN_TEST_TOKEN",)),
+        Component("off", "ashborn_missing_module:run", "ENABLE_OFF", default=False),
+        Component("json", "json:dumps", "ENABLE_JSON"),
+    )
+    loaded = load_enabled(comps)
+    assert [item.component.name for item in loaded] == ["json"]
+    assert "ashborn_missing_module" not in sys.modules
+
+
+def test_deferred_component_imports_only_when_run(monkeypatch):
+    ran = []
+
+    async def fake_run():
+        ran.append(True)
+
+    monkeypatch.setattr(components, "resolve", lambda target: fake_run)
+    comp = Component("late", "ashborn_missing_module:run", "ENABLE_LATE", deferred=True)
+    [item] = load_enabled((comp,))
+    assert item.import_ms is None and ran == []
+    asyncio.run(item.factory())
+    assert ran == [True]
+
+
+def test_shutdown_hooks_are_deduped_ordered_and_skip_unimported(monkeypatch):
+    calls = []
+    monkeypatch.setattr(components, "SHUTDOWN_ORDER", ("json:second", "json:first"))
+    monkeypatch.setattr(components, "resolve", lambda target: lambda: calls.append(target))
+    comps = (
+        Component("a", "json:dumps", "ENABLE_A", shutdown=("json:first", "json:second")),
+        Component("b", "json:dumps", "ENABLE_B", shutdown=("json:first", "ashborn_missing_module:close")),
+    )
+    hooks = shutdown_hooks(load_enabled(comps))
+    assert [h.__name__ for h in hooks] == ["json:second", "json:first", "ashborn_missing_module:close"]
+
+    async def drain():
+        for hook in hooks:
+            await hook()
+
+    asyncio.run(drain())
+    assert calls == ["json:second", "json:first"]
+
+
+def test_parse_importtime_and_summary():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       100 |        100 |     numpy.core\n"
+        "import time:       400 |        500 |   numpy\n"
+        "import time:        50 |        550 | bot.brain\n"
+        "some unrelated warning\n"
+    )
+    records = parse_importtime(stderr)
+    assert [(r.name, r.self_us, r.cumulative_us, r.depth) for r in records] == [
+        ("numpy.core", 100, 100, 2), ("numpy", 400, 500, 1), ("bot.brain", 50, 550, 0),
+    ]
+    text = summarize(records)
+    assert "total import time: 0.6 ms over 3 modules" in text
+    assert text.index("numpy ") < text.index("bot ")
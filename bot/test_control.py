@@ -0,0 +1,114 @@
+# bot/test_control.py – Unix-socket control API: pipelining, batches, receipts and errors
+
+import asyncio
+import sys
+
+import pytest
+
+from bot import brain
+from bot.buyer_engine import PaperBuyer
+from bot.control import ControlServer, expand, send_commands
+from bot.positions import PositionBook
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="Unix-domain sockets")
+
+
+@pytest.fixture
+def bot(monkeypatch):
+    traded = set()
+    monkeypatch.setattr(brain, "position_book", PositionBook())
+    monkeypatch.setattr(brain, "paper_buyer", PaperBuyer())
+    monkeypatch.setattr(brain, "was_already_traded", lambda token: token in traded)
+    monkeypatch.setattr(brain, "remember_trade", lambda token: traded.add(token) or True)
+    monkeypatch.setattr(brain, "executor", None)
+    monkeypatch.setattr(brain, "buy_orders", lambda orders: [
+        {"token": o.token, "amount": 10, "price": 0.1} for o in orders])
+    yield traded
+    if brain.executor is not None:
+        brain.executor.stop(drain=True)
+        brain.executor = None
+
+
+def _session(path, commands, **kw):
+    async def run():
+        server = await ControlServer(path).start()
+        try:
+            return await send_commands(commands, path, **kw)
+        finally:
+            await server.close()
+
+    return asyncio.run(run())
+
+
+def test_expand_assigns_ids_to_batches():
+    assert expand("status", 3) == [(3, "status")]
+    assert expand({"id": "a", "batch": ["status", {"id": "x", "cmd": "status"}]}, 1) == [
+        ("a.0", "status"), ("x", {"id": "x", "cmd": "status"})
+    ]
+    assert expand(["status"], 2) == [("2.0", "status")]
+
+
+def test_pipelined_batches_stream_back_acks_and_receipts(bot, tmp_path):
+    buys = [f"buy T{i} 0.1" for i in range(2000)]
+    replies = _session(tmp_path / "ctl.sock", buys, batch=250)
+    acks = [r for r in replies if r.get("ack") == "queued"]
+    results = {r["id"]: r for r in replies if "result" in r}
+    assert len(acks) == 2000 and len(results) == 2000
+    assert results["1.0"]["result"]["token"] == "T0"
+    assert all(r["ok"] for r in replies) and len(bot) == 2000
+
+
+def test_results_errors_and_sell_status_round_trip(bot, tmp_path):
+    replies = _session(tmp_path / "ctl.sock", [
+        {"id": "b", "action": "BUY", "token": "MOON", "amount": 0.2, "address": "MoonMint",
+         "liquidity": 20_000, "price": 0.1},
+        "buy MOON 0.2",                                                 # no address: the mint just seen
+        {"id": "bad", "cmd": "buy MOON lots"},
+        "explode",
+    ])
+    by_id = {}
+    for r in replies:
+        by_id.setdefault(r["id"], []).append(r)
+    assert by_id["b"][-1]["result"]["token"] == "MOON"
+    assert by_id["bad"][0] == {"id": "bad", "ok": False, "error": "unrecognised command"}
+    assert by_id[4][0]["ok"] is False
+
+    replies = _session(tmp_path / "ctl.sock", ["buy MOON 0.2", "sell MOON", "status"])
+    assert replies[0]["ok"] is False                                    # already traded
+    assert replies[1]["result"]["left"] == 0
+    assert replies[2]["result"]["positions"]["open"] == 0
+
+
+def test_unfilled_buy_is_told_apart_from_an_already_traded_one(bot, tmp_path, monkeypatch):
+    monkeypatch.setattr(brain, "buy_orders", lambda orders: brain.paper_buyer.buy_batch(orders))
+    replies = _session(tmp_path / "ctl.sock", [
+        {"id": "new", "action": "BUY", "token": "NEW", "amount": 0.2, "address": "NewMint"},
+        {"id": "seen", "action": "BUY", "token": "SEEN", "amount": 0.2, "address": "SeenMint",
+         "liquidity": 20_000, "price": 0.01},
+    ])
+    receipts = {r["id"]: r for r in replies if "result" in r}
+    assert receipts["new"]["skipped"] == "no pool data" and receipts["new"]["result"]["status"] == "rejected"
+    assert "skipped" not in receipts["seen"] and receipts["seen"]["result"]["status"] == "filled"
+    assert bot == {"SeenMint"}                                           # remembered by mint
+    assert brain.executor.stats()["unfilled"] == 1
+
+def test_a_live_socket_is_not_taken_over_but_a_stale_one_is(tmp_path):
+    import socket
+
+    path = tmp_path / "ctl.sock"
+
+    async def run():
+        live = await ControlServer(path).start()
+        try:
+            with pytest.raises(RuntimeError):
+                await ControlServer(path).start()
+        finally:
+            await live.close()
+
+        stale = socket.socket(socket.AF_UNIX)
+        stale.bind(str(path))                                           # bound, never listening
+        stale.close()
+        server = await ControlServer(path).start()
+        await server.close()
+
+    asyncio.run(run())
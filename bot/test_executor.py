@@ -0,0 +1,149 @@
+# bot/test_executor.py – priority, idempotency and batching of the order executor
+
+import threading
+import time
+
+from bot.executor import OrderExecutor
+
+
+class FakeBook:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.traded: set[str] = set()
+        self.buys: list[str] = []
+        self.batches: list[list[str]] = []
+        self.lock = threading.Lock()
+
+    def buy(self, token, amount):
+        time.sleep(self.delay)
+        with self.lock:
+            self.buys.append(token)
+        return {"token": token, "amount": amount}
+
+    def buy_batch(self, orders):
+        with self.lock:
+            self.batches.append([o.token for o in orders])
+        return [self.buy(o.token, o.amount) for o in orders]
+
+    def executor(self, **kw) -> OrderExecutor:
+        return OrderExecutor(self.buy, self.traded.__contains__, self.traded.add, buy_batch=self.buy_batch, **kw)
+
+
+def test_manual_orders_jump_ahead_of_alpha():
+    book = FakeBook()
+    ex = book.executor(workers=1)
+    for t in ("A1", "A2", "A3"):
+        ex.submit(t, 0.1, source="alpha")
+    ex.submit("M1", 0.1, source="manual")
+    ex.start().stop(drain=True)
+    assert book.buys == ["M1", "A1", "A2", "A3"]
+
+
+def test_same_token_is_bought_once_across_threads():
+    book = FakeBook(delay=0.01)
+    ex = book.executor(workers=4).start()
+    futures = []
+
+    def spam():
+        for _ in range(50):
+            futures.append(ex.submit("PEPE", 0.2, source="alpha"))
+
+    threads = [threading.Thread(target=spam) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for f in futures:
+        f.result(timeout=2)
+    ex.stop()
+    assert book.buys == ["PEPE"]
+    assert ex.stats()["filled"] == 1
+
+
+def test_already_traded_is_rechecked_before_buying():
+    book = FakeBook()
+    book.traded.add("OLD")
+    ex = book.executor(workers=1).start()
+    assert ex.submit("OLD", 1).result(timeout=1) is None
+    ex.stop()
+    assert book.buys == [] and ex.stats()["skipped"] == 1
+
+
+def test_same_tick_orders_are_batched():
+    book = FakeBook()
+    ex = book.executor(workers=1, batch_size=8, batch_window=0.2)
+    ex.start()
+    futures = [ex.submit(f"T{i}", 0.1, source="alpha") for i in range(8)]
+    receipts = [f.result(timeout=2) for f in futures]
+    ex.stop()
+    assert [r["token"] for r in receipts] == [f"T{i}" for i in range(8)]
+    assert book.batches == [[f"T{i}" for i in range(8)]]
+
+
+def test_failures_propagate_and_stats_are_recorded():
+    def boom(token, amount):
+        raise RuntimeError("rpc down")
+
+    failures = []
+    ex = OrderExecutor(boom, lambda t: False, lambda t: None, workers=1,
+                       on_fail=lambda o, e: failures.append((o.token, str(e)))).start()
+    fut = ex.submit("X", 1)
+    try:
+        fut.result(timeout=1)
+        raise AssertionError("expected failure")
+    except RuntimeError:
+        pass
+    ok = OrderExecutor(lambda t, a: {"token": t}, lambda t: False, lambda t: None, workers=1).start()
+    ok.submit("Y", 1).result(timeout=1)
+    ex.stop()
+    ok.stop()
+    assert ex.stats()["failed"] == 1 and failures == [("X", "rpc down")]
+    stats = ok.stats()
+    assert stats["queue_wait"]["count"] == 1 and stats["execution"]["count"] == 1
+
+
+def test_idempotency_is_keyed_on_the_mint_address():
+    book = FakeBook()
+    ex = book.executor(workers=1)
+    first = ex.submit("PEPE", 0.1, address="mint1")
+    assert ex.submit("pepe", 0.1, address="mint1") is first
+    other = ex.submit("PEPE", 0.1, address="mint2")             # same symbol, different mint
+    assert other is not first and ex.stats()["deduped"] == 1
+    ex.start().stop(drain=True)
+
+
+def test_trade_memory_is_keyed_on_the_mint_address():
+    book = FakeBook()
+    book.traded.add("mintA")                                     # BONK from mint A was bought before
+    ex = book.executor(workers=1, batch_size=4, batch_window=0.2).start()
+    futures = [ex.submit("BONK", 0.1, address=a) for a in ("mintA", "mintB", "mintC")]
+    receipts = [f.result(timeout=2) for f in futures]
+    assert receipts[0] is None and receipts[1] and receipts[2]  # new mints reusing the symbol are bought
+    assert book.traded == {"mintA", "mintB", "mintC"}
+    assert ex.submit("BONK", 0.1, address="mintB").result(timeout=1) is None
+    ex.stop()
+    assert book.buys == ["BONK", "BONK"] and ex.stats()["skipped"] == 2
+
+
+def test_a_failing_hook_fails_the_order_not_the_worker():
+    def closed(token):
+        raise RuntimeError("trade store is closed")
+
+    ex = OrderExecutor(lambda t, a: {"token": t}, closed, lambda t: None, workers=1).start()
+    fut = ex.submit("X", 1)
+    try:
+        fut.result(timeout=1)
+        raise AssertionError("expected failure")
+    except RuntimeError:
+        pass
+    ex._already_traded = lambda t: False
+    ex._remember = closed
+    try:
+        ex.submit("Y", 1).result(timeout=1)                      # bought, but not remembered
+        raise AssertionError("expected failure")
+    except RuntimeError:
+        pass
+    ex._remember = lambda t: None
+    assert ex.submit("Z", 1).result(timeout=1) == {"token": "Z"}  # the worker is still alive
+    ex.stop()
+    assert ex.stats()["failed"] == 2
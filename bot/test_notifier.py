@@ -0,0 +1,128 @@
+# bot/test_notifier.py – coalesced, rate-limited Telegram digests against a fake Bot API
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from bot import brain, notifier as notifier_mod
+from bot.notifier import Notifier, TelegramSender
+from bot.positions import PositionBook
+from bot.risk import RiskPipeline
+from bot.stub_telegram import StubTelegram
+
+
+@pytest.fixture
+def telegram():
+    with StubTelegram() as stub:
+        yield stub
+
+
+def _notifier(stub: StubTelegram, **kw) -> Notifier:
+    kw.setdefault("window", 0.2)
+    kw.setdefault("fill_window", 0.05)
+    return Notifier(TelegramSender(stub.token, 42, base_url=stub.base_url), **kw)
+
+
+async def _run_for(n: Notifier, seconds: float, produce=None) -> None:
+    task = asyncio.create_task(n.run())
+    await asyncio.sleep(0)
+    if produce is not None:
+        await asyncio.to_thread(produce)
+    await asyncio.sleep(seconds)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    await n.send.aclose()
+
+
+def test_burst_is_coalesced_into_a_digest_with_fills_first(telegram):
+    n = _notifier(telegram)
+
+    def produce():
+        for i in range(500):
+            n.notify("alert", f"new_listing T{i}")
+        n.notify("fill", "BUY MOON 10 @ 0.1")
+
+    asyncio.run(_run_for(n, 0.5, produce))
+    assert len(telegram.messages) == 1
+    text = telegram.messages[0]["text"]
+    assert text.startswith("✅ Fills (1)\nBUY MOON") and "🔎 Alerts (500)" in text and "+485 more" in text
+    assert telegram.messages[0]["chat_id"] == 42 and len(text) <= 4096
+
+
+def test_flood_control_keeps_the_digest_and_merges_later_events(telegram):
+    telegram.flood_next(1, retry_after=0.3)
+    n = _notifier(telegram)
+
+    async def run():
+        task = asyncio.create_task(n.run())
+        await asyncio.sleep(0)
+        n.notify("fill", "BUY A")
+        await asyncio.sleep(0.15)                          # first send rejected by now
+        n.notify("fill", "BUY B")
+        await asyncio.sleep(0.6)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await n.send.aclose()
+
+    started = time.monotonic()
+    asyncio.run(run())
+    assert telegram.rejected == 1 and n.throttled == 1
+    [msg] = telegram.messages
+    assert "BUY A" in msg["text"] and "BUY B" in msg["text"]
+    assert msg["at"] - started >= 0.3
+
+
+def test_rate_limit_folds_fills_into_fewer_digests(telegram):
+    n = _notifier(telegram, fill_window=0.0, per_minute=600, burst=1)  # one message per 0.1 s
+
+    async def run():
+        task = asyncio.create_task(n.run())
+        for i in range(5):
+            n.notify("fill", f"BUY T{i}")
+            await asyncio.sleep(0.02)
+        await asyncio.sleep(0.5)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await n.send.aclose()
+
+    asyncio.run(run())
+    assert 2 <= len(telegram.messages) <= 3                 # 5 fills, folded into the rate
+    assert n.bucket.stats()["delayed"] >= 1
+    assert sum(m["text"].count("BUY T") for m in telegram.messages) == 5
+
+
+def test_notify_never_blocks_and_drops_alerts_before_fills():
+    n = Notifier(lambda text: asyncio.sleep(3600), maxsize=10)
+    started = time.perf_counter()
+    threads = [threading.Thread(target=lambda: [n.notify("alert", "x") for _ in range(5000)]) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    n.notify("fill", "BUY KEEP")
+    assert time.perf_counter() - started < 2.0
+    assert n.pending() == 10 and n.dropped == 20_000 - 9
+    assert n.digest().startswith("✅ Fills (1)\nBUY KEEP")
+
+
+def test_brain_fills_sells_and_alerts_are_notified(monkeypatch):
+    n = Notifier(lambda text: asyncio.sleep(0))
+    monkeypatch.setattr(notifier_mod, "notifier", n)
+    monkeypatch.setattr(brain, "position_book", PositionBook())
+    monkeypatch.setattr(brain, "was_already_traded", lambda token: False)
+    monkeypatch.setattr(brain, "remember_trade", lambda token: True)
+    monkeypatch.setattr(brain, "executor", None)
+    monkeypatch.setattr(brain, "buy_orders", lambda orders: [
+        {"token": o.token, "amount": 4, "price": 0.5} for o in orders])
+    monkeypatch.setattr(brain, "risk_pipeline", RiskPipeline([]))
+    try:
+        evt = brain._alpha_event("MOON", "Moon", "MoonMint", "new_listing", None)
+        asyncio.run(brain.CommandBrain().process_alpha([evt]))
+        brain.executor.stop(drain=True)
+    finally:
+        brain.executor = None
+    brain.handle_command({"action": "SELL", "token": "MOON"})
+    text = n.digest()
+    assert "BUY MOON 4 @ 0.5 (alpha)" in text and "SELL MOON" in text and "new_listing MOON" in text
@@ -0,0 +1,120 @@
+# bot/test_positions.py – position book, adaptive refresh schedule and batched price refresher
+
+import asyncio
+
+import pytest
+
+from bot import brain
+from bot.positions import PositionBook, PriceRefresher
+from sniffers import bird_eye
+from sniffers.birdeye_client import BirdEyeClient
+from sniffers.stub_birdeye import StubBirdEye
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _book(clock: FakeClock) -> PositionBook:
+    return PositionBook(min_interval=2, max_interval=60, fresh_window=300, volatile=0.02, clock=clock)
+
+
+def test_fills_average_in_and_sells_realise_pnl():
+    book = _book(FakeClock())
+    book.open_from_receipt({"token": "pepe", "amount": 10, "price": 1.0}, address="MintP")
+    book.open("PEPE", 10, 2.0, address="MintP")
+    pos = book.get("pepe")
+    assert (pos.amount, pos.entry_price, pos.address) == (20, 1.5, "MintP")
+
+    book.apply_prices(book.due(book.clock() + 2), {"MintP": 3.0})
+    pos, pnl = book.close("PEPE", 5)
+    assert pnl == pytest.approx(7.5) and pos.amount == 15
+    pos, pnl = book.close("PEPE")
+    assert pnl == pytest.approx(22.5) and "PEPE" not in book
+    assert book.close("PEPE") is None
+    assert book.summary()["realized"] == pytest.approx(30.0)
+    assert book.open_from_receipt({"token": "X"}) is None
+
+
+def test_quiet_positions_back_off_and_volatile_ones_stay_fast():
+    clock = FakeClock()
+    book = _book(clock)
+    book.open("CALM", 1, 1.0, address="calm")
+    book.open("WILD", 1, 1.0, address="wild")
+    clock.now += 301                                   # both out of the fresh window
+    price = {"calm": 1.0, "wild": 1.0}
+    for step in range(6):
+        price["wild"] *= 1.1 if step % 2 else 0.9
+        book.apply_prices(book.due(), price)
+        clock.now = book.next_deadline()
+    assert book.get("WILD").interval == 2
+    assert book.get("CALM").interval > 2
+
+
+def test_refresher_batches_only_due_positions():
+    clock = FakeClock()
+    book = _book(clock)
+    for i in range(250):
+        book.open(f"T{i}", 1, 1.0, address=f"mint{i}")
+    book.open("NOADDR", 1, 1.0)                        # never priced, never scheduled
+    calls = []
+
+    async def fetch(addresses):
+        calls.append(len(addresses))
+        return {a: 1.0 for a in addresses}
+
+    refresher = PriceRefresher(book, fetch)
+    assert asyncio.run(refresher.refresh_once()) == 0  # nothing due yet
+    clock.now += 2
+    assert asyncio.run(refresher.refresh_once()) == 250
+    assert calls == [250] and refresher.stats()["rounds"] == 1
+
+
+def test_fetch_prices_splits_into_concurrent_batches():
+    with StubBirdEye() as stub:
+        stub.prices = {f"mint{i}": float(i + 1) for i in range(250)}
+
+        async def run():
+            async with BirdEyeClient("test-key", base_url=stub.base_url) as client:
+                return await bird_eye.fetch_prices(list(stub.prices) + ["unknown"], client=client, batch_size=100)
+
+        prices = asyncio.run(run())
+    assert stub.requests["/defi/multi_price"] == 3
+    assert len(prices) == 250 and prices["mint9"] == 10.0 and "unknown" not in prices
+
+
+def test_mints_sharing_a_symbol_are_separate_positions():
+    book = _book(FakeClock())
+    book.open("BONK", 10, 1.0, address="mintA")
+    book.open("BONK", 5, 4.0, address="mintB")
+    assert len(book) == 2 and book.get("BONK") is None                   # ambiguous by symbol
+    assert book.get("BONK", address="mintB").entry_price == 4.0
+    book.apply_prices(book.due(book.clock() + 2), {"mintA": 2.0, "mintB": 2.0})
+    assert book.get("x", address="mintA").last_price == 2.0
+    pos, pnl = book.close("BONK", address="mintB")
+    assert pos.address == "mintB" and pnl == pytest.approx(-10.0)
+    assert book.get("BONK").address == "mintA"                           # one left: the symbol finds it
+
+def test_buy_receipt_is_booked_and_sell_uses_the_book(monkeypatch):
+    book = PositionBook()
+    monkeypatch.setattr(brain, "position_book", book)
+    monkeypatch.setattr(brain, "was_already_traded", lambda token: False)
+    monkeypatch.setattr(brain, "remember_trade", lambda token: True)
+    monkeypatch.setattr(brain, "executor", None)
+    monkeypatch.setattr(brain, "buy_orders", lambda orders: [
+        {"token": o.token, "amount": 4, "price": 0.5} for o in orders])
+    try:
+        receipt = brain.handle_command({"action": "BUY", "token": "moon", "amount": 0.2, "address": "MoonMint"}).result(5)
+    finally:
+        brain.get_executor().stop(drain=True)
+        brain.executor = None
+    assert receipt["price"] == 0.5
+    assert book.get("MOON").address == "MoonMint"
+
+    brain.handle_command("STATUS")
+    brain.handle_command({"action": "SELL", "token": "moon", "amount": None})
+    assert "MOON" not in book
@@ -0,0 +1,189 @@
+# bot/test_risk.py – cost/selectivity ordering, concurrent I/O checks, caching, BirdEye checks
+
+import asyncio
+import time
+
+from bot import brain
+from bot.risk import (
+    Check, RiskPipeline, minimum, name_blacklist, price_sanity, replay_rules, standard_checks, token_security,
+)
+from sniffers.bird_eye import fetch_token_security, quote_token_price
+from sniffers.birdeye_client import BirdEyeClient
+from sniffers.stub_birdeye import StubBirdEye
+from sniffers.token_table import TokenTable
+
+
+def _token(i: int, **kw) -> dict:
+    return {"symbol": f"T{i}", "name": f"Token {i}", "address": f"Mint{i}", "liquidity": 50_000, "v24hUSD": 90_000, **kw}
+
+
+def test_selective_cheap_checks_move_to_the_front():
+    slow_pass = Check("slow", lambda c: None, cost=1e-3)
+    picky = Check("picky", lambda c: None if c["liquidity"] > 40_000 else "thin", cost=1e-3)
+    pipeline = RiskPipeline([slow_pass, picky], reorder_every=10)
+    candidates = [_token(i, liquidity=10_000 if i % 10 else 90_000) for i in range(100)]
+    verdicts = asyncio.run(pipeline.screen(candidates))
+    assert sum(v.ok for v in verdicts) == 10
+    assert pipeline.order() == ["picky", "slow"]
+    assert slow_pass.calls < 30                              # only the survivors after the reorder
+    assert verdicts[1].check == "picky" and verdicts[1].reason == "thin"
+
+
+def test_io_checks_run_concurrently_and_first_rejection_cancels_the_rest():
+    async def slow_ok(candidate):
+        await asyncio.sleep(0.2)
+
+    async def fast_reject(candidate):
+        await asyncio.sleep(0.01)
+        return "rug" if candidate["symbol"] == "T1" else None
+
+    slow, fast = Check("slow", slow_ok, cost=0.2), Check("fast", fast_reject, cost=0.01)
+    pipeline = RiskPipeline([slow, fast], concurrency=8)
+    started = time.perf_counter()
+    verdicts = asyncio.run(pipeline.screen([_token(i) for i in range(8)]))
+    assert time.perf_counter() - started < 0.35                # 8 candidates × 2 checks, all at once
+    assert [v.ok for v in verdicts] == [True, False] + [True] * 6
+    assert fast.calls == 8 and fast.rejected == 1 and slow.calls == 7   # T1's slow check was cancelled
+
+
+def test_io_outcomes_are_cached_per_address_errors_are_not():
+    calls = []
+
+    async def lookup(candidate):
+        calls.append(candidate["address"])
+        if candidate["address"] == "Mint2":
+            raise RuntimeError("boom")
+        return "frozen" if candidate["address"] == "Mint1" else None
+
+    check = Check("security", lookup, ttl=60)
+    pipeline = RiskPipeline([check])
+    for _ in range(3):
+        verdicts = asyncio.run(pipeline.screen([_token(0), _token(1), _token(2)]))
+    assert [v.ok for v in verdicts] == [True, False, False] and verdicts[2].reason == "error: boom"
+    assert calls.count("Mint0") == 1 and calls.count("Mint1") == 1 and calls.count("Mint2") == 3
+    stats = pipeline.stats()["checks"]["security"]
+    assert stats["cache_hits"] == 4 and stats["errors"] == 3
+
+
+def test_threshold_and_blacklist_checks():
+    pipeline = RiskPipeline([name_blacklist(("scam",)), minimum("liquidity", "liquidity", 10_000),
+                             minimum("volume", "v24hUSD", 50_000)])
+    verdicts = asyncio.run(pipeline.screen([
+        _token(0), _token(1, name="Scam Coin"), _token(2, liquidity=500), _token(3, v24hUSD=10),
+        {"symbol": "NEW", "name": "New", "address": "m"},          # no market data yet → not judged on it
+    ]))
+    assert [v.check for v in verdicts] == [None, "blacklist", "liquidity", "volume", None]
+
+
+def test_price_and_security_against_the_stub():
+    with StubBirdEye([_token(i, price=1.0) for i in range(5)]) as stub:
+        stub.prices["Mint1"] = 0.0
+        stub.prices["Mint2"] = 3.0                                # 200 % off the listed price
+        stub.security["Mint3"] = {"top10HolderPercent": 0.9, "freezeable": False}
+        stub.security["Mint4"] = {"top10HolderPercent": 0.1, "freezeable": True}
+
+        async def run():
+            async with BirdEyeClient("k", base_url=stub.base_url) as c:
+                pipeline = RiskPipeline([
+                    price_sanity(lambda a: quote_token_price(a, client=c)),
+                    token_security(lambda a: fetch_token_security(a, client=c)),
+                ])
+                return await pipeline.screen([_token(i, price=1.0) for i in range(5)])
+
+        verdicts = asyncio.run(run())
+    assert [(v.check, v.reason) for v in verdicts] == [
+        (None, ""), ("price", "no price quote"), ("price", "price 3 vs listed 1"),
+        ("security", "top10 holders 90%"), ("security", "freeze authority set"),
+    ]
+
+
+def test_rejected_alpha_is_not_bought(monkeypatch):
+    submitted = []
+    monkeypatch.setattr(brain, "risk_pipeline", RiskPipeline([name_blacklist(brain.NAME_BLACKLIST)]))
+    monkeypatch.setattr(brain, "was_already_traded", lambda token: False)
+    monkeypatch.setattr(brain, "get_executor", lambda: type("Ex", (), {
+        "submit": staticmethod(lambda token, amount, source, **meta: submitted.append(token))})())
+    events = [brain._alpha_event("GOOD", "Good coin", "m1", "new_listing", None),
+              brain._alpha_event("BAD", "Fake coin", "m2", "new_listing", None)]
+    asyncio.run(brain.CommandBrain().process_alpha(events))
+    assert submitted == ["GOOD"]
+    assert brain.risk_pipeline.stats()["passed"] == 1
+
+
+
+def test_a_listed_token_still_gets_its_liquidity_change_screened(monkeypatch):
+    submitted = []
+    monkeypatch.setattr(brain, "risk_pipeline", RiskPipeline([]))
+    monkeypatch.setattr(brain, "was_already_traded", lambda token: False)
+    monkeypatch.setattr(brain, "get_executor", lambda: type("Ex", (), {
+        "submit": staticmethod(lambda token, amount, source, **meta: submitted.append(token))})())
+    alpha = brain.CommandBrain()
+    listing = brain._alpha_event("PUMP", "Pump", "pumpMint", "new_listing", None)
+    change = brain._alpha_event("PUMP", "Pump", "pumpMint", "liquidity_change",
+                                {"liquidity": 100_000, "prev_liquidity": 10_000})
+    asyncio.run(alpha.process_alpha([listing]))
+    assert "pumpMint" in alpha.seen and alpha.admit([dict(listing)], 0) == []
+    assert alpha.admit([change], 0) == [change]                          # the change is not deduped away
+    asyncio.run(alpha.screen([change], 0))
+    assert submitted == ["PUMP", "PUMP"] and alpha.admit([dict(change)], 0) == []
+
+def test_watcher_keeps_draining_while_a_quote_is_slow(monkeypatch):
+    submitted = []
+    release = asyncio.Event()
+
+    async def quote(c):
+        if c["address"] == "slow":
+            await release.wait()
+        return None
+
+    monkeypatch.setattr(brain, "risk_pipeline", RiskPipeline([Check("quote", quote)]))
+    monkeypatch.setattr(brain, "ALPHA_QUEUE", brain.AlphaBus(maxsize=16))
+    monkeypatch.setattr(brain, "was_already_traded", lambda token: False)
+    monkeypatch.setattr(brain, "get_executor", lambda: type("Ex", (), {
+        "submit": staticmethod(lambda token, amount, source, **meta: submitted.append(token))})())
+
+    async def run():
+        alpha = brain.CommandBrain()
+        watcher = asyncio.create_task(alpha.alpha_watcher_loop())
+        brain.ALPHA_QUEUE.put(brain._alpha_event("SLOW", "Slow", "slow", "new_listing", None))
+        await asyncio.sleep(0.01)
+        brain.ALPHA_QUEUE.put(brain._alpha_event("FAST", "Fast", "fast", "new_listing", None))
+        await asyncio.sleep(0.01)
+        assert submitted == ["FAST"] and len(alpha.screening) == 1
+        release.set()
+        await alpha.idle()
+        watcher.cancel()
+        await asyncio.gather(watcher, return_exceptions=True)
+
+    asyncio.run(run())
+    assert submitted == ["FAST", "SLOW"]
+
+def test_price_quote_comes_back_on_cache_hits_and_errors_are_not_cached():
+    quotes = {"Mint0": 0.5}
+    calls = []
+
+    async def fetch(address):
+        calls.append(address)
+        if address == "Mint1":
+            raise RuntimeError("429")
+        return quotes.get(address, 0.0)
+
+    pipeline = RiskPipeline([price_sanity(fetch)])
+    candidates = [_token(0), _token(1)]
+    for _ in range(2):
+        verdicts = asyncio.run(pipeline.screen(candidates))
+        assert verdicts[0].ok and verdicts[0].facts == {"price": 0.5}
+        assert verdicts[1].reason == "error: 429"
+    assert calls == ["Mint0", "Mint1", "Mint1"]
+    assert "price" not in candidates[0]                      # the candidate is not written into
+
+
+def test_backtest_rules_filter_like_the_live_sync_checks():
+    names = ("blacklist", "liquidity", "volume", "price")                   # price: I/O, not replayed
+    kw = dict(min_liquidity=10_000, min_v24h_usd=50_000, blacklist=brain.NAME_BLACKLIST)
+    rows = [_token(0), _token(1, name="Test coin"), _token(2, liquidity=9_999), _token(3, v24hUSD=49_999),
+            _token(4, symbol=""), _token(5, liquidity=10_000, v24hUSD=50_000)]
+    live = RiskPipeline([c for c in standard_checks(names, **kw) if not c.io])
+    verdicts = asyncio.run(live.screen(rows))
+    assert replay_rules(names, **kw).select(TokenTable(rows)) == [i for i, v in enumerate(verdicts) if v.ok] == [0, 5]
+    assert replay_rules(("liquidity",), **kw).select(TokenTable(rows)) == [0, 1, 3, 4, 5]
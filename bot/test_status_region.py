@@ -0,0 +1,66 @@
+# bot/test_status_region.py – mmap status region: layout round trip, seqlock, stop marker
+
+import pytest
+
+from bot import status_region
+from bot.status_region import SIZE, StatusReader, StatusRegion, StatusRegionError, decode, read_status
+
+SNAP = {
+    "queue": {"depth": 3, "maxsize": 1024, "high_water": 40, "pushed": 900, "consumed": 897, "dropped": 2,
+              "rejected": 0, "policy": "drop_oldest"},
+    "executor": {"queued": 1, "filled": 12, "skipped": 3, "failed": 0, "workers": 2},
+    "positions": {"open": 2, "cost": 10.0, "value": 12.5, "unrealized": 2.5, "realized": -0.25},
+    "birdeye": {"limiter": {"per_minute": 300, "tokens": 41.5, "granted": 1200, "delayed": 4, "throttled": 1,
+                            "wait_s": 0.5, "paused_s": 0.0}},
+    "latency": {"end_to_end": {"count": 12, "p50_ms": 1.5, "p95_ms": 4.0, "p99_ms": 9.0, "max_ms": 11.0}},
+    "top": [{"token": "A-VERY-LONG-SYMBOL-NAME", "amount": 100.0, "entry_price": 0.01, "last_price": 0.0125,
+             "unrealized": 0.25}],
+}
+
+
+def test_published_snapshot_reads_back(tmp_path):
+    path = tmp_path / "ashborn.status"
+    region = StatusRegion(path)
+    region.publish(SNAP)
+    status = read_status(path)
+    assert path.stat().st_size == SIZE
+    assert status["state"] == "running" and status["seq"] == 2 and status["age_s"] < 5
+    assert status["queue"]["depth"] == 3 and status["queue"]["pushed"] == 900
+    assert status["executor"] == {"queued": 1, "filled": 12, "skipped": 3, "failed": 0}
+    assert status["positions"]["unrealized"] == 2.5 and status["budget"]["tokens"] == 41.5
+    assert status["latency"]["end_to_end"]["p99_ms"] == 9.0
+    assert status["top"][0]["token"] == "A-VERY-LONG-SYMB"                 # truncated to 16 bytes
+    region.publish({}, state=status_region.STOPPED)
+    assert read_status(path)["state"] == "stopped" and read_status(path)["queue"]["depth"] == 0
+    region.close()
+
+
+def test_reader_retries_while_a_write_is_in_progress(tmp_path):
+    path = tmp_path / "ashborn.status"
+    region = StatusRegion(path)
+    region.publish(SNAP)
+    reader = StatusReader(path, retries=5)
+    status_region._SEQ.pack_into(region._mm, status_region._SEQ_OFFSET, region.seq + 1)   # writer "mid-update"
+    with pytest.raises(StatusRegionError):
+        reader.read()
+    status_region._SEQ.pack_into(region._mm, status_region._SEQ_OFFSET, region.seq)
+    assert reader.read()["seq"] == region.seq
+    reader.close()
+    region.close()
+
+
+def test_a_restarted_writer_keeps_seq_increasing(tmp_path):
+    path = tmp_path / "ashborn.status"
+    first = StatusRegion(path)
+    first.publish(SNAP)
+    first.publish(SNAP)
+    first.close()
+    second = StatusRegion(path)
+    second.publish(SNAP)
+    assert read_status(path)["seq"] == 6
+    second.close()
+
+
+def test_foreign_bytes_are_refused():
+    with pytest.raises(StatusRegionError):
+        decode(b"\0" * SIZE)
@@ -0,0 +1,86 @@
+# bot/test_supervisor.py – restart policy, graceful drain and async journal intake
+
+import asyncio
+import os
+import signal
+
+from bot.command_journal import CommandJournal, JournalWatcher
+from bot.supervisor import RestartPolicy, Supervisor
+
+FAST = RestartPolicy(initial=0.01, maximum=0.02)
+
+
+def test_crashing_component_is_restarted_with_backoff():
+    runs = []
+
+    async def flaky():
+        runs.append(1)
+        if len(runs) < 3:
+            raise RuntimeError("boom")
+
+    sup = Supervisor()
+    sup.add("flaky", flaky, FAST)
+    asyncio.run(sup.run())               # returns once every component has finished
+    assert len(runs) == 3
+    assert sup.stats()["flaky"] == {"restarts": 2, "running": False}
+    assert FAST.delay(10) <= FAST.maximum
+
+
+def test_stop_cancels_components_then_runs_hooks_in_order():
+    events = []
+
+    async def forever():
+        try:
+            await asyncio.Event().wait()
+        finally:
+            events.append("cancelled")
+
+    async def async_hook():
+        events.append("async hook")
+
+    async def main():
+        sup = Supervisor(drain_timeout=1)
+        sup.add("forever", forever)
+        sup.on_shutdown(lambda: events.append("sync hook"))
+        sup.on_shutdown(async_hook)
+        asyncio.get_running_loop().call_later(0.05, sup.request_stop)
+        await sup.run()
+
+    asyncio.run(main())
+    assert events == ["cancelled", "sync hook", "async hook"]
+
+
+def test_sigterm_triggers_graceful_drain():
+    stopped = []
+
+    async def main():
+        sup = Supervisor(drain_timeout=1)
+        sup.add("idle", lambda: asyncio.sleep(3600))
+        sup.on_shutdown(lambda: stopped.append(True))
+        asyncio.get_running_loop().call_later(0.05, os.kill, os.getpid(), signal.SIGTERM)
+        await sup.run()
+
+    asyncio.run(main())
+    assert stopped == [True]
+
+
+def test_async_journal_intake(tmp_path):
+    path = tmp_path / "command.txt"
+    path.write_text("")
+    seen = []
+
+    async def main():
+        watcher = JournalWatcher(CommandJournal(path, tmp_path / "offset"), poll_interval=0.01)
+        task = asyncio.create_task(watcher.run_async(seen.append))
+        await asyncio.sleep(0.05)
+        with path.open("a") as f:
+            f.write("BUY A 1\nBUY B 2\n")
+        for _ in range(100):
+            if len(seen) == 2:
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+        watcher.close()
+
+    asyncio.run(main())
+    assert seen == ["BUY A 1", "BUY B 2"]
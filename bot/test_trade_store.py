@@ -0,0 +1,176 @@
+# bot/test_trade_store.py – trade memory backends, group commit and crash consistency
+
+import sqlite3
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from bot.trade_store import LogTradeStore, SQLiteTradeStore, open_trade_store
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture(params=["sqlite", "log"])
+def store_factory(request, tmp_path):
+    path = tmp_path / ("trades.db" if request.param == "sqlite" else "trades.txt")
+    opened = []
+
+    def factory(**kw):
+        store = open_trade_store(request.param, path, **kw)
+        opened.append(store)
+        return store
+
+    yield factory
+    for s in opened:
+        try:
+            s.close()
+        except RuntimeError:
+            pass
+
+
+def test_add_is_check_and_insert(store_factory):
+    store = store_factory()
+    assert store.add("sol")
+    assert not store.add("SOL ")
+    assert store.contains("Sol")
+    assert not store.contains("BONK")
+
+
+def test_concurrent_adds_admit_each_token_once(store_factory):
+    store = store_factory()
+    wins = []
+
+    def worker():
+        wins.extend(t for t in (f"T{i}" for i in range(200)) if store.add(t))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(wins) == sorted(f"T{i}" for i in range(200))
+    store.flush()
+    assert len(store) == 200
+    assert store.stats()["batches"] < 200               # group commit shared fsyncs
+
+
+def test_reopen_sees_flushed_tokens(store_factory):
+    store = store_factory()
+    for t in ("A", "B", "C"):
+        store.add(t)
+    store.close()
+    reopened = store_factory()
+    assert all(reopened.contains(t) for t in ("A", "B", "C"))
+    assert len(reopened) == 3
+
+
+def test_sqlite_bloom_front(tmp_path):
+    store = SQLiteTradeStore(tmp_path / "t.db")
+    store.add("KNOWN", durable=True)
+    store.close()
+    store = SQLiteTradeStore(tmp_path / "t.db", bloom_capacity=1000)
+    store.add("EARLY")                                  # may land before the background fill finishes
+    assert store.bloom_ready.wait(5)
+    assert store.contains("KNOWN") and "KNOWN" in store.bloom and "EARLY" in store.bloom
+    assert not store.contains("UNKNOWN")
+    store.add("NEW")
+    assert "NEW" in store.bloom
+    store.close()
+
+
+def test_sqlite_len_counts_each_token_once(tmp_path):
+    store = SQLiteTradeStore(tmp_path / "t.db")
+    store.add("A", durable=True)
+    store.add("B")
+    store._pending.add("A")                             # committed, not yet dropped from pending
+    assert len(store) == 2
+    store.add("C")
+    assert len(store) == 3
+    store.close()
+
+
+def test_failed_commit_reaches_waiters_and_is_retried(tmp_path):
+    store = SQLiteTradeStore(tmp_path / "t.db")
+    store._committer.retry_delay = 0.01
+    write, calls = store._write_batch, []
+
+    def flaky(tokens):
+        calls.append(list(tokens))
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("disk I/O error")
+        write(tokens)
+
+    store._committer._write_batch = flaky
+    with pytest.raises(sqlite3.OperationalError):
+        store.add("LOST?", durable=True)
+    assert store.contains("LOST?")                      # still remembered, and still pending
+    store.flush()
+    assert calls[-1] == ["LOST?"] and not store._pending
+    assert store.stats()["failed_commits"] == 1
+    store.close()
+    reopened = SQLiteTradeStore(tmp_path / "t.db")
+    assert reopened.contains("LOST?")
+    reopened.close()
+
+
+def test_legacy_file_is_imported_once(tmp_path):
+    legacy = tmp_path / "traded_tokens.txt"
+    legacy.write_text("USDC\nFARTCOIN \n\nSOL\n", encoding="utf-8")
+    store = open_trade_store("sqlite", tmp_path / "t.db", legacy_file=legacy)
+    assert len(store) == 3 and store.contains("FARTCOIN")
+    store.close()
+
+
+def test_log_store_truncates_torn_tail_and_compacts(tmp_path):
+    path = tmp_path / "trades.txt"
+    path.write_bytes(b"A\nB\nA\nA\nA\nPARTI")
+    store = LogTradeStore(path)
+    assert store.contains("A") and store.contains("B")
+    assert not store.contains("PARTI")
+    store.add("C", durable=True)
+    store.close()
+    assert path.read_text().splitlines() == ["A", "B", "C"]
+
+
+CRASH_SCRIPT = """
+import os, sys
+from bot.trade_store import open_trade_store
+store = open_trade_store(sys.argv[1], sys.argv[2], commit_delay=0.001)
+for i in range(int(sys.argv[3])):
+    store.add(f"T{i}", durable=True)
+    print(i, flush=True)
+for i in range(1000):
+    store.add(f"LOST{i}")                      # not durable – may or may not survive
+os._exit(1)                                    # crash: no close(), no flush()
+"""
+
+
+@pytest.mark.parametrize("backend,name", [("sqlite", "t.db"), ("log", "t.txt")])
+def test_durable_adds_survive_crash(tmp_path, backend, name):
+    path = tmp_path / name
+    proc = subprocess.run(
+        [sys.executable, "-c", CRASH_SCRIPT, backend, str(path), "50"],
+        cwd=ROOT, capture_output=True, text=True, timeout=60,
+    )
+    acknowledged = len(proc.stdout.split())
+    assert acknowledged == 50, proc.stderr
+
+    store = open_trade_store(backend, path)
+    assert all(store.contains(f"T{i}") for i in range(acknowledged))
+    # whatever partially made it to disk is whole records only
+    assert len(store) <= 1050
+    store.add("AFTER", durable=True)
+    store.close()
+    assert open_trade_store(backend, path).contains("AFTER")
+
+
+def test_brain_trade_memory_is_kept_out_of_the_data_dir(tmp_path):
+    from bot import brain
+
+    assert brain.remember_trade("MintX") and brain.was_already_traded("MintX")
+    brain.trade_store.flush()
+    assert (tmp_path / "traded_tokens.db").exists()
+    assert not (ROOT / "data" / "traded_tokens.db").exists()
@@ -0,0 +1,351 @@
+# bot/trade_store.py – durable, thread-safe memory of already-traded tokens
+"""
+Pluggable backends behind one small API:
+
+    store.add(token, durable=False) -> bool   # atomic check-and-insert
+    store.contains(token) -> bool
+    store.flush() / store.close()
+
+  • ``SQLiteTradeStore`` – WAL-mode SQLite, indexed primary key; nothing is
+    loaded at startup, so opening stays instant with millions of tokens.
+    An optional Bloom filter answers most "never traded" lookups without
+    touching the database; it is filled from the table on a background
+    thread, and lookups go to the index until it is ready.
+  • ``LogTradeStore`` – the legacy one-token-per-line text file, kept as an
+    append-only log with torn-tail recovery and compaction of duplicates.
+
+Writes go through a group committer: a background thread batches every
+add that arrives within ``commit_delay`` and makes them durable with one
+fsync.  ``add(durable=True)`` blocks until its batch has been committed
+and raises if that write failed; the tokens of a failed batch stay pending
+and are written again with the next one.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+from loguru import logger
+
+from utils.bloom import BloomFilter
+
+
+class _Ack(threading.Event):
+    """Set once the batch holding a waiter's entry was written – ``error`` says if that failed."""
+
+    error: Exception | None = None
+
+
+class _GroupCommitter:
+    """Collects pending tokens and hands them to ``write_batch`` in batches."""
+
+    def __init__(
+        self,
+        write_batch: Callable[[List[str]], None],
+        max_batch: int = 1024,
+        commit_delay: float = 0.002,
+        retry_delay: float = 1.0,
+    ) -> None:
+        self._write_batch = write_batch
+        self.max_batch = max_batch
+        self.commit_delay = commit_delay
+        self.retry_delay = retry_delay
+        self._queue: List[Tuple[str | None, _Ack | None]] = []
+        self._retry: List[str] = []                   # tokens of a failed batch, written again with the next one
+        self._cond = threading.Condition()
+        self._closing = False
+        self.batches = 0
+        self.committed = 0
+        self.failures = 0
+        self._thread = threading.Thread(target=self._run, name="TradeStoreCommitter", daemon=True)
+        self._thread.start()
+
+    def submit(self, token: str | None, wait: bool = False) -> None:
+        """Queue ``token``; with ``wait``, block until it is written and re-raise if that failed."""
+        done = _Ack() if wait else None
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("trade store is closed")
+            self._queue.append((token, done))
+            self._cond.notify()
+        if done is not None:
+            done.wait()
+            if done.error is not None:
+                raise done.error
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                # a failed batch is retried after ``retry_delay`` even if nothing new arrives
+                self._cond.wait_for(lambda: self._queue or self._closing,
+                                    timeout=self.retry_delay if self._retry else None)
+                if not self._queue and not self._retry:
+                    return
+                # linger briefly so concurrent adds share one fsync
+                self._cond.wait_for(lambda: len(self._queue) >= self.max_batch or self._closing, timeout=self.commit_delay)
+                batch, self._queue = self._queue[:self.max_batch], self._queue[self.max_batch:]
+                closing = self._closing
+
+            tokens = self._retry + [t for t, _ in batch if t is not None]
+            error = None
+            if tokens:
+                try:
+                    self._write_batch(tokens)
+                    self.batches += 1
+                    self.committed += len(tokens)
+                    self._retry = []
+                except Exception as e:
+                    error = e
+                    self.failures += 1
+                    self._retry = tokens
+                    logger.error(f"❌ Trade store commit of {len(tokens)} token(s) failed: {e}")
+                    if closing:
+                        logger.error(f"❌ Trade store closing – {len(tokens)} token(s) were not persisted")
+                        self._retry = []
+            for _, done in batch:
+                if done is not None:
+                    done.error = error
+                    done.set()
+
+    def flush(self) -> None:
+        self.submit(None, wait=True)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
+        self._thread.join()
+
+
+class TradeStore(ABC):
+    def __init__(self, commit_delay: float = 0.002, max_batch: int = 1024) -> None:
+        self._lock = threading.RLock()
+        self._committer = _GroupCommitter(self._write_batch, max_batch=max_batch, commit_delay=commit_delay)
+
+    # ─────────────── public API ───────────────
+    def add(self, token: str, durable: bool = False) -> bool:
+        """Record ``token``; False if it was already known. Safe from any thread."""
+        token = token.strip().upper()
+        with self._lock:
+            if self._contains(token):
+                return False
+            self._remember(token)
+            self._committer.submit(token)
+        if durable:
+            self._committer.flush()
+        return True
+
+    def contains(self, token: str) -> bool:
+        with self._lock:
+            return self._contains(token.strip().upper())
+
+    def flush(self) -> None:
+        """Block until every add so far is on disk."""
+        self._committer.flush()
+
+    def close(self) -> None:
+        self._committer.close()
+        self._close()
+
+    def stats(self) -> dict:
+        return {"tokens": len(self), "batches": self._committer.batches, "committed": self._committer.committed,
+                "failed_commits": self._committer.failures}
+
+    def __contains__(self, token: str) -> bool:
+        return self.contains(token)
+
+    # ─────────────── backend hooks ───────────────
+    @abstractmethod
+    def _contains(self, token: str) -> bool: ...
+
+    @abstractmethod
+    def _remember(self, token: str) -> None:
+        """Make ``token`` visible to lookups before it is committed."""
+
+    @abstractmethod
+    def _write_batch(self, tokens: List[str]) -> None:
+        """Durably persist ``tokens`` (runs on the committer thread)."""
+
+    @abstractmethod
+    def _close(self) -> None: ...
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+
+# ─────────────────────── SQLite (WAL) ───────────────────────
+class SQLiteTradeStore(TradeStore):
+    def __init__(self, path: Path | str, bloom_capacity: int = 0, **kw) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._reader = self._connect()
+        self._reader.executescript(
+            "CREATE TABLE IF NOT EXISTS traded (token TEXT PRIMARY KEY, ts REAL NOT NULL) WITHOUT ROWID;"
+        )
+        self._writer = self._connect()
+        self._pending: set[str] = set()
+        self._count: int | None = None                # COUNT(*) once, on first len(); then kept up to date
+        self.bloom: BloomFilter | None = None
+        self.bloom_ready = threading.Event()
+        self._bloom_backlog: List[str] | None = None
+        self._bloom_thread: threading.Thread | None = None
+        super().__init__(**kw)
+        if bloom_capacity:
+            self._bloom_backlog = []
+            self._bloom_thread = threading.Thread(
+                target=self._build_bloom, args=(bloom_capacity,), name="TradeStoreBloom", daemon=True
+            )
+            self._bloom_thread.start()
+        else:
+            self.bloom_ready.set()
+
+    def _build_bloom(self, capacity: int) -> None:
+        """Fill a Bloom filter from the table off the caller's path; lookups use the index meanwhile."""
+        bloom = BloomFilter(capacity)
+        conn = self._connect()
+        try:
+            for (token,) in conn.execute("SELECT token FROM traded"):
+                bloom.add(token)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Trade store Bloom filter not built ({e}) – every lookup uses the index")
+            return
+        finally:
+            conn.close()
+        with self._lock:                              # adds made during the scan may have missed it
+            bloom.update(self._bloom_backlog or ())
+            self._bloom_backlog = None
+            self.bloom = bloom
+        self.bloom_ready.set()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")
+        return conn
+
+    def _contains(self, token: str) -> bool:
+        if token in self._pending:
+            return True
+        if self.bloom is not None and token not in self.bloom:
+            return False
+        return self._reader.execute("SELECT 1 FROM traded WHERE token = ?", (token,)).fetchone() is not None
+
+    def _remember(self, token: str) -> None:
+        self._pending.add(token)
+        if self.bloom is not None:
+            self.bloom.add(token)
+        elif self._bloom_backlog is not None:
+            self._bloom_backlog.append(token)
+        if self._count is not None:
+            self._count += 1                          # _contains said it is new
+
+    def _write_batch(self, tokens: List[str]) -> None:
+        now = time.time()
+        with self._writer:                                  # one transaction = one WAL fsync
+            self._writer.execute("BEGIN")
+            self._writer.executemany("INSERT OR IGNORE INTO traded VALUES (?, ?)", [(t, now) for t in tokens])
+        with self._lock:
+            self._pending.difference_update(tokens)
+
+    def import_tokens(self, tokens: List[str]) -> int:
+        """Bulk-load (e.g. the legacy text file); returns how many were new."""
+        return sum(self.add(t) for t in tokens if t.strip())
+
+    def _close(self) -> None:
+        if self._bloom_thread is not None:
+            self._bloom_thread.join()
+        self._writer.close()
+        self._reader.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._count is None:
+                # a pending token may already be committed (the committer drops it after the COMMIT)
+                committed = self._reader.execute("SELECT COUNT(*) FROM traded").fetchone()[0]
+                unwritten = sum(
+                    self._reader.execute("SELECT 1 FROM traded WHERE token = ?", (t,)).fetchone() is None
+                    for t in self._pending
+                )
+                self._count = committed + unwritten
+            return self._count
+
+
+# ─────────────────── append-only text log ───────────────────
+class LogTradeStore(TradeStore):
+    def __init__(self, path: Path | str, compact_ratio: float = 0.5, **kw) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tokens: set[str] = set()
+        lines = self._recover()
+        if lines and (lines - len(self._tokens)) / lines > compact_ratio:
+            self.compact()
+        self._fh = self.path.open("ab")
+        super().__init__(**kw)
+
+    def _recover(self) -> int:
+        """Load the log, cutting off a torn (newline-less) tail from a crash."""
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            return 0
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            logger.warning(f"📁 Dropping torn trailing record in {self.path}")
+            with self.path.open("r+b") as f:
+                f.truncate(end)
+        lines = 0
+        for raw in data[:end].splitlines():
+            token = raw.decode("utf-8", errors="replace").strip().upper()
+            if token:
+                self._tokens.add(token)
+                lines += 1
+        return lines
+
+    def compact(self) -> None:
+        """Rewrite the log with one line per token (atomic rename)."""
+        tmp = self.path.with_suffix(self.path.suffix + ".compact")
+        with tmp.open("wb") as f:
+            f.write("".join(t + "\n" for t in sorted(self._tokens)).encode())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        logger.debug(f"📁 Compacted {self.path} to {len(self._tokens)} tokens")
+
+    def _contains(self, token: str) -> bool:
+        return token in self._tokens
+
+    def _remember(self, token: str) -> None:
+        self._tokens.add(token)
+
+    def _write_batch(self, tokens: List[str]) -> None:
+        self._fh.write("".join(t + "\n" for t in tokens).encode())
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def _close(self) -> None:
+        self._fh.close()
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+
+def open_trade_store(backend: str, path: Path | str, legacy_file: Path | str | None = None, **kw) -> TradeStore:
+    """Open the configured backend, importing the legacy text file into SQLite once."""
+    if backend == "log":
+        return LogTradeStore(path, **kw)
+    if backend != "sqlite":
+        raise ValueError(f"unknown trade store backend: {backend!r}")
+
+    store = SQLiteTradeStore(path, **kw)
+    if legacy_file and len(store) == 0 and Path(legacy_file).exists():
+        tokens = Path(legacy_file).read_text(encoding="utf-8").splitlines()
+        imported = store.import_tokens(tokens)
+        store.flush()
+        logger.info(f"📁 Imported {imported} traded token(s) from {legacy_file}")
+    return store
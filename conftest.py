@@ -0,0 +1,20 @@
+# conftest.py – shared test fixtures
+"""
+  • every test gets its own trade memory under ``tmp_path`` – a test that
+    reaches ``load_traded_tokens`` must not create or read
+    ``data/traded_tokens.db`` (or import the real ``traded_tokens.txt``)
+"""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def trade_store_in_tmp(tmp_path, monkeypatch):
+    from bot import brain
+
+    monkeypatch.setattr(brain, "TRADED_DB", str(tmp_path / "traded_tokens.db"))
+    monkeypatch.setattr(brain, "TRADED_FILE", str(tmp_path / "traded_tokens.txt"))
+    monkeypatch.setattr(brain, "trade_store", None)
+    yield
+    if brain.trade_store is not None:
+        brain.trade_store.close()
@@ -1,6 +1,9 @@
 # main.py  – AshBorn core launcher
 
-import os, threading, asyncio
+import time
+BOOT = time.perf_counter()
+
+import os, sys, asyncio, argparse
 from datetime import datetime
 from dotenv import load_dotenv
 from loguru import logger
@@ -15,70 +18,90 @@ except ImportError:  # safe fallback if colorama missing
     Fore = Style = Dummy()
 # ───────────────────────────────────────────────────
 
-from bot.realtime      import watch_command_file         # 🔁 command.txt watcher
-from bot.telegram_bot  import start_telegram_bot         # 📲 Telegram listener
-from sniffers.alpha_sniffer import start_sniffer_loop         # 🔎 Solana token watcher
-from bot.brain         import launch_background_tasks    # 🧠 Alpha-Brain loop
+# Components (Telegram, sniffer, brain, command file, tracing) are declared in
+# bot/components.py and imported only when enabled – see ENABLE_* in .env
+from bot.components    import describe, load_enabled, shutdown_hooks
+from bot.supervisor    import Supervisor                 # 🧭 single-loop task supervisor
+from utils.importprof  import LISTENING
 
 # ── ENV ─────────────────────────────────────────────
 load_dotenv()
 BOT_NAME  = os.getenv("BOT_NAME", "AshBorn")
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+COLD_START_BUDGET_MS = float(os.getenv("COLD_START_BUDGET_MS", "1000"))
 # ────────────────────────────────────────────────────
 
 # ── Logger ──────────────────────────────────────────
-logger.remove()
-logger.add(lambda msg: print(msg, end=""), level=LOG_LEVEL)
+# console + logs/ashborn.log (LOG_JSON=1 → ashborn.jsonl), written off-thread;
+# imported here so the LOG_* settings from .env are already loaded
+from utils.logger import setup_logging, shutdown_logging
+setup_logging(LOG_LEVEL)
 # ────────────────────────────────────────────────────
 
 
-def _start_telegram_thread() -> None:
-    """Runs Telegram polling in its own daemon thread."""
-    threading.Thread(
-        target=start_telegram_bot,
-        name="TelegramThread",
-        daemon=True
-    ).start()
-
-
-def _start_sniffer_thread() -> None:
-    """
-    Runs the async alpha-sniffer loop in its own daemon thread
-    *and* schedules the Brain’s alpha-watcher on the same loop.
-    """
-    def _runner() -> None:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-        # ── 🧠 Schedule Brain watcher on this loop ──
-        launch_background_tasks(loop)
-
-        # ── 🔎 Run sniffer loop forever ─────────────
-        loop.run_until_complete(start_sniffer_loop())
-
-    threading.Thread(
-        target=_runner,
-        name="SnifferThread",
-        daemon=True
-    ).start()
+async def run(check: bool = False) -> None:
+    """Every enabled component as a supervised task on this one loop; SIGTERM drains them."""
+    loaded = load_enabled()
+    supervisor = Supervisor(drain_timeout=float(os.getenv("SHUTDOWN_TIMEOUT", "10")))
+    for item in loaded:
+        supervisor.add(item.component.name, item.factory)
+    for hook in shutdown_hooks(loaded):              # drain orders, flush trade memory, close clients
+        supervisor.on_shutdown(hook)
+
+    def listening() -> None:
+        logger.info(
+            f"🟢 [{BOT_NAME}] listening after {(time.perf_counter() - BOOT) * 1000:.0f} ms "
+            f"– component imports (ms): {describe(loaded)}"
+        )
+        if check:
+            print(LISTENING, flush=True)
+            supervisor.request_stop()
+
+    await supervisor.run(on_started=listening)
+
+
+def profile(args: argparse.Namespace) -> int:
+    """``--importtime`` / ``--cold-start`` reports; non-zero exit when over budget."""
+    from utils.importprof import measure_cold_start, profile_imports, summarize
+
+    if args.importtime:
+        here = os.path.dirname(os.path.abspath(__file__))
+        records = profile_imports(f"import sys; sys.path.insert(0, {here!r}); "
+                                  "import main, bot.components as c; c.load_enabled()")
+        print(summarize(records))
+    if args.cold_start:
+        runs = [measure_cold_start([sys.executable, os.path.abspath(__file__), "--check"])[0]
+                for _ in range(args.repeat)]
+        best, worst = min(runs), max(runs)
+        verdict = "within" if worst <= args.budget_ms else "OVER"
+        print(f"\ncold start → listening: best {best:.0f} ms, worst {worst:.0f} ms "
+              f"({verdict} budget of {args.budget_ms:.0f} ms, {args.repeat} runs)")
+        return 0 if worst <= args.budget_ms else 1
+    return 0
 
 
 def main() -> None:
     """AshBorn boot sequence."""
+    ap = argparse.ArgumentParser(description="AshBorn core launcher")
+    ap.add_argument("--check", action="store_true", help="boot until listening, then shut down cleanly")
+    ap.add_argument("--importtime", action="store_true", help="-X importtime summary of the enabled components")
+    ap.add_argument("--cold-start", action="store_true", help="time fresh processes until they are listening")
+    ap.add_argument("--budget-ms", type=float, default=COLD_START_BUDGET_MS)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    if args.importtime or args.cold_start:
+        sys.exit(profile(args))
+
     logger.info(
         Fore.CYAN +
         f"\n🤖 [{BOT_NAME}] is waking up at {datetime.now().isoformat()} …\n" +
         Style.RESET_ALL
     )
-
-    # 1️⃣  Telegram remote-control interface
-    _start_telegram_thread()
-
-    # 2️⃣  Alpha-Sniffer + Brain alpha-watcher
-    _start_sniffer_thread()
-
-    # 3️⃣  Local command-file watcher (blocks forever)
-    watch_command_file()   # <— continuous loop
+    try:
+        asyncio.run(run(check=args.check))
+    finally:
+        shutdown_logging()                           # write out whatever is still queued
 
 
 # ── Entry-point guard ──────────────────────────────
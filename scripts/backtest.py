@@ -0,0 +1,94 @@
+# scripts/backtest.py – parameter sweep of the BirdEye shortlist over recorded snapshots
+"""
+Usage:  python -m scripts.backtest [--archive archives] [--liquidity 5000 10000 20000]
+                                   [--volume 25000 50000 100000] [--top 10] [--horizon 3600]
+                                   [--since 2025-01-01] [--until 2025-02-01] [--best 15]
+                                   [--fill recorded|amm] [--amount 0.2]
+        python -m scripts.backtest --synthetic 10000 --archive /tmp/synthetic   # random-walk archive
+
+Replays the archive once for the whole grid (see ``bot.backtest.sweep``) and
+prints the best parameter sets by P&L.  ``--fill amm`` enters through each
+token's constant-product pool (fee + slippage on ``--amount`` SOL priced at
+``PAPER_QUOTE_USD``, like the live paper buyer) instead of at the recorded
+price.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from bot.backtest import amm_fill, grid, recorded_fill, sweep
+from scripts.bench_token_filter import synthetic_tokens
+from sniffers.snapshot_archive import SnapshotArchive, SnapshotRecorder
+
+
+def _ts(value: str | None) -> float | None:
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp() if value else None
+
+
+def write_synthetic(directory: Path, snapshots: int, tokens: int, interval: float = 60.0, seed: int = 1) -> None:
+    """Random-walk prices/volumes over a churning universe – for trying the engine without history."""
+    rng = random.Random(seed)
+    universe = synthetic_tokens(tokens, seed)
+    for t in universe:
+        t["price"] = t["mc"] / 1e6
+    recorder = SnapshotRecorder(directory)
+    start = time.time() - snapshots * interval
+    for s in range(snapshots):
+        for t in rng.sample(universe, max(1, tokens // 50)):          # ~2 % listings churn per snapshot
+            t.update(address=f"Mint{s}-{rng.random():.12f}", symbol=f"S{s}", mc=rng.lognormvariate(9, 2.5))
+            t["price"] = t["mc"] / 1e6
+        for t in universe:
+            step = rng.gauss(0, 0.02)
+            t["price"] *= 1 + step
+            t["mc"] *= 1 + step
+            t["v24hUSD"] *= 1 + rng.gauss(0, 0.05)
+        recorder.append(universe, start + s * interval)
+    print(f"wrote {recorder.snapshots} snapshots ({recorder.bytes_written / 2**20:.1f} MB) → {directory}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--archive", type=Path, default=Path("archives"))
+    ap.add_argument("--liquidity", type=float, nargs="+", default=[5_000, 10_000, 20_000, 50_000])
+    ap.add_argument("--volume", type=float, nargs="+", default=[25_000, 50_000, 100_000, 250_000])
+    ap.add_argument("--top", type=int, nargs="+", default=[10])
+    ap.add_argument("--horizon", type=float, nargs="+", default=[3600.0])
+    ap.add_argument("--amount", type=float, default=0.20,
+                    help="order size in SOL; --fill amm prices it at PAPER_QUOTE_USD USD per SOL")
+    ap.add_argument("--since")
+    ap.add_argument("--until")
+    ap.add_argument("--best", type=int, default=15)
+    ap.add_argument("--synthetic", type=int, metavar="SNAPSHOTS")
+    ap.add_argument("--tokens", type=int, default=2_000)
+    ap.add_argument("--fill", choices=["recorded", "amm"], default="recorded")
+    args = ap.parse_args()
+
+    if args.synthetic:
+        write_synthetic(args.archive, args.synthetic, args.tokens)
+
+    params = grid(args.liquidity, args.volume, args.top, args.horizon, args.amount)
+    with SnapshotArchive(args.archive) as archive:
+        stats = archive.stats()
+        print(f"{stats['snapshots']} snapshots over {stats['span_s'] / 86400:.1f} days "
+              f"({stats['bytes'] / 2**20:.1f} MB, {stats['segments']} segments) × {len(params)} parameter sets")
+        started = time.perf_counter()
+        fill = amm_fill if args.fill == "amm" else recorded_fill
+        results = sweep(archive.between(_ts(args.since), _ts(args.until)), params, fill=fill)
+        elapsed = time.perf_counter() - started
+
+    print(f"replayed in {elapsed:.1f}s\n")
+    print(f"{'liquidity':>10} {'v24hUSD':>10} {'top':>4} {'horizon':>8} {'trades':>7} {'open':>5} "
+          f"{'hit':>6} {'mean':>8} {'pnl':>10} {'roi':>8}")
+    for r in sorted((r.as_dict() for r in results), key=lambda d: d["pnl"], reverse=True)[:args.best]:
+        print(f"{r['min_liquidity']:>10,.0f} {r['min_v24h_usd']:>10,.0f} {r['top']:>4} {r['horizon_s']:>8,.0f} "
+              f"{r['trades']:>7} {r['open']:>5} {r['hit_rate']:>6.1%} {r['mean_return']:>+8.2%} "
+              f"{r['pnl']:>+10.4f} {r['roi']:>+8.2%}")
+
+
+if __name__ == "__main__":
+    main()
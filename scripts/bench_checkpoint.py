@@ -0,0 +1,133 @@
+# scripts/bench_checkpoint.py – warm-restart and status-region costs
+"""
+Usage:  python -m scripts.bench_checkpoint [--keys 100000] [--events 1024] [--ticks 720] [--reads 20000]
+
+Builds the state a long-running bot carries – ``--keys`` mint addresses in
+both the brain's and the sniffer's seen windows (first seen over the last
+hours, one batch per checkpoint tick) and, when it goes down, a burst of
+``--events`` queued alpha events – checkpoints it, then restarts from the
+file.  Reported:
+
+  checkpoint   µs per incremental tick (new keys + a moved queue), file size
+  restore      ms from reading the file to the last key / event re-added
+  region       µs per status publish (writer) and per read (seqlock copy +
+               decode) on a synthetic STATUS snapshot
+
+Everything writes into a temporary directory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from bot.alpha_bus import AlphaBus
+from bot.checkpoint import Checkpointer
+from bot.status_region import StatusReader, StatusRegion
+from utils.dedupe import make_dedupe
+
+
+class FakeClock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _process(path: Path, clock, events: int):
+    ckpt = Checkpointer(path, clock=clock)
+    bus = AlphaBus(maxsize=max(1, events))
+    brain_seen, sniffer_seen = make_dedupe(window=86_400), make_dedupe(window=86_400)
+    ckpt.track_bus("alpha_queue", bus)
+    ckpt.track_dedupe("brain.seen", brain_seen)
+    ckpt.track_dedupe("sniffer.seen", sniffer_seen)
+    return ckpt, bus, brain_seen, sniffer_seen
+
+
+def bench_checkpoint(root: Path, keys: int, events: int, ticks: int) -> None:
+    path = root / "ashborn.ckpt"
+    clock = FakeClock(time.time() - ticks * 5)
+    ckpt, bus, brain_seen, sniffer_seen = _process(path, clock, events)
+    ckpt.restore()
+    per_tick = max(1, keys // ticks)
+    took = []
+    for t in range(ticks):
+        for i in range(t * per_tick, (t + 1) * per_tick):
+            mint = f"Mint{i:08d}So1anaAddre55xxxxxxxxxxxxxxxx"
+            brain_seen.check_and_add(mint)
+            sniffer_seen.check_and_add(mint)
+        bus.put({"symbol": f"T{t}", "name": f"Token {t}", "address": f"Mint{t:08d}", "kind": "new_listing",
+                 "payload": {"liquidity": 25_000.0, "price": 0.0012, "mc": 1.2e6}})
+        if t % 2:
+            bus.drain()                           # the brain keeps up: the queue is mostly empty
+        started = time.perf_counter()
+        ckpt.checkpoint()
+        took.append(time.perf_counter() - started)
+        clock.now += 5
+    for t in range(events):                       # then a burst is queued when the bot goes down
+        bus.put({"symbol": f"Q{t}", "name": f"Queued {t}", "address": f"QMint{t:08d}", "kind": "new_listing",
+                 "payload": {"liquidity": 25_000.0, "price": 0.0012, "mc": 1.2e6}})
+    ckpt.checkpoint()
+    size = path.stat().st_size
+    print(f"checkpoint  {statistics.median(took) * 1e6:8.0f} µs median tick "
+          f"({per_tick} new keys × 2 + queue), max {max(took) * 1e3:.1f} ms, "
+          f"file {size / 1024:.0f} KiB for {ticks * per_tick:,} keys × 2 + {events} events")
+
+    runs = []
+    for _ in range(3):
+        warm, bus2, seen2, _ = _process(path, clock, events)
+        started = time.perf_counter()
+        warm.restore()
+        runs.append(time.perf_counter() - started)
+    print(f"restore     {min(runs) * 1e3:8.1f} ms best of 3 → {warm.stats()['restored']}, "
+          f"queue depth {len(bus2)}, {len(seen2):,} brain keys")
+
+
+def bench_region(root: Path, reads: int) -> None:
+    snap = {
+        "queue": {"depth": 3, "maxsize": 1024, "high_water": 40, "pushed": 900, "consumed": 897},
+        "executor": {"queued": 1, "filled": 12, "skipped": 3, "failed": 0},
+        "positions": {"open": 16, "cost": 10.0, "value": 12.5, "unrealized": 2.5, "realized": -0.25},
+        "birdeye": {"limiter": {"per_minute": 300, "tokens": 41.5, "granted": 1200}},
+        "latency": {s: {"count": 100, "p50_ms": 1.0, "p95_ms": 2.0, "p99_ms": 3.0, "max_ms": 4.0}
+                    for s in ("sniffer", "queue", "analyze", "handle", "executor", "buyer", "end_to_end")},
+        "top": [{"token": f"TOK{i}", "amount": 100.0, "entry_price": 0.01, "last_price": 0.011, "unrealized": 0.1}
+                for i in range(16)],
+    }
+    region = StatusRegion(root / "ashborn.status")
+    reader = StatusReader(root / "ashborn.status")
+    started = time.perf_counter()
+    for _ in range(reads):
+        region.publish(snap)
+    publish = (time.perf_counter() - started) / reads
+    started = time.perf_counter()
+    for _ in range(reads):
+        reader.read()
+    read = (time.perf_counter() - started) / reads
+    print(f"region      {publish * 1e6:8.1f} µs per publish, {read * 1e6:.1f} µs per read")
+    reader.close()
+    region.close()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--keys", type=int, default=100_000)
+    ap.add_argument("--events", type=int, default=1024)
+    ap.add_argument("--ticks", type=int, default=720)
+    ap.add_argument("--reads", type=int, default=20_000)
+    args = ap.parse_args()
+
+    logger.remove()
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_checkpoint(Path(tmp), args.keys, args.events, args.ticks)
+        bench_region(Path(tmp), args.reads)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# scripts/bench_fills.py – AMM fill simulator throughput (batch API vs one order at a time)
+"""
+Usage:  python -m scripts.bench_fills [--orders 10000 100000] [--repeat 5] [--amount 50]
+
+Synthetic tokenlist pools (``bench_token_filter.synthetic_tokens``, price =
+mc / 1e6), one buy of ``--amount`` USD into each.  Reported in orders/s:
+
+  per-order   ``Pool.buy`` in a loop – what a paper buy costs on its own
+  batch       ``simulate_buys`` over the columns (NumPy when installed,
+              pure Python otherwise – the backend is printed)
+  paper       ``PaperBuyer.buy_batch`` – the executor's path, pools kept
+              up to date, receipts built
+
+plus the share of orders filled / partial / rejected and the median
+slippage, as a sanity check on the synthetic pools.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+from loguru import logger
+
+from bot import amm
+from bot.amm import STATUS, Pool, simulate_buys
+from bot.buyer_engine import PaperBuyer
+from scripts.bench_token_filter import synthetic_tokens
+
+
+def best_of(repeat: int, fn) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--orders", type=int, nargs="+", default=[10_000, 100_000])
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--amount", type=float, default=50.0)
+    args = ap.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")                 # receipts are not logged in a stress run
+    print(f"backend: {'numpy' if amm.np is not None else 'pure python'}\n")
+    print(f"{'orders':>8} {'per-order/s':>12} {'batch/s':>12} {'paper/s':>12}   outcome")
+    for n in args.orders:
+        rows = synthetic_tokens(n)
+        for r in rows:
+            r["price"] = r["mc"] / 1e6
+        liquidity, price, amount = amm.columns(rows, args.amount)
+
+        def per_order():
+            for liq, p in zip(liquidity, price):
+                if liq > 0 and p > 0:
+                    Pool.from_snapshot(liq, p).buy(args.amount)
+
+        buyer = PaperBuyer(quote_usd=1.0, max_pools=n)                # amounts here are already USD
+        for r in rows:
+            buyer.observe(r["symbol"], r["liquidity"], r["price"], address=r["address"])
+        orders = [SimpleNamespace(token=r["symbol"], amount=args.amount, meta={"address": r["address"]}) for r in rows]
+
+        t_single = best_of(args.repeat, per_order)
+        t_batch = best_of(args.repeat, lambda: simulate_buys(liquidity, price, amount))
+        t_paper = best_of(args.repeat, lambda: buyer.buy_batch(orders))
+
+        fills = simulate_buys(liquidity, price, amount)
+        counts = {name: sum(1 for s in fills.status if STATUS[int(s)] == name) for name in STATUS}
+        slip = statistics.median(float(s) for s, st in zip(fills.slippage, fills.status) if st != amm.REJECTED)
+        print(f"{n:>8} {n / t_single:>12,.0f} {n / t_batch:>12,.0f} {n / t_paper:>12,.0f}   "
+              f"{counts['filled']} filled, {counts['partial']} partial, {counts['rejected']} rejected, "
+              f"median slippage {slip:+.2%}")
+
+
+if __name__ == "__main__":
+    main()
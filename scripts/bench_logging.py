@@ -0,0 +1,102 @@
+# scripts/bench_logging.py – per-event logging overhead: old print sink vs the background writer
+"""
+Usage:  python -m scripts.bench_logging [--events 20000] [--repeat 3]
+
+Logs ``--events`` INFO lines shaped like the hot path's (a BUY signal with a
+token, an amount and a dict) from one thread and reports, per setup:
+
+  caller µs    time the logging call itself takes – what the event loop pays
+  worst µs     the slowest single call (flushes, rotation, a slow disk)
+  total µs     until every line is on disk (writer drained, files closed)
+
+Setups:
+  before          the old ``main.py`` sink: ``print`` to stdout (a file here)
+  file-sync       loguru writing ``logs/ashborn.log`` itself, on the caller
+  loguru-enqueue  loguru's ``enqueue=True`` (pickled through a pipe)
+  after           ``setup_logging`` – console + rotating file on the writer thread
+  after-json      the same with ``LOG_JSON=1``
+  after-hot       ``hot(key)`` at the default sampling during the burst
+  below-level     a DEBUG call with the level at INFO – the floor
+
+Everything writes into a temporary directory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from utils import logger as logmod
+from utils.logger import Sampler, setup_logging, shutdown_logging
+
+CMD = {"action": "BUY", "token": "MOON", "amount": 0.2, "source": "alpha", "address": "MoonMint1111"}
+
+
+def _emit(n: int, use_hot: bool = False, level: str = "info") -> tuple[float, float]:
+    """Seconds spent in the calls, and the slowest single call."""
+    clock = time.perf_counter_ns
+    spent = worst = 0
+    for i in range(n):
+        t0 = clock()
+        if use_hot:
+            logmod.hot("bench").info("🚀 BUY signal → token={} amount={} ({}) {}", "MOON", 0.2, i, CMD)
+        else:
+            getattr(logger, level)("🚀 BUY signal → token={} amount={} ({}) {}", "MOON", 0.2, i, CMD)
+        took = clock() - t0
+        spent += took
+        worst = max(worst, took)
+    return spent / 1e9, worst / 1e9
+
+
+def run_setup(name: str, n: int, workdir: Path) -> tuple[float, float, float]:
+    workdir.mkdir(parents=True, exist_ok=True)
+    logger.remove()
+    with open(workdir / "console.txt", "w", encoding="utf-8") as console:
+        started = time.perf_counter()
+        if name == "before":
+            with contextlib.redirect_stdout(console):
+                logger.add(lambda msg: print(msg, end=""), level="INFO")
+                caller = _emit(n)
+                logger.remove()
+        elif name in ("file-sync", "loguru-enqueue"):
+            logger.add(workdir / "ashborn.log", level="INFO", enqueue=name == "loguru-enqueue")
+            caller = _emit(n)
+            logger.remove()                                  # joins loguru's queue worker
+        else:
+            setup_logging("INFO", log_dir=str(workdir), json_lines=name == "after-json", console=console)
+            if name == "after-hot":
+                logmod.sampler = Sampler()
+            caller = _emit(n, use_hot=name == "after-hot", level="debug" if name == "below-level" else "info")
+            shutdown_logging()
+        total = time.perf_counter() - started
+    return caller[0], caller[1], total
+
+
+SETUPS = ["before", "file-sync", "loguru-enqueue", "after", "after-json", "after-hot", "below-level"]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--events", type=int, default=20_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    print(f"{args.events} events, best of {args.repeat}\n")
+    print(f"{'setup':<16} {'caller µs':>10} {'worst µs':>10} {'total µs':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in SETUPS:
+            runs = [run_setup(name, args.events, Path(tmp) / f"{name}-{r}") for r in range(args.repeat)]
+            caller = min(r[0] for r in runs) / args.events * 1e6
+            worst = min(r[1] for r in runs) * 1e6
+            total = min(r[2] for r in runs) / args.events * 1e6
+            print(f"{name:<16} {caller:>10.2f} {worst:>10.0f} {total:>10.2f}")
+    logger.remove()
+
+
+if __name__ == "__main__":
+    main()
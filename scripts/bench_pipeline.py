@@ -0,0 +1,260 @@
+# scripts/bench_pipeline.py – offline sniffer → brain → buyer benchmark against the stub BirdEye
+"""
+Usage:  python -m scripts.bench_pipeline [--sizes 1000 10000 100000] [--passes 3]
+                                         [--fixture recorded_tokenlist.json]
+                                         [--save-baseline] [--compare] [--baseline PATH] [--tolerance 0.25] [--floor-ms 1]
+
+For every snapshot size the whole pipeline runs on one event loop, exactly as
+``main.py`` wires it – only BirdEye is replaced by ``sniffers.stub_birdeye``:
+
+  pass 1      baseline snapshot (top tokens announced)
+  pass 2..n   ``--churn`` of the universe replaced by fresh listings and as
+              many liquidity moves, so every pass produces real deltas
+
+Reported per size:
+  tokens/s       snapshot tokens streamed + diffed per second (mean over passes 2..n)
+  events/s       alpha events from sniff start until the last order is filled
+  fills          orders that reached the buyer
+  dropped        events the alpha bus had to drop
+  mem peak/grow  tracemalloc peak, and growth between pass 2 and the last pass
+  p50/p99        stage latencies from ``utils.tracing``
+
+Fixtures are synthetic by default; ``--fixture`` takes a recorded tokenlist
+(a raw ``/defi/tokenlist`` response or a plain JSON list of tokens), cycled
+with fresh addresses up to each size.  ``--save-baseline`` writes the results,
+``--compare`` diffs against them and exits 1 on a regression beyond
+``--tolerance``.  tracemalloc slows every run alike, so compare like with like.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+from scripts.bench_token_filter import synthetic_tokens
+
+DEFAULT_BASELINE = Path("logs/bench_pipeline_baseline.json")
+
+# metric → +1 when higher is better, -1 when lower is better
+DIRECTION = {
+    "tokens_per_s": +1,
+    "events_per_s": +1,
+    "mem_peak_mb": -1,
+    "mem_growth_mb": -1,
+}
+
+
+def load_fixture(path: Path | None, n: int, seed: int = 1) -> list[dict]:
+    if path is None:
+        return synthetic_tokens(n, seed)
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    recorded = raw["data"]["tokens"] if isinstance(raw, dict) else raw
+    out = []
+    for i in range(n):
+        token = dict(recorded[i % len(recorded)])
+        if i >= len(recorded):
+            token["address"] = f"{token.get('address', 'Mint')}-{i // len(recorded)}"
+        out.append(token)
+    return out
+
+
+def churn(tokens: list[dict], fraction: float, round_: int, rng: random.Random) -> list[dict]:
+    """Replace ``fraction`` of the universe by new listings and move liquidity on as many others."""
+    n = int(len(tokens) * fraction)
+    out = [dict(t) for t in tokens]
+    for i in rng.sample(range(len(out)), n):
+        out[i] = {**out[i], "address": f"New{round_}-{i}", "symbol": f"N{round_}X{i}",
+                  "mc": max(out[i].get("mc", 0), 50_000), "liquidity": max(out[i].get("liquidity", 0), 50_000)}
+    for i in rng.sample(range(len(out)), n):
+        out[i]["liquidity"] = (out[i].get("liquidity") or 1.0) * 20
+    return out
+
+
+def _configure_env(args: argparse.Namespace, base_url: str, workdir: str) -> None:
+    """Pipeline modules read these at import time."""
+    os.environ["BIRDEYE_BASE_URL"] = base_url
+    os.environ.setdefault("BIRDEYE_API_KEY", "bench")          # get_client() refuses to run without one
+    os.environ["SNAPSHOT_ARCHIVE_DIR"] = os.path.join(workdir, "archives")   # recording stays in the measured path
+    os.environ["BIRDEYE_TOKENLIST_TTL"] = "0"                 # every pass must hit the server
+    os.environ["BIRDEYE_MAX_TOKENS"] = str(max(args.sizes))
+    os.environ["BIRDEYE_PAGE_SIZE"] = str(args.page_size)
+    os.environ.setdefault("BIRDEYE_RPM", "1000000")          # the stub has no credit budget to protect
+    os.environ["TRACE_LATENCY"] = "1"
+
+
+async def _wait_idle(brain_mod, alpha_brain) -> None:
+    while len(brain_mod.ALPHA_QUEUE) or alpha_brain.screening or (brain_mod.executor and brain_mod.executor.pending()):
+        await asyncio.sleep(0.002)
+    if brain_mod.executor is not None:
+        await asyncio.to_thread(brain_mod.executor.stop, True)   # wait for in-flight buys
+        brain_mod.executor = None
+
+
+async def bench_size(n: int, args: argparse.Namespace, stub, workdir: Path) -> dict:
+    from bot import brain
+    from bot.trade_store import open_trade_store
+    from sniffers import alpha_sniffer
+    from sniffers.snapshot_diff import SnapshotStore
+    from utils.dedupe import make_dedupe
+    from utils.tracing import tracer
+
+    rng = random.Random(n)
+    universe = load_fixture(args.fixture, n)
+    stub.tokens, stub.version = universe, stub.version + 1
+
+    brain.trade_store = open_trade_store("sqlite", workdir / f"traded-{n}.db")
+    alpha_sniffer.snapshots = SnapshotStore()
+    alpha_sniffer.seen_symbols = make_dedupe()
+    bus_stats_before = brain.ALPHA_QUEUE.stats()
+    alpha_brain = brain.CommandBrain()
+    watcher = asyncio.create_task(alpha_brain.alpha_watcher_loop())
+
+    tracemalloc.start()
+    passes, mem_after = [], []
+    try:
+        for p in range(args.passes):
+            if p:
+                universe = churn(universe, args.churn, p, rng)
+                stub.tokens, stub.version = universe, stub.version + 1
+            if p == 1:
+                tracer.reset()
+                tracemalloc.reset_peak()
+            started = time.perf_counter()
+            events = await alpha_sniffer.sniff_once()
+            streamed = time.perf_counter()
+            await _wait_idle(brain, alpha_brain)
+            finished = time.perf_counter()
+            mem_after.append(tracemalloc.get_traced_memory()[0])
+            passes.append({"events": events, "sniff_s": streamed - started, "total_s": finished - started})
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        watcher.cancel()
+        brain.shutdown()
+
+    measured = passes[1:] or passes
+    events = sum(p["events"] for p in measured)
+    total_s = sum(p["total_s"] for p in measured)
+    bus = brain.ALPHA_QUEUE.stats()
+    fills = tracer.report().get("buyer", {}).get("count", 0)
+    return {
+        "tokens": n,
+        "tokens_per_s": n * len(measured) / sum(p["sniff_s"] for p in measured),
+        "events_per_s": events / total_s if total_s else 0.0,
+        "events": events,
+        "fills": fills,
+        "dropped": bus.get("dropped", 0) - bus_stats_before.get("dropped", 0),
+        "mem_peak_mb": peak / 2**20,
+        "mem_growth_mb": (mem_after[-1] - mem_after[min(1, len(mem_after) - 1)]) / 2**20,
+        "stages": tracer.report(),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float, floor_ms: float = 1.0) -> list[str]:
+    """Regressions beyond ``tolerance`` (relative) for the headline metrics and stage p99s.
+
+    Stage latencies below ``floor_ms`` are treated as ``floor_ms`` – sub-millisecond
+    jitter is not a regression."""
+    problems = []
+    for size, cur in results.items():
+        old = baseline.get("results", {}).get(size)
+        if old is None:
+            continue
+        checks = [(m, d, cur[m], old[m]) for m, d in DIRECTION.items()]
+        for stage, s in cur["stages"].items():
+            if stage in old["stages"]:
+                checks.append((f"{stage}.p99_ms", -1, max(s["p99_ms"], floor_ms),
+                               max(old["stages"][stage]["p99_ms"], floor_ms)))
+        for metric, direction, new, ref in checks:
+            if metric == "mem_growth_mb":
+                ref, new = max(ref, 1.0), max(new, 1.0)          # growth hovers around 0 – compare against 1 MB
+            if not ref:
+                continue
+            change = (new - ref) / abs(ref)
+            if change * direction < -tolerance:
+                problems.append(f"{size:>7} tokens  {metric:<22} {ref:>12.3f} → {new:>12.3f}  ({change:+.0%})")
+    return problems
+
+
+def print_results(results: dict) -> None:
+    print(f"{'tokens':>7} {'tokens/s':>10} {'events/s':>10} {'events':>7} {'fills':>6} {'dropped':>7} "
+          f"{'peak MB':>8} {'grow MB':>8}")
+    for r in results.values():
+        print(f"{r['tokens']:>7} {r['tokens_per_s']:>10.0f} {r['events_per_s']:>10.0f} {r['events']:>7} "
+              f"{r['fills']:>6} {r['dropped']:>7} {r['mem_peak_mb']:>8.1f} {r['mem_growth_mb']:>8.2f}")
+        for stage, s in r["stages"].items():
+            print(f"{'':>9}{stage:<11} n={s['count']:<7} p50={s['p50_ms']:>8.3f}ms  p99={s['p99_ms']:>8.3f}ms")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    ap.add_argument("--passes", type=int, default=3)
+    ap.add_argument("--churn", type=float, default=0.02)
+    ap.add_argument("--page-size", type=int, default=50)
+    ap.add_argument("--fixture", type=Path)
+    ap.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--compare", action="store_true")
+    ap.add_argument("--tolerance", type=float, default=0.25)
+    ap.add_argument("--floor-ms", type=float, default=1.0)
+    args = ap.parse_args()
+
+    from loguru import logger
+    from sniffers.stub_birdeye import StubBirdEye
+
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+
+    with StubBirdEye() as stub, tempfile.TemporaryDirectory() as tmp:
+        stub.default_price = 1.0                              # synthetic tokens carry no price: pass price sanity
+        _configure_env(args, stub.base_url, tmp)
+
+        async def run_all() -> dict:
+            from sniffers.bird_eye import close_client
+            out = {}
+            try:
+                for n in args.sizes:
+                    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                        out[str(n)] = await bench_size(n, args, stub, Path(tmp))
+            finally:
+                await close_client()
+            return out
+
+        results = asyncio.run(run_all())
+
+    print_results(results)
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps({
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "args": {"passes": args.passes, "churn": args.churn, "page_size": args.page_size,
+                     "fixture": str(args.fixture) if args.fixture else None},
+            "results": results,
+        }, indent=2), encoding="utf-8")
+        print(f"\nbaseline saved → {args.baseline}")
+    if args.compare:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        problems = compare(results, baseline, args.tolerance, args.floor_ms)
+        if problems:
+            print(f"\n❌ regressions vs {args.baseline} (tolerance {args.tolerance:.0%}):")
+            print("\n".join(problems))
+            sys.exit(1)
+        print(f"\n✅ no regressions vs {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# scripts/bench_token_filter.py – dict-by-dict filtering vs the columnar TokenTable
+"""
+Usage:  python -m scripts.bench_token_filter   (or python scripts/bench_token_filter.py)
+        [--sizes 50 100000 250000] [--repeat 5] [--sweep 50]
+
+Times both halves of a snapshot pass on synthetic tokenlists:
+  rank       – bird_eye.RANK_RULES + top-15 by bird_eye.RANK_COLUMN (v24hUSD, the live ranking)
+  shortlist  – liquidity/v24hUSD/name rules + blacklist          (brain)
+
+Columns reported:
+  legacy     – the old dict-by-dict filter chain + full sort, on the same column
+  build      – extracting the columns from the decoded JSON rows (once per snapshot)
+  query      – rank + shortlist on the built table
+  one-shot   – legacy / (build + query): a single pass over a fresh snapshot, which
+               is what the sniffer does each poll.  Below 1x the columnar path is
+               slower; it pays off only when a snapshot is queried more than once
+  sweep      – ``--sweep`` threshold variants of the shortlist over one snapshot
+               (legacy re-scans the dicts each time; columnar builds once)
+
+The first default size is the live snapshot (bird_eye.TOKENLIST_MAX_TOKENS).
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+if __package__ in (None, ""):                        # run as a file: make the repo root importable
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sniffers import token_table  # noqa: E402
+from sniffers.bird_eye import RANK_COLUMN, RANK_RULES, TOKENLIST_MAX_TOKENS  # noqa: E402
+from sniffers.token_table import Rule, RuleSet, TokenTable, top_k  # noqa: E402
+
+SHORTLIST = RuleSet(
+    [Rule("liquidity", ">=", 10_000), Rule("v24hUSD", ">=", 50_000)],
+    blacklist=("test", "fake", "scam"),
+    require=("name", "symbol"),
+)
+
+
+def synthetic_tokens(n: int, seed: int = 1) -> list[dict]:
+    rng = random.Random(seed)
+    words = ["Moon", "Pepe", "Bonk", "Cat", "Dog", "Test", "Fake", "Scam", "Wif", "Sol"]
+    return [
+        {
+            "address": f"Mint{i:08d}",
+            "symbol": f"T{i}",
+            "name": f"{rng.choice(words)} {rng.choice(words)} {i}",
+            "mc": rng.lognormvariate(9, 2.5),
+            "liquidity": rng.lognormvariate(8.5, 2.0),
+            "v24hUSD": rng.lognormvariate(9, 2.5),
+        }
+        for i in range(n)
+    ]
+
+
+def legacy(tokens: list[dict]) -> tuple[list[dict], list[dict]]:
+    filtered = [t for t in tokens if t.get("mc", 0) > 10_000 and t.get("liquidity", 0) > 10_000]
+    ranked = sorted(filtered, key=lambda x: x.get(RANK_COLUMN, 0), reverse=True)[:15]
+    shortlisted = []
+    for t in tokens:
+        if t["liquidity"] < 10_000:
+            continue
+        if t.get("v24hUSD", 0) < 50_000:
+            continue
+        if not t["name"] or not t["symbol"]:
+            continue
+        if any(s in t["name"].lower() for s in ["test", "fake", "scam"]):
+            continue
+        shortlisted.append(t)
+    return ranked, shortlisted
+
+
+def columnar(tokens: list[dict]) -> tuple[list[dict], list[dict]]:
+    table = TokenTable(tokens)
+    ranked = table.take(top_k(table, RANK_RULES.select(table), RANK_COLUMN, 15))
+    return ranked, table.take(SHORTLIST.select(table))
+
+
+def legacy_sweep(tokens: list[dict], thresholds: list[float]) -> list[int]:
+    return [
+        sum(1 for t in tokens if t["liquidity"] >= liq and t.get("v24hUSD", 0) >= 50_000) for liq in thresholds
+    ]
+
+
+def columnar_sweep(tokens: list[dict], thresholds: list[float]) -> list[int]:
+    table = TokenTable(tokens)
+    return [
+        len(RuleSet([Rule("liquidity", ">=", liq), Rule("v24hUSD", ">=", 50_000)]).select(table))
+        for liq in thresholds
+    ]
+
+
+def _build_all(tokens: list[dict]) -> TokenTable:
+    table = TokenTable(tokens)
+    for col in ("mc", "liquidity", "v24hUSD"):
+        table.numeric[col]
+    for col in ("name", "symbol"):
+        table.text[col]
+    return table
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[TOKENLIST_MAX_TOKENS, 100_000, 250_000])
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--sweep", type=int, default=50)
+    args = ap.parse_args()
+
+    engine = "numpy" if token_table.np is not None else "pure-python"
+    print(f"columnar engine: {engine}")
+    print(f"{'tokens':>8} {'legacy ms':>10} {'build ms':>9} {'query ms':>9} {'query x':>8} {'one-shot x':>11}"
+          f" {'sweep legacy ms':>16} {'sweep col ms':>13} {'sweep x':>8}")
+    for n in args.sizes:
+        tokens = synthetic_tokens(n)
+        assert legacy(tokens) == columnar(tokens), "engines disagree"
+        thresholds = [5_000 + 1_000 * i for i in range(args.sweep)]
+        assert legacy_sweep(tokens, thresholds) == columnar_sweep(tokens, thresholds), "sweeps disagree"
+
+        old = _best(lambda: legacy(tokens), args.repeat)
+        build = _best(lambda: _build_all(tokens), args.repeat)
+        table = TokenTable(tokens)
+        columnar_on = lambda: (  # noqa: E731
+            table.take(top_k(table, RANK_RULES.select(table), RANK_COLUMN, 15)),
+            table.take(SHORTLIST.select(table)),
+        )
+        columnar_on()                                   # warm every column once
+        query = _best(columnar_on, args.repeat)
+        sw_old = _best(lambda: legacy_sweep(tokens, thresholds), 1)
+        sw_new = _best(lambda: columnar_sweep(tokens, thresholds), 1)
+        print(f"{n:>8} {old * 1e3:>10.2f} {build * 1e3:>9.2f} {query * 1e3:>9.2f} {old / query:>7.1f}x"
+              f" {old / (build + query):>10.2f}x"
+              f" {sw_old * 1e3:>16.1f} {sw_new * 1e3:>13.1f} {sw_old / sw_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
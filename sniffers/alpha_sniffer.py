@@ -1,37 +1,140 @@
 # sniffers/alpha_sniffer.py
 
 import asyncio
-import time
-from sniffers.bird_eye import fetch_latest_tokens
-from bot.brain import push_alpha_event
+import os
+from contextlib import aclosing
+from loguru import logger
+from sniffers.bird_eye import (
+    ENDPOINT_TTLS, RANK_RULES, TOKENLIST_PATH, iter_tokenlist_pages, poll_scheduler, rank_tokens, rate_limiter,
+)
+from sniffers.snapshot_archive import SnapshotRecorder
+from sniffers.snapshot_diff import DeltaKind, SnapshotStore
+from sniffers.token_table import TokenTable
+from bot.brain import push_alpha_event_async
+from bot.checkpoint import checkpointer
+from utils.dedupe import make_dedupe
+from utils.logger import hot
+from utils.tracing import tracer
 
-# Track seen token addresses to avoid duplicates
-seen_symbols = set()
+# Track seen token addresses (bounded, sliding window) to avoid duplicates
+seen_symbols = make_dedupe()
+checkpointer.track_dedupe("sniffer.seen", seen_symbols)     # restored on a warm restart
 
-async def start_sniffer_loop(poll: int = 60):
-    """Periodically pull fresh tokens from BirdEye and push as alpha events."""
-    while True:
-        print("🔎 Sniffer: Fetching new tokens from BirdEye...")
-        try:
-            tokens = fetch_latest_tokens(limit=15)
+# Previous tokenlist snapshot, keyed by mint address
+snapshots = SnapshotStore(
+    liquidity_ratio=float(os.getenv("SNIFFER_LIQUIDITY_RATIO", "10")),
+    volume_ratio=float(os.getenv("SNIFFER_VOLUME_RATIO", "5")),
+)
+
+# Every snapshot is archived for replay / backtests (SNAPSHOT_RECORD=0 to disable)
+recorder = (
+    SnapshotRecorder(os.getenv("SNAPSHOT_ARCHIVE_DIR", "archives"))
+    if os.getenv("SNAPSHOT_RECORD", "1").lower() in ("1", "true", "yes") else None
+)
 
-            for token in tokens:
-                symbol = token.get("symbol")
-                name = token.get("name")
+# Poll cadence – adapted between these bounds by the shared BirdEye budget scheduler.
+# A poll inside the tokenlist cache TTL would get the cached snapshot back, see
+# nothing change and back off, so the floor is never below that TTL.
+SNIFFER_POLL = float(os.getenv("SNIFFER_POLL", "60"))
+SNIFFER_MIN_POLL = max(float(os.getenv("SNIFFER_MIN_POLL", "10")), ENDPOINT_TTLS[TOKENLIST_PATH])
+SNIFFER_MAX_POLL = float(os.getenv("SNIFFER_MAX_POLL", "300"))
 
-                if not symbol or not name:
-                    continue
-                if symbol in seen_symbols:
-                    continue
+# On the very first snapshot only the top tokens are announced
+BASELINE_ANNOUNCE = 15
 
-                seen_symbols.add(symbol)
-                print(f"[ALPHA] New Token Detected: {symbol} / {name}")
-                push_alpha_event(symbol, name)
+async def sniff_once() -> int:
+    """
+    Take one tokenlist snapshot and push what changed against the last one –
+    page by page as the pages arrive; delistings once the last page is in.
+    The very first (baseline) snapshot is ranked as a whole instead.
+    """
+    discovered = tracer.now()
+    baseline = snapshots.snapshots == 0
+    snapshot = snapshots.begin()
+    tokens: list[dict] = []
+    held = []                                       # baseline deltas, announced once the ranking is known
+    pushed = 0
+    try:
+        async with aclosing(iter_tokenlist_pages()) as pages:
+            async for _, page in pages:
+                tokens.extend(page)
+                deltas = snapshot.feed(page)
+                if baseline:
+                    held.extend(deltas)
+                else:
+                    pushed += await push_deltas(deltas, page, discovered)
+    except BaseException:
+        snapshot.abort()
+        raise
+    if not tokens:
+        snapshot.abort()
+        return pushed
 
-        except Exception as e:
-            print(f"⚠️ Sniffer error: {e}")
+    delisted = snapshot.finish()
+    if baseline:
+        top = {t.get("address") for t in rank_tokens(tokens, BASELINE_ANNOUNCE)}
+        logger.info(f"🔎 Sniffer: baseline snapshot of {len(tokens)} tokens")
+        pushed += await push_deltas([d for d in held + delisted if d.address in top], tokens, discovered)
+    else:
+        pushed += await push_deltas(delisted, (), discovered)
+
+    if recorder is not None:
+        try:
+            await asyncio.to_thread(recorder.append, tokens)
+        except OSError as e:
+            logger.warning(f"⚠️ Snapshot archive write failed: {e}")
+    return pushed
+
+async def push_deltas(deltas: list, tokens, discovered: int) -> int:
+    """Push ``deltas`` (of ``tokens``, a page or the whole snapshot) as alpha events."""
+    if not deltas:
+        return 0
+    # new listings must pass the same mc / liquidity floor as before
+    changed = {d.address for d in deltas}
+    rows = {t["address"]: t for t in tokens if t.get("address") in changed}
+    new_rows = [rows[d.address] for d in deltas if d.kind is DeltaKind.NEW_LISTING and d.address in rows]
+    eligible = {new_rows[i]["address"] for i in RANK_RULES.select(TokenTable(new_rows))}
+
+    pushed = 0
+    for d in deltas:
+        if not d.symbol or not d.name:
+            continue
+        if d.kind is DeltaKind.NEW_LISTING:
+            if d.address not in eligible or seen_symbols.check_and_add(d.address):
+                continue
+            hot("sniffer.alpha").info("[ALPHA] New Token Detected: {} / {}", d.symbol, d.name)
+        else:
+            hot("sniffer.alpha").info("[ALPHA] {}: {} / {} → {}", d.kind.value, d.symbol, d.name, d.payload())
+        payload = d.payload()
+        price = (rows.get(d.address) or {}).get("price")
+        if price:
+            payload["price"] = price                  # with liquidity: the pool a paper fill hits
+        if await push_alpha_event_async(d.symbol, d.name, d.address, kind=d.kind.value, payload=payload,
+                                        discovered_ns=discovered):
+            pushed += 1
+        await asyncio.sleep(0)   # let the brain drain while a big snapshot is still being pushed
+    return pushed
+
+async def start_sniffer_loop(poll: float = SNIFFER_POLL):
+    """
+    Snapshot BirdEye's tokenlist and push what changed as alpha events.
+    The pause between snapshots shrinks while snapshots keep producing
+    events, grows through quiet periods and after a 429, and never lets
+    the sniffer spend more than its share of ``BIRDEYE_RPM``.
+    """
+    poll_scheduler.register("sniffer", SNIFFER_MIN_POLL, SNIFFER_MAX_POLL, initial=poll)
+    while True:
+        logger.debug("🔎 Sniffer: Fetching new tokens from BirdEye...")
+        pushed = 0
+        with rate_limiter.metered() as meter:
+            try:
+                pushed = await sniff_once()
+            except Exception as e:
+                logger.warning(f"⚠️ Sniffer error: {e}")
 
-        await asyncio.sleep(poll)
+        delay = poll_scheduler.observe("sniffer", changed=pushed, requests=meter.requests)
+        logger.info(f"🔎 Sniffer: {pushed} event(s), {meter.requests} request(s) → next poll in {delay:.0f}s")
+        await asyncio.sleep(delay)
 
 # For manual testing
 if __name__ == "__main__":
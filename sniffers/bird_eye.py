@@ -1,68 +1,239 @@
 # bird_eye.py
 
+import asyncio
 import os
-import requests
+from contextlib import aclosing
+from typing import AsyncIterator, Tuple
+
 from loguru import logger
 from dotenv import load_dotenv
 
+from sniffers.birdeye_cache import ResponseCache
+from sniffers.birdeye_client import BIRDEYE_BASE_URL, BirdEyeClient, BirdEyeError, BirdEyeRateLimited
+from sniffers.token_table import Rule, RuleSet, TokenTable, top_k
+from utils.rate_limit import PollScheduler, TokenBucket
+
 load_dotenv()
 
-# ✅ Load API Key
+# ✅ API Key – checked when the first client is created, not at import
 BIRDEYE_API_KEY = os.getenv("BIRDEYE_API_KEY")
-if not BIRDEYE_API_KEY:
-    raise RuntimeError("❌ Missing BIRDEYE_API_KEY in .env file")
 
 # ✅ Endpoints
-TOKENLIST_API = "https://public-api.birdeye.so/defi/tokenlist"
-PRICE_API = "https://public-api.birdeye.so/defi/price"
+TOKENLIST_PATH = "/defi/tokenlist"
+PRICE_PATH = "/defi/price"
+MULTI_PRICE_PATH = "/defi/multi_price"
+SECURITY_PATH = "/defi/token_security"
+TOKENLIST_API = BIRDEYE_BASE_URL + TOKENLIST_PATH
+PRICE_API = BIRDEYE_BASE_URL + PRICE_PATH
 
-# ✅ Auth headers
-HEADERS = {
-    "accept": "application/json",
-    "X-API-KEY": BIRDEYE_API_KEY,
+# ✅ Response cache – one tokenlist download serves sniffer *and* brain
+ENDPOINT_TTLS = {
+    TOKENLIST_PATH: float(os.getenv("BIRDEYE_TOKENLIST_TTL", "30")),
+    PRICE_PATH: float(os.getenv("BIRDEYE_PRICE_TTL", "5")),
+    MULTI_PRICE_PATH: float(os.getenv("BIRDEYE_PRICE_TTL", "5")),
+    SECURITY_PATH: float(os.getenv("BIRDEYE_SECURITY_TTL", "600")),
 }
+response_cache = ResponseCache(ttls=ENDPOINT_TTLS, maxsize=int(os.getenv("BIRDEYE_CACHE_SIZE", "256")))
 
-def fetch_latest_tokens(limit: int = 10) -> list[dict]:
-    """Fetch latest Solana tokens from BirdEye and filter/sort manually by volume."""
-    try:
-        params = {
-            "chain": "solana"
-        }
-        response = requests.get(TOKENLIST_API, headers=HEADERS, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-
-        # ✅ Extract tokens list correctly from nested structure
+def cache_stats() -> dict[str, dict[str, float]]:
+    """Hit / miss / latency counters per BirdEye endpoint."""
+    return response_cache.stats()
+
+# ✅ API credit budget – one bucket for every request, pollers paced to fit inside it
+BIRDEYE_RPM = float(os.getenv("BIRDEYE_RPM", "300"))
+rate_limiter = TokenBucket(BIRDEYE_RPM, burst=float(os.getenv("BIRDEYE_BURST", "20")))
+poll_scheduler = PollScheduler(BIRDEYE_RPM, rate_limiter, share=float(os.getenv("BIRDEYE_POLL_SHARE", "0.8")))
+
+def budget_stats() -> dict[str, dict]:
+    return {"limiter": rate_limiter.stats(), "pollers": poll_scheduler.stats()}
+
+# ✅ Shared pooled client (created lazily on the running loop)
+_client: BirdEyeClient | None = None
+
+def get_client() -> BirdEyeClient:
+    """Return the process-wide BirdEye client, creating it on first use."""
+    global _client
+    if _client is None or _client.closed:
+        api_key = BIRDEYE_API_KEY or os.getenv("BIRDEYE_API_KEY")
+        if not api_key:
+            raise BirdEyeError("❌ Missing BIRDEYE_API_KEY in .env file")
+        _client = BirdEyeClient(api_key, limiter=rate_limiter)
+    return _client
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+# ✅ Filter by mcap and liquidity, rank by 24h USD volume (desc).  The tokenlist reports that volume as
+# "v24hUSD" (also its default sort_by key); the "volume_24h_usd" the sniffer used to sort on is not in the
+# payload, so that sort was a no-op that kept the API's v24hUSD order – ranking by v24hUSD keeps that order.
+RANK_RULES = RuleSet([Rule("mc", ">", 10_000), Rule("liquidity", ">", 10_000)])
+RANK_COLUMN = "v24hUSD"
+
+def rank_tokens(all_tokens: list[dict], limit: int) -> list[dict]:
+    """Columnar filter + partial top-k selection (no full sort)."""
+    table = TokenTable(all_tokens)
+    return table.take(top_k(table, RANK_RULES.select(table), RANK_COLUMN, limit))
+
+# ✅ Paging – the tokenlist is served volume-sorted, PAGE_SIZE tokens per request
+TOKENLIST_PAGE_SIZE = int(os.getenv("BIRDEYE_PAGE_SIZE", "50"))
+TOKENLIST_CONCURRENCY = int(os.getenv("BIRDEYE_PAGE_CONCURRENCY", "4"))
+# one page per poll by default – the single request the sniffer always made; every extra page costs a
+# credit per poll, and the sniffer's PollScheduler cost grows with it (its interval stretches to match)
+TOKENLIST_MAX_TOKENS = int(os.getenv("BIRDEYE_MAX_TOKENS", str(TOKENLIST_PAGE_SIZE)))
+
+async def iter_tokenlist_pages(
+    *,
+    page_size: int = TOKENLIST_PAGE_SIZE,
+    concurrency: int = TOKENLIST_CONCURRENCY,
+    max_tokens: int = TOKENLIST_MAX_TOKENS,
+    sort_by: str = RANK_COLUMN,
+    client: BirdEyeClient | None = None,
+) -> AsyncIterator[Tuple[int, list[dict]]]:
+    """
+    Yield ``(offset, tokens)`` pages as they arrive, fetching up to
+    ``concurrency`` pages at once.  Pages may arrive out of order; the last
+    one is cut so that at most ``max_tokens`` tokens are yielded.
+    Close the generator (``aclosing`` / ``break``) to stop early – pending
+    page requests are cancelled.
+    """
+    client = client or get_client()
+    base = {"chain": "solana", "sort_by": sort_by, "sort_type": "desc", "limit": page_size}
+
+    async def fetch_page(offset: int) -> Tuple[int, list[dict], int | None]:
+        data = await response_cache.get_json(client, TOKENLIST_PATH, params={**base, "offset": offset})
         if not data or "data" not in data or "tokens" not in data["data"]:
-            logger.warning("⚠️ BirdEye returned unexpected format for token data.")
-            return []
+            raise BirdEyeError(f"unexpected tokenlist page format at offset {offset}")
+        return offset, data["data"]["tokens"], data["data"].get("total")
 
-        all_tokens = data["data"]["tokens"]
+    end = max_tokens                              # shrinks once `total` or a short page is seen
+    next_offset = 0
+    pending: set[asyncio.Task] = set()
 
-        # ✅ Filter by mcap and liquidity
-        filtered = [
-            t for t in all_tokens
-            if t.get("mc", 0) > 10_000 and t.get("liquidity", 0) > 10_000
-        ]
+    def learn(offset: int, tokens: list[dict], total: int | None) -> None:
+        nonlocal end
+        if total is not None:
+            end = min(end, int(total))
+        if len(tokens) < page_size:
+            end = min(end, offset + len(tokens))
 
-        # ✅ Sort manually by volume_24h_usd (desc)
-        sorted_tokens = sorted(filtered, key=lambda x: x.get("volume_24h_usd", 0), reverse=True)
+    try:
+        # page 0 alone first – it tells us `total`, so nothing is fetched speculatively
+        offset, tokens, total = await fetch_page(0)
+        learn(offset, tokens, total)
+        next_offset = page_size
+        yield offset, tokens[:max_tokens]
+
+        while True:
+            while len(pending) < concurrency and next_offset < end:
+                pending.add(asyncio.ensure_future(fetch_page(next_offset)))
+                next_offset += page_size
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=lambda t: t.result()[0] if not t.exception() else -1):
+                offset, tokens, total = task.result()
+                learn(offset, tokens, total)
+                if offset < end:
+                    yield offset, tokens[:max_tokens - offset]
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+async def stream_tokenlist(**kw) -> AsyncIterator[dict]:
+    """Token-by-token view of ``iter_tokenlist_pages`` (same keyword arguments)."""
+    async with aclosing(iter_tokenlist_pages(**kw)) as pages:
+        async for _, tokens in pages:
+            for token in tokens:
+                yield token
 
-        logger.debug(f"📡 BirdEye fetched and sorted {len(sorted_tokens)} tokens")
-        return sorted_tokens[:limit]
+async def fetch_latest_tokens(limit: int = 10, client: BirdEyeClient | None = None, **page_kw) -> list[dict]:
+    """
+    Stream the volume-sorted tokenlist and return the top ``limit`` tokens
+    passing RANK_RULES.  Paging stops as soon as the contiguous prefix of
+    pages received proves that no later page can enter the top ``limit``.
+    The prefix is one TokenTable per snapshot, extended page by page.
+    """
+    page_size = page_kw.get("page_size", TOKENLIST_PAGE_SIZE)
+    arrived: dict[int, list[dict]] = {}
+    table = TokenTable([])
+    top: list[int] = []
+    prefix_end = 0
+    try:
+        async with aclosing(iter_tokenlist_pages(client=client, **page_kw)) as pages:
+            async for offset, tokens in pages:
+                arrived[offset] = tokens
+                if prefix_end not in arrived:
+                    continue
+                while prefix_end in arrived:
+                    table.extend(arrived.pop(prefix_end))
+                    prefix_end += page_size
+                top = top_k(table, RANK_RULES.select(table), RANK_COLUMN, limit)
+                if table and len(top) >= limit:
+                    volumes = table.numeric[RANK_COLUMN]
+                    if not top or volumes[top[-1]] >= volumes[-1]:   # nothing later ranks higher
+                        break
+
+        ranked = table.take(top)
+        logger.debug(f"📡 BirdEye streamed {len(table)} tokens ({prefix_end // page_size} pages), kept {len(ranked)}")
+        return ranked
 
+    except BirdEyeRateLimited as e:
+        logger.warning(f"⏳ BirdEye rate limit – tokenlist skipped, retry after {e.retry_after:g}s")
+        return []
     except Exception as e:
         logger.error(f"❌ Error fetching BirdEye tokens: {e}")
         return []
 
-def fetch_token_price(token_address: str) -> float:
-    """Fetch token price from BirdEye."""
+async def quote_token_price(token_address: str, client: BirdEyeClient | None = None) -> float:
+    """Price of one mint, 0.0 when BirdEye has none.
+    Errors propagate – the risk pipeline counts them and rejects the token without caching it."""
+    client = client or get_client()
+    data = await response_cache.get_json(client, PRICE_PATH, params={"address": token_address})
+    return float(((data or {}).get("data") or {}).get("value") or 0.0)
+
+async def fetch_token_price(token_address: str, client: BirdEyeClient | None = None) -> float:
+    """Fetch token price from BirdEye (0.0 on any error)."""
     try:
-        params = {"address": token_address}
-        response = requests.get(PRICE_API, headers=HEADERS, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        return float(data.get("data", {}).get("value", 0.0))
+        return await quote_token_price(token_address, client)
     except Exception as e:
         logger.error(f"❌ Error fetching price for {token_address}: {e}")
         return 0.0
+
+async def fetch_token_security(token_address: str, client: BirdEyeClient | None = None) -> dict:
+    """Holder concentration / authorities for one mint (``top10HolderPercent``, ``freezeable``, …).
+    Errors propagate – the risk pipeline counts them and rejects the token."""
+    client = client or get_client()
+    data = await response_cache.get_json(client, SECURITY_PATH, params={"address": token_address})
+    return (data or {}).get("data") or {}
+
+# ✅ Batched prices – up to PRICE_BATCH_SIZE addresses per multi_price request
+PRICE_BATCH_SIZE = int(os.getenv("BIRDEYE_PRICE_BATCH", "100"))
+
+async def fetch_prices(
+    addresses: list[str], client: BirdEyeClient | None = None, batch_size: int = PRICE_BATCH_SIZE
+) -> dict[str, float]:
+    """
+    Prices for many addresses in ``ceil(n / batch_size)`` requests, fetched
+    concurrently (the client's semaphore caps how many are in flight).  A
+    failed batch is logged and its addresses are simply missing from the result.
+    """
+    client = client or get_client()
+    unique = sorted(set(addresses))
+    batches = [unique[i:i + batch_size] for i in range(0, len(unique), batch_size)]
+
+    async def fetch_batch(batch: list[str]) -> dict[str, float]:
+        data = await response_cache.get_json(client, MULTI_PRICE_PATH, params={"list_address": ",".join(batch)})
+        quotes = (data or {}).get("data") or {}
+        return {a: float(q["value"]) for a, q in quotes.items() if q and q.get("value") is not None}
+
+    prices: dict[str, float] = {}
+    for batch, result in zip(batches, await asyncio.gather(*map(fetch_batch, batches), return_exceptions=True)):
+        if isinstance(result, BaseException):
+            logger.error(f"❌ Error fetching {len(batch)} prices: {result}")
+            continue
+        prices.update(result)
+    return prices
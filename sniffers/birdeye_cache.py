@@ -0,0 +1,140 @@
+# sniffers/birdeye_cache.py – shared TTL response cache for BirdEye calls
+"""
+Sits in front of ``BirdEyeClient`` so the sniffer loop and the brain never
+pay twice for the same tokenlist.
+
+  • per-endpoint TTLs (tokenlist changes slowly, prices quickly)
+  • bounded LRU eviction via ``cachetools.LRUCache``
+  • single-flight: concurrent callers for one key share a single request
+  • conditional revalidation with ETag / Last-Modified once an entry expires
+  • hit / miss / revalidation / latency counters per endpoint
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, Mapping
+
+from cachetools import LRUCache
+from loguru import logger
+
+from sniffers.birdeye_client import BirdEyeClient
+
+
+@dataclass
+class _Entry:
+    value: Any
+    stored_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+@dataclass
+class EndpointStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    revalidated: int = 0
+    errors: int = 0
+    fetches: int = 0
+    fetch_seconds: float = 0.0
+    max_fetch_seconds: float = 0.0
+
+    def record_fetch(self, seconds: float) -> None:
+        self.fetches += 1
+        self.fetch_seconds += seconds
+        self.max_fetch_seconds = max(self.max_fetch_seconds, seconds)
+
+    def as_dict(self) -> dict[str, float]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "revalidated": self.revalidated,
+            "errors": self.errors,
+            "fetches": self.fetches,
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            "avg_fetch_ms": 1000 * self.fetch_seconds / self.fetches if self.fetches else 0.0,
+            "max_fetch_ms": 1000 * self.max_fetch_seconds,
+        }
+
+
+@dataclass
+class ResponseCache:
+    ttls: Mapping[str, float] = field(default_factory=dict)
+    default_ttl: float = 0.0
+    maxsize: int = 256
+    clock: Callable[[], float] = time.monotonic
+
+    def __post_init__(self) -> None:
+        self._entries: LRUCache = LRUCache(maxsize=self.maxsize)
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self._stats: dict[str, EndpointStats] = {}
+
+    # ─────────────── public API ───────────────
+    async def get_json(self, client: BirdEyeClient, path: str, params: Mapping[str, Any] | None = None) -> Any:
+        key = (client.base_url, path, tuple(sorted((params or {}).items())))
+        stats = self._stats.setdefault(path, EndpointStats())
+
+        entry = self._entries.get(key)
+        if entry is not None and self.clock() - entry.stored_at < self.ttls.get(path, self.default_ttl):
+            stats.hits += 1
+            return entry.value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            stats.coalesced += 1
+        else:
+            stats.misses += 1
+            task = asyncio.ensure_future(self._fetch(key, client, path, params, entry, stats))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t, k=key: self._inflight.pop(k, None))
+        # shield: one impatient caller being cancelled must not cancel the others
+        return await asyncio.shield(task)
+
+    def invalidate(self, path: str | None = None) -> None:
+        for key in [k for k in self._entries if path is None or k[1] == path]:
+            del self._entries[key]
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        return {path: s.as_dict() for path, s in self._stats.items()}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ─────────────── internals ───────────────
+    async def _fetch(self, key, client, path, params, entry: _Entry | None, stats: EndpointStats) -> Any:
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        started = time.perf_counter()
+        try:
+            resp = await client.get(path, params=params, headers=headers or None)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.record_fetch(time.perf_counter() - started)
+
+        if resp.status_code == 304 and entry is not None:
+            stats.revalidated += 1
+            entry.stored_at = self.clock()
+            self._entries[key] = entry
+            logger.debug(f"♻️ BirdEye {path} not modified – reusing cached body")
+            return entry.value
+
+        value = resp.json()
+        self._entries[key] = _Entry(
+            value=value,
+            stored_at=self.clock(),
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+        )
+        return value
@@ -0,0 +1,151 @@
+# sniffers/birdeye_client.py – pooled async HTTP client for the BirdEye public API
+"""
+One long-lived ``httpx.AsyncClient`` shared by every BirdEye call.
+
+  • persistent connection pool with keep-alive (no TCP/TLS handshake per call)
+  • concurrency cap so bursts never open more sockets than the pool allows
+  • retry with full-jitter exponential backoff on transport errors, 429 and 5xx
+  • optional shared ``TokenBucket``: every attempt spends a credit, a 429
+    pauses the bucket for ``Retry-After`` so *all* callers back off together
+
+Nothing in here blocks the event loop – the sniffer and the brain's
+alpha-watcher can share one loop without stalling each other.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+from typing import Any, Mapping
+
+import httpx
+from loguru import logger
+
+from utils.rate_limit import TokenBucket
+
+BIRDEYE_BASE_URL = os.getenv("BIRDEYE_BASE_URL", "https://public-api.birdeye.so")   # override → stub / proxy
+
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+class BirdEyeError(RuntimeError):
+    """Raised when BirdEye keeps failing after every retry."""
+
+
+class BirdEyeRateLimited(BirdEyeError):
+    """Every attempt was answered with 429; ``retry_after`` is the server's last hint."""
+
+    def __init__(self, message: str, retry_after: float = 0.0) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def retry_after_seconds(resp: httpx.Response) -> float:
+    """Numeric ``Retry-After`` header (HTTP-date form is ignored → 0)."""
+    try:
+        return max(0.0, float(resp.headers.get("Retry-After", "")))
+    except ValueError:
+        return 0.0
+
+
+class BirdEyeClient:
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        base_url: str = BIRDEYE_BASE_URL,
+        timeout: float = 10.0,
+        max_connections: int = 10,
+        max_keepalive: int = 10,
+        keepalive_expiry: float = 30.0,
+        max_concurrency: int = 4,
+        retries: int = 3,
+        backoff_base: float = 0.25,
+        backoff_cap: float = 8.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+        limiter: TokenBucket | None = None,
+    ) -> None:
+        self.limiter = limiter
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._sem = asyncio.Semaphore(max_concurrency)
+        self._http = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"accept": "application/json", "X-API-KEY": api_key},
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            transport=transport,
+        )
+
+    # ─────────────── lifecycle ───────────────
+    async def __aenter__(self) -> "BirdEyeClient":
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    @property
+    def closed(self) -> bool:
+        return self._http.is_closed
+
+    @property
+    def base_url(self) -> str:
+        return str(self._http.base_url)
+
+    # ─────────────── requests ───────────────
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter backoff: uniform(0, min(cap, base · 2^attempt))."""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    async def get(
+        self,
+        path: str,
+        params: Mapping[str, Any] | None = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> httpx.Response:
+        """GET with retry; returns the final response (2xx or 304)."""
+        last_exc: Exception | None = None
+        retry_after = 0.0
+        for attempt in range(self.retries + 1):
+            retry_after = 0.0
+            if self.limiter is not None:
+                await self.limiter.acquire()
+            try:
+                async with self._sem:
+                    resp = await self._http.get(path, params=params, headers=headers)
+                if resp.status_code not in RETRY_STATUS:
+                    if resp.status_code != 304:
+                        resp.raise_for_status()
+                    return resp
+                last_exc = httpx.HTTPStatusError(
+                    f"BirdEye {resp.status_code} for {path}", request=resp.request, response=resp
+                )
+                if resp.status_code == 429:
+                    retry_after = retry_after_seconds(resp)
+                    if self.limiter is not None:
+                        self.limiter.pause(retry_after or self._backoff(attempt))
+            except httpx.TransportError as e:
+                last_exc = e
+
+            if attempt < self.retries:
+                delay = max(self._backoff(attempt), retry_after)
+                logger.debug(f"🔁 BirdEye retry {attempt + 1}/{self.retries} for {path} in {delay:.2f}s ({last_exc})")
+                await asyncio.sleep(delay)
+
+        message = f"BirdEye request to {path} failed after {self.retries + 1} attempts: {last_exc}"
+        if isinstance(last_exc, httpx.HTTPStatusError) and last_exc.response.status_code == 429:
+            raise BirdEyeRateLimited(message, retry_after)
+        raise BirdEyeError(message)
+
+    async def get_json(self, path: str, params: Mapping[str, Any] | None = None) -> Any:
+        resp = await self.get(path, params=params)
+        return resp.json()
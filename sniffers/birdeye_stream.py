@@ -0,0 +1,212 @@
+# sniffers/birdeye_stream.py – push-based new-listing source (BirdEye websocket)
+"""
+Streaming alternative to the 60 s tokenlist poll: one websocket subscribed
+to ``SUBSCRIBE_TOKEN_NEW_LISTING``, each listing pushed onto the alpha bus
+the moment it arrives.
+
+  • reconnect with full-jitter exponential backoff; the re-subscription
+    carries ``since`` = the last listing time handled, and a bounded dedupe
+    on the mint address drops whatever the server replays twice
+  • a listing only counts as handled – seen, and past the cursor – once
+    it was pushed; one the bus rejected is asked for again on the next
+    subscription
+  • heartbeat: after ``heartbeat`` seconds of silence a ping is sent, after
+    ``2 × heartbeat`` without any frame (pong included) the connection is
+    declared stalled and replaced
+  • backpressure: listings are pushed with ``push_alpha_event_async`` one at
+    a time – under ``ALPHA_QUEUE_POLICY=block`` a full bus stops the
+    consumer, the bounded socket buffer fills and TCP throttles the server
+  • runs alongside the polling sniffer (``ENABLE_STREAM=1``) or instead of
+    it (``ENABLE_SNIFFER=0``); the brain dedupes BUYs on the address either way
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from loguru import logger
+
+from sniffers.ws_protocol import WebSocket, WebSocketError, connect
+from utils.dedupe import make_dedupe
+from utils.logger import hot
+from utils.tracing import tracer
+
+BIRDEYE_WS_URL = os.getenv("BIRDEYE_WS_URL", "wss://public-api.birdeye.so/socket/solana")
+STREAM_MIN_LIQUIDITY = float(os.getenv("STREAM_MIN_LIQUIDITY", "10000"))
+STREAM_HEARTBEAT = float(os.getenv("STREAM_HEARTBEAT", "15"))
+STREAM_BUFFER = int(os.getenv("STREAM_BUFFER", "256"))
+
+LISTING_TYPE = "TOKEN_NEW_LISTING_DATA"
+
+Listing = Dict[str, Any]
+
+
+class StreamStalled(WebSocketError):
+    """No frame – not even a pong – within two heartbeats."""
+
+
+def _number(value: object) -> float:
+    try:
+        return float(value or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class BirdEyeStream:
+    def __init__(
+        self,
+        on_listing: Callable[[Listing, int], Awaitable[bool]],
+        api_key: str = "",
+        *,
+        url: str = BIRDEYE_WS_URL,
+        min_liquidity: float = STREAM_MIN_LIQUIDITY,
+        heartbeat: float = STREAM_HEARTBEAT,
+        buffer: int = STREAM_BUFFER,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 30.0,
+        connect_timeout: float = 10.0,
+    ) -> None:
+        self.on_listing = on_listing
+        self.api_key = api_key
+        self.url = url
+        self.min_liquidity = min_liquidity
+        self.heartbeat = heartbeat
+        self.buffer = buffer
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.connect_timeout = connect_timeout
+        self.since: str | None = None                     # resume cursor (last liquidityAddedAt)
+        self.gap: str | None = None                       # earliest listing whose push was rejected
+        self.seen = make_dedupe()
+        self.connections = self.reconnects = self.stalls = 0
+        self.received = self.pushed = self.filtered = self.duplicates = 0
+        self.buffer_high_water = 0
+
+    # ─────────────── connection ───────────────
+    def _endpoint(self) -> str:
+        return f"{self.url}?x-api-key={self.api_key}" if self.api_key else self.url
+
+    def subscription(self) -> Dict[str, Any]:
+        msg: Dict[str, Any] = {"type": "SUBSCRIBE_TOKEN_NEW_LISTING", "min_liquidity": self.min_liquidity}
+        since = self.since
+        if self.gap is not None and (since is None or self.gap < since):
+            since = self.gap
+        if since is not None:
+            msg["since"] = since
+        self.gap = None                                   # re-requested; a new rejection sets it again
+        return msg
+
+    def _advance(self, added: object) -> None:
+        if added is not None and (self.since is None or str(added) > self.since):
+            self.since = str(added)
+
+    async def run(self) -> None:
+        """Stay subscribed forever; every failure ends in a backoff and a fresh connection."""
+        attempt = 0
+        while True:
+            received = self.received
+            try:
+                await self.session()
+            except (OSError, WebSocketError, asyncio.TimeoutError) as e:
+                logger.warning(f"📡 Stream connection lost: {e}")
+            if self.received > received:
+                attempt = 0                               # the last session was healthy
+            delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+            attempt += 1
+            self.reconnects += 1
+            await asyncio.sleep(delay)
+
+    async def session(self) -> None:
+        ws = await connect(
+            self._endpoint(),
+            {"Origin": "ws://public-api.birdeye.so", "Sec-WebSocket-Protocol": "echo-protocol"},
+            timeout=self.connect_timeout,
+            buffer=self.buffer,
+        )
+        self.connections += 1
+        try:
+            await ws.send_text(json.dumps(self.subscription()))
+            logger.info(f"📡 Stream subscribed (since={self.since})")
+            while True:
+                await self.handle(await self._recv(ws), tracer.now())
+                self.buffer_high_water = max(self.buffer_high_water, ws.high_water)
+        finally:
+            await ws.close()
+
+    async def _recv(self, ws: WebSocket) -> str:
+        while True:
+            try:
+                return await asyncio.wait_for(ws.recv(), self.heartbeat)
+            except asyncio.TimeoutError:
+                if time.monotonic() - ws.last_seen >= 2 * self.heartbeat:
+                    self.stalls += 1
+                    raise StreamStalled(f"no frame for {2 * self.heartbeat:g}s")
+                await ws.ping()
+
+    # ─────────────── messages ───────────────
+    async def handle(self, raw: str, discovered_ns: int = 0) -> bool:
+        self.received += 1
+        try:
+            msg = json.loads(raw)
+        except ValueError:
+            logger.warning(f"⚠️ Stream sent non-JSON: {raw[:80]!r}")
+            return False
+        if msg.get("type") != LISTING_TYPE:
+            return False
+        data = msg.get("data") or {}
+        added = data.get("liquidityAddedAt")
+        address = data.get("address")
+        if not address or not data.get("symbol") or not data.get("name"):
+            self.filtered += 1
+            self._advance(added)
+            return False
+        if _number(data.get("liquidity")) < self.min_liquidity:
+            self.filtered += 1
+            self._advance(added)
+            return False
+        if address in self.seen:
+            self.duplicates += 1
+            return False
+        if await self.on_listing(data, discovered_ns):
+            self.seen.check_and_add(address)
+            self._advance(added)
+            self.pushed += 1
+            return True
+        if added is not None and (self.gap is None or str(added) < self.gap):
+            self.gap = str(added)
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "connections": self.connections,
+            "reconnects": self.reconnects,
+            "stalls": self.stalls,
+            "received": self.received,
+            "pushed": self.pushed,
+            "filtered": self.filtered,
+            "duplicates": self.duplicates,
+            "buffer_high_water": self.buffer_high_water,
+            "since": self.since,
+        }
+
+
+async def push_listing(data: Listing, discovered_ns: int = 0) -> bool:
+    from bot.brain import push_alpha_event_async
+
+    hot("stream.alpha").info("[ALPHA] New Token Streamed: {} / {}", data["symbol"], data["name"])
+    payload = {"liquidity": data.get("liquidity"), "source": "stream"}
+    return await push_alpha_event_async(
+        data["symbol"], data["name"], data["address"], kind="new_listing", payload=payload, discovered_ns=discovered_ns
+    )
+
+
+async def start_stream_sniffer() -> None:
+    """Supervisor entry point: push new listings from the BirdEye websocket onto the alpha bus."""
+    stream = BirdEyeStream(push_listing, os.getenv("BIRDEYE_API_KEY", ""))
+    logger.info(f"📡 Streaming sniffer → {BIRDEYE_WS_URL}")
+    await stream.run()
@@ -0,0 +1,236 @@
+# sniffers/snapshot_archive.py – compressed columnar tokenlist archive + mmap replay reader
+"""
+Every tokenlist snapshot is appended to a daily segment in ``archives/``
+(``tokenlist-YYYYMMDD.snap``):
+
+  record  = header | column directory | compressed column blobs
+  header  = magic "ASNP", version, column count, unix ts, rows, body size, crc32
+  column  = kind (d = float64, s = utf-8 text), name, raw / compressed size
+
+  • numeric columns are float64, byte-shuffled (every 1st byte, then every
+    2nd …) before zlib – neighbouring floats share sign/exponent bytes, which
+    then compress into long runs
+  • text columns are NUL-joined utf-8
+  • a torn tail (crash mid-append) fails the length check and is ignored;
+    the crc is verified when a snapshot is first decoded
+
+``SnapshotArchive`` mmaps the segments, indexes them with one header scan and
+decompresses a column only when a replay touches it.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from loguru import logger
+
+from sniffers.token_table import TokenTable, np
+
+MAGIC = b"ASNP"
+VERSION = 1
+_HEADER = struct.Struct("<4sBBdIII")        # magic, version, ncols, ts, rows, body_len, crc32
+_COLUMN = struct.Struct("<cBII")            # kind, name_len, raw_len, comp_len
+
+ARCHIVE_NUMERIC = ("price", "mc", "liquidity", "v24hUSD")
+ARCHIVE_TEXT = ("address", "symbol", "name")
+SEGMENT_FORMAT = "tokenlist-%Y%m%d.snap"
+
+
+class ArchiveError(ValueError):
+    """A record failed its integrity check."""
+
+
+def _shuffle(raw: bytes, width: int = 8) -> bytes:
+    return b"".join(raw[i::width] for i in range(width))
+
+
+def _unshuffle(data: bytes, width: int = 8) -> bytearray:
+    n = len(data) // width
+    out = bytearray(len(data))
+    for i in range(width):
+        out[i::width] = data[i * n:(i + 1) * n]
+    return out
+
+
+def encode_snapshot(
+    tokens: Sequence[dict],
+    ts: float,
+    numeric: Sequence[str] = ARCHIVE_NUMERIC,
+    text: Sequence[str] = ARCHIVE_TEXT,
+    level: int = 6,
+) -> bytes:
+    """One archive record for ``tokens`` taken at unix time ``ts``."""
+    table = TokenTable(tokens)
+    directory, blobs = [], []
+    for name in numeric:
+        col = array("d", table.numeric[name])
+        if sys.byteorder != "little":                   # pragma: no cover - the file format is little-endian
+            col.byteswap()
+        raw = col.tobytes()
+        blob = zlib.compress(_shuffle(raw), level)
+        directory.append(_COLUMN.pack(b"d", len(name), len(raw), len(blob)) + name.encode())
+        blobs.append(blob)
+    for name in text:
+        raw = "\0".join(v.replace("\0", "") for v in table.text[name]).encode()
+        blob = zlib.compress(raw, level)
+        directory.append(_COLUMN.pack(b"s", len(name), len(raw), len(blob)) + name.encode())
+        blobs.append(blob)
+    body = b"".join(directory) + b"".join(blobs)
+    header = _HEADER.pack(MAGIC, VERSION, len(directory), ts, len(tokens), len(body), zlib.crc32(body))
+    return header + body
+
+
+class SnapshotRecorder:
+    """Append-only writer; safe to call from ``asyncio.to_thread``."""
+
+    def __init__(self, directory: Path | str = "archives", segment_format: str = SEGMENT_FORMAT,
+                 level: int = 6, fsync: bool = False) -> None:
+        self.directory = Path(directory)
+        self.segment_format = segment_format
+        self.level = level
+        self.fsync = fsync
+        self.snapshots = 0
+        self.bytes_written = 0
+        self._lock = threading.Lock()
+
+    def segment_for(self, ts: float) -> Path:
+        return self.directory / datetime.fromtimestamp(ts, timezone.utc).strftime(self.segment_format)
+
+    def append(self, tokens: Sequence[dict], ts: float | None = None) -> Path:
+        ts = time.time() if ts is None else ts
+        record = encode_snapshot(tokens, ts, level=self.level)
+        path = self.segment_for(ts)
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with path.open("ab") as f:
+                f.write(record)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            self.snapshots += 1
+            self.bytes_written += len(record)
+        return path
+
+
+@dataclass
+class ArchivedSnapshot:
+    ts: float
+    rows: int
+    _buf: mmap.mmap = field(repr=False)
+    _body: Tuple[int, int, int] = field(repr=False)                       # offset, length, crc
+    _columns: Dict[str, Tuple[bytes, int, int, int]] = field(repr=False)  # name → kind, offset, raw, comp
+    _verified: bool = field(default=False, repr=False)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._columns)
+
+    def column(self, name: str):
+        """Decode one column: ``array('d')`` (list without NumPy) or ``list[str]``."""
+        if not self._verified:
+            offset, length, crc = self._body
+            if zlib.crc32(self._buf[offset:offset + length]) != crc:
+                raise ArchiveError(f"corrupt snapshot at ts={self.ts}")
+            self._verified = True
+        kind, offset, raw_len, comp_len = self._columns[name]
+        raw = zlib.decompress(self._buf[offset:offset + comp_len])
+        if kind == b"d":
+            col = array("d")
+            col.frombytes(_unshuffle(raw))
+            if sys.byteorder != "little":               # pragma: no cover
+                col.byteswap()
+            return col if np is not None else col.tolist()
+        return raw.decode().split("\0") if self.rows else []
+
+    def table(self) -> TokenTable:
+        return TokenTable.from_columns(self.rows, self.names, self.column)
+
+
+class SnapshotArchive:
+    """Time-ordered, memory-mapped view over one segment file or a directory of them."""
+
+    def __init__(self, source: Path | str | Iterable[Path | str] = "archives") -> None:
+        if isinstance(source, (str, Path)):
+            source = Path(source)
+            files = sorted(source.glob("*.snap")) if source.is_dir() else [source]
+        else:
+            files = sorted(Path(p) for p in source)
+        self.files = files
+        self._maps: List[mmap.mmap] = []
+        self._index: List[ArchivedSnapshot] = []
+        for path in files:
+            self._open(path)
+        self._index.sort(key=lambda s: s.ts)
+
+    def _open(self, path: Path) -> None:
+        with path.open("rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(buf)
+        offset, size = 0, len(buf)
+        while offset + _HEADER.size <= size:
+            magic, version, ncols, ts, rows, body_len, crc = _HEADER.unpack_from(buf, offset)
+            body = offset + _HEADER.size
+            if magic != MAGIC or version != VERSION or body + body_len > size:
+                logger.warning(f"🗄️ {path.name}: ignoring {size - offset} trailing bytes (torn or foreign record)")
+                break
+            entries, pos = [], body
+            for _ in range(ncols):
+                kind, name_len, raw_len, comp_len = _COLUMN.unpack_from(buf, pos)
+                name = buf[pos + _COLUMN.size:pos + _COLUMN.size + name_len].decode()
+                entries.append((name, kind, raw_len, comp_len))
+                pos += _COLUMN.size + name_len
+            columns = {}
+            for name, kind, raw_len, comp_len in entries:          # blobs follow the directory in order
+                columns[name] = (kind, pos, raw_len, comp_len)
+                pos += comp_len
+            self._index.append(ArchivedSnapshot(ts, rows, buf, (body, body_len, crc), columns))
+            offset = body + body_len
+
+    # ─────────────── access ───────────────
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[ArchivedSnapshot]:
+        return iter(self._index)
+
+    def __getitem__(self, i: int) -> ArchivedSnapshot:
+        return self._index[i]
+
+    def between(self, start: float | None = None, end: float | None = None) -> Iterator[ArchivedSnapshot]:
+        for snap in self._index:
+            if (start is None or snap.ts >= start) and (end is None or snap.ts < end):
+                yield snap
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "segments": len(self._maps),
+            "snapshots": len(self._index),
+            "rows": sum(s.rows for s in self._index),
+            "bytes": sum(len(m) for m in self._maps),
+            "span_s": self._index[-1].ts - self._index[0].ts if self._index else 0.0,
+        }
+
+    def close(self) -> None:
+        self._index.clear()
+        for buf in self._maps:
+            buf.close()
+        self._maps.clear()
+
+    def __enter__(self) -> "SnapshotArchive":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -0,0 +1,137 @@
+# sniffers/snapshot_diff.py – address-keyed tokenlist snapshots and typed deltas
+"""
+Keeps the previous tokenlist as ``address → (liquidity, v24hUSD, symbol, name)``
+and turns each new snapshot into typed deltas:
+
+  new_listing       address not present in the previous snapshot
+  liquidity_change  liquidity moved by ≥ ``liquidity_ratio``× (up or down)
+  volume_spike      24h volume grew by ≥ ``volume_ratio``×
+  delisted          address missing from this snapshot
+
+Unchanged rows cost one tuple comparison; only changed rows build events.
+Tokens without an address are ignored (symbols collide across mints).
+
+``SnapshotStore.begin()`` diffs a snapshot as it streams in: ``feed`` each
+page as it arrives and get its deltas right away, ``finish`` once the last
+page is in (→ the delistings), or ``abort`` a snapshot that broke off – the
+rows fed so far become current, nothing is reported as delisted.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, Iterable, List, Tuple
+
+_Row = Tuple[float, float, str, str]          # liquidity, v24hUSD, symbol, name
+
+
+class DeltaKind(str, Enum):
+    NEW_LISTING = "new_listing"
+    LIQUIDITY_CHANGE = "liquidity_change"
+    VOLUME_SPIKE = "volume_spike"
+    DELISTED = "delisted"
+
+
+@dataclass(frozen=True)
+class TokenDelta:
+    kind: DeltaKind
+    address: str
+    symbol: str
+    name: str
+    liquidity: float = 0.0
+    v24h_usd: float = 0.0
+    prev_liquidity: float = 0.0
+    prev_v24h_usd: float = 0.0
+
+    def payload(self) -> Dict[str, float]:
+        out = {"liquidity": self.liquidity, "v24hUSD": self.v24h_usd}
+        if self.kind is not DeltaKind.NEW_LISTING:
+            out.update(prev_liquidity=self.prev_liquidity, prev_v24hUSD=self.prev_v24h_usd)
+        return out
+
+
+def _f(value: object) -> float:
+    try:
+        return float(value or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+@dataclass
+class SnapshotStore:
+    liquidity_ratio: float = 10.0
+    volume_ratio: float = 5.0
+    floor: float = 1.0                                    # avoids ÷0 for tokens that had no liquidity/volume
+    rows: Dict[str, _Row] = field(default_factory=dict)
+    snapshots: int = 0
+
+    def diff(self, tokens: Iterable[dict]) -> List[TokenDelta]:
+        """Replace the stored snapshot with ``tokens``; return what changed."""
+        snapshot = self.begin()
+        return snapshot.feed(tokens) + snapshot.finish()
+
+    def begin(self) -> "SnapshotDiff":
+        """Start diffing a snapshot that arrives in pieces."""
+        return SnapshotDiff(self)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, address: str) -> bool:
+        return address in self.rows
+
+
+class SnapshotDiff:
+    """One snapshot in progress against ``store.rows``."""
+
+    def __init__(self, store: SnapshotStore) -> None:
+        self.store = store
+        self.prev = store.rows
+        self.cur: Dict[str, _Row] = {}
+        self.changed = False
+
+    def feed(self, tokens: Iterable[dict]) -> List[TokenDelta]:
+        """Deltas of ``tokens`` (any part of the snapshot, in any order)."""
+        prev, cur = self.prev, self.cur
+        deltas: List[TokenDelta] = []
+        liq_hi, vol_hi, floor = self.store.liquidity_ratio, self.store.volume_ratio, self.store.floor
+
+        for t in tokens:
+            address = t.get("address")
+            if not address:
+                continue
+            row = (_f(t.get("liquidity")), _f(t.get("v24hUSD")), t.get("symbol") or "", t.get("name") or "")
+            cur[address] = row
+            old = prev.get(address)
+            if old == row:
+                continue
+            if old is None:
+                deltas.append(TokenDelta(DeltaKind.NEW_LISTING, address, row[2], row[3], row[0], row[1]))
+                continue
+
+            liq_ratio = max(row[0], floor) / max(old[0], floor)
+            if liq_ratio >= liq_hi or liq_ratio <= 1 / liq_hi:
+                deltas.append(TokenDelta(DeltaKind.LIQUIDITY_CHANGE, address, row[2], row[3], row[0], row[1], old[0], old[1]))
+            if max(row[1], floor) / max(old[1], floor) >= vol_hi:
+                deltas.append(TokenDelta(DeltaKind.VOLUME_SPIKE, address, row[2], row[3], row[0], row[1], old[0], old[1]))
+
+        self.changed = self.changed or bool(deltas)
+        return deltas
+
+    def finish(self) -> List[TokenDelta]:
+        """The snapshot is complete: it replaces the stored one; returns the delistings."""
+        prev, cur = self.prev, self.cur
+        deltas: List[TokenDelta] = []
+        if len(cur) != len(prev) or self.changed:
+            for address in prev.keys() - cur.keys():
+                old = prev[address]
+                deltas.append(TokenDelta(DeltaKind.DELISTED, address, old[2], old[3], 0.0, 0.0, old[0], old[1]))
+        self.store.rows = cur
+        self.store.snapshots += 1
+        return deltas
+
+    def abort(self) -> None:
+        """The snapshot broke off: keep what was fed (its deltas went out), delist nothing."""
+        if self.cur:
+            self.store.rows = {**self.prev, **self.cur}
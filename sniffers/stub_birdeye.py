@@ -0,0 +1,174 @@
+# sniffers/stub_birdeye.py – local BirdEye stand-in for tests and offline runs
+"""
+Tiny threaded HTTP/1.1 server that speaks just enough of the BirdEye API:
+
+  GET /defi/tokenlist   → {"success": true, "data": {"tokens": [...], "total": N}}
+                          (honours sort_by / sort_type / offset / limit)
+  GET /defi/price       → {"success": true, "data": {"value": price}}
+  GET /defi/multi_price → {"success": true, "data": {address: {"value": price}, …}}
+                          (``list_address`` = comma-separated addresses)
+  GET /defi/token_security → {"success": true, "data": {"top10HolderPercent": …, "freezeable": …, …}}
+
+Prices come from ``prices``, else the token's own ``price`` in the tokenlist,
+else ``default_price``;
+security data from ``security``, else ``DEFAULT_SECURITY``.
+
+The tokenlist carries an ETag and prices a Last-Modified header, both
+answered with 304 on a matching conditional request.
+
+Knobs for tests: inject failures, add latency, count requests and the
+distinct client connections that carried them (to check keep-alive).
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+DEFAULT_SECURITY = {"top10HolderPercent": 0.2, "creatorPercentage": 0.0, "freezeable": False}
+
+
+class StubBirdEye:
+    def __init__(self, tokens: list[dict] | None = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.tokens: list[dict] = tokens or []
+        self.prices: dict[str, float] = {}
+        self.security: dict[str, dict] = {}
+        self.default_price = 0.0
+        self.version = 1                                  # bump to change the tokenlist ETag
+        self.last_modified = "Wed, 01 Jan 2025 00:00:00 GMT"
+        self.delay = 0.0
+        self.requests: Counter[str] = Counter()
+        self.connections: set[tuple[str, int]] = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._fail: list[tuple[int, dict]] = []           # (status, extra headers)
+        self._sorted: dict[tuple, list[dict]] = {}        # (id(tokens), version, sort_by, desc) → ordering
+        self._by_address: tuple | None = None             # ((id(tokens), version), address → token)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    # ─────────────── lifecycle ───────────────
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubBirdEye":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="StubBirdEye", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubBirdEye":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    # ─────────────── test knobs ───────────────
+    def fail_next(self, count: int, status: int = 500, headers: dict | None = None) -> None:
+        with self._lock:
+            self._fail.extend([(status, headers or {})] * count)
+
+    # ─────────────── routing ───────────────
+    def route(self, path: str, query: dict[str, list[str]], headers) -> tuple[int, dict, dict]:
+        """Return (status, body, extra_headers) for one request."""
+        if path == "/defi/tokenlist":
+            etag = f'"v{self.version}"'
+            if headers.get("If-None-Match") == etag:
+                return 304, {}, {"ETag": etag}
+            tokens = self.tokens
+            sort_by = query.get("sort_by", [None])[0]
+            if sort_by:
+                desc = query.get("sort_type", ["desc"])[0] == "desc"
+                tokens = self._sorted_tokens(tokens, sort_by, desc)
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", [str(len(tokens))])[0])
+            page = tokens[offset:offset + limit]
+            return 200, {"success": True, "data": {"tokens": page, "total": len(tokens)}}, {"ETag": etag}
+        if path == "/defi/price":
+            lm = {"Last-Modified": self.last_modified}
+            if headers.get("If-Modified-Since") == self.last_modified:
+                return 304, {}, lm
+            address = query.get("address", [""])[0]
+            return 200, {"success": True, "data": {"value": self._price(address)}}, lm
+        if path == "/defi/multi_price":
+            addresses = [a for a in query.get("list_address", [""])[0].split(",") if a]
+            quotes = {a: {"value": self.prices[a]} if a in self.prices else None for a in addresses}
+            return 200, {"success": True, "data": quotes}, {}
+        if path == "/defi/token_security":
+            address = query.get("address", [""])[0]
+            return 200, {"success": True, "data": self.security.get(address, DEFAULT_SECURITY)}, {}
+        return 404, {"success": False, "message": "not found"}, {}
+
+    def _price(self, address: str) -> float:
+        if address in self.prices:
+            return self.prices[address]
+        key = (id(self.tokens), self.version)
+        with self._lock:
+            cached = self._by_address
+        if cached is None or cached[0] != key:
+            cached = (key, {t.get("address"): t for t in self.tokens})
+            with self._lock:
+                self._by_address = cached
+        index = cached[1]
+        return float((index.get(address) or {}).get("price") or self.default_price)
+
+    def _sorted_tokens(self, tokens: list[dict], sort_by: str, desc: bool) -> list[dict]:
+        """Sort once per tokenlist version – paging a 100k snapshot must not re-sort per page."""
+        key = (id(tokens), self.version, sort_by, desc)
+        with self._lock:
+            ordered = self._sorted.get(key)
+        if ordered is None:
+            ordered = sorted(tokens, key=lambda t: t.get(sort_by) or 0, reverse=desc)
+            with self._lock:
+                self._sorted = {key: ordered}
+        return ordered
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:  # keep test output quiet
+                pass
+
+            def do_GET(self) -> None:
+                url = urlparse(self.path)
+                with stub._lock:
+                    stub.requests[url.path] += 1
+                    stub.connections.add(self.client_address)
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                    failure = stub._fail.pop(0) if stub._fail else None
+                try:
+                    if stub.delay:
+                        time.sleep(stub.delay)
+                    if failure is not None:
+                        (status, extra), body = failure, {"success": False}
+                    else:
+                        status, body, extra = stub.route(url.path, parse_qs(url.query), self.headers)
+                    payload = b"" if status == 304 else json.dumps(body).encode()
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    for k, v in extra.items():
+                        self.send_header(k, v)
+                    self.end_headers()
+                    self.wfile.write(payload)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+        return Handler
@@ -0,0 +1,134 @@
+# sniffers/stub_birdeye_ws.py – local BirdEye websocket stand-in replaying recorded messages
+"""
+Asyncio websocket server on its own thread that speaks the new-listing feed:
+
+  client → {"type": "SUBSCRIBE_TOKEN_NEW_LISTING", "since": "…"?}
+  server → {"type": "TOKEN_NEW_LISTING_DATA", "data": {...}}  (one per message)
+
+After a subscription it replays ``messages`` (recorded frames, e.g. a JSONL
+capture via ``from_recording``) whose ``liquidityAddedAt`` is after ``since``
+– as fast as the socket takes them, or at ``rate`` messages per second.
+
+Knobs for tests: ``drop_after`` cuts the first connection mid-replay,
+``stall_after`` stops sending and answering pings on it, and the counters
+record connections, subscriptions and messages sent.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+
+from sniffers.ws_protocol import WebSocketError, accept
+
+
+class StubBirdEyeWS:
+    def __init__(self, messages: list[dict] | None = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.messages: list[dict] = messages or []
+        self.host = host
+        self.port = port
+        self.rate = 0.0                                   # messages / s, 0 = unthrottled
+        self.drop_after: int | None = None                # first connection only
+        self.stall_after: int | None = None               # first connection only
+        self.connections = 0
+        self.sent = 0
+        self.subscriptions: list[dict] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server: asyncio.AbstractServer | None = None
+        self._started = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @classmethod
+    def from_recording(cls, path: Path | str, **kw) -> "StubBirdEyeWS":
+        lines = Path(path).read_text().splitlines()
+        return cls([json.loads(line) for line in lines if line.strip()], **kw)
+
+    @staticmethod
+    def listing(i: int, liquidity: float = 50_000, **extra) -> dict:
+        """A synthetic recorded frame – ``liquidityAddedAt`` increases with ``i``."""
+        data = {
+            "address": f"Mint{i:06d}",
+            "symbol": f"T{i}",
+            "name": f"Token {i}",
+            "decimals": 9,
+            "liquidity": liquidity,
+            "liquidityAddedAt": f"2025-01-01T00:00:00.{i:06d}",
+            **extra,
+        }
+        return {"type": "TOKEN_NEW_LISTING_DATA", "data": data}
+
+    # ─────────────── lifecycle ───────────────
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/socket/solana"
+
+    def start(self) -> "StubBirdEyeWS":
+        self._thread = threading.Thread(target=self._serve, name="StubBirdEyeWS", daemon=True)
+        self._thread.start()
+        self._started.wait(5)
+        return self
+
+    def stop(self) -> None:
+        if self._loop is not None and self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(5)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(5)
+
+    def __enter__(self) -> "StubBirdEyeWS":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def _serve(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._server = self._loop.run_until_complete(asyncio.start_server(self._handle, self.host, self.port))
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._started.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._server.close()
+            self._loop.close()
+
+    async def _shutdown(self) -> None:
+        self._server.close()
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    # ─────────────── one client ───────────────
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        first = self.connections == 1
+        try:
+            ws = await accept(reader, writer)
+            sub = json.loads(await ws.recv())
+            self.subscriptions.append(sub)
+            since = sub.get("since")
+            replay = [m for m in self.messages if since is None or m["data"]["liquidityAddedAt"] > since]
+            started = time.monotonic()
+            for n, msg in enumerate(replay):
+                if first and self.drop_after is not None and n >= self.drop_after:
+                    writer.transport.abort()              # no close frame – a dropped connection
+                    return
+                if first and self.stall_after is not None and n >= self.stall_after:
+                    ws.auto_pong = False
+                    await asyncio.sleep(3600)             # silent until the client gives up
+                await ws.send_text(json.dumps(msg))
+                self.sent += 1
+                if self.rate:
+                    ahead = started + (n + 1) / self.rate - time.monotonic()
+                    if ahead > 0:
+                        await asyncio.sleep(ahead)
+            while True:                                   # keep the feed open (pings still answered)
+                await ws.recv()
+        except (WebSocketError, ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
@@ -0,0 +1,96 @@
+# sniffers/test_birdeye_cache.py – TTL cache, single-flight and revalidation against the stub server
+
+import asyncio
+
+import pytest
+
+from sniffers.birdeye_cache import ResponseCache
+from sniffers.birdeye_client import BirdEyeClient
+from sniffers.stub_birdeye import StubBirdEye
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def stub():
+    with StubBirdEye([{"symbol": "AAA", "name": "Alpha"}]) as s:
+        yield s
+
+
+def _client(stub: StubBirdEye) -> BirdEyeClient:
+    return BirdEyeClient("test-key", base_url=stub.base_url, backoff_base=0.001)
+
+
+def test_ttl_hit_then_expiry(stub):
+    clock = FakeClock()
+    cache = ResponseCache(ttls={"/defi/tokenlist": 30}, clock=clock)
+
+    async def run():
+        async with _client(stub) as client:
+            await cache.get_json(client, "/defi/tokenlist")
+            clock.now = 10
+            await cache.get_json(client, "/defi/tokenlist")
+            clock.now = 31
+            stub.version += 1                           # content changed → full 200
+            await cache.get_json(client, "/defi/tokenlist")
+
+    asyncio.run(run())
+    assert stub.requests["/defi/tokenlist"] == 2
+    s = cache.stats()["/defi/tokenlist"]
+    assert (s["hits"], s["misses"], s["revalidated"]) == (1, 2, 0)
+
+
+def test_single_flight_coalesces_concurrent_callers(stub):
+    stub.delay = 0.05
+    cache = ResponseCache(ttls={"/defi/tokenlist": 30})
+
+    async def run():
+        async with _client(stub) as client:
+            return await asyncio.gather(*(cache.get_json(client, "/defi/tokenlist") for _ in range(20)))
+
+    results = asyncio.run(run())
+    assert stub.requests["/defi/tokenlist"] == 1
+    assert all(r == results[0] for r in results)
+    assert cache.stats()["/defi/tokenlist"]["coalesced"] == 19
+
+
+def test_etag_and_last_modified_revalidation(stub):
+    clock = FakeClock()
+    cache = ResponseCache(ttls={"/defi/tokenlist": 1, "/defi/price": 1}, clock=clock)
+
+    async def run():
+        async with _client(stub) as client:
+            first = await cache.get_json(client, "/defi/tokenlist")
+            await cache.get_json(client, "/defi/price", {"address": "x"})
+            clock.now = 5
+            again = await cache.get_json(client, "/defi/tokenlist")
+            await cache.get_json(client, "/defi/price", {"address": "x"})
+            return first, again
+
+    first, again = asyncio.run(run())
+    assert first == again
+    stats = cache.stats()
+    assert stats["/defi/tokenlist"]["revalidated"] == 1
+    assert stats["/defi/price"]["revalidated"] == 1
+
+
+def test_lru_bound_and_errors_not_cached(stub):
+    cache = ResponseCache(ttls={"/defi/price": 60}, maxsize=3)
+    stub.fail_next(1, status=404)
+
+    async def run():
+        async with _client(stub) as client:
+            with pytest.raises(Exception):
+                await cache.get_json(client, "/defi/price", {"address": "a0"})
+            for i in range(5):
+                await cache.get_json(client, "/defi/price", {"address": f"a{i}"})
+
+    asyncio.run(run())
+    assert len(cache) == 3
+    assert cache.stats()["/defi/price"]["errors"] == 1
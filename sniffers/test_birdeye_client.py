@@ -0,0 +1,94 @@
+# sniffers/test_birdeye_client.py – pooled async client against the local stub server
+
+import asyncio
+
+import pytest
+
+from sniffers import bird_eye
+from sniffers.birdeye_client import BirdEyeClient, BirdEyeError
+from sniffers.stub_birdeye import StubBirdEye
+
+TOKENS = [
+    {"symbol": "AAA", "name": "Alpha", "mc": 50_000, "liquidity": 20_000, "v24hUSD": 10},
+    {"symbol": "BBB", "name": "Beta", "mc": 50_000, "liquidity": 20_000, "v24hUSD": 30},
+    {"symbol": "CCC", "name": "Gamma", "mc": 5_000, "liquidity": 20_000, "v24hUSD": 99},
+]
+
+
+@pytest.fixture
+def stub():
+    with StubBirdEye(TOKENS) as s:
+        yield s
+
+
+def _client(stub: StubBirdEye, **kw) -> BirdEyeClient:
+    kw.setdefault("backoff_base", 0.001)
+    return BirdEyeClient("test-key", base_url=stub.base_url, **kw)
+
+
+def test_fetch_latest_tokens_filters_and_ranks(stub):
+    async def run():
+        async with _client(stub) as client:
+            return await bird_eye.fetch_latest_tokens(limit=5, client=client)
+
+    tokens = asyncio.run(run())
+    assert [t["symbol"] for t in tokens] == ["BBB", "AAA"]
+
+
+def test_keepalive_reuses_one_connection(stub):
+    async def run():
+        async with _client(stub) as client:
+            for _ in range(10):
+                await client.get_json("/defi/tokenlist")
+
+    asyncio.run(run())
+    assert stub.requests["/defi/tokenlist"] == 10
+    assert len(stub.connections) == 1
+
+
+def test_retries_transient_failures(stub):
+    stub.fail_next(2, status=503)
+
+    async def run():
+        async with _client(stub, retries=3) as client:
+            return await client.get_json("/defi/tokenlist")
+
+    data = asyncio.run(run())
+    assert data["data"]["total"] == len(TOKENS)
+    assert stub.requests["/defi/tokenlist"] == 3
+
+
+def test_gives_up_after_retries(stub):
+    stub.fail_next(5, status=500)
+
+    async def run():
+        async with _client(stub, retries=1) as client:
+            await client.get_json("/defi/tokenlist")
+
+    with pytest.raises(BirdEyeError):
+        asyncio.run(run())
+    assert stub.requests["/defi/tokenlist"] == 2
+
+
+def test_fetch_token_price_returns_zero_on_failure(stub):
+    stub.prices["mint1"] = 1.25
+    stub.fail_next(1, status=404)
+
+    async def run():
+        async with _client(stub) as client:
+            bad = await bird_eye.fetch_token_price("mint1", client=client)
+            good = await bird_eye.fetch_token_price("mint1", client=client)
+            return bad, good
+
+    assert asyncio.run(run()) == (0.0, 1.25)
+
+
+def test_concurrency_cap(stub):
+    stub.delay = 0.02
+
+    async def run():
+        async with _client(stub, max_concurrency=2) as client:
+            await asyncio.gather(*(client.get_json("/defi/price", {"address": str(i)}) for i in range(8)))
+
+    asyncio.run(run())
+    assert stub.max_in_flight <= 2
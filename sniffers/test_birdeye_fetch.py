@@ -1,11 +1,13 @@
-# sniffers/test_birdeye_fetch.py
+# sniffers/test_birdeye_fetch.py  – run with: python -m sniffers.test_birdeye_fetch
 
-from bird_eye import fetch_latest_tokens
+import asyncio
+
+from sniffers.bird_eye import fetch_latest_tokens
 from pprint import pprint
 
 if __name__ == "__main__":
     print("🔍 Fetching latest Solana tokens from BirdEye...\n")
-    tokens = fetch_latest_tokens(limit=5)
+    tokens = asyncio.run(fetch_latest_tokens(limit=5))
 
     if not tokens:
         print("❌ FAILED: No tokens returned.")
@@ -0,0 +1,118 @@
+# sniffers/test_birdeye_stream.py – websocket new-listing source against the local stand-in server
+
+import asyncio
+import json
+
+from bot.alpha_bus import AlphaBus
+from sniffers.birdeye_stream import BirdEyeStream
+from sniffers.stub_birdeye_ws import StubBirdEyeWS
+
+
+def _stream(stub: StubBirdEyeWS, sink: list, **kw) -> BirdEyeStream:
+    async def on_listing(data, discovered_ns):
+        sink.append(data["address"])
+        return True
+
+    kw.setdefault("backoff_base", 0.01)
+    kw.setdefault("heartbeat", 5.0)
+    return BirdEyeStream(on_listing, url=stub.url, min_liquidity=10_000, **kw)
+
+
+async def _run_until(stream: BirdEyeStream, done, timeout: float = 10.0) -> None:
+    task = asyncio.create_task(stream.run())
+    try:
+        async with asyncio.timeout(timeout):
+            while not done():
+                await asyncio.sleep(0.01)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+def test_replays_recorded_listings_at_high_rate_in_order(tmp_path):
+    frames = [StubBirdEyeWS.listing(i, liquidity=5_000 if i % 10 == 0 else 50_000) for i in range(3000)]
+    frames.insert(5, {"type": "PRICE_DATA", "data": {"value": 1.0}})
+    recording = tmp_path / "listings.jsonl"
+    recording.write_text("\n".join(json.dumps(f) for f in frames))
+    got = []
+    with StubBirdEyeWS.from_recording(recording) as stub:
+        stream = _stream(stub, got)
+        asyncio.run(_run_until(stream, lambda: stream.received == len(frames)))
+    assert got == [f"Mint{i:06d}" for i in range(3000) if i % 10]
+    assert stream.filtered == 300 and stream.connections == 1
+    assert stub.subscriptions == [{"type": "SUBSCRIBE_TOKEN_NEW_LISTING", "min_liquidity": 10_000}]
+
+
+def test_reconnects_and_resumes_after_a_dropped_connection():
+    with StubBirdEyeWS([StubBirdEyeWS.listing(i) for i in range(1000)]) as stub:
+        stub.drop_after = 400
+        got = []
+        stream = _stream(stub, got)
+        asyncio.run(_run_until(stream, lambda: len(got) == 1000))
+    assert got == [f"Mint{i:06d}" for i in range(1000)]
+    assert stub.connections == 2 and stream.reconnects == 1
+    assert stub.subscriptions[1]["since"] <= StubBirdEyeWS.listing(399)["data"]["liquidityAddedAt"]
+
+
+def test_silent_connection_is_detected_by_heartbeat():
+    with StubBirdEyeWS([StubBirdEyeWS.listing(i) for i in range(50)]) as stub:
+        stub.stall_after = 20
+        got = []
+        stream = _stream(stub, got, heartbeat=0.1)
+        asyncio.run(_run_until(stream, lambda: len(got) == 50, timeout=5))
+    assert stream.stalls == 1 and stub.connections == 2
+    assert got == [f"Mint{i:06d}" for i in range(50)]
+
+
+def test_full_alpha_bus_pushes_back_instead_of_dropping():
+    bus = AlphaBus(maxsize=8, policy="block")
+    consumed = []
+
+    async def run():
+        async def on_listing(data, discovered_ns):
+            return await bus.put_async({"symbol": data["symbol"], "address": data["address"]})
+
+        async def slow_brain():
+            while True:
+                consumed.extend(e["address"] for e in await bus.get_batch(max_items=4))
+                await asyncio.sleep(0.001)
+
+        brain = asyncio.create_task(slow_brain())
+        stream = BirdEyeStream(on_listing, url=stub.url, min_liquidity=0, buffer=16, backoff_base=0.01)
+        await _run_until(stream, lambda: len(consumed) == 2000)
+        brain.cancel()
+        return stream
+
+    with StubBirdEyeWS([StubBirdEyeWS.listing(i) for i in range(2000)]) as stub:
+        stream = asyncio.run(run())
+    assert consumed == [f"Mint{i:06d}" for i in range(2000)]
+    assert bus.stats()["dropped"] == 0 and bus.high_water <= 8
+    assert stream.buffer_high_water <= 16
+
+
+def test_rejected_push_is_not_marked_seen_and_is_asked_for_again():
+    accept = [False]
+
+    async def on_listing(data, discovered_ns):
+        return accept[0]
+
+    stream = BirdEyeStream(on_listing, min_liquidity=10_000)
+    first, second = StubBirdEyeWS.listing(1), StubBirdEyeWS.listing(2)
+    assert not asyncio.run(stream.handle(json.dumps(first)))             # the bus was full
+    accept[0] = True
+    assert asyncio.run(stream.handle(json.dumps(second)))
+    assert stream.subscription()["since"] == first["data"]["liquidityAddedAt"]
+    assert stream.subscription()["since"] == second["data"]["liquidityAddedAt"]
+    assert asyncio.run(stream.handle(json.dumps(first)))                  # the replay goes through
+    assert stream.pushed == 2 and stream.duplicates == 0
+
+
+def test_junk_liquidity_is_filtered_not_raised():
+    async def on_listing(data, discovered_ns):
+        return True
+
+    stream = BirdEyeStream(on_listing, min_liquidity=10_000)
+    junk = StubBirdEyeWS.listing(3)
+    junk["data"]["liquidity"] = "n/a"
+    assert not asyncio.run(stream.handle(json.dumps(junk)))
+    assert stream.filtered == 1 and stream.since == junk["data"]["liquidityAddedAt"]
@@ -0,0 +1,67 @@
+# sniffers/test_snapshot_archive.py – columnar archive round-trip, torn tails, lazy mmap reads
+
+import math
+
+import pytest
+
+from sniffers.snapshot_archive import ArchiveError, SnapshotArchive, SnapshotRecorder
+from sniffers.token_table import Rule, RuleSet
+
+
+def _tokens(n, scale=1.0):
+    return [{"address": f"M{i}", "symbol": f"T{i}", "name": f"Token {i}", "price": (i + 1) * scale,
+             "mc": 1e6 * (i + 1), "liquidity": 1_000.0 * i, "v24hUSD": 500.0 * i, "logoURI": "ignored"}
+            for i in range(n)]
+
+
+def test_round_trip_over_segments(tmp_path):
+    rec = SnapshotRecorder(tmp_path)
+    day = 86_400
+    rec.append(_tokens(50), ts=10 * day + 5)
+    rec.append(_tokens(50, 2.0), ts=11 * day + 5)        # next UTC day → second segment
+    rec.append([], ts=11 * day + 65)
+    assert len(list(tmp_path.glob("*.snap"))) == 2
+
+    with SnapshotArchive(tmp_path) as archive:
+        assert [s.ts for s in archive] == [10 * day + 5, 11 * day + 5, 11 * day + 65]
+        snap = archive[1]
+        assert snap.rows == 50 and "logoURI" not in snap.names
+        table = snap.table()
+        assert table.text["symbol"][7] == "T7"
+        assert list(table.numeric["price"])[:3] == [2.0, 4.0, 6.0]
+        assert table.rows[3] == {"price": 8.0, "mc": 4e6, "liquidity": 3_000.0, "v24hUSD": 1_500.0,
+                                 "address": "M3", "symbol": "T3", "name": "Token 3"}
+        rules = RuleSet([Rule("liquidity", ">=", 45_000)], require=("symbol",))
+        assert [table.rows[i]["address"] for i in rules.select(table)] == [f"M{i}" for i in range(45, 50)]
+        assert len(archive[2].table()) == 0
+        assert [s.ts for s in archive.between(11 * day, 11 * day + 60)] == [11 * day + 5]
+        assert archive.stats()["rows"] == 100
+
+
+def test_missing_values_and_compression(tmp_path):
+    rec = SnapshotRecorder(tmp_path)
+    rec.append([{"address": "A", "mc": None, "name": None}], ts=1.0)
+    big = _tokens(2_000)
+    rec.append(big, ts=2.0)
+    assert rec.bytes_written < len(repr(big)) / 3
+    with SnapshotArchive(tmp_path) as archive:
+        row = archive[0].table().rows[0]
+        assert row["mc"] == 0.0 and row["name"] == "" and not math.isnan(row["price"])
+
+
+def test_torn_tail_and_corruption(tmp_path):
+    rec = SnapshotRecorder(tmp_path)
+    path = rec.append(_tokens(10), ts=1.0)
+    rec.append(_tokens(10), ts=2.0)
+    data = path.read_bytes()
+    path.write_bytes(data[:-7])                          # crash mid-append
+    with SnapshotArchive(path) as archive:
+        assert [s.ts for s in archive] == [1.0]
+
+    corrupt = bytearray(data)
+    corrupt[60] ^= 0xFF                                  # inside the first record's body
+    path.write_bytes(bytes(corrupt))
+    with SnapshotArchive(path) as archive:
+        with pytest.raises(ArchiveError):
+            archive[0].column("price")
+        assert archive[1].column("symbol")[0] == "T0"
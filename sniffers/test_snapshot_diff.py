@@ -0,0 +1,104 @@
+# sniffers/test_snapshot_diff.py – snapshot deltas and the sniffer pass built on them
+
+import asyncio
+
+import pytest
+
+from sniffers import alpha_sniffer
+from sniffers.snapshot_diff import DeltaKind, SnapshotStore
+from utils.dedupe import TTLDedupe
+
+
+def _tok(address, liquidity=50_000, v24h=100_000, symbol=None, mc=1e6):
+    return {"address": address, "symbol": symbol or address.upper(), "name": f"{address} coin",
+            "liquidity": liquidity, "v24hUSD": v24h, "mc": mc}
+
+
+def test_first_snapshot_is_all_new_listings():
+    store = SnapshotStore()
+    deltas = store.diff([_tok("a"), _tok("b"), {"symbol": "NOADDR"}])
+    assert [(d.kind, d.address) for d in deltas] == [(DeltaKind.NEW_LISTING, "a"), (DeltaKind.NEW_LISTING, "b")]
+    assert len(store) == 2
+
+
+def test_unchanged_snapshot_yields_nothing():
+    store = SnapshotStore()
+    store.diff([_tok("a"), _tok("b")])
+    assert store.diff([_tok("b"), _tok("a")]) == []
+
+
+def test_threshold_changes_and_delistings():
+    store = SnapshotStore(liquidity_ratio=10, volume_ratio=5)
+    store.diff([_tok("a"), _tok("b"), _tok("c"), _tok("d")])
+    deltas = store.diff([
+        _tok("a", liquidity=500_000),            # 10× liquidity
+        _tok("b", v24h=600_000),                 # 6× volume
+        _tok("c", liquidity=60_000),             # small move – ignored
+        _tok("e"),                               # new
+    ])                                           # d delisted
+    got = {(d.kind, d.address) for d in deltas}
+    assert got == {
+        (DeltaKind.LIQUIDITY_CHANGE, "a"),
+        (DeltaKind.VOLUME_SPIKE, "b"),
+        (DeltaKind.NEW_LISTING, "e"),
+        (DeltaKind.DELISTED, "d"),
+    }
+    liq = next(d for d in deltas if d.kind is DeltaKind.LIQUIDITY_CHANGE)
+    assert liq.payload() == {"liquidity": 500_000, "v24hUSD": 100_000, "prev_liquidity": 50_000, "prev_v24hUSD": 100_000}
+
+
+def test_streamed_pages_diff_like_one_snapshot():
+    old = [_tok("a"), _tok("b"), _tok("d")]
+    new = [_tok("a", liquidity=1_000_000), _tok("b"), _tok("e")]
+    whole, paged = SnapshotStore(), SnapshotStore()
+    whole.diff(old)
+    paged.diff(old)
+    snapshot = paged.begin()
+    streamed = snapshot.feed(new[2:]) + snapshot.feed(new[:2])            # pages arrive out of order
+    assert {d.kind for d in streamed} == {DeltaKind.NEW_LISTING, DeltaKind.LIQUIDITY_CHANGE}
+    streamed += snapshot.finish()
+    assert sorted(streamed, key=repr) == sorted(whole.diff(new), key=repr)
+    assert paged.rows == whole.rows
+
+
+def test_aborted_snapshot_delists_nothing():
+    store = SnapshotStore()
+    store.diff([_tok("a"), _tok("b")])
+    snapshot = store.begin()
+    snapshot.feed([_tok("a", liquidity=1_000_000)])
+    snapshot.abort()                                                     # the stream broke off
+    assert set(store.rows) == {"a", "b"} and store.snapshots == 1
+    assert store.diff([_tok("a", liquidity=1_000_000), _tok("b")]) == []  # the change is not re-announced
+
+
+def test_same_symbol_different_mints_are_distinct():
+    store = SnapshotStore()
+    deltas = store.diff([_tok("mint1", symbol="PEPE"), _tok("mint2", symbol="PEPE")])
+    assert {d.address for d in deltas} == {"mint1", "mint2"}
+
+
+def test_sniff_once_pushes_typed_events(monkeypatch):
+    universe = [_tok("a"), _tok("b", mc=100)]      # b fails the mc floor
+    pushed = []
+
+    async def fake_pages(**_):
+        for offset in range(0, len(universe), 2):
+            yield offset, universe[offset:offset + 2]
+
+    async def fake_push(symbol, name, address=None, kind="new_listing", payload=None, discovered_ns=0):
+        pushed.append((kind, address))
+        return True
+
+    monkeypatch.setattr(alpha_sniffer, "iter_tokenlist_pages", fake_pages)
+    monkeypatch.setattr(alpha_sniffer, "push_alpha_event_async", fake_push)
+    monkeypatch.setattr(alpha_sniffer, "snapshots", SnapshotStore())
+    monkeypatch.setattr(alpha_sniffer, "recorder", None)
+    monkeypatch.setattr(alpha_sniffer, "seen_symbols", TTLDedupe(3600, 100))
+
+    asyncio.run(alpha_sniffer.sniff_once())
+    assert pushed == [("new_listing", "a")]
+
+    universe = [_tok("a", liquidity=1_000_000), _tok("b", mc=100), _tok("c")]
+    pushed.clear()
+    asyncio.run(alpha_sniffer.sniff_once())
+    assert sorted(pushed) == [("liquidity_change", "a"), ("new_listing", "c")]
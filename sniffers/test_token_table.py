@@ -0,0 +1,97 @@
+# sniffers/test_token_table.py – columnar rules and top-k match the old dict-by-dict code
+
+import random
+
+import pytest
+
+from sniffers import token_table
+from sniffers.token_table import Rule, RuleSet, TokenTable, top_k
+
+
+def _tokens(n: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    words = ["Moon", "Test", "Pepe", "FAKE", "Scamcoin", "Bonk", ""]
+    out = []
+    for i in range(n):
+        t = {
+            "symbol": f"T{i}" if rng.random() > 0.05 else "",
+            "name": f"{rng.choice(words)} {i}".strip(),
+            "mc": rng.choice([0, 5_000, 20_000, 1e6]),
+            "liquidity": rng.choice([0, 9_999, 10_000, 50_000]),
+            "v24hUSD": rng.choice([0, 49_999, 50_000, 1e6]),
+            "volume_24h_usd": rng.choice([0, 1, 2, 3, 1e5]),      # plenty of ties
+        }
+        if rng.random() < 0.1:
+            del t["mc"]
+        out.append(t)
+    return out
+
+
+def _legacy_rank(tokens, limit):
+    filtered = [t for t in tokens if t.get("mc", 0) > 10_000 and t.get("liquidity", 0) > 10_000]
+    return sorted(filtered, key=lambda x: x.get("volume_24h_usd", 0), reverse=True)[:limit]
+
+
+def _legacy_shortlist(tokens):
+    return [
+        t for t in tokens
+        if t["liquidity"] >= 10_000 and t.get("v24hUSD", 0) >= 50_000 and t["name"] and t["symbol"]
+        and not any(s in t["name"].lower() for s in ["test", "fake", "scam"])
+    ]
+
+
+@pytest.fixture(params=["numpy", "pure"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(token_table, "np", None)
+    return request.param
+
+
+@pytest.mark.parametrize("limit", [1, 10, 500])
+def test_rank_matches_full_sort(backend, limit):
+    tokens = _tokens(2_000)
+    table = TokenTable(tokens)
+    rules = RuleSet([Rule("mc", ">", 10_000), Rule("liquidity", ">", 10_000)])
+    assert table.take(top_k(table, rules.select(table), "volume_24h_usd", limit)) == _legacy_rank(tokens, limit)
+
+
+def test_shortlist_matches_legacy_chain(backend):
+    tokens = _tokens(2_000, seed=11)
+    rules = RuleSet(
+        [Rule("liquidity", ">=", 10_000), Rule("v24hUSD", ">=", 50_000)],
+        blacklist=("test", "fake", "scam"),
+        require=("name", "symbol"),
+    )
+    table = TokenTable(tokens)
+    assert table.take(rules.select(table)) == _legacy_shortlist(tokens)
+
+
+def test_empty_and_degenerate_inputs(backend):
+    empty = TokenTable([])
+    assert RuleSet([Rule("mc", ">", 1)]).select(empty) == []
+    table = TokenTable(_tokens(5))
+    assert RuleSet().select(table) == [0, 1, 2, 3, 4]
+    assert top_k(table, [], "mc", 3) == []
+
+
+def test_extend_matches_a_table_built_in_one_go(backend):
+    tokens = _tokens(300, seed=5)
+    table = TokenTable(tokens[:100])
+    rules = RuleSet([Rule("mc", ">", 10_000), Rule("liquidity", ">", 10_000)], require=("name",))
+    rules.select(table)                                     # some columns extracted before the next pages
+    view = table.column("mc")
+    table.extend(tokens[100:250])
+    table.extend(tokens[250:])
+    assert len(view) == 100 and len(table) == 300
+    whole = TokenTable(tokens)
+    assert rules.select(table) == rules.select(whole)
+    assert top_k(table, rules.select(table), "v24hUSD", 10) == top_k(whole, rules.select(whole), "v24hUSD", 10)
+
+
+def test_rule_validation():
+    with pytest.raises(ValueError):
+        Rule("price; import os", ">", 1)
+    with pytest.raises(ValueError):
+        Rule("mc", "==", 1)
@@ -0,0 +1,106 @@
+# sniffers/test_tokenlist_stream.py – concurrent paged tokenlist streaming against the stub server
+
+import asyncio
+import random
+from contextlib import aclosing
+
+import pytest
+
+from sniffers import bird_eye
+from sniffers.birdeye_client import BirdEyeClient
+from sniffers.stub_birdeye import StubBirdEye
+
+
+def _universe(n: int, seed: int = 3) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "address": f"Mint{i}",
+            "symbol": f"T{i}",
+            "name": f"Token {i}",
+            "mc": rng.choice([1_000, 50_000, 2e6]),
+            "liquidity": rng.choice([1_000, 50_000]),
+            "v24hUSD": round(rng.uniform(0, 1e6), 2),
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def stub():
+    with StubBirdEye(_universe(1_000)) as s:
+        s.delay = 0.005
+        yield s
+
+
+def _client(stub: StubBirdEye) -> BirdEyeClient:
+    return BirdEyeClient("test-key", base_url=stub.base_url, backoff_base=0.001, max_concurrency=8)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    bird_eye.response_cache.invalidate()
+
+
+def test_streams_every_page_exactly_once(stub):
+    async def run():
+        async with _client(stub) as client:
+            return [t async for t in bird_eye.stream_tokenlist(client=client, page_size=50, concurrency=4,
+                                                                   max_tokens=1_000)]
+
+    tokens = asyncio.run(run())
+    assert sorted(t["address"] for t in tokens) == sorted(t["address"] for t in stub.tokens)
+    assert stub.requests["/defi/tokenlist"] == 20
+    assert stub.max_in_flight <= 4
+
+
+def test_default_poll_is_one_request(stub):
+    async def run():
+        async with _client(stub) as client:
+            return [t async for t in bird_eye.stream_tokenlist(client=client)]
+
+    tokens = asyncio.run(run())
+    assert len(tokens) == bird_eye.TOKENLIST_PAGE_SIZE and stub.requests["/defi/tokenlist"] == 1
+
+
+def test_max_tokens_caps_requests(stub):
+    async def run():
+        async with _client(stub) as client:
+            return [t async for t in bird_eye.stream_tokenlist(client=client, page_size=50, max_tokens=120)]
+
+    assert len(asyncio.run(run())) == 120           # 3 pages: 0, 50, 100[:20]
+    assert stub.requests["/defi/tokenlist"] == 3
+
+
+def test_consumer_can_stop_early(stub):
+    async def run():
+        async with _client(stub) as client:
+            async with aclosing(bird_eye.iter_tokenlist_pages(client=client, page_size=50, concurrency=4)) as pages:
+                async for offset, _ in pages:
+                    if offset == 0:
+                        break
+            await asyncio.sleep(0.05)
+
+    asyncio.run(run())
+    assert stub.requests["/defi/tokenlist"] == 1
+
+
+def test_top_k_matches_full_scan_and_stops_early(stub):
+    async def run():
+        async with _client(stub) as client:
+            return await bird_eye.fetch_latest_tokens(limit=10, client=client, page_size=50, concurrency=4)
+
+    top = asyncio.run(run())
+    assert top == bird_eye.rank_tokens(stub.tokens, 10)
+    # ~1/4 of the universe qualifies, so the top-10 is settled within the first pages
+    assert stub.requests["/defi/tokenlist"] < 20
+
+
+def test_page_error_is_reported_as_empty_result(stub):
+    stub.fail_next(10, status=400)
+
+    async def run():
+        async with _client(stub) as client:
+            return await bird_eye.fetch_latest_tokens(limit=5, client=client)
+
+    assert asyncio.run(run()) == []
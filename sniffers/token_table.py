@@ -0,0 +1,215 @@
+# sniffers/token_table.py – columnar tokenlist snapshot + compiled filter rules
+"""
+A tokenlist snapshot stored column-wise instead of as a list of dicts.
+
+  • numeric columns (mc, liquidity, v24hUSD, volume_24h_usd, price) live in
+    ``array('d')`` buffers that NumPy views zero-copy.  NumPy is in
+    requirements.txt; without it the columns stay plain float lists and the
+    rules run as pure-Python scans, which work but are slower than the old
+    per-dict chain on a single pass over a snapshot.  Columns are extracted
+    lazily, once per snapshot, on first use – from the row dicts, or from an
+    archived snapshot via ``TokenTable.from_columns``; ``extend`` appends a
+    page and extracts only its rows
+  • a ``RuleSet`` turns its threshold rules into vectorised boolean masks
+    (NumPy) or successive survivor scans over the columns (pure Python),
+    instead of a chain of per-dict ``.get`` calls
+  • name blacklisting is one precompiled case-insensitive regex
+  • ``top_k`` uses partial selection (argpartition / heapq) – no full sort
+"""
+
+from __future__ import annotations
+
+import heapq
+from itertools import compress
+import operator
+import re
+from array import array
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Sequence
+
+try:  # required (requirements.txt) – the pure-Python path is only a fallback
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on environment
+    np = None
+
+NUMERIC_COLUMNS = ("mc", "liquidity", "v24hUSD", "volume_24h_usd", "price")
+
+_OPS: Dict[str, Callable[[object, object], object]] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+_REFLECTED = {">": "__lt__", ">=": "__le__", "<": "__gt__", "<=": "__ge__"}
+
+
+def _num(value: object) -> float:
+    try:
+        return float(value or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class _Columns(dict):
+    """Column cache: each column is extracted from the row dicts on first use."""
+
+    def __init__(self, rows: Sequence[dict], build: Callable[[Sequence[dict], str], object]) -> None:
+        super().__init__()
+        self._rows = rows
+        self._build = build
+
+    def __missing__(self, name: str):
+        col = self[name] = self._build(self._rows, name)
+        return col
+
+    def extend(self, rows: Sequence[dict], new: Sequence[dict]) -> None:
+        """Point at ``rows`` and grow every extracted column by ``new`` only."""
+        self._rows = rows
+        for name, col in self.items():
+            self[name] = col + self._build(new, name)          # a new buffer: live NumPy views stay valid
+
+
+def _numeric_column(rows: Sequence[dict], name: str):
+    if name not in NUMERIC_COLUMNS:
+        raise KeyError(name)
+    try:
+        values = [float(r.get(name) or 0.0) for r in rows]
+    except (TypeError, ValueError):                         # strings / junk in the feed
+        values = [_num(r.get(name)) for r in rows]
+    # NumPy wants a contiguous buffer; pure Python scans the (already boxed) list faster
+    return array("d", values) if np is not None else values
+
+
+def _text_column(rows: Sequence[dict], name: str) -> List[str]:
+    return [r.get(name) or "" for r in rows]
+
+
+class _ColumnRows(Sequence):
+    """Row dicts rebuilt on demand from a column-only table (e.g. an archived snapshot)."""
+
+    def __init__(self, table: "TokenTable", n: int, names: Sequence[str]) -> None:
+        self._table = table
+        self._n = n
+        self._names = names
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._n))]
+        t = self._table
+        return {
+            name: (t.numeric[name][i] if name in NUMERIC_COLUMNS else t.text[name][i])
+            for name in self._names
+        }
+
+
+class TokenTable:
+    def __init__(self, rows: Sequence[dict]) -> None:
+        self.rows = rows
+        self.numeric: Dict[str, Sequence[float]] = _Columns(rows, _numeric_column)
+        self.text: Dict[str, List[str]] = _Columns(rows, _text_column)
+
+    @classmethod
+    def from_columns(cls, n: int, names: Sequence[str], build: Callable[[str], object]) -> "TokenTable":
+        """A table whose columns come from ``build(name)`` (lazily) instead of row dicts."""
+        table = cls.__new__(cls)
+        table.rows = _ColumnRows(table, n, names)
+        table.numeric = _Columns(table.rows, lambda _, name: build(name))
+        table.text = _Columns(table.rows, lambda _, name: build(name))
+        return table
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def column(self, name: str):
+        """NumPy view of a numeric column (zero-copy) or the raw column."""
+        col = self.numeric[name]
+        return np.frombuffer(col, dtype=np.float64) if np is not None and len(col) else col
+
+    def extend(self, rows: Sequence[dict]) -> None:
+        """Append row dicts (e.g. the next tokenlist page) without re-reading the earlier ones."""
+        self.rows = [*self.rows, *rows]
+        self.numeric.extend(self.rows, rows)
+        self.text.extend(self.rows, rows)
+
+    def take(self, indices: Iterable[int]) -> List[dict]:
+        rows = self.rows
+        return [rows[i] for i in indices]
+
+
+@dataclass(frozen=True)
+class Rule:
+    column: str
+    op: str
+    value: float
+
+    def __post_init__(self) -> None:
+        if self.column not in NUMERIC_COLUMNS:
+            raise ValueError(f"unknown column {self.column!r}")
+        if self.op not in _OPS:
+            raise ValueError(f"unknown operator {self.op!r}")
+
+    def predicate(self) -> Callable[[float], bool]:
+        """``col OP value`` as a bound C-level method of the threshold (``value < col`` …)."""
+        return getattr(float(self.value), _REFLECTED[self.op])
+
+
+@dataclass
+class RuleSet:
+    rules: Sequence[Rule] = ()
+    blacklist: Sequence[str] = ()
+    require: Sequence[str] = ()                             # text columns that must be non-empty
+    _banned: Callable[[str], object] | None = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._banned = (
+            re.compile("|".join(map(re.escape, self.blacklist)), re.IGNORECASE).search if self.blacklist else None
+        )
+
+    def select(self, table: TokenTable) -> List[int]:
+        """Row indices passing every rule, required field and the blacklist."""
+        n = len(table)
+        if not n:
+            return []
+        if np is not None and self.rules:
+            mask = np.ones(n, dtype=bool)
+            for r in self.rules:
+                mask &= _OPS[r.op](table.column(r.column), r.value)
+            idx: Iterable[int] = np.flatnonzero(mask).tolist()
+        else:
+            # survivors shrink rule by rule, so later rules touch fewer rows
+            idx = range(n)
+            for r in self.rules:
+                col, pred = table.numeric[r.column], r.predicate()
+                vals = col if isinstance(idx, range) else map(col.__getitem__, idx)
+                idx = list(compress(idx, map(pred, vals)))
+
+        for col in self.require:
+            values = table.text[col]
+            idx = [i for i in idx if values[i]]
+        if self._banned is not None:
+            names, banned = table.text["name"], self._banned
+            idx = [i for i in idx if not banned(names[i])]
+        return list(idx)
+
+    def is_banned(self, name: str) -> bool:
+        return bool(self._banned and self._banned(name))
+
+
+def top_k(table: TokenTable, indices: Sequence[int], column: str, k: int) -> List[int]:
+    """Indices of the ``k`` largest values of ``column`` among ``indices`` (desc, stable)."""
+    if k <= 0 or not indices:
+        return []
+    if np is not None and len(indices) > k:
+        idx = np.asarray(indices)
+        vals = table.column(column)[idx]
+        kth = np.partition(vals, len(vals) - k)[len(vals) - k]      # k-th largest value
+        above = np.flatnonzero(vals > kth)
+        ties = np.flatnonzero(vals == kth)[: k - len(above)]          # earliest ties, like a stable sort
+        pick = np.concatenate((above, ties))
+        pick = pick[np.lexsort((pick, -vals[pick]))]
+        return idx[pick].tolist()
+    col = table.numeric[column]
+    return heapq.nlargest(k, indices, key=col.__getitem__)
@@ -0,0 +1,220 @@
+# sniffers/ws_protocol.py – minimal RFC 6455 WebSocket over asyncio streams
+"""
+Just enough WebSocket for a JSON push feed, on the stdlib only:
+
+  • client handshake (``connect``) and server handshake (``accept``)
+  • frame codec – 7/16/64-bit lengths, client masking, fragmentation
+  • ``WebSocket`` – a reader task decodes frames into a *bounded* message
+    buffer and answers pings itself.  When the buffer is full the reader
+    stops reading the socket, so a slow consumer pushes back through TCP
+    to the sender instead of growing memory
+  • ``last_seen`` (any frame, pongs included) for heartbeat checks
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import os
+import ssl
+import time
+from typing import Dict, Tuple
+from urllib.parse import urlsplit
+
+OP_CONT, OP_TEXT, OP_BINARY, OP_CLOSE, OP_PING, OP_PONG = 0x0, 0x1, 0x2, 0x8, 0x9, 0xA
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+MAX_MESSAGE = 4 * 1024 * 1024
+
+
+class WebSocketError(ConnectionError):
+    """Handshake refused, protocol violation or connection closed."""
+
+
+def accept_key(key: str) -> str:
+    return base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+
+
+def _mask(data: bytes, key: bytes) -> bytes:
+    n = len(data)
+    if not n:
+        return data
+    k = (key * (n // 4 + 1))[:n]
+    return (int.from_bytes(data, "big") ^ int.from_bytes(k, "big")).to_bytes(n, "big")
+
+
+def encode_frame(opcode: int, payload: bytes, mask: bool, fin: bool = True) -> bytes:
+    head = bytearray([(0x80 if fin else 0) | opcode])
+    n = len(payload)
+    bit = 0x80 if mask else 0
+    if n < 126:
+        head.append(bit | n)
+    elif n < 1 << 16:
+        head.append(bit | 126)
+        head += n.to_bytes(2, "big")
+    else:
+        head.append(bit | 127)
+        head += n.to_bytes(8, "big")
+    if mask:
+        key = os.urandom(4)
+        head += key
+        payload = _mask(payload, key)
+    return bytes(head) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[bool, int, bytes]:
+    """Return (fin, opcode, unmasked payload) of the next frame."""
+    b0, b1 = await reader.readexactly(2)
+    n = b1 & 0x7F
+    if n == 126:
+        n = int.from_bytes(await reader.readexactly(2), "big")
+    elif n == 127:
+        n = int.from_bytes(await reader.readexactly(8), "big")
+    if n > MAX_MESSAGE:
+        raise WebSocketError(f"frame of {n} bytes exceeds {MAX_MESSAGE}")
+    key = await reader.readexactly(4) if b1 & 0x80 else None
+    payload = await reader.readexactly(n)
+    return bool(b0 & 0x80), b0 & 0x0F, _mask(payload, key) if key else payload
+
+
+async def _read_head(reader: asyncio.StreamReader) -> Tuple[str, Dict[str, str]]:
+    raw = await reader.readuntil(b"\r\n\r\n")
+    first, *lines = raw.decode("latin-1").split("\r\n")
+    headers = {}
+    for line in lines:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return first, headers
+
+
+class WebSocket:
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, *, client: bool, buffer: int = 256
+    ) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.client = client                              # clients mask what they send
+        self.last_seen = time.monotonic()
+        self.high_water = 0
+        self.close_code: int | None = None
+        self.auto_pong = True                             # stub servers switch it off to fake a stall
+        self._messages: asyncio.Queue = asyncio.Queue(maxsize=buffer)
+        self._reader_task = asyncio.create_task(self._read_loop())
+
+    # ─────────────── sending ───────────────
+    def _send(self, opcode: int, payload: bytes) -> None:
+        if not self.writer.is_closing():
+            self.writer.write(encode_frame(opcode, payload, mask=self.client))
+
+    async def send_text(self, text: str) -> None:
+        self._send(OP_TEXT, text.encode())
+        await self.writer.drain()
+
+    async def ping(self, payload: bytes = b"") -> None:
+        self._send(OP_PING, payload)
+        await self.writer.drain()
+
+    # ─────────────── receiving ───────────────
+    async def _read_loop(self) -> None:
+        parts: list[bytes] = []
+        try:
+            while True:
+                fin, opcode, payload = await read_frame(self.reader)
+                self.last_seen = time.monotonic()
+                if opcode == OP_PING:
+                    if self.auto_pong:
+                        self._send(OP_PONG, payload)
+                elif opcode == OP_PONG:
+                    pass
+                elif opcode == OP_CLOSE:
+                    self.close_code = int.from_bytes(payload[:2], "big") if len(payload) >= 2 else 1005
+                    self._send(OP_CLOSE, payload[:2])
+                    break
+                elif opcode in (OP_TEXT, OP_BINARY, OP_CONT):
+                    parts.append(payload)
+                    if fin:
+                        message = b"".join(parts).decode()
+                        parts.clear()
+                        await self._messages.put(message)          # blocks when full → TCP backpressure
+                        self.high_water = max(self.high_water, self._messages.qsize())
+                else:
+                    raise WebSocketError(f"unknown opcode {opcode:#x}")
+        except (asyncio.IncompleteReadError, ConnectionError, UnicodeDecodeError) as e:
+            await self._messages.put(e if isinstance(e, WebSocketError) else WebSocketError(str(e) or "connection lost"))
+            return
+        await self._messages.put(WebSocketError(f"closed by peer ({self.close_code})"))
+
+    def pending(self) -> int:
+        return self._messages.qsize()
+
+    async def recv(self) -> str:
+        """Next text message; raises ``WebSocketError`` once the connection is gone."""
+        item = self._messages.get_nowait() if not self._messages.empty() else await self._messages.get()
+        if isinstance(item, BaseException):
+            self._messages.put_nowait(item)                        # keep raising on later calls
+            raise item
+        return item
+
+    # ─────────────── lifecycle ───────────────
+    async def close(self, code: int = 1000) -> None:
+        self._reader_task.cancel()
+        try:
+            self._send(OP_CLOSE, code.to_bytes(2, "big"))
+            self.writer.close()
+            await asyncio.wait_for(self.writer.wait_closed(), 1.0)
+        except (ConnectionError, asyncio.TimeoutError):
+            pass
+
+
+async def connect(
+    url: str, headers: Dict[str, str] | None = None, *, timeout: float = 10.0, buffer: int = 256
+) -> WebSocket:
+    """Open a client WebSocket to ``ws://`` or ``wss://`` ``url``."""
+    parts = urlsplit(url)
+    secure = parts.scheme == "wss"
+    host = parts.hostname or "localhost"
+    port = parts.port or (443 if secure else 80)
+    path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(host, port, ssl=ssl.create_default_context() if secure else None), timeout
+    )
+    key = base64.b64encode(os.urandom(16)).decode()
+    lines = [
+        f"GET {path} HTTP/1.1",
+        f"Host: {parts.netloc}",
+        "Upgrade: websocket",
+        "Connection: Upgrade",
+        f"Sec-WebSocket-Key: {key}",
+        "Sec-WebSocket-Version: 13",
+        *(f"{k}: {v}" for k, v in (headers or {}).items()),
+    ]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode())
+    try:
+        status, reply = await asyncio.wait_for(_read_head(reader), timeout)
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError) as e:
+        writer.close()
+        raise WebSocketError(f"handshake failed: {e}") from e
+    if " 101 " not in f"{status} " or reply.get("sec-websocket-accept") != accept_key(key):
+        writer.close()
+        raise WebSocketError(f"handshake refused: {status}")
+    return WebSocket(reader, writer, client=True, buffer=buffer)
+
+
+async def accept(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, buffer: int = 256) -> WebSocket:
+    """Server side: answer the upgrade request read from ``reader``."""
+    _, headers = await _read_head(reader)
+    key = headers.get("sec-websocket-key")
+    if not key or headers.get("upgrade", "").lower() != "websocket":
+        writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n")
+        writer.close()
+        raise WebSocketError("not a websocket upgrade")
+    extra = f"Sec-WebSocket-Protocol: {headers['sec-websocket-protocol']}\r\n" if "sec-websocket-protocol" in headers else ""
+    writer.write(
+        (
+            "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept_key(key)}\r\n{extra}\r\n"
+        ).encode()
+    )
+    await writer.drain()
+    return WebSocket(reader, writer, client=False, buffer=buffer)
@@ -0,0 +1,61 @@
+# utils/bloom.py – compact Bloom filter for fast "definitely not seen" checks
+
+from __future__ import annotations
+
+import hashlib
+import math
+from typing import Iterable
+
+
+class BloomFilter:
+    """
+    Classic Bloom filter over a ``bytearray`` bit set.
+
+    Sized from the expected ``capacity`` and target ``error_rate``; the k
+    probe positions come from double hashing one 16-byte blake2b digest.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be >= 1 and 0 < error_rate < 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _probes(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        m = self.num_bits
+        return ((h1 + i * h2) % m for i in range(self.num_hashes))
+
+    def add(self, item: str) -> None:
+        bits = self.bits
+        for p in self._probes(item):
+            bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+    def update(self, items: Iterable[str]) -> None:
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._probes(item))
+
+    def clear(self) -> None:
+        self.bits = bytearray(len(self.bits))
+        self.count = 0
+
+    def fill_ratio(self) -> float:
+        return int.from_bytes(self.bits, "little").bit_count() / self.num_bits
+
+    def estimated_fp_rate(self) -> float:
+        """False-positive probability implied by the current bit occupancy."""
+        return self.fill_ratio() ** self.num_hashes
+
+    def __len__(self) -> int:
+        return self.count
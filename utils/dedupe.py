@@ -0,0 +1,231 @@
+# utils/dedupe.py – bounded, time-windowed "have I seen this token?" structures
+"""
+Shared by the sniffer and the brain so neither grows a forever-set.
+
+Both flavours answer ``check_and_add(key) -> bool`` (True = duplicate within
+the window) under a fixed memory budget:
+
+  • ``TTLDedupe``           exact; cachetools TTL-LRU keyed on token address.
+                            At capacity the oldest key is evicted early.
+  • ``RotatingBloomDedupe`` approximate; N Bloom-filter generations rotated
+                            every window/(N-1), so a key is remembered for at
+                            least ``window`` seconds in O(capacity) bits –
+                            unless a generation fills up first: it is then
+                            rotated early (logged, counted in ``stats()``)
+                            and the effective window shrinks.
+
+The window starts at a key's first sighting; re-sightings do not extend it.
+
+For warm restarts (``bot.checkpoint``) both also offer ``fresh()`` – the keys
+first seen since the previous call, tracked only once it has been called –
+and ``restore(keys, age)``, which re-adds keys first seen ``age`` seconds
+ago so they expire when they would have without the restart.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List
+
+from cachetools import TTLCache
+from loguru import logger
+
+from utils.bloom import BloomFilter
+
+
+class TTLDedupe:
+    def __init__(self, window: float, capacity: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self.window = window
+        self.capacity = capacity
+        self._clock = clock
+        self._cache: TTLCache = TTLCache(maxsize=capacity, ttl=window, timer=clock)
+        # restored keys → expiry: a plain dict fills ≈35x faster than TTLCache inserts (warm restarts)
+        self._warm: Dict[str, float] = {}
+        self._warm_until = 0.0
+        self._lock = threading.Lock()
+        self._fresh: List[str] | None = None
+        self.checks = self.duplicates = 0
+
+    def _in_warm(self, key: str) -> bool:
+        """Caller holds the lock."""
+        now = self._clock()
+        if now >= self._warm_until:
+            self._warm = {}                               # every restored key has expired
+            return False
+        expires = self._warm.get(key)
+        if expires is None:
+            return False
+        if expires <= now:
+            del self._warm[key]
+            return False
+        return True
+
+    def check_and_add(self, key: str) -> bool:
+        with self._lock:
+            self.checks += 1
+            if key in self._cache or (self._warm and self._in_warm(key)):
+                self.duplicates += 1
+                return True
+            self._cache[key] = True
+            if self._fresh is not None:
+                self._fresh.append(key)
+            return False
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._cache or (bool(self._warm) and self._in_warm(key))
+
+    def fresh(self) -> List[str]:
+        with self._lock:
+            out, self._fresh = self._fresh or [], []
+            return out
+
+    def restore(self, keys: Iterable[str], age: float) -> int:
+        """Re-add ``keys`` first seen ``age`` seconds ago; call oldest batch first."""
+        if age >= self.window:
+            return 0
+        expires = self._clock() - max(0.0, age) + self.window
+        with self._lock:
+            before = len(self._warm)
+            self._warm.update(dict.fromkeys(keys, expires))
+            added = len(self._warm) - before
+            for _ in range(len(self._warm) - self.capacity):       # over budget: forget the oldest batches
+                del self._warm[next(iter(self._warm))]
+            self._warm_until = max(self._warm_until, expires)
+            return added
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            now = self._clock()
+            return list(self._cache.keys()) + [k for k, expires in self._warm.items() if expires > now]
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._cache.expire()
+            now = self._clock()
+            return len(self._cache) + sum(1 for expires in self._warm.values() if expires > now)
+
+    def stats(self) -> Dict[str, float]:
+        size = len(self)
+        return {
+            "kind": "ttl",
+            "window_s": self.window,
+            "size": size,
+            "occupancy": size / self.capacity,
+            "checks": self.checks,
+            "duplicates": self.duplicates,
+            "estimated_fp_rate": 0.0,
+        }
+
+
+class RotatingBloomDedupe:
+    def __init__(
+        self,
+        window: float,
+        capacity: int,
+        generations: int = 3,
+        error_rate: float = 0.001,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if generations < 2:
+            raise ValueError("need at least 2 generations")
+        self.window = window
+        self.capacity = capacity
+        self.slice = window / (generations - 1)
+        self._per_gen = max(1, capacity // generations)
+        self._error_rate = error_rate
+        self._clock = clock
+        self._gens: List[BloomFilter] = [BloomFilter(self._per_gen, error_rate) for _ in range(generations)]
+        self._rotated_at = clock()
+        self._lock = threading.Lock()
+        self._fresh: List[str] | None = None
+        self.checks = self.duplicates = self.rotations = self.early_rotations = 0
+
+    def _maybe_rotate(self) -> None:
+        now = self._clock()
+        elapsed = int((now - self._rotated_at) // self.slice)
+        if not elapsed and self._gens[0].count >= self._per_gen:
+            elapsed = 1                                   # current generation full → rotate early
+            self.early_rotations += 1
+            logger.warning(
+                f"🧹 Dedupe generation full ({self._per_gen} keys) after {now - self._rotated_at:.0f}s "
+                f"of a {self.slice:.0f}s slice – rotating early, keys are remembered for less than "
+                f"{self.window:.0f}s (raise DEDUPE_CAPACITY)"
+            )
+        for _ in range(min(elapsed, len(self._gens))):
+            self._gens.pop()
+            self._gens.insert(0, BloomFilter(self._per_gen, self._error_rate))
+            self.rotations += 1
+        if elapsed:
+            self._rotated_at = now
+
+    def check_and_add(self, key: str) -> bool:
+        with self._lock:
+            self._maybe_rotate()
+            self.checks += 1
+            if any(key in g for g in self._gens):
+                self.duplicates += 1
+                return True
+            self._gens[0].add(key)
+            if self._fresh is not None:
+                self._fresh.append(key)
+            return False
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            self._maybe_rotate()
+            return any(key in g for g in self._gens)
+
+    def fresh(self) -> List[str]:
+        with self._lock:
+            out, self._fresh = self._fresh or [], []
+            return out
+
+    def restore(self, keys: Iterable[str], age: float) -> int:
+        """Re-add ``keys`` first seen ``age`` seconds ago into the generation they would sit in."""
+        if age >= self.window:
+            return 0
+        with self._lock:
+            self._maybe_rotate()
+            gen = self._gens[min(int(max(0.0, age) // self.slice), len(self._gens) - 1)]
+            before = gen.count
+            gen.update(keys)
+            return gen.count - before
+
+    def __len__(self) -> int:
+        return sum(g.count for g in self._gens)
+
+    def estimated_fp_rate(self) -> float:
+        miss = 1.0
+        for g in self._gens:
+            miss *= 1.0 - g.estimated_fp_rate()
+        return 1.0 - miss
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            size = len(self)
+            return {
+                "kind": "bloom",
+                "window_s": self.window,
+                "size": size,
+                "occupancy": size / (self._per_gen * len(self._gens)),
+                "checks": self.checks,
+                "duplicates": self.duplicates,
+                "rotations": self.rotations,
+                "early_rotations": self.early_rotations,
+                "estimated_fp_rate": self.estimated_fp_rate(),
+            }
+
+
+def make_dedupe(kind: str | None = None, window: float | None = None, capacity: int | None = None):
+    """Build the configured dedupe (env: DEDUPE_BACKEND, DEDUPE_WINDOW_S, DEDUPE_CAPACITY)."""
+    kind = kind or os.getenv("DEDUPE_BACKEND", "ttl")
+    window = window if window is not None else float(os.getenv("DEDUPE_WINDOW_S", "21600"))
+    capacity = capacity if capacity is not None else int(os.getenv("DEDUPE_CAPACITY", "100000"))
+    if kind == "ttl":
+        return TTLDedupe(window, capacity)
+    if kind == "bloom":
+        return RotatingBloomDedupe(window, capacity)
+    raise ValueError(f"unknown dedupe backend: {kind!r}")
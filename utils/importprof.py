@@ -0,0 +1,92 @@
+# utils/importprof.py – `-X importtime` summaries and a cold-start stopwatch
+"""
+``python main.py --importtime`` and ``python main.py --cold-start`` use this:
+
+  • ``profile_imports`` runs a snippet under ``python -X importtime`` in a
+    fresh interpreter and parses the per-module self / cumulative µs
+  • ``summarize`` folds that into the top packages by self time and the
+    heaviest first-level imports – where a cold start actually goes
+  • ``measure_cold_start`` starts a fresh process and times it until it
+    prints the ``LISTENING`` marker (interpreter start-up included)
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+LISTENING = "ASHBORN-LISTENING"
+
+
+@dataclass(frozen=True)
+class ImportRecord:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative, name = line[len("import time:"):].split("|", 2)
+            depth = (len(name) - len(name.lstrip())) // 2
+            records.append(ImportRecord(name.strip(), int(self_us), int(cumulative), depth))
+        except ValueError:
+            continue
+    return records
+
+
+def profile_imports(code: str, env: Dict[str, str] | None = None) -> List[ImportRecord]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, env=env, check=False
+    )
+    if proc.returncode:
+        raise RuntimeError(f"import profile failed:\n{proc.stderr[-2000:]}")
+    return parse_importtime(proc.stderr)
+
+
+def summarize(records: Sequence[ImportRecord], top: int = 15) -> str:
+    by_package: Dict[str, int] = defaultdict(int)
+    for r in records:
+        by_package[r.name.split(".")[0]] += r.self_us
+    total = sum(by_package.values())
+    roots = sorted((r for r in records if r.depth <= 1), key=lambda r: r.cumulative_us, reverse=True)
+
+    lines = [f"total import time: {total / 1000:.1f} ms over {len(records)} modules", "",
+             f"{'package':<28} {'self ms':>9} {'share':>6}"]
+    for name, us in sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)[:top]:
+        lines.append(f"{name:<28} {us / 1000:>9.1f} {us / total:>6.1%}")
+    lines += ["", f"{'first-level import':<40} {'cumulative ms':>13}"]
+    for r in roots[:top]:
+        lines.append(f"{r.name:<40} {r.cumulative_us / 1000:>13.1f}")
+    return "\n".join(lines)
+
+
+def measure_cold_start(argv: Sequence[str], timeout: float = 30.0) -> Tuple[float, str]:
+    """Wall-clock ms from spawning ``argv`` until it prints ``LISTENING``; plus its output."""
+    started = time.perf_counter()
+    proc = subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    output: List[str] = []
+    elapsed = None
+    try:
+        for line in proc.stdout:
+            output.append(line)
+            if elapsed is None and LISTENING in line:
+                elapsed = (time.perf_counter() - started) * 1000
+            if time.perf_counter() - started > timeout:
+                break
+        proc.wait(timeout=timeout)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+    if elapsed is None:
+        raise RuntimeError("process never reached LISTENING:\n" + "".join(output[-30:]))
+    return elapsed, "".join(output)
@@ -0,0 +1,298 @@
+# utils/logger.py – central logging: background writer, rotation, JSON lines, hot-path sampling
+"""
+``setup_logging()`` replaces the old ``print`` sink in ``main.py``.
+
+  • the loguru handler only hands the record to an in-process queue
+    (``queue.SimpleQueue.put``); rendering, JSON encoding, file and console
+    I/O, rotation and gzip all happen on one background writer thread.
+    loguru's own ``enqueue=True`` pickles every record through a pipe –
+    slower in the caller than writing the file directly
+  • ``logs/ashborn.log`` rotates at ``LOG_ROTATE_MB`` or every
+    ``LOG_ROTATE_HOURS``, whichever comes first; rotated files are gzipped
+    and the newest ``LOG_RETENTION`` are kept
+  • ``LOG_JSON=1`` writes JSON lines (time, level, message, module, line,
+    extra) to the file instead of text
+  • ``hot(key)`` for per-event call sites: the first ``LOG_SAMPLE_BURST``
+    messages of a key per ``LOG_SAMPLE_INTERVAL`` seconds pass, then one in
+    ``LOG_SAMPLE_EVERY``; a suppressed call costs a dict lookup, and the next
+    message that passes carries ``(+N suppressed)``
+"""
+
+from __future__ import annotations
+
+import atexit
+import gzip
+import json
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, TextIO
+
+from loguru import logger
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_DIR = os.getenv("LOG_DIR", "logs")
+LOG_JSON = os.getenv("LOG_JSON", "0").lower() in ("1", "true", "yes")
+LOG_ROTATE_MB = float(os.getenv("LOG_ROTATE_MB", "50"))
+LOG_ROTATE_HOURS = float(os.getenv("LOG_ROTATE_HOURS", "24"))
+LOG_RETENTION = int(os.getenv("LOG_RETENTION", "14"))
+LOG_SAMPLE_BURST = int(os.getenv("LOG_SAMPLE_BURST", "20"))
+LOG_SAMPLE_INTERVAL = float(os.getenv("LOG_SAMPLE_INTERVAL", "1"))
+LOG_SAMPLE_EVERY = int(os.getenv("LOG_SAMPLE_EVERY", "100"))
+
+YIELD_EVERY = 16                                      # records rendered per GIL hand-off on the writer
+
+
+def render_text(record: Dict[str, Any]) -> str:
+    suppressed = record["extra"].get("suppressed")
+    tail = f" (+{suppressed} suppressed)" if suppressed else ""
+    text = (
+        f"{record['time']:%Y-%m-%d %H:%M:%S.%f}"[:-3]
+        + f" | {record['level'].name:<8} | {record['name']}:{record['function']}:{record['line']} - "
+        + f"{record['message']}{tail}\n"
+    )
+    exc = record["exception"]
+    if exc is not None and exc.type is not None:
+        text += "".join(traceback.format_exception(exc.type, exc.value, exc.traceback))
+    return text
+
+
+def render_json(record: Dict[str, Any]) -> str:
+    entry = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "message": record["message"],
+        "module": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+    }
+    if record["extra"]:
+        entry["extra"] = record["extra"]
+    if record["exception"] is not None and record["exception"].type is not None:
+        entry["exception"] = repr(record["exception"].value)
+    return json.dumps(entry, default=str, ensure_ascii=False) + "\n"
+
+
+class RotatingFile:
+    """Append-only text file rotated by size or age; rotated copies gzipped, the oldest pruned."""
+
+    def __init__(
+        self,
+        path: Path | str,
+        max_bytes: float = LOG_ROTATE_MB * 1024 * 1024,
+        interval: float = LOG_ROTATE_HOURS * 3600,
+        backups: int = LOG_RETENTION,
+        compress: bool = True,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.backups = backups
+        self.compress = compress
+        self.clock = clock
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._open()
+
+    def _open(self) -> None:
+        self._fh = open(self.path, "a", encoding="utf-8")
+        self.size = self._fh.tell()
+        self.opened_at = self.clock()
+
+    def write(self, text: str) -> None:
+        if self.size and (self.size + len(text) > self.max_bytes or self.clock() - self.opened_at >= self.interval):
+            self.rotate()
+        self._fh.write(text)
+        self.size += len(text.encode("utf-8")) if not text.isascii() else len(text)
+
+    def flush(self) -> None:
+        self._fh.flush()
+
+    def rotate(self) -> Path:
+        self._fh.close()
+        stamp = datetime.fromtimestamp(self.clock()).strftime("%Y%m%d-%H%M%S")
+        target = self.path.with_name(f"{self.path.stem}.{stamp}{self.path.suffix}")
+        n = 1
+        while target.exists() or target.with_name(target.name + ".gz").exists():
+            target = self.path.with_name(f"{self.path.stem}.{stamp}-{n}{self.path.suffix}")
+            n += 1
+        self.path.rename(target)
+        if self.compress:
+            with open(target, "rb") as src, gzip.open(target.with_name(target.name + ".gz"), "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            target.unlink()
+            target = target.with_name(target.name + ".gz")
+        self._prune()
+        self._open()
+        return target
+
+    def _prune(self) -> None:
+        rotated = sorted(self.path.parent.glob(f"{self.path.stem}.*{self.path.suffix}*"), key=lambda p: p.stat().st_mtime)
+        for old in rotated[: max(0, len(rotated) - self.backups)]:
+            old.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+class BackgroundSink:
+    """loguru sink: ``put`` the record now, render and write it on the writer thread."""
+
+    def __init__(self, outputs: List[tuple[Any, Callable[[Dict[str, Any]], str], int]]) -> None:
+        self.outputs = outputs                        # (writer with write/flush, renderer, min level no)
+        self.written = 0
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._drain, name="LogWriter", daemon=True)
+        self._thread.start()
+
+    def __call__(self, message) -> None:
+        self._queue.put(message.record)
+
+    def _drain(self) -> None:
+        while True:
+            record = self._queue.get()
+            if record is None:
+                break
+            batch = [record]
+            while True:                               # write whatever piled up, then flush once
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    self._write(batch)
+                    return
+                batch.append(record)
+            self._write(batch)
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        for out, render, levelno in self.outputs:
+            try:
+                for i, record in enumerate(batch, 1):
+                    if record["level"].no >= levelno:
+                        out.write(render(record))
+                    if not i % YIELD_EVERY:
+                        time.sleep(0)                 # hand the GIL back – never stall the loop for a whole batch
+                out.flush()
+            except Exception as e:                    # a broken sink must not kill the writer
+                sys.__stderr__.write(f"logging sink error: {e}\n")
+        self.written += len(batch)
+
+    def close(self, timeout: float = 5.0) -> None:
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+        for out, _, _ in self.outputs:
+            if hasattr(out, "close") and out not in (sys.stdout, sys.stderr, sys.__stdout__, sys.__stderr__):
+                out.close()
+
+
+class Sampler:
+    """Per-key burst + 1-in-N sampling for per-event log lines."""
+
+    def __init__(
+        self,
+        burst: int = LOG_SAMPLE_BURST,
+        interval: float = LOG_SAMPLE_INTERVAL,
+        every: int = LOG_SAMPLE_EVERY,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.burst = burst
+        self.interval = interval
+        self.every = max(1, every)
+        self.clock = clock
+        self._state: Dict[str, list] = {}             # key → [window start, seen in window, suppressed]
+        self._lock = threading.Lock()
+
+    def allow(self, key: str) -> int:
+        """0 → suppress; otherwise 1 + the number of messages suppressed since the last one that passed."""
+        now = self.clock()
+        with self._lock:
+            st = self._state.get(key)
+            if st is None:
+                st = self._state[key] = [now, 0, 0]
+            if now - st[0] >= self.interval:
+                st[0], st[1] = now, 0
+            st[1] += 1
+            if st[1] <= self.burst or (st[1] - self.burst) % self.every == 0:
+                passed, st[2] = st[2] + 1, 0
+                return passed
+            st[2] += 1
+            return 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {key: st[2] for key, st in self._state.items() if st[2]}
+
+
+class _Muted:
+    """Stands in for the logger when a hot-path message is sampled out."""
+
+    def _drop(self, *args, **kwargs) -> None:
+        return None
+
+    trace = debug = info = success = warning = error = critical = exception = log = _drop
+
+
+MUTED = _Muted()
+sampler = Sampler()
+
+
+def hot(key: str):
+    """``hot("alpha.promote").info("… {}", x)`` – sampled per ``key``; format args are only rendered if kept."""
+    passed = sampler.allow(key)
+    if not passed:
+        return MUTED
+    return logger.bind(hot=key, suppressed=passed - 1) if passed > 1 else logger
+
+
+_sink: BackgroundSink | None = None
+_handler_id: int | None = None
+
+
+def setup_logging(
+    level: str = LOG_LEVEL,
+    *,
+    log_dir: str | None = LOG_DIR,
+    json_lines: bool = LOG_JSON,
+    console: TextIO | None = sys.stdout,
+    file_level: str | None = None,
+) -> BackgroundSink:
+    """Route every loguru record through one background writer (console text + rotating file)."""
+    global _sink, _handler_id
+    shutdown_logging()
+    outputs: List[tuple[Any, Callable[[Dict[str, Any]], str], int]] = []
+    if console is not None:
+        outputs.append((console, render_text, logger.level(level).no))
+    if log_dir:
+        path = Path(log_dir) / ("ashborn.jsonl" if json_lines else "ashborn.log")
+        outputs.append((RotatingFile(path), render_json if json_lines else render_text,
+                        logger.level(file_level or level).no))
+    _sink = BackgroundSink(outputs)
+    logger.remove()
+    lowest = min((lv for _, _, lv in outputs), default=logger.level(level).no)
+    _handler_id = logger.add(_sink, level=lowest, format="{message}", catch=True)
+    return _sink
+
+
+def shutdown_logging() -> None:
+    """Write out everything still queued and close the files (also runs at exit)."""
+    global _sink, _handler_id
+    if _handler_id is not None:
+        try:
+            logger.remove(_handler_id)
+        except ValueError:
+            pass
+        _handler_id = None
+    if _sink is not None:
+        _sink.close()
+        _sink = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,191 @@
+# utils/rate_limit.py – shared API-credit budget: token bucket + adaptive poll scheduler
+"""
+One ``TokenBucket`` sits in front of every BirdEye request, one
+``PollScheduler`` decides how long each poller sleeps.
+
+  • ``TokenBucket`` – ``per_minute`` credits, ``burst`` of them up front.
+    ``acquire`` reserves a token immediately (the balance may go negative)
+    and sleeps off the deficit, so waiters are served FIFO without a lock
+    bound to any one event loop.  ``pause(retry_after)`` freezes the bucket
+    after a 429: nobody sends until the server says so, and no credit is
+    earned meanwhile; the first request after it goes straight out.
+  • ``metered()`` counts the requests made inside a ``with`` block (and
+    every task spawned from it) through a context variable – the scheduler
+    learns what one poll *costs* without guessing
+  • ``PollScheduler`` – per-poller interval: halve it after a poll that
+    found new / changed tokens, ×1.5 after a quiet one, ×2 (at least the
+    Retry-After) after a throttle, clamped to [min, max]; then raised to
+    whatever floor keeps Σ cost / interval within ``share`` of the budget
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator
+
+
+@dataclass
+class Meter:
+    requests: int = 0
+
+
+_meter: contextvars.ContextVar[Meter | None] = contextvars.ContextVar("rate_limit_meter", default=None)
+
+
+class TokenBucket:
+    def __init__(
+        self, per_minute: float, burst: float | None = None, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        if per_minute <= 0:
+            raise ValueError("per_minute must be > 0")
+        self.per_minute = per_minute
+        self.rate = per_minute / 60.0
+        self.capacity = burst if burst is not None else max(1.0, min(per_minute, 20.0))
+        self.clock = clock
+        self.tokens = self.capacity
+        self._stamp = clock()                             # credit accrues from here (future while paused)
+        self._lock = threading.Lock()
+        self.granted = self.delayed = self.throttled = 0
+        self.wait_seconds = 0.0
+
+    def _refill(self, now: float) -> None:
+        if now > self._stamp:
+            self.tokens = min(self.capacity, self.tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+
+    def reserve(self, cost: float = 1.0) -> float:
+        """Take ``cost`` credits now; return how long the caller must wait before using them."""
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            self.tokens -= cost
+            delay = max(0.0, self._stamp - now) + (-self.tokens / self.rate if self.tokens < 0 else 0.0)
+            self.granted += 1
+            if delay > 0:
+                self.delayed += 1
+                self.wait_seconds += delay
+        meter = _meter.get()
+        if meter is not None:
+            meter.requests += 1
+        return delay
+
+    async def acquire(self, cost: float = 1.0) -> float:
+        delay = self.reserve(cost)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def pause(self, seconds: float) -> None:
+        """Server said 429 / Retry-After: one request at ``seconds`` from now, none (and no credit) before."""
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            self.throttled += 1
+            if now + seconds > self._stamp:
+                self._stamp = now + seconds
+                self.tokens = min(self.tokens, 1.0)
+
+    def retry_after(self) -> float:
+        return max(0.0, self._stamp - self.clock())
+
+    @staticmethod
+    @contextmanager
+    def metered() -> Iterator[Meter]:
+        meter = Meter()
+        token = _meter.set(meter)
+        try:
+            yield meter
+        finally:
+            _meter.reset(token)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "per_minute": self.per_minute,
+            "tokens": round(self.tokens, 2),
+            "granted": self.granted,
+            "delayed": self.delayed,
+            "throttled": self.throttled,
+            "wait_s": round(self.wait_seconds, 3),
+            "paused_s": round(self.retry_after(), 3),
+        }
+
+
+@dataclass
+class Poller:
+    name: str
+    min_interval: float
+    max_interval: float
+    interval: float
+    cost: float = 1.0                                     # EWMA of requests per poll
+    polls: int = 0
+    active: int = 0                                       # polls that found something
+    throttled_seen: int = 0
+
+
+class PollScheduler:
+    def __init__(
+        self,
+        budget_per_minute: float,
+        limiter: TokenBucket | None = None,
+        *,
+        share: float = 0.8,                               # headroom for refreshers / manual calls
+        speedup: float = 0.5,
+        backoff: float = 1.5,
+        cost_alpha: float = 0.3,
+    ) -> None:
+        self.budget_per_minute = budget_per_minute
+        self.limiter = limiter
+        self.share = share
+        self.speedup = speedup
+        self.backoff = backoff
+        self.cost_alpha = cost_alpha
+        self.pollers: Dict[str, Poller] = {}
+
+    def register(self, name: str, min_interval: float, max_interval: float, initial: float | None = None) -> Poller:
+        start = min(max_interval, max(min_interval, initial if initial is not None else min_interval))
+        poller = self.pollers[name] = Poller(name, min_interval, max_interval, start)
+        if self.limiter is not None:
+            poller.throttled_seen = self.limiter.throttled
+        return poller
+
+    def floor(self, name: str) -> float:
+        """Shortest interval for ``name`` that keeps every poller within the budget share."""
+        poller = self.pollers[name]
+        allowed = self.budget_per_minute * self.share
+        others = sum(p.cost * 60.0 / p.interval for p in self.pollers.values() if p is not poller)
+        available = max(allowed - others, allowed / len(self.pollers))
+        return poller.cost * 60.0 / available
+
+    def observe(self, name: str, changed: int, requests: int | None = None) -> float:
+        """Feed one poll's outcome; returns how long ``name`` should sleep before the next one."""
+        p = self.pollers[name]
+        p.polls += 1
+        if requests:
+            p.cost = requests if p.polls == 1 else self.cost_alpha * requests + (1 - self.cost_alpha) * p.cost
+        throttled, retry_after = False, 0.0
+        if self.limiter is not None:
+            throttled = self.limiter.throttled > p.throttled_seen
+            p.throttled_seen = self.limiter.throttled
+            retry_after = self.limiter.retry_after()
+
+        if throttled or retry_after:
+            interval = max(p.interval * 2, retry_after)
+        elif changed:
+            p.active += 1
+            interval = p.interval * self.speedup
+        else:
+            interval = p.interval * self.backoff
+        p.interval = min(p.max_interval, max(p.min_interval, interval, retry_after))
+        p.interval = max(p.interval, self.floor(name))
+        return p.interval
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {
+            p.name: {"interval": round(p.interval, 2), "cost": round(p.cost, 2), "polls": p.polls, "active": p.active}
+            for p in self.pollers.values()
+        }
@@ -0,0 +1,90 @@
+# utils/test_dedupe.py – windowed dedupe: expiry, memory bound and metrics
+
+import pytest
+
+from utils.dedupe import RotatingBloomDedupe, TTLDedupe, make_dedupe
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.parametrize("cls", [TTLDedupe, RotatingBloomDedupe])
+def test_duplicate_within_window_then_forgotten(cls):
+    clock = FakeClock()
+    d = cls(window=60, capacity=1000, clock=clock)
+    assert d.check_and_add("mintA") is False
+    clock.now = 30
+    assert d.check_and_add("mintA") is True
+    clock.now = 200
+    assert d.check_and_add("mintA") is False
+    s = d.stats()
+    assert s["checks"] == 3 and s["duplicates"] == 1
+
+
+@pytest.mark.parametrize("cls", [TTLDedupe, RotatingBloomDedupe])
+def test_fresh_keys_and_restore_keep_the_original_expiry(cls):
+    clock = FakeClock()
+    d = cls(window=60, capacity=1000, clock=clock)
+    d.check_and_add("before")                       # not tracked until fresh() is first called
+    assert d.fresh() == []
+    d.check_and_add("mintA")
+    d.check_and_add("mintA")
+    assert d.fresh() == ["mintA"] and d.fresh() == []
+
+    warm = cls(window=60, capacity=1000, clock=clock)
+    warm.fresh()
+    warm.restore(["old"], age=75)                   # already past its window
+    warm.restore(["mintA"], age=40)
+    assert warm.fresh() == []                       # restored keys are not fresh again
+    assert "old" not in warm
+    assert warm.check_and_add("mintA") is True
+    clock.now = 80                                  # first seen 120 s ago: past the window (+ a Bloom slice)
+    assert warm.check_and_add("mintA") is False
+
+
+def test_ttl_memory_is_bounded():
+    d = TTLDedupe(window=3600, capacity=100)
+    for i in range(10_000):
+        d.check_and_add(f"mint{i}")
+    assert len(d) == 100
+    assert d.stats()["occupancy"] == 1.0
+
+
+def test_bloom_remembers_at_least_one_window():
+    clock = FakeClock()
+    d = RotatingBloomDedupe(window=60, capacity=3000, generations=3, clock=clock)
+    d.check_and_add("mintA")
+    for t in range(1, 60):
+        clock.now = t
+        assert "mintA" in d
+
+
+def test_bloom_early_rotation_is_counted():
+    clock = FakeClock()
+    d = RotatingBloomDedupe(window=60, capacity=30, generations=3, clock=clock)
+    for i in range(25):                             # 10 keys per generation, all within one slice
+        d.check_and_add(f"mint{i}")
+    s = d.stats()
+    assert s["early_rotations"] == 2 and s["rotations"] == 2
+    assert s["occupancy"] <= 1.0
+
+
+def test_bloom_false_positive_rate_is_reported_and_small():
+    d = RotatingBloomDedupe(window=3600, capacity=30_000, generations=3, error_rate=0.001)
+    for i in range(10_000):
+        d.check_and_add(f"mint{i}")
+    false_hits = sum(d.check_and_add(f"other{i}") for i in range(10_000))
+    stats = d.stats()
+    assert stats["estimated_fp_rate"] < 0.01
+    assert false_hits / 10_000 < 0.01
+
+
+def test_make_dedupe_rejects_unknown_backend():
+    assert isinstance(make_dedupe("bloom", 10, 100), RotatingBloomDedupe)
+    with pytest.raises(ValueError):
+        make_dedupe("nope", 10, 100)
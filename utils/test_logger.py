@@ -0,0 +1,89 @@
+# utils/test_logger.py – background log writer, rotation, JSON lines and hot-path sampling
+
+import gzip
+import json
+import sys
+
+import pytest
+from loguru import logger
+
+from utils import logger as logmod
+from utils.logger import MUTED, RotatingFile, Sampler, setup_logging, shutdown_logging
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def _restore_logging():
+    yield
+    shutdown_logging()
+    logger.remove()
+    logger.add(sys.stderr)                                  # loguru's default handler
+
+
+def test_sampler_passes_burst_then_one_in_n_with_suppressed_count():
+    clock = FakeClock()
+    s = Sampler(burst=3, interval=1.0, every=5, clock=clock)
+    results = [s.allow("k") for _ in range(13)]
+    assert results[:3] == [1, 1, 1]
+    assert results[3:] == [0, 0, 0, 0, 5, 0, 0, 0, 0, 5]   # 4 suppressed, then the 5th passes
+    assert s.allow("other") == 1 and s.stats() == {}
+    s.allow("k")
+    clock.now = 1.0                                         # new window → burst again
+    assert s.allow("k") == 2 and s.allow("k") == 1
+
+
+def test_hot_is_muted_when_sampled_out(monkeypatch):
+    monkeypatch.setattr(logmod, "sampler", Sampler(burst=1, every=1000))
+    assert logmod.hot("x") is logger
+    assert logmod.hot("x") is MUTED
+    MUTED.info("never {}", "rendered")
+
+
+def test_rotating_file_rotates_by_size_gzips_and_prunes(tmp_path):
+    clock = FakeClock()
+    f = RotatingFile(tmp_path / "ashborn.log", max_bytes=100, interval=3600, backups=2, clock=clock)
+    for i in range(10):
+        clock.now += 1
+        f.write(f"{i:02d} " + "x" * 57 + "\n")               # 61 bytes → one line per file
+    f.close()
+    rotated = sorted(tmp_path.glob("ashborn.*.log.gz"))
+    assert len(rotated) == 2
+    assert gzip.open(rotated[-1], "rt").read().startswith("08 ")
+    assert (tmp_path / "ashborn.log").read_text().startswith("09 ")
+
+
+def test_rotating_file_rotates_by_age(tmp_path):
+    clock = FakeClock()
+    f = RotatingFile(tmp_path / "a.log", max_bytes=1 << 20, interval=60, compress=False, clock=clock)
+    f.write("old\n")
+    clock.now = 61
+    f.write("new\n")
+    f.close()
+    assert [p.read_text() for p in tmp_path.glob("a.*.log")] == ["old\n"]
+    assert (tmp_path / "a.log").read_text() == "new\n"
+
+
+def test_setup_logging_writes_json_lines_with_suppressed_count(tmp_path, monkeypatch):
+    monkeypatch.setattr(logmod, "sampler", Sampler(burst=1, every=3))
+    setup_logging("INFO", log_dir=str(tmp_path), json_lines=True, console=None)
+    logger.debug("below level")
+    for i in range(4):
+        logmod.hot("buy.signal").info("🚀 BUY {}", i)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("failed")
+    shutdown_logging()
+
+    lines = [json.loads(line) for line in (tmp_path / "ashborn.jsonl").read_text().splitlines()]
+    assert [e["message"] for e in lines] == ["🚀 BUY 0", "🚀 BUY 3", "failed"]
+    assert lines[1]["extra"] == {"hot": "buy.signal", "suppressed": 2}
+    assert lines[2]["level"] == "ERROR" and "boom" in lines[2]["exception"]
+    assert lines[0]["module"] == __name__
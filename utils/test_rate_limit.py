@@ -0,0 +1,94 @@
+# utils/test_rate_limit.py – token bucket, Retry-After pauses and the adaptive poll scheduler
+
+import asyncio
+
+import pytest
+
+from sniffers.birdeye_client import BirdEyeClient, BirdEyeRateLimited
+from sniffers.stub_birdeye import StubBirdEye
+from utils.rate_limit import PollScheduler, TokenBucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_bucket_spends_burst_then_queues_fifo():
+    clock = FakeClock()
+    bucket = TokenBucket(60, burst=2, clock=clock)            # one credit per second
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 1.0, 2.0]
+    clock.now = 10
+    assert bucket.reserve() == 0.0                            # refilled (capped at the burst)
+    assert bucket.stats()["delayed"] == 2
+
+
+def test_pause_blocks_everyone_and_earns_no_credit():
+    clock = FakeClock()
+    bucket = TokenBucket(60, burst=5, clock=clock)
+    bucket.pause(30)
+    assert bucket.retry_after() == 30
+    assert bucket.reserve() == pytest.approx(30.0)            # first request right when the pause ends
+    assert bucket.reserve() == pytest.approx(31.0)            # then at the refill rate
+    clock.now = 40
+    assert bucket.reserve() == 0.0 and bucket.throttled == 1
+
+
+def test_metered_counts_requests_of_spawned_tasks():
+    bucket = TokenBucket(6000)
+
+    async def run():
+        with bucket.metered() as meter:
+            await asyncio.gather(*(bucket.acquire() for _ in range(3)))
+        await bucket.acquire()                                 # outside the block
+        return meter.requests
+
+    assert asyncio.run(run()) == 3
+
+
+def test_scheduler_speeds_up_on_activity_and_backs_off_when_quiet():
+    sched = PollScheduler(budget_per_minute=1000)
+    sched.register("sniffer", min_interval=10, max_interval=300, initial=60)
+    assert sched.observe("sniffer", changed=3, requests=1) == 30
+    assert sched.observe("sniffer", changed=1, requests=1) == 15
+    assert sched.observe("sniffer", changed=2, requests=1) == 10
+    intervals = [sched.observe("sniffer", changed=0, requests=1) for _ in range(20)]
+    assert intervals[0] == 15 and intervals[-1] == 300
+
+
+def test_scheduler_keeps_all_pollers_inside_the_budget():
+    sched = PollScheduler(budget_per_minute=100, share=0.8)
+    sched.register("sniffer", 1, 600, initial=1)
+    sched.register("prices", 1, 600, initial=1)
+    for _ in range(5):
+        sched.observe("sniffer", changed=1, requests=40)
+        sched.observe("prices", changed=1, requests=4)
+    per_minute = sum(p.cost * 60 / p.interval for p in sched.pollers.values())
+    assert per_minute <= 100 * 0.8 + 1e-6
+
+
+def test_scheduler_honours_retry_after():
+    clock = FakeClock()
+    bucket = TokenBucket(600, clock=clock)
+    sched = PollScheduler(600, bucket)
+    sched.register("sniffer", 10, 300, initial=10)
+    bucket.pause(120)
+    assert sched.observe("sniffer", changed=5, requests=1) == 120
+
+
+def test_429_retry_after_pauses_the_shared_bucket():
+    bucket = TokenBucket(6000)
+    with StubBirdEye([]) as stub:
+        stub.fail_next(2, status=429, headers={"Retry-After": "0.2"})
+
+        async def run():
+            async with BirdEyeClient("k", base_url=stub.base_url, backoff_base=0.001, retries=1, limiter=bucket) as c:
+                with pytest.raises(BirdEyeRateLimited) as err:
+                    await c.get_json("/defi/tokenlist")
+                return err.value.retry_after
+
+        assert asyncio.run(run()) == pytest.approx(0.2)
+    assert bucket.throttled == 2 and bucket.granted == 2
@@ -0,0 +1,71 @@
+# utils/test_tracing.py – HDR-style histograms, disabled fast path, exposition
+
+import asyncio
+import random
+
+from utils.tracing import Histogram, Tracer, _index, _value
+
+
+def test_bucket_error_is_bounded():
+    for v in [0, 1, 127, 128, 129, 1_000, 65_535, 1_234_567, 10**9, 3 * 10**12]:
+        assert abs(_value(_index(v)) - v) <= max(1, v / 64)
+
+
+def test_percentiles_match_exact_values_within_resolution():
+    rng = random.Random(7)
+    values = [int(rng.lognormvariate(13, 1)) for _ in range(20_000)]
+    hist = Histogram()
+    for v in values:
+        hist.record(v)
+    values.sort()
+    p = hist.percentiles((0.5, 0.95, 0.99))
+    for q in (0.5, 0.95, 0.99):
+        exact = values[int(q * len(values)) - 1]
+        assert abs(p[q] - exact) / exact < 0.03
+    assert hist.count == len(values) and hist.max == values[-1]
+
+
+def test_disabled_tracer_records_nothing():
+    t = Tracer(enabled=False)
+    assert t.now() == 0
+    t.record("queue", t.now())
+    t.record("queue", 123, 456)
+    assert t.report() == {}
+
+
+def test_report_and_prometheus_export(tmp_path):
+    t = Tracer(enabled=True)
+    for ms in (1, 2, 3, 4, 100):
+        t.record("buyer", 1, 1 + ms * 1_000_000)
+    t.record("queue", 0)                       # start from a disabled span – ignored
+    rep = t.report()
+    assert list(rep) == ["buyer"]
+    assert rep["buyer"]["count"] == 5
+    assert 2.9 < rep["buyer"]["p50_ms"] < 3.1 and 99 < rep["buyer"]["p99_ms"] <= 100
+
+    path = tmp_path / "latency.prom"
+    t.export(path)
+    text = path.read_text()
+    assert "# TYPE ashborn_stage_latency_seconds summary" in text
+    assert 'ashborn_stage_latency_seconds{stage="buyer",quantile="0.5"}' in text
+    assert 'ashborn_stage_latency_seconds_count{stage="buyer"} 5' in text
+
+
+def test_alpha_event_is_traced_through_the_brain(monkeypatch):
+    from bot import brain
+    from bot.risk import RiskPipeline
+    from utils import tracing
+
+    t = Tracer(enabled=True)
+    monkeypatch.setattr(brain, "tracer", t)
+    monkeypatch.setattr(tracing, "tracer", t)
+    submitted = []
+    monkeypatch.setattr(brain, "was_already_traded", lambda token: False)
+    monkeypatch.setattr(brain, "get_executor", lambda: type("Ex", (), {
+        "submit": staticmethod(lambda token, amount, source, **meta: submitted.append(meta))})())
+
+    evt = brain._alpha_event("NEW", "New coin", "mint", "new_listing", None, discovered_ns=t.now())
+    monkeypatch.setattr(brain, "risk_pipeline", RiskPipeline([]))
+    asyncio.run(brain.CommandBrain().process_alpha([evt]))
+    assert set(t.report()) == {"sniffer", "queue", "analyze", "handle"}
+    assert submitted == [{"origin_ns": evt["trace"]["discovered"], "address": "mint"}]